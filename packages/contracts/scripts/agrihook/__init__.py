@@ -0,0 +1,4 @@
+"""
+Agri-Hook Python Toolkit
+Off-chain models and tooling shared by the Agri-Hook oracle, monitoring and test scripts
+"""
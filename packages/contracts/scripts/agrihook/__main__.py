@@ -0,0 +1,7 @@
+"""python -m agrihook"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,616 @@
+"""
+Agri-Hook Command Line
+Single entry point for the oracle and monitoring tools: python -m agrihook <command>
+
+Only argparse and the standard library are imported at startup. Each command imports what it
+needs when it runs, so pure-math commands (consensus, simulate) never load web3, eth_account or
+aiohttp, and `bench` measures that they stay that way.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+COSTON2_RPC = "https://coston2-api.flare.network/ext/C/rpc"
+CHAIN_ID = 114
+
+# Default location: Minas Gerais, Brazil (Coffee region)
+DEFAULT_LATITUDE = -18.5122
+DEFAULT_LONGITUDE = -44.5550
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('web3', 'eth_account', 'aiohttp', 'requests')
+
+WEATHER_ORACLE_ABI = [
+    {"inputs": [], "name": "basePrice", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "getTheoreticalPrice", "outputs": [{"type": "uint256"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"type": "uint256"}, {"type": "int256"}, {"type": "int256"}], "name": "updateWeatherSimple", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+    {"inputs": [], "name": "getCurrentWeatherEvent", "outputs": [{"type": "uint8"}, {"type": "int256"}, {"type": "uint256"}, {"type": "bool"}], "stateMutability": "view", "type": "function"}
+]
+
+INSURANCE_VAULT_ABI = [
+    {"inputs": [], "name": "claimPayout", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+    {"inputs": [{"type": "address"}], "name": "getPolicy", "outputs": [{"type": "int256"}, {"type": "int256"}, {"type": "bytes32"}, {"type": "uint256"}, {"type": "uint256"}, {"type": "uint256"}, {"type": "uint256"}, {"type": "bool"}, {"type": "bool"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "getVaultStats", "outputs": [{"type": "uint256"}, {"type": "uint256"}, {"type": "uint256"}, {"type": "uint256"}, {"type": "uint256"}], "stateMutability": "view", "type": "function"}
+]
+
+
+def _print_json(data):
+    print(json.dumps(data, indent=2, default=str))
+
+
+def _fetch_results(args) -> Dict:
+    from .providers import fetch_observations, history_rows, summarize_results
+
+    observations = fetch_observations(args.lat, args.lon, providers=args.providers, days=args.days)
+    if args.history:
+        from .history_store import HistoryStore
+        HistoryStore(args.history).append(history_rows(observations))
+    return summarize_results(observations)
+
+
+# ---------------------------------------------------------------------- chain helpers
+
+def _load_env():
+    try:
+        import dotenv
+    except ImportError:
+        return
+    dotenv.load_dotenv()
+
+
+def _web3():
+    from web3 import Web3
+    from .rpc_pool import RPCPool
+
+    _load_env()
+    return Web3(RPCPool.from_env(os.getenv('COSTON2_RPC', COSTON2_RPC)))
+
+
+def _require_env(name: str) -> str:
+    value = os.getenv(name)
+    if not value:
+        raise SystemExit(f"❌ {name} not set in environment")
+    return value
+
+
+def _contract(w3, env_name: str, abi: List[Dict]):
+    return w3.eth.contract(address=w3.to_checksum_address(_require_env(env_name)), abi=abi)
+
+
+def _account():
+    from eth_account import Account
+    return Account.from_key(_require_env('PRIVATE_KEY'))
+
+
+def _send(w3, account, call, gas: int) -> Dict:
+    """Sign and send a contract call, returning the receipt"""
+    from .telemetry import span
+
+    tx = call.build_transaction({
+        'from': account.address,
+        'nonce': w3.eth.get_transaction_count(account.address),
+        'gas': gas,
+        'gasPrice': w3.eth.gas_price,
+        'chainId': CHAIN_ID
+    })
+    signed_tx = account.sign_transaction(tx)
+    tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    print(f"   Transaction sent: {tx_hash.hex()}")
+    with span('tx.receipt_wait'):
+        return w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+
+
+# ---------------------------------------------------------------------- commands
+
+def cmd_fetch(args) -> int:
+    """Per-provider 7-day summaries"""
+    _print_json(_fetch_results(args))
+    return 0
+
+
+def cmd_consensus(args) -> int:
+    """Median consensus, drought tier and WeatherData struct"""
+    from .consensus import build_weather_data, calculate_consensus, get_drought_severity
+
+    if args.rainfall:
+        readings = [{'source': f'input{i}', 'rainfall': r, 'temperature': args.temperature,
+                     'humidity': args.humidity} for i, r in enumerate(args.rainfall)]
+    else:
+        readings = [r for r in _fetch_results(args).values() if r['success']]
+    if len(readings) < 2:
+        print('❌ Not enough data sources (need at least 2)', file=sys.stderr)
+        return 1
+
+    consensus = calculate_consensus(readings)
+    _print_json({
+        'consensus': consensus,
+        'drought': get_drought_severity(consensus['rainfall']),
+        'weather_data': build_weather_data(consensus, {'latitude': args.lat, 'longitude': args.lon}),
+    })
+    return 0
+
+
+def cmd_simulate(args) -> int:
+    """Drought scenario walkthrough (pure math)"""
+    import importlib.util
+    from .reporting import make_reporter
+
+    spec = importlib.util.spec_from_file_location(
+        'drought_scenario', os.path.join(SCRIPTS_DIR, 'test-drought-scenario.py'))
+    scenario = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(scenario)
+
+    reporter = make_reporter(args.reporter, scenario.RENDERERS, scenario.render_summary)
+    tester = scenario.DroughtScenarioTester(reporter, rainfall=args.rainfall, pool_price=args.pool_price)
+    result = tester.run_scenario(output=args.output)
+    return 0 if result.ok else 1
+
+
+def cmd_submit(args) -> int:
+    """Gated updateWeatherSimple on the WeatherOracle"""
+    from .oracle_gate import SubmissionGate, contract_rainfall
+
+    rainfall = args.rainfall
+    if rainfall is None:
+        from .consensus import calculate_consensus
+        readings = [r for r in _fetch_results(args).values() if r['success']]
+        if len(readings) < 2:
+            print('❌ Not enough data sources (need at least 2)', file=sys.stderr)
+            return 1
+        rainfall = calculate_consensus(readings)['rainfall']
+
+    w3 = _web3()
+    oracle = _contract(w3, 'WEATHER_ORACLE_ADDRESS', WEATHER_ORACLE_ABI)
+    gate = SubmissionGate(oracle)
+    decision = gate.decide(rainfall)
+    if not decision.submit and not args.force:
+        print(f"⏭️  Skipped: on-chain event already {decision.current} ({decision.age}s old)")
+        return 0
+    print(f"🌦️  Submitting {decision.rainfall}mm ({decision.reason}): {decision.current} → {decision.predicted}")
+    if args.dry_run:
+        return 0
+
+    receipt = _send(w3, _account(), oracle.functions.updateWeatherSimple(
+        contract_rainfall(rainfall), int(args.lat * 1e6), int(args.lon * 1e6)), gas=200000)
+    if receipt['status'] != 1:
+        print("❌ Transaction failed")
+        return 1
+    print(f"✅ Weather updated in block {receipt['blockNumber']}")
+    return 0
+
+
+def cmd_monitor(args) -> int:
+    """Oracle and vault state, one JSON line per poll"""
+    w3 = _web3()
+    oracle = _contract(w3, 'WEATHER_ORACLE_ADDRESS', WEATHER_ORACLE_ABI)
+    vault = _contract(w3, 'INSURANCE_VAULT_ADDRESS', INSURANCE_VAULT_ABI) \
+        if os.getenv('INSURANCE_VAULT_ADDRESS') else None
+
+    polls = 0
+    while True:
+        event_type, impact, timestamp, active = oracle.functions.getCurrentWeatherEvent().call()
+        state = {
+            'block': w3.eth.block_number,
+            'time': int(time.time()),
+            'base_price': oracle.functions.basePrice().call(),
+            'theoretical_price': oracle.functions.getTheoreticalPrice().call(),
+            'weather_event': {'type': event_type, 'impact': impact, 'timestamp': timestamp, 'active': active},
+        }
+        if vault is not None:
+            coverage, premiums, payouts, treasury, utilization = vault.functions.getVaultStats().call()
+            state['vault'] = {'total_coverage': coverage, 'total_premiums': premiums,
+                              'total_payouts': payouts, 'treasury': treasury, 'utilization_rate': utilization}
+        print(json.dumps(state), flush=True)
+
+        polls += 1
+        if not args.interval or (args.count and polls >= args.count):
+            return 0
+        time.sleep(args.interval)
+
+
+def cmd_claim(args) -> int:
+    """Claim the caller's insurance payout"""
+    w3 = _web3()
+    account = _account()
+    vault = _contract(w3, 'INSURANCE_VAULT_ADDRESS', INSURANCE_VAULT_ABI)
+
+    policy = vault.functions.getPolicy(account.address).call()
+    active, claimed = policy[7], policy[8]
+    print(f"📋 Policy for {account.address}: coverage {policy[3]}, active {active}, claimed {claimed}")
+    if not active or claimed:
+        print("❌ No claimable policy")
+        return 1
+    if args.dry_run:
+        vault.functions.claimPayout().call({'from': account.address})
+        print("✅ Claim would succeed")
+        return 0
+
+    receipt = _send(w3, account, vault.functions.claimPayout(), gas=300000)
+    if receipt['status'] != 1:
+        print("❌ Transaction failed")
+        return 1
+    print(f"✅ Payout claimed in block {receipt['blockNumber']}")
+    return 0
+
+
+def cmd_daemon(args) -> int:
+    """Resident scheduler for weather, FTSO and FDC jobs with a health endpoint"""
+    import asyncio
+    from .daemon import OracleDaemon, Region
+
+    regions = [Region.parse(spec) for spec in args.region] or \
+        [Region('minas_gerais', DEFAULT_LATITUDE, DEFAULT_LONGITUDE, submit=True)]
+    w3 = account = None
+    oracle_address = os.getenv('WEATHER_ORACLE_ADDRESS')
+    if oracle_address:
+        w3 = _web3()
+        if os.getenv('PRIVATE_KEY') and not args.dry_run:
+            account = _account()
+
+    daemon = OracleDaemon(regions, w3, oracle_address, account,
+                          weather_interval=args.weather_interval, ftso_interval=args.ftso_interval,
+                          fdc_interval=args.fdc_interval, fdc_dir=args.fdc_dir,
+                          history_dir=args.history, dry_run=args.dry_run)
+    try:
+        asyncio.run(daemon.run(args.host, args.port, args.duration))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_serve(args) -> int:
+    """Cached consensus HTTP service for the frontend and bots"""
+    from .providers import ProviderClient
+    from .weather_service import WeatherService
+
+    _load_env()
+    service = WeatherService(ProviderClient(providers=args.providers, cache_ttl=args.ttl), ttl=args.ttl)
+    warm = [(region.latitude, region.longitude) for region in _regions(args)] if args.region else None
+    service.serve(args.host, args.port, warm)
+    return 0
+
+
+def cmd_fuzz(args) -> int:
+    """Differential fuzzing of the Python contract models against a local EVM (anvil)"""
+    from web3 import Web3
+    from .difffuzz import TARGETS, EVMHarness, fuzz
+
+    w3 = Web3(Web3.HTTPProvider(args.rpc))
+    if args.curve and args.premium:
+        harness = EVMHarness(w3, args.curve, args.premium, batch_size=args.batch_size)
+    else:
+        harness = EVMHarness.deploy(w3, args.artifacts, batch_size=args.batch_size)
+
+    reports = fuzz(harness, args.cases, args.target, args.seed, args.legacy)
+    for report in reports:
+        found = sum(report.mismatches.values())
+        print(f"{'✅' if report.passed else '❌'} {report.target}: {report.cases:,} cases, "
+              f"{found:,} mismatch(es), {report.round_trips} round trip(s), {report.elapsed:.1f} s")
+        for example in report.examples:
+            print(f"   {json.dumps(example.describe(TARGETS[report.target]))}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([r.summary() for r in reports], f, indent=2)
+    return 0 if all(r.passed for r in reports) else 1
+
+
+def cmd_whatif(args) -> int:
+    """Premiums, prices and claims under hypothetical oracle / vault state (eth_call overrides)"""
+    from .regions import calculate_region_hash
+    from .whatif import ScenarioEngine, claim_scenarios, premium_scenarios, price_scenarios
+
+    w3 = _web3()
+    oracle = _contract(w3, 'WEATHER_ORACLE_ADDRESS', WEATHER_ORACLE_ABI)
+    scenarios = price_scenarios(oracle.address, args.rainfall,
+                                int(args.base_price * 1e6) if args.base_price is not None else None)
+    if os.getenv('INSURANCE_VAULT_ADDRESS'):
+        vault = _contract(w3, 'INSURANCE_VAULT_ADDRESS', INSURANCE_VAULT_ABI)
+        treasury = int(args.treasury * 10**18) if args.treasury is not None \
+            else vault.functions.getVaultStats().call()[3]
+        risks = [tuple(int(v) for v in spec.split(':')) for spec in args.risk]
+        region_hash = calculate_region_hash(int(args.lat * 1e6), int(args.lon * 1e6))
+        scenarios += premium_scenarios(vault.address, region_hash, int(args.coverage * 1e6),
+                                       risks, args.utilization, treasury)
+        drought = min(args.rainfall)
+        scenarios += claim_scenarios(vault.address, oracle.address,
+                                     [w3.to_checksum_address(f) for f in args.farmer], drought)
+
+    engine = ScenarioEngine(w3, calls_per_request=args.batch_size)
+    results = engine.evaluate(scenarios, block=args.block)
+    for result in results:
+        value = 'reverted: ' + result.errors[0] if not result.ok else \
+            result.value if result.values[0] else 'ok'
+        check = ''
+        if result.predicted is not None:
+            matches = result.ok and tuple(result.values[0]) == result.predicted
+            check = '  ✅' if matches else f'  ❌ model {result.predicted}'
+        print(f"   {result.name:<36} {value}{check}")
+    print(f"📊 {len(results)} scenario(s), {engine.eth_calls} eth_call(s), {engine.round_trips} round trip(s)")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([r.summary() for r in results], f, indent=2, default=str)
+    return 0
+
+
+def cmd_wallets(args) -> int:
+    """Multi-sender wallet pool: lane balances, top-ups, claim waves and risk pushes"""
+    from .wallet_pool import WalletPool, address_of, claims, derive_keys, risk_updates
+
+    w3 = _web3()
+    master = bytes.fromhex(_require_env('PRIVATE_KEY').removeprefix('0x'))
+    operators = [k for k in os.getenv('OPERATOR_KEYS', '').split(',') if k] or \
+        derive_keys(master, args.operators, 'operator')
+    farmers = derive_keys(master, args.farmers, 'farmer')
+    workers = args.workers
+
+    if args.action == 'risk':
+        with open(args.updates) as f:
+            updates = [(bytes.fromhex(h.removeprefix('0x')), c, r) for h, c, r in json.load(f)]
+        vault = _require_env('INSURANCE_VAULT_ADDRESS')
+        with WalletPool(w3, [master], workers=workers) as pool:        # updateRegionRisk is onlyOwner
+            report = pool.execute(risk_updates(vault, address_of(master), updates, w3.eth.gas_price,
+                                               chain_id=CHAIN_ID))
+    else:
+        with WalletPool(w3, operators + farmers, funder_key=master, workers=workers) as pool:
+            if args.action == 'balances':
+                _print_json({address: balance / 1e18 for address, balance in pool.balances().items()})
+                low = pool.low_balances(int(args.min_balance * 1e18))
+                print(f"{'⚠️ ' if low else '✅'} {len(low)} lane(s) below {args.min_balance}")
+                return 1 if low else 0
+            if args.action == 'top-up':
+                minimum, target = int(args.min_balance * 1e18), int(args.target_balance * 1e18)
+                report = pool.top_up(dict.fromkeys(pool.addresses, minimum), dict.fromkeys(pool.addresses, target))
+            else:
+                vault = _require_env('INSURANCE_VAULT_ADDRESS')
+                report = pool.execute(claims(vault, [address_of(k) for k in farmers], w3.eth.gas_price,
+                                             chain_id=CHAIN_ID))
+
+    for outcome in report.failed:
+        print(f"   ❌ {outcome.op.label}: {outcome.error}")
+    _print_json(report.summary())
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump([o.summary() for o in report.outcomes], f, indent=2)
+    return 1 if report.failed else 0
+
+
+def cmd_queue(args) -> int:
+    """Durable job queue: enqueue, work, status, retry"""
+    from .job_queue import JobQueue, claim_key, oracle_handlers, region_day_key, run_worker
+
+    queue = JobQueue(args.db)
+    if args.action == 'status':
+        _print_json(queue.stats())
+        return 0
+    if args.action == 'retry':
+        print(f"🔁 {queue.retry_failed(args.kind)} failed job(s) back to pending")
+        return 0
+    if args.action == 'enqueue':
+        if args.kind is None:
+            raise SystemExit('❌ enqueue needs --kind')
+        if args.kind == 'claim':
+            jobs = [(claim_key(farmer, args.event_timestamp), {'farmer': farmer}) for farmer in args.farmer]
+        else:
+            jobs = [(region_day_key(region.name, day), {'region': region.name, 'latitude': region.latitude,
+                                                        'longitude': region.longitude, 'day': day})
+                    for region in _regions(args) for day in args.day]
+        added = queue.enqueue_many(args.kind, jobs)
+        print(f"📥 {added} new {args.kind} job(s), {len(jobs) - added} already queued")
+        return 0
+
+    # work
+    w3 = account = oracle = vault = None
+    _load_env()
+    if os.getenv('PRIVATE_KEY') and (os.getenv('WEATHER_ORACLE_ADDRESS') or os.getenv('INSURANCE_VAULT_ADDRESS')):
+        w3, account = _web3(), _account()
+        if os.getenv('WEATHER_ORACLE_ADDRESS'):
+            oracle = _contract(w3, 'WEATHER_ORACLE_ADDRESS', WEATHER_ORACLE_ABI)
+        if os.getenv('INSURANCE_VAULT_ADDRESS'):
+            vault = _contract(w3, 'INSURANCE_VAULT_ADDRESS', INSURANCE_VAULT_ABI)
+    handlers = oracle_handlers(queue, w3, account, oracle, vault, history_dir=args.history, fdc_dir=args.fdc_dir)
+    counts = run_worker(queue, handlers, max_jobs=args.max_jobs, idle_exit=not args.follow)
+    print(f"✅ {counts['completed']} completed, ❌ {counts['failed']} failed")
+    _print_json(queue.stats())
+    return 0
+
+
+def _regions(args) -> list:
+    from .daemon import Region
+    return [Region.parse(spec) for spec in args.region] or [Region('minas_gerais', DEFAULT_LATITUDE, DEFAULT_LONGITUDE)]
+
+
+# ---------------------------------------------------------------------- startup benchmark
+
+BENCH_COMMANDS = [
+    ['--help'],
+    ['consensus', '--rainfall', '0', '3', '4'],
+    ['simulate', '--reporter', 'quiet'],
+]
+
+
+def _time_process(argv: List[str], runs: int) -> float:
+    """Median wall time in ms of running `argv` in a fresh interpreter"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=SCRIPTS_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return round(samples[len(samples) // 2], 1)
+
+
+def _leaked_modules(command: List[str]) -> List[str]:
+    """Heavy modules loaded after running a command in a fresh interpreter"""
+    probe = ('import contextlib, io, json, sys\n'
+             'from agrihook.cli import main\n'
+             'with contextlib.redirect_stdout(io.StringIO()):\n'
+             '    try:\n'
+             f'        main({command!r})\n'
+             '    except SystemExit:\n'
+             '        pass\n'
+             f'print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))\n')
+    out = subprocess.run([sys.executable, '-c', probe], cwd=SCRIPTS_DIR, capture_output=True, text=True)
+    return json.loads(out.stdout.strip().splitlines()[-1]) if out.stdout.strip() else ['<probe failed>']
+
+
+def cmd_bench(args) -> int:
+    """Startup time per command and a check that pure commands skip heavy imports"""
+    baseline = _time_process([sys.executable, '-c', 'pass'], args.runs)
+    web3_import = _time_process([sys.executable, '-c', 'import web3'], args.runs)
+    rows = []
+    for command in BENCH_COMMANDS:
+        elapsed = _time_process([sys.executable, '-m', 'agrihook'] + command, args.runs)
+        rows.append({'command': ' '.join(command), 'ms': elapsed,
+                     'over_baseline_ms': round(elapsed - baseline, 1),
+                     'heavy_imports': _leaked_modules(command)})
+
+    failed = [r for r in rows if r['heavy_imports'] or (args.budget_ms and r['over_baseline_ms'] > args.budget_ms)]
+    _print_json({'python_ms': baseline, 'import_web3_ms': web3_import, 'commands': rows,
+                 'passed': not failed})
+    return 1 if failed else 0
+
+
+# ---------------------------------------------------------------------- parser
+
+def _add_location(parser, fetch: bool = True):
+    parser.add_argument('--lat', type=float, default=DEFAULT_LATITUDE)
+    parser.add_argument('--lon', type=float, default=DEFAULT_LONGITUDE)
+    if fetch:
+        parser.add_argument('--providers', nargs='+', help='Provider names (default: all registered)')
+        parser.add_argument('--days', type=int, default=7)
+        parser.add_argument('--history', default=os.getenv('WEATHER_HISTORY_DIR'),
+                            help='Append daily observations to this history store')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='agrihook', description='Agri-Hook oracle and monitoring tools')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('fetch', help=cmd_fetch.__doc__)
+    _add_location(p)
+    p.set_defaults(func=cmd_fetch)
+
+    p = commands.add_parser('consensus', help=cmd_consensus.__doc__)
+    _add_location(p)
+    p.add_argument('--rainfall', type=float, nargs='+', help='Use these readings instead of fetching')
+    p.add_argument('--temperature', type=float, default=0.0)
+    p.add_argument('--humidity', type=float, default=0.0)
+    p.set_defaults(func=cmd_consensus)
+
+    p = commands.add_parser('simulate', help=cmd_simulate.__doc__)
+    p.add_argument('--rainfall', type=float, default=0)
+    p.add_argument('--pool-price', type=float, default=5.00)
+    p.add_argument('--reporter', choices=['console', 'ndjson', 'quiet'], default=None)
+    p.add_argument('--output', help='Also write the legacy JSON summary')
+    p.set_defaults(func=cmd_simulate)
+
+    p = commands.add_parser('submit', help=cmd_submit.__doc__)
+    _add_location(p)
+    p.add_argument('--rainfall', type=float, help='Rainfall in mm (default: fetch consensus)')
+    p.add_argument('--force', action='store_true', help='Submit even if the stored event is unchanged')
+    p.add_argument('--dry-run', action='store_true')
+    p.set_defaults(func=cmd_submit)
+
+    p = commands.add_parser('monitor', help=cmd_monitor.__doc__)
+    p.add_argument('--interval', type=float, default=0, help='Poll every N seconds (0: once)')
+    p.add_argument('--count', type=int, default=0, help='Stop after N polls (0: forever)')
+    p.set_defaults(func=cmd_monitor)
+
+    p = commands.add_parser('claim', help=cmd_claim.__doc__)
+    p.add_argument('--dry-run', action='store_true', help='Simulate with eth_call only')
+    p.set_defaults(func=cmd_claim)
+
+    p = commands.add_parser('daemon', help=cmd_daemon.__doc__)
+    p.add_argument('--region', action='append', default=[], metavar='NAME:LAT:LON[:submit]')
+    p.add_argument('--weather-interval', type=float, default=900)
+    p.add_argument('--ftso-interval', type=float, default=240)
+    p.add_argument('--fdc-interval', type=float, default=90)
+    p.add_argument('--fdc-dir', help='Write attestation requests to DIR/requests, submit DIR/proofs')
+    p.add_argument('--history', default=os.getenv('WEATHER_HISTORY_DIR'))
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=9464)
+    p.add_argument('--duration', type=float, help='Exit after N seconds')
+    p.add_argument('--dry-run', action='store_true', help='Decide and log, never send transactions')
+    p.set_defaults(func=cmd_daemon)
+
+    p = commands.add_parser('serve', help=cmd_serve.__doc__)
+    p.add_argument('--region', action='append', default=[], metavar='NAME:LAT:LON',
+                   help='Warm these regions before serving')
+    p.add_argument('--providers', nargs='+', help='Provider names (default: all registered)')
+    p.add_argument('--ttl', type=float, default=600)
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8787)
+    p.set_defaults(func=cmd_serve)
+
+    p = commands.add_parser('fuzz', help=cmd_fuzz.__doc__)
+    p.add_argument('--rpc', default='http://127.0.0.1:8545')
+    p.add_argument('--cases', type=int, default=100_000, help='Cases per target')
+    p.add_argument('--target', nargs='+', choices=['fee', 'bonus', 'premium'])
+    p.add_argument('--seed', type=int, default=0)
+    p.add_argument('--batch-size', type=int, default=500, help='Cases per eth_call')
+    p.add_argument('--legacy', action='store_true', help='Also check models with known divergences')
+    p.add_argument('--artifacts', default=os.path.join(os.path.dirname(SCRIPTS_DIR), 'out'),
+                   help='forge build output used to deploy the harness')
+    p.add_argument('--curve', help='Existing CurveHarness address (skip deployment)')
+    p.add_argument('--premium', help='Existing PremiumHarness address')
+    p.add_argument('--output', help='Write the reports as JSON')
+    p.set_defaults(func=cmd_fuzz)
+
+    p = commands.add_parser('whatif', help=cmd_whatif.__doc__)
+    _add_location(p, fetch=False)
+    p.add_argument('--rainfall', type=int, nargs='+', default=[0, 3, 7, 12], help='7-day rainfall (mm)')
+    p.add_argument('--base-price', type=float, help='Override basePrice (USD)')
+    p.add_argument('--coverage', type=float, default=10000, help='Coverage (USDC)')
+    p.add_argument('--risk', nargs='+', default=['0:0', '50:50', '100:100'], metavar='CURRENT:HISTORICAL')
+    p.add_argument('--utilization', type=int, nargs='+', default=[0, 50, 80], help='Vault utilization %%')
+    p.add_argument('--treasury', type=Decimal,
+                   help='Override treasuryBalance (CFLR, held in wei; default: on-chain)')
+    p.add_argument('--farmer', action='append', default=[], help='Check claimPayout under the driest rainfall')
+    p.add_argument('--block', type=int, help='Evaluate at this block (default: latest)')
+    p.add_argument('--batch-size', type=int, default=500, help='eth_calls per JSON-RPC batch')
+    p.add_argument('--output', help='Write the results as JSON')
+    p.set_defaults(func=cmd_whatif)
+
+    p = commands.add_parser('wallets', help=cmd_wallets.__doc__)
+    p.add_argument('action', choices=['balances', 'top-up', 'claim', 'risk'])
+    p.add_argument('--operators', type=int, default=4, help='Operator lanes derived from PRIVATE_KEY '
+                   '(or OPERATOR_KEYS=key1,key2,...)')
+    p.add_argument('--farmers', type=int, default=0, help='Farmer lanes derived from PRIVATE_KEY')
+    p.add_argument('--min-balance', type=float, default=0.5, help='C2FLR')
+    p.add_argument('--target-balance', type=float, default=2.0, help='C2FLR')
+    p.add_argument('--updates', help='risk: JSON [[regionHash, current, historical], ...]')
+    p.add_argument('--workers', type=int, help='Signing processes (default: CPU count)')
+    p.add_argument('--output', help='Write per-transaction outcomes as JSON')
+    p.set_defaults(func=cmd_wallets)
+
+    p = commands.add_parser('queue', help=cmd_queue.__doc__)
+    p.add_argument('action', choices=['enqueue', 'work', 'status', 'retry'])
+    p.add_argument('--db', default=os.getenv('AGRIHOOK_QUEUE_DB', 'agrihook-jobs.db'))
+    p.add_argument('--kind', choices=['fetch', 'attest', 'submit', 'claim'])
+    p.add_argument('--region', action='append', default=[], metavar='NAME:LAT:LON')
+    p.add_argument('--day', action='append', default=[], help='YYYY-MM-DD (repeatable)')
+    p.add_argument('--farmer', action='append', default=[], help='Farmer address for claim jobs')
+    p.add_argument('--event-timestamp', type=int, default=0, help='Weather event timestamp for claim keys')
+    p.add_argument('--fdc-dir', default='fdc-rounds')
+    p.add_argument('--history', default=os.getenv('WEATHER_HISTORY_DIR'))
+    p.add_argument('--max-jobs', type=int)
+    p.add_argument('--follow', action='store_true', help='Keep polling when the queue is empty')
+    p.set_defaults(func=cmd_queue)
+
+    p = commands.add_parser('bench', help=cmd_bench.__doc__)
+    p.add_argument('--runs', type=int, default=5)
+    p.add_argument('--budget-ms', type=float, default=0,
+                   help='Fail if a command takes longer than this over bare Python')
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
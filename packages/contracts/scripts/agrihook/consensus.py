@@ -0,0 +1,85 @@
+"""
+Weather Consensus for Agri-Hook
+Median multi-source consensus, drought severity tiers and the WeatherOracle.WeatherData struct
+
+Pure Python (no web3/aiohttp) so consensus and severity checks start instantly.
+"""
+
+import statistics
+from datetime import datetime
+from typing import Dict, List
+
+from .telemetry import span, timed
+
+FDC_RAINFALL_SCALE = 100          # WeatherData.rainfall is attested in 0.01 mm units
+
+
+@timed('consensus.calculate')
+def calculate_consensus(weather_data: List[Dict]) -> Dict:
+    """Calculate consensus from multiple sources (2/3 agreement)"""
+    if len(weather_data) < 2:
+        raise ValueError('Need at least 2 sources for consensus')
+    
+    # Get median values
+    rainfall_values = sorted([d['rainfall'] for d in weather_data])
+    temp_values = sorted([d['temperature'] for d in weather_data])
+    humidity_values = sorted([d['humidity'] for d in weather_data])
+    
+    median_rainfall = statistics.median(rainfall_values)
+    median_temp = statistics.median(temp_values)
+    median_humidity = statistics.median(humidity_values)
+    
+    # Check if values are within 20% of each other (consensus threshold)
+    rainfall_consensus = all(
+        abs(v - median_rainfall) / (median_rainfall + 0.1) <= 0.2 
+        for v in rainfall_values
+    )
+    
+    return {
+        'rainfall': round(median_rainfall, 1),
+        'temperature': round(median_temp, 1),
+        'humidity': round(median_humidity, 1),
+        'consensus': rainfall_consensus,
+        'sources': [d['source'] for d in weather_data]
+    }
+
+
+def get_drought_severity(rainfall: float) -> Dict:
+    """Determine drought severity based on rainfall"""
+    if rainfall == 0:
+        return {
+            'severity': 'SEVERE',
+            'multiplier': 150,
+            'description': 'Severe drought - Coffee plants dying'
+        }
+    elif rainfall < 5:
+        return {
+            'severity': 'MODERATE',
+            'multiplier': 130,
+            'description': 'Moderate drought - Coffee plants stressed'
+        }
+    elif rainfall < 10:
+        return {
+            'severity': 'MILD',
+            'multiplier': 115,
+            'description': 'Mild drought - Coffee plants struggling'
+        }
+    else:
+        return {
+            'severity': 'NORMAL',
+            'multiplier': 100,
+            'description': 'Normal conditions - Coffee plants healthy'
+        }
+
+
+def build_weather_data(consensus: Dict, location: Dict) -> Dict:
+    """WeatherOracle.WeatherData struct fields for an FDC attestation"""
+    with span('attestation.build'):
+        return {
+            'rainfall': int(consensus['rainfall'] * FDC_RAINFALL_SCALE),
+            'temperature': int(consensus['temperature'] * 100),
+            'soilMoisture': 0,
+            'latitude': int(location['latitude'] * 1e6),
+            'longitude': int(location['longitude'] * 1e6),
+            'timestamp': int(datetime.now().timestamp()),
+        }
@@ -0,0 +1,188 @@
+"""
+Agri-Hook Contract Math
+Exact integer mirrors of the pure functions in AgriHook, FeeCurve, BonusCurve and WeatherOracle
+"""
+
+UINT24_MAX = 2**24 - 1
+UINT256_MAX = 2**256 - 1
+
+# AgriHook: Circuit Breaker Thresholds (Innovation #4)
+RECOVERY_THRESHOLD = 50           # 50% gap triggers recovery mode
+CIRCUIT_BREAKER_THRESHOLD = 100   # 100% gap freezes pool
+
+# AgriHook: Fee Configuration (Innovation #1)
+ALIGNED_FEE = 10                  # 0.01% for aligned traders
+BASE_FEE = 3000                   # 0.3% base fee
+MAX_MISALIGNED_FEE = 100000       # 10% max fee (100% gap)
+FEE_MULTIPLIER = 10               # Quadratic fee scaling
+
+# AgriHook: Bonus Configuration (Innovation #3)
+MAX_BONUS_RATE = 500              # 5% max bonus
+BONUS_MULTIPLIER = 5              # Quadratic bonus scaling
+BONUS_SCALE_FACTOR = 10000        # Basis points
+
+# FeeCurve / BonusCurve
+BASIS_POINTS = 10000
+
+# WeatherOracle: multipliers for coffee prices
+SEVERE_DROUGHT_MULTIPLIER = 150   # 150% = 1.5x price
+MODERATE_DROUGHT_MULTIPLIER = 130 # 130% = 1.3x price
+MILD_DROUGHT_MULTIPLIER = 115     # 115% = 1.15x price
+
+# WeatherOracle.WeatherEventType (the rainfall updates only ever set NONE or DROUGHT)
+WEATHER_EVENT_NONE = 0
+WEATHER_EVENT_DROUGHT = 1
+WEATHER_EVENT_FROST = 2
+WEATHER_EVENT_FLOOD = 3
+WEATHER_EVENT_HEATWAVE = 4
+WEATHER_EVENT_STORM = 5
+DROUGHT_RAINFALL_THRESHOLD = 10   # Rainfall (mm) below which a drought event is active
+WEATHER_DATA_MAX_AGE = 3600       # setWeatherDisruptionWithFDC rejects data older than 1 hour
+
+# InsuranceVault: premium pricing
+BASE_PREMIUM_RATE = 500           # 5% base rate (basis points)
+UTILIZATION_THRESHOLD_1 = 50      # 50% utilization
+UTILIZATION_THRESHOLD_2 = 80      # 80% utilization
+RISK_DAMPENING_FACTOR = 4         # Divide combined risk by 4
+
+# InsuranceVault: policies
+MIN_COVERAGE = 1000 * 10**6       # $1,000 minimum (USDC, 6 decimals)
+MAX_COVERAGE = 100000 * 10**6     # $100,000 maximum
+POLICY_DURATION = 365 * 86400     # 1 year policies (seconds)
+PAYOUT_DIVISOR = 2                # claimPayout pays 50% of coverage
+
+# Operating modes returned by getOperatingMode()
+MODE_NORMAL = 0
+MODE_RECOVERY = 1
+MODE_CIRCUIT_BREAKER = 2
+MODE_NAMES = {
+    MODE_NORMAL: 'NORMAL',
+    MODE_RECOVERY: 'RECOVERY',
+    MODE_CIRCUIT_BREAKER: 'CIRCUIT BREAKER',
+}
+
+
+class ContractRevert(Exception):
+    """Raised where the Solidity code would revert"""
+
+
+def _checked(value: int) -> int:
+    """Apply Solidity 0.8 checked-arithmetic bounds to a uint256 result"""
+    if value < 0 or value > UINT256_MAX:
+        raise ContractRevert('Arithmetic overflow/underflow')
+    return value
+
+
+def calculate_deviation(current_pool_price: int, theoretical_price: int) -> int:
+    """AgriHook.calculateDeviation: deviation as integer percentage"""
+    if theoretical_price == 0:
+        raise ContractRevert('Division by zero')
+    if current_pool_price > theoretical_price:
+        return _checked((current_pool_price - theoretical_price) * 100) // theoretical_price
+    return _checked((theoretical_price - current_pool_price) * 100) // theoretical_price
+
+
+def is_trader_aligned(current_pool_price: int, theoretical_price: int, is_buying: bool) -> bool:
+    """AgriHook.isTraderAligned: True if the trade moves the pool towards the oracle"""
+    if current_pool_price == theoretical_price:
+        return True
+    if current_pool_price > theoretical_price:
+        return not is_buying
+    return is_buying
+
+
+def get_operating_mode(deviation: int) -> int:
+    """AgriHook.getOperatingMode: 0=Normal, 1=Recovery, 2=CircuitBreaker"""
+    if deviation >= CIRCUIT_BREAKER_THRESHOLD:
+        return MODE_CIRCUIT_BREAKER
+    elif deviation >= RECOVERY_THRESHOLD:
+        return MODE_RECOVERY
+    return MODE_NORMAL
+
+
+def is_buying_commodity(zero_for_one: bool, currency0: str, currency1: str) -> bool:
+    """Mirror of the isBuyingCommodity expression in _beforeSwap/_afterSwap"""
+    return zero_for_one == (int(currency0, 16) < int(currency1, 16))
+
+
+def quadratic_fee(deviation: int, base_fee: int, multiplier: int, max_fee: int) -> int:
+    """FeeCurve.quadraticFee: baseFee + deviation² × multiplier / 10000, capped"""
+    additional_fee = _checked(_checked(deviation * deviation) * multiplier) // BASIS_POINTS
+    total_fee = _checked(base_fee + additional_fee)
+    if total_fee > max_fee:
+        # uint24(maxFee) truncates exactly like the Solidity cast
+        return max_fee & UINT24_MAX
+    if total_fee > UINT24_MAX:
+        raise ContractRevert('Fee exceeds uint24')
+    return total_fee
+
+
+def quadratic_bonus(deviation: int, multiplier: int, max_bonus: int) -> int:
+    """BonusCurve.quadraticBonus: deviation² × multiplier / 10000, capped"""
+    if deviation == 0:
+        return 0
+    bonus = _checked(_checked(deviation * deviation) * multiplier) // BASIS_POINTS
+    return max_bonus if bonus > max_bonus else bonus
+
+
+def misaligned_fee(deviation: int) -> int:
+    """Fee charged by _beforeSwap to a misaligned trader"""
+    return quadratic_fee(deviation, BASE_FEE, FEE_MULTIPLIER, MAX_MISALIGNED_FEE)
+
+
+def aligned_bonus_rate(deviation: int) -> int:
+    """Bonus rate (basis points) used by _afterSwap and rebalancePool"""
+    return quadratic_bonus(deviation, BONUS_MULTIPLIER, MAX_BONUS_RATE)
+
+
+def calculate_weather_multiplier(rainfall: int) -> int:
+    """WeatherOracle.calculateWeatherMultiplier: price multiplier % from 7-day rainfall (mm)"""
+    if rainfall == 0:
+        return SEVERE_DROUGHT_MULTIPLIER
+    elif rainfall < 5:
+        return MODERATE_DROUGHT_MULTIPLIER
+    elif rainfall < 10:
+        return MILD_DROUGHT_MULTIPLIER
+    return 100
+
+
+def weather_event_for_rainfall(rainfall: int):
+    """(eventType, priceImpactPercent, active) stored by updateWeatherSimple / setWeatherDisruptionWithFDC"""
+    impact = calculate_weather_multiplier(rainfall) - 100
+    event_type = WEATHER_EVENT_DROUGHT if rainfall < DROUGHT_RAINFALL_THRESHOLD else WEATHER_EVENT_NONE
+    return event_type, impact, event_type != WEATHER_EVENT_NONE
+
+
+def theoretical_price(base_price: int, price_impact_percent: int, active: bool) -> int:
+    """WeatherOracle.getTheoreticalPrice for a given weather event"""
+    if not active:
+        return base_price
+    adjusted = _sdiv(base_price * (100 + price_impact_percent), 100)
+    if adjusted <= 0:
+        raise ContractRevert('Invalid price calculation')
+    return adjusted
+
+
+def utilization_multiplier(total_coverage: int, treasury_balance: int) -> int:
+    """InsuranceVault utilization multiplier % (100 / 125 / 150)"""
+    utilization_rate = _checked(total_coverage * 100) // _checked(treasury_balance + 1)
+    if utilization_rate < UTILIZATION_THRESHOLD_1:
+        return 100
+    elif utilization_rate < UTILIZATION_THRESHOLD_2:
+        return 125
+    return 150
+
+
+def calculate_premium(coverage_amount: int, current_risk: int, historical_risk: int,
+                      total_coverage: int = 0, treasury_balance: int = 0) -> int:
+    """InsuranceVault.calculatePremium for a region's stored risk scores and vault totals"""
+    base_premium = _checked(coverage_amount * BASE_PREMIUM_RATE) // BASIS_POINTS
+    risk_multiplier = _checked(100 + _checked(current_risk + historical_risk) // RISK_DAMPENING_FACTOR)
+    risk_adjusted = _checked(base_premium * risk_multiplier) // 100
+    return _checked(risk_adjusted * utilization_multiplier(total_coverage, treasury_balance)) // 100
+
+
+def _sdiv(a: int, b: int) -> int:
+    """Signed integer division truncating towards zero (Solidity int256 semantics)"""
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
@@ -0,0 +1,429 @@
+"""
+Oracle Daemon for Agri-Hook
+Resident asyncio process running weather consensus, FTSO refreshes and FDC rounds on a schedule
+
+One ProviderClient (pooled aiohttp session and response cache), one RPCPool and one
+StateCache live for the whole process, so a cycle only pays for its network I/O. Web3 calls
+are synchronous and run on the default thread pool. A small HTTP endpoint on localhost serves
+/healthz, /metrics (Prometheus text) and /state.
+"""
+
+import asyncio
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .consensus import build_weather_data, calculate_consensus
+from .contract_math import WEATHER_DATA_MAX_AGE
+from .providers import ProviderClient, history_rows, summarize_results
+from .telemetry import TELEMETRY
+
+WEATHER_INTERVAL = 900            # Seconds between consensus rounds per region
+FTSO_INTERVAL = 240               # WeatherOracleWithFTSO rejects prices older than 5 minutes
+FDC_INTERVAL = 90                 # One FDC voting round
+STALE_FACTOR = 3                  # A job is unhealthy after missing this many intervals
+HEALTH_HOST = '127.0.0.1'
+HEALTH_PORT = 9464
+
+WEATHER_ORACLE_ABI = [
+    {"inputs": [{"type": "uint256"}, {"type": "int256"}, {"type": "int256"}], "name": "updateWeatherSimple", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+    {"inputs": [], "name": "getCurrentWeatherEvent", "outputs": [{"type": "uint8"}, {"type": "int256"}, {"type": "uint256"}, {"type": "bool"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [], "name": "updatePriceFromFTSO", "outputs": [], "stateMutability": "nonpayable", "type": "function"},
+    {"inputs": [], "name": "useFTSO", "outputs": [{"type": "bool"}], "stateMutability": "view", "type": "function"},
+    {"inputs": [{"components": [
+        {"name": "merkleRoot", "type": "bytes32"},
+        {"name": "leaf", "type": "bytes32"},
+        {"name": "proof", "type": "bytes32[]"},
+        {"components": [
+            {"name": "requestHash", "type": "bytes32"},
+            {"components": [{"name": "abiEncodedData", "type": "bytes"}], "name": "responseBody", "type": "tuple"}
+        ], "name": "data", "type": "tuple"}
+    ], "name": "proof", "type": "tuple"}], "name": "setWeatherDisruptionWithFDC", "outputs": [], "stateMutability": "nonpayable", "type": "function"}
+]
+
+# JsonApi attestation template (see fdc-attestation-request.json)
+ATTESTATION_TYPE = '0x' + b'JsonApi'.hex().ljust(64, '0')
+SOURCE_ID = '0x' + b'OpenWeatherMap'.hex().ljust(64, '0')
+JQ_TRANSFORM = ('{rainfall: ((.rain."1h" // 0) * 1), temperature: ((.main.temp * 100) | floor), '
+                'soilMoisture: ((.main.humidity * 100) | floor), latitude: ((.coord.lat * 1000000) | floor), '
+                'longitude: ((.coord.lon * 1000000) | floor), timestamp: .dt}')
+WEATHER_DATA_COMPONENTS = [
+    {"internalType": "uint256", "name": "rainfall", "type": "uint256"},
+    {"internalType": "int256", "name": "temperature", "type": "int256"},
+    {"internalType": "int256", "name": "soilMoisture", "type": "int256"},
+    {"internalType": "int256", "name": "latitude", "type": "int256"},
+    {"internalType": "int256", "name": "longitude", "type": "int256"},
+    {"internalType": "uint256", "name": "timestamp", "type": "uint256"}
+]
+
+
+class TransactionReverted(RuntimeError):
+    """A mined transaction with status 0: resending the same call would revert again"""
+
+
+@dataclass
+class Region:
+    """A location the daemon tracks; `submit` marks the one written to the oracle"""
+    name: str
+    latitude: float
+    longitude: float
+    submit: bool = False
+
+    @classmethod
+    def parse(cls, spec: str) -> 'Region':
+        """name:lat:lon[:submit]"""
+        parts = spec.split(':')
+        return cls(parts[0], float(parts[1]), float(parts[2]), len(parts) > 3 and parts[3] == 'submit')
+
+
+@dataclass
+class Job:
+    """Recurring coroutine with its health record"""
+    name: str
+    interval: float
+    run: Callable[[], Awaitable]
+    runs: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    started: Optional[float] = None
+    last_start: Optional[float] = None
+    last_success: Optional[float] = None
+    last_error: Optional[str] = None
+    last_duration_ms: Optional[float] = None
+
+    def healthy(self, now: float) -> bool:
+        if self.consecutive_failures >= STALE_FACTOR:
+            return False
+        reference = self.last_success or self.started
+        return reference is None or now - reference < self.interval * STALE_FACTOR
+
+    def status(self, now: float) -> Dict:
+        return {
+            'interval': self.interval,
+            'runs': self.runs,
+            'failures': self.failures,
+            'consecutive_failures': self.consecutive_failures,
+            'last_success_age': round(now - self.last_success, 1) if self.last_success else None,
+            'last_duration_ms': self.last_duration_ms,
+            'last_error': self.last_error,
+            'healthy': self.healthy(now),
+        }
+
+
+class Scheduler:
+    """Runs each job at a fixed rate in its own task; a failing job never stops the others"""
+
+    def __init__(self):
+        self.jobs: Dict[str, Job] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def every(self, name: str, interval: float, run: Callable[[], Awaitable]) -> Job:
+        job = self.jobs[name] = Job(name, interval, run)
+        return job
+
+    async def _loop(self, job: Job):
+        loop = asyncio.get_running_loop()
+        next_run = loop.time()
+        job.started = time.time()
+        while True:
+            job.last_start = time.time()
+            start = loop.time()
+            try:
+                with TELEMETRY.span('daemon.job', job=job.name):
+                    await job.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job.failures += 1
+                job.consecutive_failures += 1
+                job.last_error = f'{type(e).__name__}: {e}'
+                TELEMETRY.echo(f"❌ {job.name}: {job.last_error}")
+            else:
+                job.consecutive_failures = 0
+                job.last_success = time.time()
+            job.runs += 1
+            job.last_duration_ms = round((loop.time() - start) * 1000, 1)
+
+            # Fixed rate: skip missed slots instead of bunching up after a slow cycle
+            next_run += job.interval
+            now = loop.time()
+            if next_run < now:
+                next_run = now + job.interval - (now - next_run) % job.interval
+            await asyncio.sleep(next_run - now)
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._loop(job), name=job.name) for job in self.jobs.values()]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def status(self) -> Dict:
+        now = time.time()
+        return {name: job.status(now) for name, job in self.jobs.items()}
+
+    def healthy(self) -> bool:
+        now = time.time()
+        return all(job.healthy(now) for job in self.jobs.values())
+
+
+class OracleDaemon:
+    """Weather consensus, FTSO refresh and FDC jobs sharing warm clients and caches"""
+
+    def __init__(self, regions: List[Region], w3=None, oracle_address: Optional[str] = None,
+                 account=None, api_keys: Optional[Dict[str, str]] = None,
+                 weather_interval: float = WEATHER_INTERVAL, ftso_interval: float = FTSO_INTERVAL,
+                 fdc_interval: float = FDC_INTERVAL, fdc_dir: Optional[str] = None,
+                 history_dir: Optional[str] = None, dry_run: bool = False):
+        """
+        Args:
+            regions: Locations to track (at most one with submit=True)
+            w3: Web3 instance (an RPCPool-backed one keeps connections warm); None = off-chain only
+            oracle_address: WeatherOracle(WithFTSO) address for submissions and FTSO refreshes
+            account: eth_account signer; without one, transactions are only logged
+            fdc_dir: Directory for FDC rounds: requests/ is written, proofs/ is submitted
+            history_dir: Append every fetched observation to this HistoryStore
+        """
+        self.regions = regions
+        self.w3 = w3
+        self.account = account
+        self.dry_run = dry_run or account is None
+        self.fdc_dir = fdc_dir
+        self.client = ProviderClient(api_keys)
+        self.consensus: Dict[str, Dict] = {}
+        self.submissions: List[Dict] = []
+
+        self.oracle = self.cache = self.gate = None
+        if w3 is not None and oracle_address:
+            from .oracle_gate import SubmissionGate
+            from .state_cache import StateCache
+            self.oracle = w3.eth.contract(address=w3.to_checksum_address(oracle_address), abi=WEATHER_ORACLE_ABI)
+            self.cache = StateCache(w3)
+            self.gate = SubmissionGate(self.oracle, self.cache)
+        self._ftso_enabled: Optional[bool] = None
+        self._nonce: Optional[int] = None
+        self._tx_lock = asyncio.Lock()
+
+        self.history = None
+        if history_dir:
+            from .history_store import HistoryStore
+            self.history = HistoryStore(history_dir)
+
+        self.scheduler = Scheduler()
+        for region in regions:
+            self.scheduler.every(f'weather:{region.name}', weather_interval,
+                                 lambda region=region: self.weather_round(region))
+        if self.oracle is not None:
+            self.scheduler.every('ftso', ftso_interval, self.ftso_refresh)
+        if fdc_dir:
+            self.scheduler.every('fdc', fdc_interval, self.fdc_round)
+
+    # ------------------------------------------------------------------ transactions
+
+    async def _transact(self, call, gas: int) -> Optional[Dict]:
+        """Send a transaction with a locally tracked nonce (None in dry-run mode)"""
+        if self.dry_run:
+            return None
+        async with self._tx_lock:
+            def send():
+                if self._nonce is None:
+                    self._nonce = self.w3.eth.get_transaction_count(self.account.address)
+                tx = call.build_transaction({
+                    'from': self.account.address,
+                    'nonce': self._nonce,
+                    'gas': gas,
+                    'gasPrice': self.w3.eth.gas_price
+                })
+                signed_tx = self.account.sign_transaction(tx)
+                try:
+                    tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+                except Exception:
+                    self._nonce = None             # Re-read after a rejected transaction
+                    raise
+                self._nonce += 1
+                with TELEMETRY.span('tx.receipt_wait'):
+                    return self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+
+            receipt = await asyncio.to_thread(send)
+        self.cache.new_block(receipt['blockNumber'])
+        if receipt['status'] != 1:
+            raise TransactionReverted(f"transaction {receipt['transactionHash'].hex()} reverted")
+        return receipt
+
+    # ------------------------------------------------------------------ jobs
+
+    async def weather_round(self, region: Region):
+        """Fetch all providers, build consensus and (for the submit region) update the oracle"""
+        observations = await self.client.fetch_all(region.latitude, region.longitude)
+        if self.history is not None:
+            self.history.append(history_rows(observations))
+        readings = [r for r in summarize_results(observations).values() if r['success']]
+        if len(readings) < 2:
+            raise RuntimeError(f'only {len(readings)} provider(s) answered')
+
+        consensus = calculate_consensus(readings)
+        consensus['timestamp'] = int(time.time())
+        self.consensus[region.name] = consensus
+        if not region.submit or self.gate is None:
+            return
+
+        decision = await asyncio.to_thread(self.gate.decide, consensus['rainfall'])
+        TELEMETRY.count('daemon.weather_decisions', reason=decision.reason)
+        if not decision.submit:
+            return
+        receipt = await self._transact(self.oracle.functions.updateWeatherSimple(
+            decision.rainfall, int(region.latitude * 1e6), int(region.longitude * 1e6)), gas=200000)
+        if receipt is not None:
+            self.gate.submitted_event(decision, int(time.time()))
+        self.submissions.append({'job': 'weather', 'region': region.name, 'reason': decision.reason,
+                                 'rainfall': decision.rainfall, 'sent': receipt is not None,
+                                 'time': int(time.time())})
+
+    async def ftso_refresh(self):
+        """updatePriceFromFTSO inside the contract's 5-minute staleness window"""
+        if self._ftso_enabled is None:
+            self._ftso_enabled = await asyncio.to_thread(self.oracle.functions.useFTSO().call)
+        if not self._ftso_enabled:
+            return
+        receipt = await self._transact(self.oracle.functions.updatePriceFromFTSO(), gas=300000)
+        self.submissions.append({'job': 'ftso', 'sent': receipt is not None, 'time': int(time.time())})
+
+    async def fdc_round(self):
+        """
+        Write JsonApi attestation requests for fresh consensus and submit any new proofs
+
+        Requesting the attestation from the FDC hub and fetching the proof from the DA layer is
+        left to an outside process that drops proof JSON into proofs/. A proof whose
+        setWeatherDisruptionWithFDC reverts moves to proofs/failed/ (with a .error.json note), so
+        it is not resent, and paid for, every round.
+        """
+        requests_dir = os.path.join(self.fdc_dir, 'requests')
+        proofs_dir = os.path.join(self.fdc_dir, 'proofs')
+        done_dir = os.path.join(proofs_dir, 'done')
+        failed_dir = os.path.join(proofs_dir, 'failed')
+        for directory in (requests_dir, proofs_dir, done_dir, failed_dir):
+            os.makedirs(directory, exist_ok=True)
+
+        now = time.time()
+        for region in self.regions:
+            consensus = self.consensus.get(region.name)
+            if consensus is None or now - consensus['timestamp'] > WEATHER_DATA_MAX_AGE:
+                continue
+            with open(os.path.join(requests_dir, f'{region.name}.json'), 'w') as f:
+                json.dump(attestation_request(region, consensus), f, indent=2)
+
+        if self.oracle is None:
+            return
+        for name in sorted(os.listdir(proofs_dir)):
+            path = os.path.join(proofs_dir, name)
+            if not name.endswith('.json') or not os.path.isfile(path):
+                continue
+            with open(path) as f:
+                proof = json.load(f)
+            try:
+                receipt = await self._transact(self.oracle.functions.setWeatherDisruptionWithFDC(proof), gas=500000)
+            except TransactionReverted as e:
+                shutil.move(path, os.path.join(failed_dir, name))
+                with open(os.path.join(failed_dir, name[:-len('.json')] + '.error.json'), 'w') as f:
+                    json.dump({'error': str(e), 'time': int(time.time())}, f)
+                TELEMETRY.count('daemon.fdc_proofs_failed')
+                self.submissions.append({'job': 'fdc', 'proof': name, 'sent': True, 'reverted': True,
+                                         'time': int(time.time())})
+                continue
+            if receipt is None:
+                continue
+            shutil.move(path, os.path.join(done_dir, name))
+            self.cache.invalidate(self.oracle.address)
+            self.submissions.append({'job': 'fdc', 'proof': name, 'sent': True, 'time': int(time.time())})
+
+    # ------------------------------------------------------------------ health endpoint
+
+    def health(self) -> Dict:
+        return {
+            'healthy': self.scheduler.healthy(),
+            'dry_run': self.dry_run,
+            'jobs': self.scheduler.status(),
+            'gate': self.gate.stats() if self.gate is not None else None,
+            'rpc': self.w3.provider.metrics() if self.w3 is not None and hasattr(self.w3.provider, 'metrics') else None,
+            'providers': {'requests': self.client.requests, 'cache_hits': self.client.cache_hits},
+        }
+
+    def metrics(self) -> str:
+        lines = [TELEMETRY.prometheus().rstrip('\n'),
+                 '# TYPE agrihook_daemon_job_healthy gauge']
+        now = time.time()
+        for name, job in self.scheduler.jobs.items():
+            lines.append(f'agrihook_daemon_job_healthy{{job="{name}"}} {int(job.healthy(now))}')
+        lines.append('# TYPE agrihook_daemon_job_runs_total counter')
+        for name, job in self.scheduler.jobs.items():
+            lines.append(f'agrihook_daemon_job_runs_total{{job="{name}"}} {job.runs}')
+        lines.append('# TYPE agrihook_daemon_job_failures_total counter')
+        for name, job in self.scheduler.jobs.items():
+            lines.append(f'agrihook_daemon_job_failures_total{{job="{name}"}} {job.failures}')
+        return '\n'.join(line for line in lines if line) + '\n'
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            path = request_line.decode('latin-1').split(' ')[1] if request_line else '/'
+            status, content_type = '200 OK', 'application/json'
+            if path == '/healthz':
+                health = self.health()
+                body = json.dumps(health, default=str)
+                if not health['healthy']:
+                    status = '503 Service Unavailable'
+            elif path == '/metrics':
+                body, content_type = self.metrics(), 'text/plain; version=0.0.4'
+            elif path == '/state':
+                body = json.dumps({'consensus': self.consensus, 'submissions': self.submissions[-50:]})
+            else:
+                status, body = '404 Not Found', '{"error": "not found"}'
+            payload = body.encode()
+            writer.write(f'HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n'
+                         f'Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n'.encode() + payload)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    # ------------------------------------------------------------------ lifecycle
+
+    async def run(self, host: str = HEALTH_HOST, port: int = HEALTH_PORT,
+                  duration: Optional[float] = None):
+        """Start the jobs and the health endpoint; run until cancelled or `duration` elapses"""
+        TELEMETRY.enable()
+        server = await asyncio.start_server(self._handle, host, port)
+        self.scheduler.start()
+        TELEMETRY.echo(f"✅ Oracle daemon running: {len(self.scheduler.jobs)} jobs, "
+                       f"health on http://{host}:{port}/healthz{' (dry run)' if self.dry_run else ''}")
+        try:
+            if duration is None:
+                await asyncio.Event().wait()
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            await self.scheduler.stop()
+            server.close()
+            await server.wait_closed()
+            await self.client.close()
+
+
+def attestation_request(region: Region, consensus: Dict) -> Dict:
+    """FDC JsonApi request for a region, annotated with the consensus it should confirm"""
+    url = (f'https://api.openweathermap.org/data/2.5/weather?lat={region.latitude}&lon={region.longitude}'
+           f'&appid={os.getenv("OPENWEATHERMAP_API_KEY", "YOUR_API_KEY")}&units=metric')
+    return {
+        'attestationType': ATTESTATION_TYPE,
+        'sourceId': SOURCE_ID,
+        'requestBody': {
+            'url': url,
+            'jqTransform': JQ_TRANSFORM,
+            'abi': {'components': WEATHER_DATA_COMPONENTS, 'name': 'WeatherData', 'type': 'tuple'},
+        },
+        'expected': build_weather_data(consensus, {'latitude': region.latitude, 'longitude': region.longitude}),
+    }
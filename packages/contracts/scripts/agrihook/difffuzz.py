@@ -0,0 +1,335 @@
+"""
+Differential Fuzzer for Agri-Hook
+Python contract models vs the compiled FeeCurve, BonusCurve and InsuranceVault.calculatePremium, in batched eth_calls
+
+Cases are drawn in bulk across the full uint256 range. Each draw is a threshold, a value next to
+a threshold, a power of two ±1 or a log-uniform integer. The harness contracts in
+test/mocks/FuzzHarness.sol evaluate BATCH_SIZE cases per eth_call, with a revert counting as an
+outcome. CALLS_PER_REQUEST eth_calls travel in one JSON-RPC batch, so 10⁵ cases take about ten
+HTTP round trips. Every mismatch is shrunk towards the smallest input that still disagrees, and
+each shrink round costs one more batch for all counterexamples together.
+
+    cd packages/contracts && forge build && anvil &
+    python -m agrihook fuzz --cases 100000
+"""
+
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .contract_math import (
+    BASE_FEE,
+    BONUS_MULTIPLIER,
+    CIRCUIT_BREAKER_THRESHOLD,
+    FEE_MULTIPLIER,
+    MAX_BONUS_RATE,
+    MAX_COVERAGE,
+    MAX_MISALIGNED_FEE,
+    MIN_COVERAGE,
+    RECOVERY_THRESHOLD,
+    UINT24_MAX,
+    UINT256_MAX,
+    ContractRevert,
+    calculate_premium,
+    quadratic_bonus,
+    quadratic_fee,
+)
+
+BATCH_SIZE = 500                  # Cases per eth_call (≈ 10M gas for premium cases)
+CALLS_PER_REQUEST = 20            # eth_calls per JSON-RPC batch
+CALL_GAS = 30_000_000             # anvil's default block gas limit
+MAX_EXAMPLES = 5                  # Counterexamples shrunk per (target, model)
+MAX_SHRINK_ROUNDS = 256
+DEFAULT_RPC = 'http://127.0.0.1:8545'
+HARNESS_FILE = 'FuzzHarness.sol'
+
+Case = Tuple[int, ...]
+Outcome = Tuple[bool, int]        # (succeeded, return value); a revert is (False, 0)
+
+
+# ---- targets
+
+def _legacy_bonus(deviation: int, multiplier: int, max_bonus: int) -> int:
+    """test-agri-hook-full.py's float model, in basis points (ignores multiplier and cap)"""
+    return int(min((deviation ** 2) / 10000, 5.0) * 100)
+
+
+@dataclass(frozen=True)
+class Arg:
+    """One uint256 argument and the values worth hitting exactly"""
+    name: str
+    interesting: Tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class Target:
+    """A harness batch function and the Python models that should agree with it"""
+    name: str
+    harness: str                          # 'curve' or 'premium'
+    signature: str                        # Batch function, e.g. batchQuadraticFee(uint256[4][])
+    args: Tuple[Arg, ...]
+    models: Dict[str, Callable[..., int]] = field(hash=False)
+    legacy: Tuple[str, ...] = ()          # Models with known divergences: only run on request
+
+    @property
+    def arity(self) -> int:
+        return len(self.args)
+
+
+_UINT_EDGES = (0, 1, 2, UINT24_MAX, UINT24_MAX + 1, 2**128 - 1, 2**128, UINT256_MAX - 1, UINT256_MAX)
+_DEVIATIONS = (RECOVERY_THRESHOLD - 1, RECOVERY_THRESHOLD, CIRCUIT_BREAKER_THRESHOLD - 1,
+               CIRCUIT_BREAKER_THRESHOLD, 999, 1000, 1001, 9848, 9849, 9850)    # Bonus / fee caps
+_RISKS = (25, 50, 79, 80, 99, 100, 101, 400)
+
+TARGETS: Dict[str, Target] = {t.name: t for t in (
+    Target('fee', 'curve', 'batchQuadraticFee(uint256[4][])', (
+        Arg('deviation', _DEVIATIONS + _UINT_EDGES),
+        Arg('baseFee', (BASE_FEE, MAX_MISALIGNED_FEE) + _UINT_EDGES),
+        Arg('multiplier', (FEE_MULTIPLIER, 3, 10000) + _UINT_EDGES),
+        Arg('maxFee', (MAX_MISALIGNED_FEE, 2**24 + MAX_MISALIGNED_FEE) + _UINT_EDGES),
+    ), {'contract_math': quadratic_fee}),
+    Target('bonus', 'curve', 'batchQuadraticBonus(uint256[3][])', (
+        Arg('deviation', _DEVIATIONS + _UINT_EDGES),
+        Arg('multiplier', (BONUS_MULTIPLIER, 10000) + _UINT_EDGES),
+        Arg('maxBonus', (MAX_BONUS_RATE, 10000) + _UINT_EDGES),
+    ), {'contract_math': quadratic_bonus, 'legacy_float': _legacy_bonus}, legacy=('legacy_float',)),
+    Target('premium', 'premium', 'batchCalculatePremium(uint256[5][])', (
+        Arg('coverageAmount', (MIN_COVERAGE, MAX_COVERAGE, 10**4 - 1, 10**4) + _UINT_EDGES),
+        Arg('currentRisk', _RISKS + _UINT_EDGES),
+        Arg('historicalRisk', _RISKS + _UINT_EDGES),
+        Arg('totalCoverage', (MAX_COVERAGE, 10**18) + _UINT_EDGES),
+        Arg('treasuryBalance', (MAX_COVERAGE, 10**18) + _UINT_EDGES),
+    ), {'contract_math': calculate_premium}),
+)}
+
+
+def _utilization_edge(case: List[int], rng: random.Random):
+    """Put totalCoverage / treasuryBalance next to a utilization threshold"""
+    treasury = rng.choice((rng.getrandbits(rng.randint(1, 96)), MAX_COVERAGE))
+    percent = rng.choice((49, 50, 79, 80))
+    case[3] = max(((treasury + 1) * percent) // 100 + rng.randint(-1, 1), 0)
+    case[4] = treasury
+
+
+# ---- case generation
+
+def draw(arg: Arg, rng: random.Random) -> int:
+    """One value: an interesting value, a neighbour of one, a power of two ±1, or log-uniform"""
+    r = rng.random()
+    if r < 0.25:
+        return rng.choice(arg.interesting)
+    if r < 0.35:
+        return min(max(rng.choice(arg.interesting) + rng.randint(-2, 2), 0), UINT256_MAX)
+    if r < 0.5:
+        return min(max((1 << rng.randint(0, 255)) + rng.randint(-1, 1), 0), UINT256_MAX)
+    return rng.getrandbits(rng.randint(0, 256))
+
+
+def generate(target: Target, n: int, rng: random.Random) -> List[Case]:
+    cases = []
+    for _ in range(n):
+        case = [draw(arg, rng) for arg in target.args]
+        if target.harness == 'premium' and rng.random() < 0.2:
+            _utilization_edge(case, rng)
+        cases.append(tuple(case))
+    return cases
+
+
+def model_outcome(model: Callable[..., int], case: Case) -> Outcome:
+    try:
+        return True, int(model(*case))
+    except (ContractRevert, ArithmeticError):
+        return False, 0
+
+
+# ---- EVM side
+
+class EVMHarness:
+    """Deployed harness contracts, evaluated with batched eth_call"""
+
+    def __init__(self, w3, curve: str, premium: str, batch_size: int = BATCH_SIZE,
+                 calls_per_request: int = CALLS_PER_REQUEST):
+        self.w3 = w3
+        self.addresses = {'curve': w3.to_checksum_address(curve), 'premium': w3.to_checksum_address(premium)}
+        self.batch_size = batch_size
+        self.calls_per_request = calls_per_request
+        self.round_trips = 0
+        self.eth_calls = 0
+
+    @classmethod
+    def deploy(cls, w3, artifacts: str, deployer: Optional[str] = None, **kwargs) -> 'EVMHarness':
+        """Deploy CurveHarness and PremiumHarness from forge artifacts (out/) with an unlocked account"""
+        import json
+        import os
+
+        deployer = deployer or w3.eth.accounts[0]
+        addresses = []
+        for name in ('CurveHarness', 'PremiumHarness'):
+            path = os.path.join(artifacts, HARNESS_FILE, f'{name}.json')
+            if not os.path.exists(path):
+                raise FileNotFoundError(f'{path} not found: run `forge build` in packages/contracts')
+            with open(path) as f:
+                bytecode = json.load(f)['bytecode']['object']
+            tx_hash = w3.eth.send_transaction({'from': deployer, 'data': bytecode})
+            receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+            if receipt['status'] != 1 or not receipt['contractAddress']:
+                raise RuntimeError(f'{name} deployment failed')
+            addresses.append(receipt['contractAddress'])
+        return cls(w3, *addresses, **kwargs)
+
+    def _requests(self, target: Target, cases: Sequence[Case]) -> List[Tuple[str, list]]:
+        from eth_abi import encode
+
+        selector = self.w3.keccak(text=target.signature)[:4]
+        to = self.addresses[target.harness]
+        requests = []
+        for start in range(0, len(cases), self.batch_size):
+            chunk = [list(c) for c in cases[start:start + self.batch_size]]
+            data = '0x' + (selector + encode([f'uint256[{target.arity}][]'], [chunk])).hex()
+            requests.append(('eth_call', [{'to': to, 'data': data, 'gas': hex(CALL_GAS)}, 'latest']))
+        return requests
+
+    def _send(self, requests: List[Tuple[str, list]]) -> List[bytes]:
+        """Results of many eth_calls, CALLS_PER_REQUEST per JSON-RPC batch"""
+        provider = self.w3.provider
+        results = []
+        for start in range(0, len(requests), self.calls_per_request):
+            group = requests[start:start + self.calls_per_request]
+            self.round_trips += 1
+            self.eth_calls += len(group)
+            try:
+                responses = provider.make_batch_request(group)
+            except NotImplementedError:
+                responses = [provider.make_request(method, params) for method, params in group]
+            if isinstance(responses, dict):                 # The whole batch was rejected
+                raise RuntimeError(f"eth_call batch failed: {responses.get('error')}")
+            for response in responses:
+                if 'error' in response:
+                    raise RuntimeError(f"eth_call failed: {response['error']}")
+                results.append(bytes.fromhex(response['result'][2:]))
+        return results
+
+    def evaluate(self, target: Target, cases: Sequence[Case]) -> List[Outcome]:
+        from eth_abi import decode
+
+        outcomes = []
+        for raw in self._send(self._requests(target, cases)):
+            values, ok = decode(['uint256[]', 'bool[]'], raw)
+            outcomes.extend(zip(ok, values))
+        return [(bool(ok), int(value)) for ok, value in outcomes]
+
+
+# ---- fuzzing
+
+@dataclass
+class Mismatch:
+    target: str
+    model: str
+    case: Case
+    evm: Outcome
+    python: Outcome
+    shrink_steps: int = 0
+
+    def describe(self, target: Target) -> Dict:
+        show = lambda o: o[1] if o[0] else 'revert'
+        return {
+            'model': self.model,
+            'args': {a.name: v for a, v in zip(target.args, self.case)},
+            'evm': show(self.evm),
+            'python': show(self.python),
+            'shrink_steps': self.shrink_steps,
+        }
+
+
+@dataclass
+class TargetReport:
+    target: str
+    cases: int
+    mismatches: Dict[str, int]            # Per model
+    examples: List[Mismatch]
+    elapsed: float
+    round_trips: int
+
+    @property
+    def passed(self) -> bool:
+        return not any(self.mismatches.values())
+
+    def summary(self) -> Dict:
+        target = TARGETS[self.target]
+        return {
+            'target': self.target,
+            'cases': self.cases,
+            'mismatches': self.mismatches,
+            'counterexamples': [m.describe(target) for m in self.examples],
+            'elapsed_s': round(self.elapsed, 2),
+            'round_trips': self.round_trips,
+        }
+
+
+def _shrink_candidates(target: Target, case: Case) -> List[Case]:
+    """Simpler variants of a case, one argument changed each, smallest first"""
+    candidates = set()
+    for i, (arg, value) in enumerate(zip(target.args, case)):
+        options = {0, 1, value >> 8, value >> 64}
+        options.update(value - (value >> k) for k in range(1, value.bit_length() + 1))   # Bisection
+        options.update(v for v in arg.interesting if v < value)
+        for option in options:
+            if 0 <= option < value:
+                candidates.add(case[:i] + (option,) + case[i + 1:])
+    return sorted(candidates, key=lambda c: (sum(v.bit_length() for v in c), c))
+
+
+def shrink(harness: EVMHarness, target: Target, found: List[Mismatch]) -> List[Mismatch]:
+    """Greedy shrink of every counterexample at once, one batched evaluation per round"""
+    found = list(found)
+    for _ in range(MAX_SHRINK_ROUNDS):
+        pending = [(m, _shrink_candidates(target, m.case)) for m in found]
+        flat = [c for _, candidates in pending for c in candidates]
+        if not flat:
+            break
+        evm = iter(harness.evaluate(target, flat))
+        progress = False
+        for index, (mismatch, candidates) in enumerate(pending):
+            model = target.models[mismatch.model]
+            for candidate, evm_outcome in zip(candidates, [next(evm) for _ in candidates]):
+                python = model_outcome(model, candidate)
+                if python != evm_outcome:
+                    found[index] = Mismatch(target.name, mismatch.model, candidate, evm_outcome, python,
+                                            mismatch.shrink_steps + 1)
+                    progress = True
+                    break
+        if not progress:
+            break
+    unique = {(m.model, m.case): m for m in found}
+    return list(unique.values())
+
+
+def fuzz_target(harness: EVMHarness, target: Target, n_cases: int, seed: int = 0,
+                legacy: bool = False, max_examples: int = MAX_EXAMPLES) -> TargetReport:
+    """Evaluate n_cases on the EVM and in every model, then shrink the first mismatches"""
+    started = time.perf_counter()
+    trips = harness.round_trips
+    cases = generate(target, n_cases, random.Random(f'{seed}:{target.name}'))
+    evm = harness.evaluate(target, cases)
+
+    models = {name: fn for name, fn in target.models.items() if legacy or name not in target.legacy}
+    counts = {name: 0 for name in models}
+    examples: List[Mismatch] = []
+    for name, model in models.items():
+        found = []
+        for case, evm_outcome in zip(cases, evm):
+            python = model_outcome(model, case)
+            if python != evm_outcome:
+                counts[name] += 1
+                if len(found) < max_examples:
+                    found.append(Mismatch(target.name, name, case, evm_outcome, python))
+        examples.extend(shrink(harness, target, found) if found else [])
+
+    return TargetReport(target.name, len(cases), counts, examples,
+                        time.perf_counter() - started, harness.round_trips - trips)
+
+
+def fuzz(harness: EVMHarness, n_cases: int, targets: Optional[Sequence[str]] = None, seed: int = 0,
+         legacy: bool = False) -> List[TargetReport]:
+    return [fuzz_target(harness, TARGETS[name], n_cases, seed, legacy) for name in (targets or TARGETS)]
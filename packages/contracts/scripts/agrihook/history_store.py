@@ -0,0 +1,241 @@
+"""
+Weather History Store for Agri-Hook
+Append-only columnar store of per-region, per-provider daily observations with memory-mapped reads
+
+Directory layout:
+    meta.json               provider columns and field names
+    regions.bin             append-only int32 (lat_cell, lon_cell) records; row number = region id
+    days/YYYY/YYYY-MM-DD.f32  float32 [region, provider, field] for one day, NaN = not observed
+
+Regions are the 0.1° cells used by InsuranceVault.calculateRegionHash. A day partition only
+grows (new regions are appended as new rows), so readers can memory-map it at any time.
+"""
+
+import json
+import os
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .regions import region_cell, to_e6
+
+FIELDS = ('rainfall_mm', 'temp_c', 'humidity_pct')
+MAX_PROVIDERS = 8                 # Provider columns reserved per region row
+DTYPE = np.float32
+
+META_FILE = 'meta.json'
+REGIONS_FILE = 'regions.bin'
+DAYS_DIR = 'days'
+REGION_DTYPE = np.dtype([('lat_cell', '<i4'), ('lon_cell', '<i4')])
+
+
+class HistoryStore:
+    """Date-partitioned float32 history of DailyObservation records (single writer, many readers)"""
+
+    def __init__(self, root: str, fields: Sequence[str] = FIELDS, max_providers: int = MAX_PROVIDERS):
+        """
+        Args:
+            root: Store directory (created if missing)
+            fields: Observation attributes stored per provider (only used for a new store)
+            max_providers: Provider columns per region row (only used for a new store)
+        """
+        self.root = root
+        os.makedirs(os.path.join(root, DAYS_DIR), exist_ok=True)
+
+        meta_path = os.path.join(root, META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                meta = json.load(f)
+        else:
+            meta = {'version': 1, 'fields': list(fields), 'max_providers': max_providers, 'providers': []}
+            self._write_meta(meta)
+        self.fields: Tuple[str, ...] = tuple(meta['fields'])
+        self.max_providers: int = meta['max_providers']
+        self.providers: List[str] = list(meta['providers'])
+
+        self._regions_path = os.path.join(root, REGIONS_FILE)
+        cells = np.fromfile(self._regions_path, dtype=REGION_DTYPE) \
+            if os.path.exists(self._regions_path) else np.empty(0, dtype=REGION_DTYPE)
+        self._cells = cells
+        self._region_ids: Dict[Tuple[int, int], int] = {
+            (int(lat), int(lon)): i for i, (lat, lon) in enumerate(cells.tolist())
+        }
+        self._row_size = self.max_providers * len(self.fields)
+
+    # ------------------------------------------------------------------ registry
+
+    def _write_meta(self, meta: Dict):
+        tmp_path = os.path.join(self.root, META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.root, META_FILE))
+
+    def provider_index(self, name: str, create: bool = True) -> Optional[int]:
+        """Column of a provider, registering it on first write"""
+        if name in self.providers:
+            return self.providers.index(name)
+        if not create:
+            return None
+        if len(self.providers) >= self.max_providers:
+            raise ValueError(f'Store has no free provider column for {name}')
+        self.providers.append(name)
+        self._write_meta({'version': 1, 'fields': list(self.fields),
+                          'max_providers': self.max_providers, 'providers': self.providers})
+        return len(self.providers) - 1
+
+    @property
+    def regions(self) -> np.ndarray:
+        """(lat_cell, lon_cell) of every region, indexed by region id"""
+        return self._cells
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def region_id(self, lat_cell: int, lon_cell: int, create: bool = True) -> Optional[int]:
+        """Region id of a 0.1° cell, appending it to the registry on first use"""
+        key = (lat_cell, lon_cell)
+        region = self._region_ids.get(key)
+        if region is not None or not create:
+            return region
+        record = np.array([key], dtype=REGION_DTYPE)
+        with open(self._regions_path, 'ab') as f:
+            record.tofile(f)
+        self._cells = np.concatenate([self._cells, record])
+        region = self._region_ids[key] = len(self._cells) - 1
+        return region
+
+    def region_for(self, latitude: float, longitude: float, create: bool = True) -> Optional[int]:
+        """Region id for a location in degrees"""
+        return self.region_id(*region_cell(to_e6(latitude), to_e6(longitude)), create=create)
+
+    # ------------------------------------------------------------------ partitions
+
+    def _day_path(self, day: date) -> str:
+        return os.path.join(self.root, DAYS_DIR, f'{day.year:04d}', f'{day.isoformat()}.f32')
+
+    def days(self) -> List[date]:
+        """Dates that have a partition, oldest first"""
+        found = []
+        days_dir = os.path.join(self.root, DAYS_DIR)
+        for year in os.listdir(days_dir):
+            for name in os.listdir(os.path.join(days_dir, year)):
+                if name.endswith('.f32'):
+                    found.append(date.fromisoformat(name[:-4]))
+        return sorted(found)
+
+    def day(self, day: date) -> Optional[np.ndarray]:
+        """Read-only memory map of one day: [region, provider, field], None if never written"""
+        path = self._day_path(day)
+        if not os.path.exists(path):
+            return None
+        rows = os.path.getsize(path) // (self._row_size * DTYPE().itemsize)
+        if rows == 0:
+            return None
+        return np.memmap(path, dtype=DTYPE, mode='r',
+                         shape=(rows, self.max_providers, len(self.fields)))
+
+    def _open_for_write(self, day: date, rows: int) -> np.ndarray:
+        """Writable map of a day partition, appending NaN rows up to `rows` regions"""
+        path = self._day_path(day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        existing = os.path.getsize(path) // (self._row_size * DTYPE().itemsize) \
+            if os.path.exists(path) else 0
+        if rows > existing:
+            with open(path, 'ab') as f:
+                np.full((rows - existing) * self._row_size, np.nan, dtype=DTYPE).tofile(f)
+        return np.memmap(path, dtype=DTYPE, mode='r+',
+                         shape=(max(rows, existing), self.max_providers, len(self.fields)))
+
+    # ------------------------------------------------------------------ writes
+
+    def append_day(self, day: date, provider: str, region_ids: Sequence[int],
+                   values: np.ndarray, overwrite: bool = False) -> int:
+        """
+        Store one provider's values for many regions on one day
+
+        Args:
+            values: float array of shape (len(region_ids), len(fields))
+            overwrite: Replace cells that already hold a value (default keeps the first write)
+
+        Returns:
+            Number of region rows written
+        """
+        column = self.provider_index(provider)
+        region_ids = np.asarray(region_ids, dtype=np.int64)
+        values = np.asarray(values, dtype=DTYPE).reshape(len(region_ids), len(self.fields))
+        if len(region_ids) == 0:
+            return 0
+
+        data = self._open_for_write(day, len(self._cells))
+        if not overwrite:
+            empty = np.isnan(data[region_ids, column]).all(axis=1)
+            region_ids, values = region_ids[empty], values[empty]
+        data[region_ids, column] = values
+        data.flush()
+        del data
+        return len(region_ids)
+
+    def append(self, observations: Iterable, overwrite: bool = False) -> int:
+        """
+        Store DailyObservation records (any mix of providers, days and locations)
+
+        Returns:
+            Number of (region, provider, day) rows written
+        """
+        batches: Dict[Tuple[date, str], Tuple[List[int], List[List[float]]]] = {}
+        for o in observations:
+            region = self.region_for(o.latitude, o.longitude)
+            ids, rows = batches.setdefault((o.day, o.provider), ([], []))
+            ids.append(region)
+            rows.append([getattr(o, field) for field in self.fields])
+
+        written = 0
+        for (day, provider), (ids, rows) in sorted(batches.items()):
+            written += self.append_day(day, provider, ids, np.array(rows, dtype=DTYPE), overwrite)
+        return written
+
+    # ------------------------------------------------------------------ scans
+
+    def scan(self, start: date, end: date, regions: Optional[Sequence[int]] = None,
+             providers: Optional[Sequence[str]] = None,
+             fields: Optional[Sequence[str]] = None) -> Tuple[List[date], np.ndarray]:
+        """
+        Read an inclusive date range
+
+        Returns:
+            (days, array of shape [day, region, provider, field]); missing data is NaN
+        """
+        n_days = (end - start).days + 1
+        days = [start + timedelta(days=i) for i in range(n_days)]
+        region_ids = np.arange(len(self._cells)) if regions is None else np.asarray(regions, dtype=np.int64)
+        columns = list(range(len(self.providers))) if providers is None else \
+            [self.providers.index(p) for p in providers]
+        field_ids = list(range(len(self.fields))) if fields is None else \
+            [self.fields.index(f) for f in fields]
+
+        out = np.full((n_days, len(region_ids), len(columns), len(field_ids)), np.nan, dtype=DTYPE)
+        for i, day in enumerate(days):
+            data = self.day(day)
+            if data is None:
+                continue
+            present = region_ids < len(data)
+            block = data[region_ids[present]][:, columns][:, :, field_ids]
+            out[i, present] = block
+        return days, out
+
+    def consensus(self, start: date, end: date, field: str = 'rainfall_mm',
+                  regions: Optional[Sequence[int]] = None) -> Tuple[List[date], np.ndarray]:
+        """
+        Cross-provider median of one field, like calculate_consensus
+
+        Returns:
+            (days, array of shape [day, region]); NaN where no provider reported
+        """
+        days, data = self.scan(start, end, regions=regions, fields=[field])
+        values = data[..., 0]
+        observed = ~np.isnan(values).all(axis=2)
+        median = np.full(values.shape[:2], np.nan, dtype=DTYPE)
+        if observed.any():
+            median[observed] = np.nanmedian(values[observed], axis=1)
+        return days, median
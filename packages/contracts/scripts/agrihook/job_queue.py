@@ -0,0 +1,397 @@
+"""
+Durable Job Queue for Agri-Hook
+SQLite (WAL) queue for fetch, attest, submit and claim jobs with idempotency keys and checkpoints
+
+A job is identified by (kind, key), e.g. ('fetch', 'minas_gerais:2026-10-19') or
+('claim', '0xfarmer:1760000000'); enqueueing the same key twice is a no-op, so re-running a
+batch never repeats finished work. Workers lease jobs (at-least-once: a crashed worker's lease
+expires and the job is picked up again) and store checkpoints as they go. Transactions are
+signed and checkpointed before they are broadcast, so a resumed job re-broadcasts the same
+signed transaction or waits for its receipt instead of paying gas twice.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .telemetry import TELEMETRY
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+DEFAULT_LEASE = 300               # Seconds a worker owns a job before others may take it over
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE = 10                   # Back-off after the n-th failure: RETRY_BASE * 2**(n-1) seconds
+MAX_RETRY_DELAY = 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_until REAL,
+    worker TEXT,
+    checkpoint TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, available_at);
+"""
+
+
+def region_day_key(region: str, day) -> str:
+    """Idempotency key for per-region daily work (fetch, attest, submit)"""
+    return f'{region}:{day}'
+
+
+def claim_key(farmer: str, event_timestamp: int) -> str:
+    """Idempotency key for one farmer's claim against one weather event"""
+    return f'{farmer.lower()}:{int(event_timestamp)}'
+
+
+class Job:
+    """A leased job; handlers read `payload` and persist progress with checkpoint()"""
+
+    __slots__ = ('queue', 'id', 'kind', 'key', 'payload', 'attempts', 'checkpoint_data', 'lease')
+
+    def __init__(self, queue: 'JobQueue', row: sqlite3.Row, lease: float = DEFAULT_LEASE):
+        self.queue = queue
+        self.lease = lease
+        self.id = row['id']
+        self.kind = row['kind']
+        self.key = row['key']
+        self.payload = json.loads(row['payload'])
+        self.attempts = row['attempts']
+        self.checkpoint_data = json.loads(row['checkpoint']) if row['checkpoint'] else {}
+
+    def checkpoint(self, **data):
+        """Merge progress into the job's checkpoint and commit it (also renews the lease)"""
+        self.checkpoint_data.update(data)
+        self.queue._checkpoint(self)
+
+    def __repr__(self):
+        return f'Job({self.id}, {self.kind}, {self.key}, attempt {self.attempts})'
+
+
+class JobQueue:
+    """SQLite-backed queue; safe to share between processes on one host"""
+
+    def __init__(self, path: str, worker: Optional[str] = None):
+        self.path = path
+        self.worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')    # Durable at checkpoints under WAL
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    # ------------------------------------------------------------------ producers
+
+    def enqueue(self, kind: str, key: str, payload: Optional[Dict] = None,
+                max_attempts: int = DEFAULT_MAX_ATTEMPTS, delay: float = 0) -> bool:
+        """Add a job unless (kind, key) already exists; True if it was added"""
+        return self.enqueue_many(kind, [(key, payload or {})], max_attempts, delay) == 1
+
+    def enqueue_many(self, kind: str, jobs: Iterable[Tuple[str, Dict]],
+                     max_attempts: int = DEFAULT_MAX_ATTEMPTS, delay: float = 0) -> int:
+        """Add a batch in one transaction; returns the number of new jobs"""
+        now = time.time()
+        rows = [(kind, key, json.dumps(payload, sort_keys=True), max_attempts, now + delay, now, now)
+                for key, payload in jobs]
+        with self._transaction():
+            before = self.db.total_changes
+            self.db.executemany(
+                'INSERT OR IGNORE INTO jobs (kind, key, payload, max_attempts, available_at, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            added = self.db.total_changes - before
+        TELEMETRY.count('job_queue.enqueued', added, kind=kind)
+        return added
+
+    # ------------------------------------------------------------------ workers
+
+    def claim(self, kinds: Optional[List[str]] = None, lease: float = DEFAULT_LEASE) -> Optional[Job]:
+        """Lease the oldest ready job (pending, or running with an expired lease)"""
+        now = time.time()
+        kind_filter = ''
+        params: List = [now, now]
+        if kinds:
+            kind_filter = f' AND kind IN ({",".join("?" * len(kinds))})'
+            params += list(kinds)
+        with self._transaction():
+            row = self.db.execute(
+                'SELECT * FROM jobs WHERE ((state = \'pending\' AND available_at <= ?) '
+                'OR (state = \'running\' AND lease_until < ?))' + kind_filter +
+                ' ORDER BY available_at, id LIMIT 1', params).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                'UPDATE jobs SET state = ?, attempts = attempts + 1, lease_until = ?, worker = ?, updated_at = ? '
+                'WHERE id = ?', (RUNNING, now + lease, self.worker, now, row['id']))
+            row = self.db.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone()
+        return Job(self, row, lease)
+
+    def _checkpoint(self, job: Job):
+        now = time.time()
+        self.db.execute('UPDATE jobs SET checkpoint = ?, lease_until = ?, updated_at = ? WHERE id = ?',
+                        (json.dumps(job.checkpoint_data, default=str), now + job.lease, now, job.id))
+
+    def complete(self, job: Job, result=None):
+        self.db.execute('UPDATE jobs SET state = ?, result = ?, error = NULL, lease_until = NULL, updated_at = ? '
+                        'WHERE id = ?', (DONE, json.dumps(result, default=str), time.time(), job.id))
+        TELEMETRY.count('job_queue.completed', kind=job.kind)
+
+    def fail(self, job: Job, error: str, retry: bool = True):
+        """Record a failure; the job is retried with back-off until max_attempts"""
+        now = time.time()
+        with self._transaction():
+            max_attempts = self.db.execute('SELECT max_attempts FROM jobs WHERE id = ?', (job.id,)).fetchone()[0]
+            if retry and job.attempts < max_attempts:
+                delay = min(RETRY_BASE * 2 ** (job.attempts - 1), MAX_RETRY_DELAY)
+                self.db.execute('UPDATE jobs SET state = ?, error = ?, available_at = ?, lease_until = NULL, '
+                                'updated_at = ? WHERE id = ?', (PENDING, error, now + delay, now, job.id))
+            else:
+                self.db.execute('UPDATE jobs SET state = ?, error = ?, lease_until = NULL, updated_at = ? '
+                                'WHERE id = ?', (FAILED, error, now, job.id))
+        TELEMETRY.count('job_queue.failures', kind=job.kind)
+
+    def retry_failed(self, kind: Optional[str] = None) -> int:
+        """Move failed jobs back to pending (attempt counters restart)"""
+        where, params = ("state = 'failed'", [])
+        if kind:
+            where, params = where + ' AND kind = ?', [kind]
+        cursor = self.db.execute(f'UPDATE jobs SET state = ?, attempts = 0, available_at = ?, updated_at = ? '
+                                 f'WHERE {where}', [PENDING, time.time(), time.time()] + params)
+        return cursor.rowcount
+
+    # ------------------------------------------------------------------ inspection
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """kind → state → count"""
+        stats: Dict[str, Dict[str, int]] = {}
+        for kind, state, count in self.db.execute('SELECT kind, state, COUNT(*) FROM jobs GROUP BY kind, state'):
+            stats.setdefault(kind, {})[state] = count
+        return stats
+
+    def get(self, kind: str, key: str) -> Optional[Dict]:
+        row = self.db.execute('SELECT * FROM jobs WHERE kind = ? AND key = ?', (kind, key)).fetchone()
+        if row is None:
+            return None
+        data = dict(row)
+        for column in ('payload', 'checkpoint', 'result'):
+            data[column] = json.loads(data[column]) if data[column] else None
+        return data
+
+    def _transaction(self):
+        return _Immediate(self.db)
+
+
+class _Immediate:
+    """BEGIN IMMEDIATE … COMMIT (takes the write lock up front so claims never race)"""
+
+    def __init__(self, db: sqlite3.Connection):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute('BEGIN IMMEDIATE')
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (e.g. policy already claimed)"""
+
+
+def run_worker(queue: JobQueue, handlers: Dict[str, Callable[[Job], object]],
+               max_jobs: Optional[int] = None, idle_exit: bool = True, poll: float = 1.0,
+               lease: float = DEFAULT_LEASE) -> Dict[str, int]:
+    """
+    Process jobs until the queue is empty (idle_exit) or max_jobs have run
+
+    Handlers return a JSON-serializable result. Raising PermanentJobError fails the job
+    without retries; any other exception schedules a retry.
+    """
+    counts = {'completed': 0, 'failed': 0}
+    kinds = list(handlers)
+    while max_jobs is None or counts['completed'] + counts['failed'] < max_jobs:
+        job = queue.claim(kinds, lease)
+        if job is None:
+            if idle_exit:
+                break
+            time.sleep(poll)
+            continue
+        try:
+            with TELEMETRY.span('job_queue.run', kind=job.kind):
+                result = handlers[job.kind](job)
+        except PermanentJobError as e:
+            queue.fail(job, str(e), retry=False)
+            counts['failed'] += 1
+        except Exception as e:
+            queue.fail(job, f'{type(e).__name__}: {e}')
+            counts['failed'] += 1
+        else:
+            queue.complete(job, result)
+            counts['completed'] += 1
+    return counts
+
+
+# ---------------------------------------------------------------------- transaction checkpoints
+
+def send_checkpointed(job: Job, w3, account, call, gas: int, receipt_timeout: float = 120) -> Dict:
+    """
+    Sign, checkpoint, broadcast and wait, resuming from a previous attempt's checkpoint
+
+    The signed raw transaction is stored before it is sent. On resume the same bytes are
+    re-broadcast (a no-op if the node already has them) and the worker waits for that
+    transaction's receipt, so one job never spends a second nonce.
+    """
+    state = job.checkpoint_data
+    if 'raw_tx' not in state:
+        tx = call.build_transaction({
+            'from': account.address,
+            'nonce': w3.eth.get_transaction_count(account.address, 'pending'),
+            'gas': gas,
+            'gasPrice': w3.eth.gas_price
+        })
+        signed_tx = account.sign_transaction(tx)
+        job.checkpoint(raw_tx=_hex(signed_tx.raw_transaction), tx_hash=_hex(signed_tx.hash), nonce=tx['nonce'])
+
+    tx_hash = state['tx_hash']
+    receipt = _receipt(w3, tx_hash)
+    if receipt is None:
+        try:
+            w3.eth.send_raw_transaction(state['raw_tx'])
+        except Exception as e:
+            # Already known / nonce too low: the transaction (or a replacement) is on its way
+            if _receipt(w3, tx_hash) is None and 'known' not in str(e).lower() \
+                    and 'nonce too low' not in str(e).lower():
+                raise
+        job.checkpoint(broadcast_at=int(time.time()))
+        with TELEMETRY.span('tx.receipt_wait'):
+            receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=receipt_timeout)
+
+    if receipt['status'] != 1:
+        raise PermanentJobError(f'transaction {tx_hash} reverted')
+    return {'tx_hash': tx_hash, 'block': receipt['blockNumber'], 'gas_used': receipt['gasUsed']}
+
+
+def _hex(data: bytes) -> str:
+    return '0x' + bytes(data).hex()
+
+
+def _receipt(w3, tx_hash: str) -> Optional[Dict]:
+    try:
+        return w3.eth.get_transaction_receipt(tx_hash)
+    except Exception:
+        return None
+
+
+# ---------------------------------------------------------------------- oracle and claim handlers
+
+def oracle_handlers(queue: JobQueue, w3=None, account=None, oracle=None, vault=None,
+                    api_keys: Optional[Dict[str, str]] = None, history_dir: Optional[str] = None,
+                    fdc_dir: Optional[str] = None) -> Dict[str, Callable[[Job], object]]:
+    """
+    Handlers for the standard job kinds
+
+    fetch   {region, latitude, longitude, day}   provider observations → consensus (per-provider checkpoints)
+    attest  {region, latitude, longitude, day}   FDC JsonApi request file from the fetch job's consensus
+    submit  {region, latitude, longitude, day}   gated updateWeatherSimple from the fetch job's consensus
+    claim   {farmer}                             claimPayout for the signer's policy
+    """
+    from dataclasses import asdict
+    from datetime import date
+
+    def fetched(job: Job) -> Dict:
+        fetch = queue.get('fetch', job.key)
+        if fetch is None or fetch['state'] != DONE:
+            raise RuntimeError(f'fetch {job.key} not done yet')
+        return fetch['result']['consensus']
+
+    def fetch(job: Job):
+        import asyncio
+        from .consensus import calculate_consensus
+        from .providers import DailyObservation, ProviderClient, available_providers, history_rows, summarize_results
+
+        p = job.payload
+        done = job.checkpoint_data.get('providers', {})
+        missing = [name for name in available_providers() if name not in done]
+        if missing:
+            async def run():
+                async with ProviderClient(api_keys, missing) as client:
+                    return await client.fetch_all(p['latitude'], p['longitude'], end=date.fromisoformat(p['day']))
+            for name, result in asyncio.run(run()).items():
+                if not isinstance(result, Exception):
+                    done[name] = [{**asdict(o), 'day': o.day.isoformat()} for o in result]
+            job.checkpoint(providers=done)       # Paid-for responses survive a crash
+
+        observations = {name: [DailyObservation(**{**o, 'day': date.fromisoformat(o['day'])}) for o in rows]
+                        for name, rows in done.items()}
+        readings = [r for r in summarize_results(observations).values() if r['success']]
+        if len(readings) < 2:
+            raise RuntimeError(f'only {len(readings)} provider(s) answered')
+        if history_dir and not job.checkpoint_data.get('stored'):
+            from .history_store import HistoryStore
+            HistoryStore(history_dir).append(history_rows(observations))
+            job.checkpoint(stored=True)
+        return {'consensus': calculate_consensus(readings)}
+
+    def attest(job: Job):
+        from .daemon import Region, attestation_request
+
+        p = job.payload
+        path = os.path.join(fdc_dir, 'requests', f"{job.key.replace(':', '_')}.json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(attestation_request(Region(p['region'], p['latitude'], p['longitude']), fetched(job)), f, indent=2)
+        return {'request': path}
+
+    def submit(job: Job):
+        from .oracle_gate import SubmissionGate
+
+        p = job.payload
+        if 'raw_tx' not in job.checkpoint_data:
+            decision = SubmissionGate(oracle).decide(fetched(job)['rainfall'])
+            if not decision.submit:
+                return {'skipped': decision.reason}
+            job.checkpoint(rainfall=decision.rainfall, reason=decision.reason)
+        call = oracle.functions.updateWeatherSimple(
+            job.checkpoint_data['rainfall'], int(p['latitude'] * 1e6), int(p['longitude'] * 1e6))
+        return send_checkpointed(job, w3, account, call, gas=200000)
+
+    def claim(job: Job):
+        farmer = job.payload['farmer']
+        if account is None or farmer.lower() != account.address.lower():
+            raise PermanentJobError(f'claim for {farmer} needs that farmer\'s key')
+        if 'raw_tx' not in job.checkpoint_data:
+            policy = vault.functions.getPolicy(account.address).call()
+            active, claimed = policy[7], policy[8]
+            if claimed or not active:
+                raise PermanentJobError('policy already claimed' if claimed else 'no active policy')
+        return send_checkpointed(job, w3, account, vault.functions.claimPayout(), gas=300000)
+
+    handlers = {'fetch': fetch}
+    if fdc_dir:
+        handlers['attest'] = attest
+    if oracle is not None and account is not None:
+        handlers['submit'] = submit
+    if vault is not None and account is not None:
+        handlers['claim'] = claim
+    return handlers
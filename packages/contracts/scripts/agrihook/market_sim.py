@@ -0,0 +1,374 @@
+"""
+Agri-Hook Market Simulator
+Agent-based simulation of AgriHook pools: arbitrage bots vs aligned traders vs rebalancers
+
+Many independent pools are simulated side by side in numpy arrays, one swap
+event per pool per step, so a run covers millions of swaps per minute.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .contract_math import (
+    ALIGNED_FEE,
+    BASE_FEE,
+    BASIS_POINTS,
+    BONUS_MULTIPLIER,
+    BONUS_SCALE_FACTOR,
+    CIRCUIT_BREAKER_THRESHOLD,
+    FEE_MULTIPLIER,
+    MAX_BONUS_RATE,
+    MAX_MISALIGNED_FEE,
+    MILD_DROUGHT_MULTIPLIER,
+    MODERATE_DROUGHT_MULTIPLIER,
+    RECOVERY_THRESHOLD,
+    SEVERE_DROUGHT_MULTIPLIER,
+)
+
+PRICE_SCALE = 10**6               # Prices are 6-decimal integers, like WeatherOracle.basePrice
+FEE_UNITS = 1_000_000             # Uniswap V4 fee units (3000 = 0.3%)
+
+# Agent populations
+AGENT_ARBITRAGE = 0
+AGENT_ALIGNED = 1
+AGENT_REBALANCER = 2
+AGENT_NAMES = ('arbitrage', 'aligned', 'rebalancer')
+
+
+@dataclass
+class SimConfig:
+    """Pool, agent population and hook-rule parameters for a simulation run"""
+    n_pools: int = 10_000                 # Independent pools simulated in parallel
+    steps_per_day: int = 96               # Swap events per pool per oracle day
+    base_price: float = 5.0               # Oracle base price (USD per bag)
+    reserve_commodity: float = 100_000.0  # Initial COFFEE reserve per pool
+    range_lower: Optional[float] = None   # Concentrated liquidity range (None = full range)
+    range_upper: Optional[float] = None
+
+    # Relative arrival rates of each agent population
+    arbitrage_rate: float = 1.0
+    aligned_rate: float = 1.0
+    rebalancer_rate: float = 0.2
+    bonus_sensitivity: float = 2.0        # Aligned arrivals scale by 1 + sensitivity × bonus%
+
+    # Agent behaviour
+    market_lag: float = 0.02              # Per-step convergence of the CEX price to the oracle
+    market_noise: float = 0.002           # Per-step CEX price noise (fraction)
+    arb_min_edge: float = 0.001           # Minimum profit (fraction of trade) after fees
+    aligned_trade_fraction: float = 0.002 # Mean aligned trade size (fraction of quote reserve)
+    rebalance_capital: float = 50_000.0   # Capital sent with each rebalancePool() call
+
+    # Hook rules
+    fee_to_treasury: float = 0.0          # Share of misaligned fees routed to the treasury
+    initial_treasury: float = 10_000.0
+    breaker_flag_sticks: bool = False     # See note in MarketSimulator._step
+    rebalance_moves_price: bool = True    # Rebalancing capital moves the pool to the oracle
+    seed: int = 0
+
+
+@dataclass
+class SimResult:
+    """Aggregated outcome of a simulation run"""
+    steps: int
+    swaps_attempted: int
+    swaps_executed: int
+    swaps_reverted: int
+    rebalances: int
+    fees_by_agent: Dict[str, float]
+    volume_by_agent: Dict[str, float]
+    arbitrage_profit: float
+    bonuses_paid: float
+    treasury: float
+    mean_deviation: np.ndarray = field(repr=False)    # Per step, across pools
+    mode_share: np.ndarray = field(repr=False)        # Per step: [normal, recovery, breaker]
+
+    def summary(self) -> Dict:
+        """Scalar metrics as a JSON-serialisable dict"""
+        return {
+            'steps': self.steps,
+            'swaps_attempted': self.swaps_attempted,
+            'swaps_executed': self.swaps_executed,
+            'swaps_reverted': self.swaps_reverted,
+            'rebalances': self.rebalances,
+            'fees_by_agent': self.fees_by_agent,
+            'volume_by_agent': self.volume_by_agent,
+            'arbitrage_profit': self.arbitrage_profit,
+            'bonuses_paid': self.bonuses_paid,
+            'treasury': self.treasury,
+            'max_mean_deviation': float(self.mean_deviation.max(initial=0)),
+            'breaker_share': float(self.mode_share[:, 2].mean()) if len(self.mode_share) else 0.0,
+        }
+
+
+def weather_multipliers(rainfall: Sequence[float]) -> np.ndarray:
+    """Vectorized WeatherOracle.calculateWeatherMultiplier over integer-mm rainfall"""
+    rain = np.floor(np.asarray(rainfall, dtype=np.float64))
+    return np.select(
+        [rain == 0, rain < 5, rain < 10],
+        [SEVERE_DROUGHT_MULTIPLIER, MODERATE_DROUGHT_MULTIPLIER, MILD_DROUGHT_MULTIPLIER],
+        default=100,
+    ).astype(np.int64)
+
+
+def hook_deviation(pool_price: np.ndarray, oracle_price: np.ndarray) -> np.ndarray:
+    """Vectorized AgriHook.calculateDeviation on 6-decimal integer prices"""
+    return (np.abs(pool_price - oracle_price) * 100) // oracle_price
+
+
+def hook_modes(deviation: np.ndarray) -> np.ndarray:
+    """Vectorized AgriHook.getOperatingMode"""
+    return ((deviation >= RECOVERY_THRESHOLD).astype(np.int8)
+            + (deviation >= CIRCUIT_BREAKER_THRESHOLD).astype(np.int8))
+
+
+def hook_fees(deviation: np.ndarray, aligned: np.ndarray) -> np.ndarray:
+    """Vectorized _beforeSwap fee: ALIGNED_FEE or FeeCurve.quadraticFee"""
+    misaligned = np.minimum(BASE_FEE + (deviation * deviation * FEE_MULTIPLIER) // BASIS_POINTS,
+                            MAX_MISALIGNED_FEE)
+    return np.where(aligned, ALIGNED_FEE, misaligned)
+
+
+def hook_bonus_rates(deviation: np.ndarray) -> np.ndarray:
+    """Vectorized BonusCurve.quadraticBonus with the hook's constants"""
+    return np.minimum((deviation * deviation * BONUS_MULTIPLIER) // BASIS_POINTS, MAX_BONUS_RATE)
+
+
+class MarketSimulator:
+    """Array-backed discrete-event simulator for a population of AgriHook pools"""
+
+    def __init__(self, config: Optional[SimConfig] = None):
+        self.config = config or SimConfig()
+        cfg = self.config
+        n = cfg.n_pools
+        self.rng = np.random.default_rng(cfg.seed)
+
+        # Concentrated liquidity is modelled with virtual reserves on top of real ones
+        p0 = cfg.base_price
+        if cfg.range_lower is not None and cfg.range_upper is not None:
+            sa, sb, sp = np.sqrt(cfg.range_lower), np.sqrt(cfg.range_upper), np.sqrt(p0)
+            liquidity = cfg.reserve_commodity / (1 / sp - 1 / sb)
+            self.x_offset = liquidity / sb
+            self.y_offset = liquidity * sa
+            x_virtual = liquidity / sp
+        else:
+            self.x_offset = self.y_offset = 0.0
+            x_virtual = cfg.reserve_commodity
+
+        self.x = np.full(n, x_virtual)                 # Virtual COFFEE reserve
+        self.y = self.x * p0                           # Virtual quote reserve
+        self.oracle = np.full(n, p0)
+        self.market = np.full(n, p0)                   # Lagging external (CEX) price
+        self.treasury = np.full(n, cfg.initial_treasury)
+        self.breaker = np.zeros(n, dtype=bool)         # circuitBreakerActive
+
+        self.fees = np.zeros(3)
+        self.volume = np.zeros(3)
+        self.arb_profit = 0.0
+        self.bonuses = 0.0
+        self.attempted = self.executed = self.reverted = self.rebalances = 0
+
+    def pool_price(self) -> np.ndarray:
+        """Current pool price (quote per COFFEE)"""
+        return self.y / self.x
+
+    def _swap(self, idx: np.ndarray, buying: np.ndarray, amount_in: np.ndarray,
+              fee: np.ndarray):
+        """Execute constant-product swaps, returning (COFFEE moved, quote moved)"""
+        x, y = self.x[idx], self.y[idx]
+        effective = amount_in * (1 - fee / FEE_UNITS)
+        # Keep real reserves non-negative inside a concentrated range
+        max_x_out = np.maximum(x - self.x_offset, 0)
+        max_y_out = np.maximum(y - self.y_offset, 0)
+
+        x_out = np.minimum(x * effective / (y + effective), max_x_out)
+        y_out = np.minimum(y * effective / (x + effective), max_y_out)
+
+        self.x[idx] = np.where(buying, x - x_out, x + effective)
+        self.y[idx] = np.where(buying, y + effective, y - y_out)
+        return np.where(buying, x_out, amount_in), np.where(buying, amount_in, y_out)
+
+    def _step(self, oracle_price: float):
+        """Advance every pool by one swap event"""
+        cfg = self.config
+        n = cfg.n_pools
+        rng = self.rng
+
+        self.oracle[:] = oracle_price
+        self.market += (self.oracle - self.market) * cfg.market_lag
+        self.market *= 1 + rng.normal(0, cfg.market_noise, n)
+
+        price = self.pool_price()
+        pool_int = np.round(price * PRICE_SCALE).astype(np.int64)
+        oracle_int = np.round(self.oracle * PRICE_SCALE).astype(np.int64)
+        deviation = hook_deviation(pool_int, oracle_int)
+        mode = hook_modes(deviation)
+        bonus_rate = np.where(mode == 1, hook_bonus_rates(deviation), 0)
+
+        # Draw which agent population acts on each pool this step
+        aligned_w = cfg.aligned_rate * (1 + cfg.bonus_sensitivity * bonus_rate / 100)
+        rebal_w = np.where(self.breaker, cfg.rebalancer_rate, 0.0)
+        total = cfg.arbitrage_rate + aligned_w + rebal_w
+        u = rng.random(n) * total
+        agent = np.where(u < cfg.arbitrage_rate, AGENT_ARBITRAGE,
+                         np.where(u < cfg.arbitrage_rate + aligned_w, AGENT_ALIGNED, AGENT_REBALANCER))
+
+        # rebalancePool(): only callable while circuitBreakerActive is set
+        rebal = np.flatnonzero(agent == AGENT_REBALANCER)
+        if rebal.size:
+            self._rebalance(rebal, deviation[rebal])
+
+        # Swaps: arbitrageurs trade the pool towards the CEX price, aligned traders towards the oracle
+        target = np.where(agent == AGENT_ARBITRAGE, self.market, self.oracle)
+        wants = (agent != AGENT_REBALANCER) & (np.abs(target - price) > 1e-12)
+        buying = target > price
+        aligned = np.where(pool_int == oracle_int, True,
+                           np.where(pool_int > oracle_int, ~buying, buying))
+        fee = hook_fees(deviation, aligned)
+
+        k = self.x * self.y
+        quote_to_target = np.sqrt(k * target) - self.y         # > 0 when buying COFFEE
+        coffee_to_target = np.sqrt(k / target) - self.x        # > 0 when selling COFFEE
+        full_size = np.where(buying, quote_to_target, coffee_to_target)
+
+        aligned_size = np.where(
+            buying,
+            self.y * cfg.aligned_trade_fraction,
+            self.x * cfg.aligned_trade_fraction,
+        ) * rng.exponential(1.0, n)
+        size = np.where(agent == AGENT_ARBITRAGE, full_size, np.minimum(aligned_size, full_size))
+
+        # Bots only trade when the edge beats the hook fee
+        edge = np.abs(target - price) / price
+        profitable = (agent != AGENT_ARBITRAGE) | (edge > fee / FEE_UNITS + cfg.arb_min_edge)
+        wants &= profitable & (size > 0)
+
+        idx = np.flatnonzero(wants)
+        self.attempted += idx.size
+        if idx.size == 0:
+            return deviation, mode
+
+        # _beforeSwap reverts at >= 100% deviation. The revert also rolls back the
+        # circuitBreakerActive write, so on-chain the flag never sticks and
+        # rebalancePool() stays unreachable; breaker_flag_sticks models the intended design.
+        blocked = mode[idx] == 2
+        if cfg.breaker_flag_sticks:
+            self.breaker[idx[blocked]] = True
+        self.reverted += int(blocked.sum())
+        idx = idx[~blocked]
+        self.executed += idx.size
+        if idx.size == 0:
+            return deviation, mode
+
+        agents_i = agent[idx]
+        buying_i = buying[idx]
+        fee_i = fee[idx]
+        amount_in = size[idx]
+        quote_value = np.where(buying_i, amount_in, amount_in * price[idx])
+        fee_paid = quote_value * fee_i / FEE_UNITS
+
+        price_before = price[idx]
+        coffee, quote = self._swap(idx, buying_i, amount_in, fee_i)
+
+        np.add.at(self.fees, agents_i, fee_paid)
+        np.add.at(self.volume, agents_i, quote_value)
+        misaligned = ~aligned[idx]
+        self.treasury[idx] += np.where(misaligned, fee_paid * cfg.fee_to_treasury, 0.0)
+
+        arb = agents_i == AGENT_ARBITRAGE
+        if arb.any():
+            # Profit marked against the CEX price the bot unwinds at
+            market = self.market[idx]
+            pnl = np.where(buying_i, coffee * market - quote, quote - coffee * market)
+            self.arb_profit += float(pnl[arb].sum())
+
+        # _afterSwap: quadratic bonus on |amount0| for aligned traders in RECOVERY mode
+        rate = bonus_rate[idx]
+        eligible = aligned[idx] & (rate > 0)
+        if eligible.any():
+            bonus = coffee * rate / BONUS_SCALE_FACTOR * price_before
+            pay = eligible & (self.treasury[idx] >= bonus) & (bonus > 0)
+            self.treasury[idx[pay]] -= bonus[pay]
+            self.bonuses += float(bonus[pay].sum())
+
+        return deviation, mode
+
+    def _rebalance(self, idx: np.ndarray, deviation: np.ndarray):
+        """Apply AgriHook.rebalancePool() for pools whose breaker flag is set"""
+        cfg = self.config
+        capital = cfg.rebalance_capital
+        bonus = capital * hook_bonus_rates(deviation) / BONUS_SCALE_FACTOR
+        self.treasury[idx] += capital - bonus
+        self.bonuses += float(bonus.sum())
+        self.rebalances += idx.size
+
+        if cfg.rebalance_moves_price:
+            # Model the deposit as liquidity added at the oracle price
+            k = self.x[idx] * self.y[idx]
+            oracle = self.oracle[idx]
+            self.x[idx] = np.sqrt(k / oracle)
+            self.y[idx] = np.sqrt(k * oracle)
+
+        price = np.round(self.pool_price()[idx] * PRICE_SCALE).astype(np.int64)
+        oracle_int = np.round(self.oracle[idx] * PRICE_SCALE).astype(np.int64)
+        cleared = hook_deviation(price, oracle_int) < CIRCUIT_BREAKER_THRESHOLD
+        self.breaker[idx[cleared]] = False
+
+    def run(self, rainfall: Sequence[float]) -> SimResult:
+        """
+        Replay a daily 7-day-rainfall series as oracle shocks
+
+        Args:
+            rainfall: Rainfall (mm, last 7 days) per simulated day
+        """
+        cfg = self.config
+        oracle_prices = cfg.base_price * weather_multipliers(rainfall) / 100
+        steps = len(oracle_prices) * cfg.steps_per_day
+
+        mean_deviation = np.zeros(steps)
+        mode_share = np.zeros((steps, 3))
+        step = 0
+        for day_price in oracle_prices:
+            for _ in range(cfg.steps_per_day):
+                deviation, mode = self._step(day_price)
+                mean_deviation[step] = deviation.mean()
+                mode_share[step] = np.bincount(mode, minlength=3)[:3] / cfg.n_pools
+                step += 1
+
+        return SimResult(
+            steps=steps,
+            swaps_attempted=self.attempted,
+            swaps_executed=self.executed,
+            swaps_reverted=self.reverted,
+            rebalances=self.rebalances,
+            fees_by_agent=dict(zip(AGENT_NAMES, self.fees.round(6).tolist())),
+            volume_by_agent=dict(zip(AGENT_NAMES, self.volume.round(6).tolist())),
+            arbitrage_profit=self.arb_profit,
+            bonuses_paid=self.bonuses,
+            treasury=float(self.treasury.sum()),
+            mean_deviation=mean_deviation,
+            mode_share=mode_share,
+        )
+
+
+def main():
+    """Run a drought shock scenario and print the summary"""
+    import json
+    import time
+
+    # 10 normal days, a week-long severe drought, then recovery
+    rainfall = [25] * 10 + [0] * 7 + [3] * 3 + [25] * 10
+    sim = MarketSimulator(SimConfig(n_pools=5_000, steps_per_day=48))
+
+    start = time.perf_counter()
+    result = sim.run(rainfall)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps(result.summary(), indent=2))
+    print(f"\n⏱️  {result.swaps_attempted:,} swap attempts in {elapsed:.1f}s "
+          f"({result.swaps_attempted / elapsed * 60:,.0f}/min)")
+
+
+if __name__ == '__main__':
+    main()
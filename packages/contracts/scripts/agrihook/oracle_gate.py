@@ -0,0 +1,127 @@
+"""
+Oracle Submission Gate for Agri-Hook
+Skips WeatherOracle writes that would store the same WeatherEvent that is already on-chain
+
+updateWeatherSimple and setWeatherDisruptionWithFDC only depend on the rainfall tier, so any
+consensus inside the current tier produces an identical (eventType, priceImpactPercent, active).
+The gate predicts that tuple locally and submits only on a change, or as a heartbeat when the
+stored event is about to fall outside the 1-hour freshness window.
+
+The two paths hand the contract different units: updateWeatherSimple takes whole millimetres,
+while the FDC WeatherData carries rainfall × 100 (build_weather_data). Pass
+scale=consensus.FDC_RAINFALL_SCALE when deciding for setWeatherDisruptionWithFDC.
+"""
+
+import math
+import time
+from typing import NamedTuple, Optional, Tuple
+
+from .contract_math import WEATHER_DATA_MAX_AGE, weather_event_for_rainfall
+from .telemetry import TELEMETRY
+
+HEARTBEAT_MARGIN = 600            # Seconds before the deadline to refresh (FDC rounds take minutes)
+SIMPLE_RAINFALL_SCALE = 1         # updateWeatherSimple: whole millimetres
+
+REASON_CHANGED = 'changed'
+REASON_HEARTBEAT = 'heartbeat'
+REASON_NO_STATE = 'no-state'
+REASON_UNCHANGED = 'unchanged'
+
+
+class GateDecision(NamedTuple):
+    """Outcome of SubmissionGate.decide()"""
+    submit: bool
+    reason: str
+    rainfall: int                          # Integer rainfall the contract will see (mm × scale)
+    predicted: Tuple[int, int, bool]       # (eventType, priceImpactPercent, active)
+    current: Optional[Tuple[int, int, bool]]
+    age: Optional[int]                     # Seconds since the on-chain event timestamp
+
+
+def contract_rainfall(rainfall_mm: float, scale: int = SIMPLE_RAINFALL_SCALE) -> int:
+    """Consensus rainfall as the uint256 value passed to the oracle (mm × scale, truncated)"""
+    return max(int(math.floor(rainfall_mm * scale)), 0)
+
+
+class SubmissionGate:
+    """Decides whether a weather update would change the oracle's stored event"""
+
+    def __init__(self, oracle=None, cache=None, freshness: int = WEATHER_DATA_MAX_AGE,
+                 heartbeat_margin: int = HEARTBEAT_MARGIN):
+        """
+        Args:
+            oracle: WeatherOracle contract (web3), optional when state is supplied via record()
+            cache: StateCache used for getCurrentWeatherEvent (re-read after DisruptionUpdated)
+            freshness: Maximum age of the stored event in seconds
+            heartbeat_margin: Resubmit this many seconds before the freshness deadline
+        """
+        self.oracle = oracle
+        self.cache = cache
+        self.freshness = freshness
+        self.heartbeat_margin = heartbeat_margin
+        self._event: Optional[Tuple[int, int, int, bool]] = None
+
+        self.submitted = 0
+        self.skipped = 0
+
+    def current_event(self) -> Optional[Tuple[int, int, int, bool]]:
+        """On-chain (eventType, priceImpact, timestamp, active), None if unknown"""
+        if self.oracle is not None:
+            if self.cache is not None:
+                event = self.cache.call(self.oracle, 'getCurrentWeatherEvent')
+            else:
+                event = self.oracle.functions.getCurrentWeatherEvent().call()
+            self._event = tuple(event)
+        return self._event
+
+    def record(self, event_type: int, price_impact: int, timestamp: int, active: bool):
+        """Set the known on-chain event (after our own transaction, or without an RPC)"""
+        self._event = (event_type, price_impact, timestamp, active)
+
+    def decide(self, rainfall_mm: float, now: Optional[int] = None,
+               scale: int = SIMPLE_RAINFALL_SCALE) -> GateDecision:
+        """
+        Predict the update's effect and decide whether it is worth a transaction
+
+        Args:
+            scale: SIMPLE_RAINFALL_SCALE for updateWeatherSimple, consensus.FDC_RAINFALL_SCALE
+                for setWeatherDisruptionWithFDC
+        """
+        rainfall = contract_rainfall(rainfall_mm, scale)
+        predicted = weather_event_for_rainfall(rainfall)
+        event = self.current_event()
+        now = int(time.time()) if now is None else now
+
+        if event is None:
+            decision = GateDecision(True, REASON_NO_STATE, rainfall, predicted, None, None)
+        else:
+            event_type, impact, timestamp, active = event
+            current = (int(event_type), int(impact), bool(active))
+            age = now - int(timestamp)
+            if current != predicted:
+                reason = REASON_CHANGED
+            elif age >= self.freshness - self.heartbeat_margin:
+                reason = REASON_HEARTBEAT
+            else:
+                reason = REASON_UNCHANGED
+            decision = GateDecision(reason != REASON_UNCHANGED, reason, rainfall, predicted, current, age)
+
+        if decision.submit:
+            self.submitted += 1
+        else:
+            self.skipped += 1
+        TELEMETRY.count('oracle_gate.decisions', reason=decision.reason)
+        return decision
+
+    def submitted_event(self, decision: GateDecision, timestamp: int):
+        """Record the event a successful submission stored"""
+        event_type, impact, active = decision.predicted
+        self.record(event_type, impact, timestamp, active)
+
+    def stats(self) -> dict:
+        total = self.submitted + self.skipped
+        return {
+            'submitted': self.submitted,
+            'skipped': self.skipped,
+            'skip_rate': round(self.skipped / total, 4) if total else 0.0,
+        }
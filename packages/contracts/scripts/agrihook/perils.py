@@ -0,0 +1,140 @@
+"""
+Multi-Peril Classifier for Agri-Hook
+Table-driven drought, flood and frost tiers for every region in one pass over the observation block
+
+Each peril is a row in a table: which observation field it reads, how the window is reduced per
+provider (sum, min, max, mean), whether it fires below or above its bounds, and its tiers. The
+classifier reduces every distinct (field, reduction) pair once, takes the median across
+providers (the consensus rule), looks all perils up with np.searchsorted and keeps the most
+severe one per region. Adding a peril adds a table row, not a pass or a provider call.
+
+Drought is evaluated on the floored integer millimetres the oracle receives, so its tiers and
+impacts are exactly calculateWeatherMultiplier's. FLOOD and FROST tiers are off-chain
+assessments: WeatherOracle defines the event types, but its rainfall updates only store DROUGHT.
+"""
+
+import warnings
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .contract_math import (
+    MILD_DROUGHT_MULTIPLIER,
+    MODERATE_DROUGHT_MULTIPLIER,
+    SEVERE_DROUGHT_MULTIPLIER,
+    WEATHER_EVENT_DROUGHT,
+    WEATHER_EVENT_FLOOD,
+    WEATHER_EVENT_FROST,
+    WEATHER_EVENT_NONE,
+)
+from .history_store import FIELDS
+from .sharding import SEVERITY_NAMES, _round1
+
+EVENT_NAMES = {WEATHER_EVENT_NONE: 'NONE', WEATHER_EVENT_DROUGHT: 'DROUGHT',
+               WEATHER_EVENT_FROST: 'FROST', WEATHER_EVENT_FLOOD: 'FLOOD'}
+REDUCERS = {'sum': np.nansum, 'min': np.nanmin, 'max': np.nanmax, 'mean': np.nanmean}
+
+
+@dataclass(frozen=True)
+class Peril:
+    """One row of the peril table"""
+    name: str
+    event_type: int               # WeatherOracle.WeatherEventType
+    field: str                    # Observation field (history_store.FIELDS)
+    reduce: str                   # Per-provider window reduction: sum / min / max / mean
+    below: bool                   # True: fires when the value is under a bound
+    bounds: Tuple[float, ...]     # Tier bounds, MILD → SEVERE (below: value < bound, above: ≥)
+    impacts: Tuple[int, ...]      # priceImpact % per tier, MILD → SEVERE
+    floor: bool = False           # Compare floor(value) (the oracle's uint256 mm)
+
+    def tiers(self, values: np.ndarray) -> np.ndarray:
+        """0 (NORMAL) .. len(bounds) (most severe) per value; 0 where NaN"""
+        values = np.floor(values) if self.floor else values
+        if self.below:
+            # value < bound, bounds descending: negate to search an ascending array
+            tiers = np.searchsorted(-np.asarray(self.bounds), -values, side='left')
+        else:
+            tiers = np.searchsorted(np.asarray(self.bounds), values, side='right')
+        return np.where(np.isnan(values), 0, tiers)
+
+
+DEFAULT_PERILS: Tuple[Peril, ...] = (
+    # 7-day rainfall < 10 / < 5 / < 1 mm (floored to 0) → +15 / +30 / +50 %
+    Peril('drought', WEATHER_EVENT_DROUGHT, 'rainfall_mm', 'sum', True, (10, 5, 1),
+          (MILD_DROUGHT_MULTIPLIER - 100, MODERATE_DROUGHT_MULTIPLIER - 100,
+           SEVERE_DROUGHT_MULTIPLIER - 100), floor=True),
+    # 7-day rainfall ≥ 100 / 150 / 250 mm: waterlogging, cherry drop, harvest delays
+    Peril('flood', WEATHER_EVENT_FLOOD, 'rainfall_mm', 'sum', False, (100, 150, 250), (5, 10, 20)),
+    # Coldest day < 3 / 1 / -1 °C (daily mean, the only temperature providers report)
+    Peril('frost', WEATHER_EVENT_FROST, 'temp_c', 'min', True, (3, 1, -1), (10, 25, 40)),
+)
+
+RESULT_DTYPE = np.dtype([
+    ('event_type', 'u1'),
+    ('severity', 'u1'),           # Index into SEVERITY_NAMES
+    ('impact', 'i2'),             # priceImpact %
+    ('peril', 'i1'),              # Row of the winning peril, -1 for none
+])
+
+
+def reduce_window(observations: np.ndarray, fields: Sequence[str],
+                  needs: Sequence[Tuple[str, str]]) -> Dict[Tuple[str, str], np.ndarray]:
+    """
+    Median-across-providers window statistic for each (field, reduction) pair
+
+    Per-provider values and medians are rounded to 0.1 like providers.summarize and
+    calculate_consensus, so drought tiers agree with the consensus the oracle is sent.
+
+    Args:
+        observations: [day, region, provider, field] (HistoryStore.scan layout)
+    Returns:
+        (field, reduction) → [region] float64, NaN where no provider reported
+    """
+    stats = {}
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)     # All-NaN slices: regions without data
+        for field, how in dict.fromkeys(needs):
+            values = observations[..., fields.index(field)].astype(np.float64)
+            reported = ~np.isnan(values).all(axis=0)
+            per_provider = _round1(np.where(reported, REDUCERS[how](values, axis=0), np.nan))
+            stats[field, how] = _round1(np.nanmedian(per_provider, axis=1))
+    return stats
+
+
+def classify(observations: np.ndarray, fields: Sequence[str] = FIELDS,
+             perils: Sequence[Peril] = DEFAULT_PERILS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify every region against every peril
+
+    Returns:
+        (result, tiers): RESULT_DTYPE array per region, and [region, peril] tier matrix
+    """
+    stats = reduce_window(observations, list(fields), [(p.field, p.reduce) for p in perils])
+    n_regions = observations.shape[1]
+    tiers = np.zeros((n_regions, len(perils)), dtype=np.int64)
+    impacts = np.zeros((n_regions, len(perils)), dtype=np.int64)
+    for i, peril in enumerate(perils):
+        tiers[:, i] = peril.tiers(stats[peril.field, peril.reduce])
+        impacts[:, i] = np.asarray((0,) + peril.impacts)[tiers[:, i]]
+
+    # Most severe tier wins, then the larger impact, then table order
+    score = tiers * 10**6 + impacts * len(perils) + (len(perils) - 1 - np.arange(len(perils)))
+    winner = np.argmax(score, axis=1)
+    rows = np.arange(n_regions)
+    severity = tiers[rows, winner]
+    hit = severity > 0
+
+    result = np.zeros(n_regions, dtype=RESULT_DTYPE)
+    event_types = np.asarray([p.event_type for p in perils])
+    result['event_type'] = np.where(hit, event_types[winner], WEATHER_EVENT_NONE)
+    result['severity'] = np.minimum(severity, len(SEVERITY_NAMES) - 1)
+    result['impact'] = np.where(hit, impacts[rows, winner], 0)
+    result['peril'] = np.where(hit, winner, -1)
+    return result, tiers
+
+
+def describe(result: np.ndarray) -> List[Dict]:
+    """Readable event/severity/impact per region"""
+    return [{'event': EVENT_NAMES.get(int(e), str(e)), 'severity': SEVERITY_NAMES[s], 'impact': int(i)}
+            for e, s, i in zip(result['event_type'], result['severity'], result['impact'])]
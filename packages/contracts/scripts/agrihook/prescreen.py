@@ -0,0 +1,212 @@
+"""
+Swap Pre-Screener for Agri-Hook
+Predicts AgriHook fee tier, operating mode, bonus eligibility and reverts before a swap is sent
+"""
+
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .contract_math import (
+    ALIGNED_FEE,
+    BONUS_SCALE_FACTOR,
+    MODE_CIRCUIT_BREAKER,
+    MODE_NAMES,
+    MODE_RECOVERY,
+    aligned_bonus_rate,
+    calculate_deviation,
+    get_operating_mode,
+    is_buying_commodity,
+    is_trader_aligned,
+    misaligned_fee,
+)
+
+AGRI_HOOK_ABI = [
+    {"name": "getPoolStatus", "type": "function", "stateMutability": "view",
+     "inputs": [{"name": "key", "type": "tuple", "components": [
+         {"name": "currency0", "type": "address"},
+         {"name": "currency1", "type": "address"},
+         {"name": "fee", "type": "uint24"},
+         {"name": "tickSpacing", "type": "int24"},
+         {"name": "hooks", "type": "address"}]}],
+     "outputs": [{"name": "currentPrice", "type": "uint256"},
+                 {"name": "oraclePrice", "type": "uint256"},
+                 {"name": "deviation", "type": "uint256"},
+                 {"name": "mode", "type": "uint8"},
+                 {"name": "treasury", "type": "uint256"}]},
+]
+
+# Fee tiers reported for a candidate swap
+TIER_ALIGNED = 'ALIGNED'
+TIER_MISALIGNED = 'MISALIGNED'
+TIER_BLOCKED = 'BLOCKED'
+
+CIRCUIT_BREAKER_REVERT = 'Circuit breaker active - use rebalancePool()'
+
+
+class PoolStatus(NamedTuple):
+    """Decoded AgriHook.getPoolStatus() result"""
+    current_price: int
+    oracle_price: int
+    deviation: int
+    mode: int
+    treasury: int
+    block_number: Optional[int] = None
+
+
+class SwapPrediction(NamedTuple):
+    """Predicted hook behaviour for one candidate swap"""
+    fee: int                      # Hook fee in hundredths of a bip (0 when reverting)
+    tier: str                     # ALIGNED / MISALIGNED / BLOCKED
+    mode: int                     # 0=Normal, 1=Recovery, 2=CircuitBreaker
+    mode_name: str
+    aligned: bool
+    bonus_eligible: bool          # _afterSwap would try to pay a bonus
+    bonus_rate: int               # Bonus rate in basis points
+    bonus_amount: int             # Expected bonus for the candidate amount (0 if unfunded)
+    reverts: bool
+    revert_reason: Optional[str]
+
+
+def _predict(status: PoolStatus, is_buying: bool) -> SwapPrediction:
+    """Predict the outcome for one trade direction against a pool status"""
+    mode_name = MODE_NAMES[status.mode]
+
+    if status.mode == MODE_CIRCUIT_BREAKER:
+        return SwapPrediction(0, TIER_BLOCKED, status.mode, mode_name, False,
+                              False, 0, 0, True, CIRCUIT_BREAKER_REVERT)
+
+    aligned = is_trader_aligned(status.current_price, status.oracle_price, is_buying)
+    if aligned:
+        fee, tier = ALIGNED_FEE, TIER_ALIGNED
+    else:
+        fee, tier = misaligned_fee(status.deviation), TIER_MISALIGNED
+
+    bonus_eligible = aligned and status.mode == MODE_RECOVERY and status.deviation > 0
+    bonus_rate = aligned_bonus_rate(status.deviation) if bonus_eligible else 0
+
+    return SwapPrediction(fee, tier, status.mode, mode_name, aligned,
+                          bonus_eligible, bonus_rate, 0, False, None)
+
+
+def status_from_prices(current_price: int, oracle_price: int, treasury: int = 0,
+                       block_number: Optional[int] = None) -> PoolStatus:
+    """Build a PoolStatus offline using the hook's own deviation/mode rules"""
+    if current_price == 0:
+        current_price = oracle_price
+    deviation = calculate_deviation(current_price, oracle_price)
+    return PoolStatus(current_price, oracle_price, deviation,
+                      get_operating_mode(deviation), treasury, block_number)
+
+
+class SwapPrescreener:
+    """Screens candidate swaps against a per-block cached AgriHook pool status"""
+
+    def __init__(self, w3=None, hook_address: Optional[str] = None,
+                 pool_key: Optional[Tuple] = None, cache=None, block_ttl: float = 1.0):
+        """
+        Args:
+            w3: Web3 instance (optional when statuses are supplied via set_status)
+            hook_address: AgriHook contract address
+            pool_key: (currency0, currency1, fee, tickSpacing, hooks)
+            cache: StateCache whose head block is reused instead of polling eth_blockNumber
+            block_ttl: Seconds a polled head block is reused when neither a cache nor
+                new_block() supplies one
+        """
+        self.w3 = w3
+        self.pool_key = tuple(pool_key) if pool_key else None
+        self.hook = None
+        if w3 is not None and hook_address:
+            self.hook = w3.eth.contract(
+                address=w3.to_checksum_address(hook_address), abi=AGRI_HOOK_ABI)
+
+        self.cache = cache
+        self.block_ttl = block_ttl
+        self._head: Optional[int] = None
+        self._head_checked = 0.0
+        self._subscribed = False
+
+        self._status: Optional[PoolStatus] = None
+        self._outcomes: Dict[bool, SwapPrediction] = {}
+        self.status_reads = 0
+        self.head_reads = 0
+
+    def set_status(self, status: PoolStatus):
+        """Install a pool status and precompute both trade directions"""
+        self._status = status
+        self._outcomes = {True: _predict(status, True), False: _predict(status, False)}
+
+    def new_block(self, block: int):
+        """Notify the screener of a new head (e.g. from a block subscription)"""
+        self._head = block
+        self._subscribed = True
+
+    def head(self) -> int:
+        """Block screened against by default: new_block() head, StateCache head, or a throttled poll"""
+        if self._subscribed:
+            return self._head
+        if self.cache is not None:
+            return self.cache.block_number()
+        now = time.monotonic()
+        if self._head is None or now - self._head_checked >= self.block_ttl:
+            self._head = self.w3.eth.block_number
+            self._head_checked = now
+            self.head_reads += 1
+        return self._head
+
+    def status(self, block_number: Optional[int] = None) -> PoolStatus:
+        """Return the pool status, reading getPoolStatus at most once per block"""
+        cached = self._status
+        if self.hook is None:
+            if cached is None:
+                raise ValueError('No pool status available (no hook contract configured)')
+            return cached
+
+        if block_number is None:
+            block_number = self.head()
+        if cached is not None and cached.block_number == block_number:
+            return cached
+
+        values = self.hook.functions.getPoolStatus(self.pool_key).call(
+            block_identifier=block_number)
+        self.status_reads += 1
+        self.set_status(PoolStatus(*values, block_number=block_number))
+        return self._status
+
+    def screen(self, zero_for_one: bool, amount: int = 0,
+               block_number: Optional[int] = None) -> SwapPrediction:
+        """Predict the hook outcome for a single swap"""
+        return self.screen_batch([(zero_for_one, amount)], block_number)[0]
+
+    def screen_batch(self, swaps: Iterable[Tuple[bool, int]],
+                     block_number: Optional[int] = None) -> List[SwapPrediction]:
+        """
+        Predict the hook outcome for many swaps with a single status lookup
+
+        Args:
+            swaps: (zeroForOne, amount0) pairs; amount0 sizes the expected bonus
+            block_number: Block to screen against (defaults to head())
+        """
+        status = self.status(block_number)
+        if self.pool_key:
+            currency0, currency1 = self.pool_key[0], self.pool_key[1]
+        else:
+            currency0, currency1 = '0x0', '0x1'
+        buying_when_zero_for_one = is_buying_commodity(True, currency0, currency1)
+
+        outcomes = self._outcomes
+        treasury = status.treasury
+        results = []
+        append = results.append
+        for zero_for_one, amount in swaps:
+            prediction = outcomes[zero_for_one == buying_when_zero_for_one]
+            if prediction.bonus_eligible and amount:
+                bonus = (abs(amount) * prediction.bonus_rate) // BONUS_SCALE_FACTOR
+                if 0 < bonus <= treasury:
+                    prediction = prediction._replace(bonus_amount=bonus)
+            append(prediction)
+        return results
+
+    def doomed(self, swaps: Iterable[Tuple[bool, int]],
+               block_number: Optional[int] = None) -> List[int]:
+        """Indices of candidate swaps that would revert in _beforeSwap"""
+        return [i for i, p in enumerate(self.screen_batch(swaps, block_number)) if p.reverts]
@@ -0,0 +1,324 @@
+"""
+Weather Provider Plug-ins for Agri-Hook
+Common async interface returning normalized per-day observations from every weather source
+
+A provider only describes how to request one source and how to normalize its JSON.
+ProviderClient adds connection pooling, TTL caching and concurrent fan-out to all of them;
+concurrent fetches of the same provider window share one upstream request.
+"""
+
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Type
+
+import aiohttp
+
+from .singleflight import AsyncSingleFlight
+from .telemetry import TELEMETRY
+
+DEFAULT_WINDOW_DAYS = 7           # Rainfall window used by calculateWeatherMultiplier
+DEFAULT_CACHE_TTL = 600           # Seconds a provider response is reused
+DEFAULT_TIMEOUT = 10              # Seconds per upstream request
+DEFAULT_NEGATIVE_TTL = 30         # Seconds a provider failure is replayed instead of retried
+
+
+@dataclass(frozen=True, slots=True)
+class DailyObservation:
+    """One provider's normalized weather for one location and day"""
+    provider: str
+    latitude: float
+    longitude: float
+    day: date
+    rainfall_mm: float
+    temp_c: float
+    humidity_pct: float
+
+
+class ProviderError(Exception):
+    """Raised when a provider request or response cannot be used"""
+
+
+class WeatherProvider(ABC):
+    """Base class for weather source plug-ins"""
+
+    name: str = ''                # Registry key, also the api_keys key
+    label: str = ''               # Display name used in reports
+    api_key_env: str = ''         # Environment variable holding the API key
+    max_concurrency: int = 4      # Parallel requests allowed against this source
+    estimated: bool = False       # Daily values are extrapolated, not measured (never stored as history)
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key or os.getenv(self.api_key_env, '')
+
+    @abstractmethod
+    async def fetch_days(self, session: aiohttp.ClientSession, latitude: float,
+                         longitude: float, start: date, end: date) -> List[DailyObservation]:
+        """Fetch normalized observations for every day in [start, end]"""
+
+    async def _get_json(self, session: aiohttp.ClientSession, url: str, params: Dict) -> Dict:
+        async with session.get(url, params=params) as response:
+            if response.status != 200:
+                raise ProviderError(f'{self.label}: HTTP {response.status}')
+            return await response.json(content_type=None)
+
+    def _observation(self, latitude: float, longitude: float, day: date, rainfall: float,
+                     temp: float, humidity: float) -> DailyObservation:
+        return DailyObservation(self.name, latitude, longitude, day,
+                                float(rainfall or 0), float(temp), float(humidity))
+
+
+PROVIDERS: Dict[str, Type[WeatherProvider]] = {}
+
+
+def register_provider(cls: Type[WeatherProvider]) -> Type[WeatherProvider]:
+    """Class decorator adding a provider to the registry"""
+    if not cls.name:
+        raise ValueError(f'{cls.__name__} has no provider name')
+    PROVIDERS[cls.name] = cls
+    return cls
+
+
+def available_providers() -> List[str]:
+    """Names of all registered providers"""
+    return list(PROVIDERS)
+
+
+@register_provider
+class VisualCrossingProvider(WeatherProvider):
+    """Visual Crossing timeline API: one request covers the whole window (days[])"""
+
+    name = 'visual_crossing'
+    label = 'VisualCrossing'
+    api_key_env = 'VISUAL_CROSSING_API_KEY'
+    url = 'https://weather.visualcrossing.com/VisualCrossingWebServices/rest/services/timeline'
+
+    async def fetch_days(self, session, latitude, longitude, start, end):
+        data = await self._get_json(
+            session,
+            f'{self.url}/{latitude},{longitude}/{start.isoformat()}/{end.isoformat()}',
+            {
+                'key': self.api_key,
+                'unitGroup': 'metric',
+                'include': 'days',
+                'elements': 'datetime,temp,precip,humidity',
+            },
+        )
+        return [
+            self._observation(latitude, longitude, date.fromisoformat(d['datetime']),
+                              d.get('precip', 0), d['temp'], d['humidity'])
+            for d in data['days']
+        ]
+
+
+@register_provider
+class WeatherApiProvider(WeatherProvider):
+    """WeatherAPI.com history API: one request per day (forecast.forecastday[0].day)"""
+
+    name = 'weather_api'
+    label = 'WeatherAPI'
+    api_key_env = 'WEATHER_API_KEY'
+    url = 'http://api.weatherapi.com/v1/history.json'
+
+    async def _fetch_day(self, session, latitude, longitude, day):
+        data = await self._get_json(session, self.url, {
+            'key': self.api_key,
+            'q': f'{latitude},{longitude}',
+            'dt': day.isoformat(),
+        })
+        d = data['forecast']['forecastday'][0]['day']
+        return self._observation(latitude, longitude, day,
+                                 d.get('totalprecip_mm', 0), d['avgtemp_c'], d['avghumidity'])
+
+    async def fetch_days(self, session, latitude, longitude, start, end):
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        return list(await asyncio.gather(
+            *(self._fetch_day(session, latitude, longitude, day) for day in days)))
+
+
+@register_provider
+class OpenWeatherMapProvider(WeatherProvider):
+    """OpenWeatherMap current weather (main / rain.1h)"""
+
+    name = 'openweathermap'
+    label = 'OpenWeatherMap'
+    api_key_env = 'OPENWEATHERMAP_API_KEY'
+    url = 'https://api.openweathermap.org/data/2.5/weather'
+    estimated = True
+
+    async def fetch_days(self, session, latitude, longitude, start, end):
+        data = await self._get_json(session, self.url, {
+            'lat': latitude,
+            'lon': longitude,
+            'appid': self.api_key,
+            'units': 'metric',
+        })
+        # Free tier has no history: current hourly rain is extrapolated to every day
+        daily_rain = data.get('rain', {}).get('1h', 0) * 24
+        temp, humidity = data['main']['temp'], data['main']['humidity']
+        return [
+            self._observation(latitude, longitude, start + timedelta(days=i),
+                              daily_rain, temp, humidity)
+            for i in range((end - start).days + 1)
+        ]
+
+
+def window(days: int = DEFAULT_WINDOW_DAYS, end: Optional[date] = None) -> Tuple[date, date]:
+    """Inclusive [start, end] date range covering the last `days` days"""
+    end = end or datetime.now().date()
+    return end - timedelta(days=days - 1), end
+
+
+def history_rows(results: Dict, today: Optional[date] = None) -> List[DailyObservation]:
+    """
+    Observations that may be stored as history from fetch_all()/fetch_observations() results
+
+    Today's total is still accumulating and the history store keeps the first value written for a
+    day, so only completed days are returned. Estimated providers are skipped entirely.
+    """
+    today = today or datetime.now().date()
+    return [o for name, result in results.items()
+            if not isinstance(result, Exception) and not PROVIDERS[name].estimated
+            for o in result if o.day < today]
+
+
+def summarize(observations: List[DailyObservation]) -> Dict:
+    """Collapse one provider's window into the 7-day totals used for consensus"""
+    if not observations:
+        raise ProviderError('No observations to summarize')
+    n = len(observations)
+    provider = PROVIDERS.get(observations[0].provider)
+    return {
+        'source': provider.label if provider else observations[0].provider,
+        'rainfall': round(sum(o.rainfall_mm for o in observations), 1),
+        'temperature': round(sum(o.temp_c for o in observations) / n, 1),
+        'humidity': round(sum(o.humidity_pct for o in observations) / n, 1),
+        'days': n,
+        'timestamp': int(time.time()),
+        'success': True,
+    }
+
+
+class ProviderClient:
+    """Shared session, cache and concurrency limits for all registered providers"""
+
+    def __init__(self, api_keys: Optional[Dict[str, str]] = None,
+                 providers: Optional[List[str]] = None,
+                 cache_ttl: float = DEFAULT_CACHE_TTL, timeout: float = DEFAULT_TIMEOUT,
+                 connection_limit: int = 32, negative_ttl: float = DEFAULT_NEGATIVE_TTL):
+        api_keys = api_keys or {}
+        names = providers or available_providers()
+        self.providers = {name: PROVIDERS[name](api_keys.get(name)) for name in names}
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.connection_limit = connection_limit
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cache: Dict[Tuple, Tuple[float, List[DailyObservation]]] = {}
+        self._limits = {name: asyncio.Semaphore(p.max_concurrency)
+                        for name, p in self.providers.items()}
+        self.flights = AsyncSingleFlight('providers', negative_ttl=negative_ttl)
+        self.requests = 0
+        self.cache_hits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def session(self) -> aiohttp.ClientSession:
+        """Pooled HTTP session (created on first use, kept alive across calls)"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def fetch(self, name: str, latitude: float, longitude: float,
+                    start: date, end: date) -> List[DailyObservation]:
+        """Fetch one provider's observations through the cache"""
+        key = (name, round(latitude, 4), round(longitude, 4), start, end)
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            self.cache_hits += 1
+            TELEMETRY.count('provider.cache_hits', provider=name)
+            return cached[1]
+        return await self.flights.do(key, self._fetch_upstream, key, latitude, longitude, start, end)
+
+    async def _fetch_upstream(self, key: Tuple, latitude: float, longitude: float,
+                              start: date, end: date) -> List[DailyObservation]:
+        name = key[0]
+        provider = self.providers[name]
+        async with self._limits[name]:
+            self.requests += 1
+            with TELEMETRY.span('provider.fetch', provider=name):
+                observations = await provider.fetch_days(self.session(), latitude, longitude, start, end)
+        self._cache[key] = (time.monotonic() + self.cache_ttl, observations)
+        return observations
+
+    async def fetch_all(self, latitude: float, longitude: float,
+                        days: int = DEFAULT_WINDOW_DAYS, end: Optional[date] = None) -> Dict:
+        """
+        Fetch every provider concurrently
+
+        Returns:
+            provider name → list of DailyObservation, or the exception it raised
+        """
+        start, end = window(days, end)
+        names = list(self.providers)
+        results = await asyncio.gather(
+            *(self.fetch(name, latitude, longitude, start, end) for name in names),
+            return_exceptions=True,
+        )
+        return dict(zip(names, results))
+
+
+def fetch_observations(latitude: float, longitude: float,
+                       api_keys: Optional[Dict[str, str]] = None,
+                       providers: Optional[List[str]] = None,
+                       days: int = DEFAULT_WINDOW_DAYS) -> Dict:
+    """
+    Blocking helper for scripts: fetch all providers concurrently
+
+    Returns:
+        provider name → list of DailyObservation, or the exception it raised
+    """
+    async def run():
+        async with ProviderClient(api_keys, providers) as client:
+            return await client.fetch_all(latitude, longitude, days)
+
+    return asyncio.run(run())
+
+
+def summarize_results(results: Dict) -> Dict:
+    """Summarize fetch_all()/fetch_observations() results per provider"""
+    summaries = {}
+    for name, result in results.items():
+        label = PROVIDERS[name].label
+        if isinstance(result, Exception):
+            summaries[name] = {'source': label, 'success': False, 'error': str(result) or repr(result)}
+        else:
+            summaries[name] = summarize(result)
+    return summaries
+
+
+def fetch_sources(latitude: float, longitude: float, api_keys: Optional[Dict[str, str]] = None,
+                  providers: Optional[List[str]] = None, days: int = DEFAULT_WINDOW_DAYS) -> Dict:
+    """
+    Blocking helper for scripts: fetch all providers and summarize each
+
+    Returns:
+        provider name → summary dict ({'success': False, 'error': ...} on failure)
+    """
+    return summarize_results(fetch_observations(latitude, longitude, api_keys, providers, days))
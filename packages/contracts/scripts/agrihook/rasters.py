@@ -0,0 +1,249 @@
+"""
+Gridded Precipitation Rasters for Agri-Hook
+Memory-mapped daily precipitation grids sampled at every farm coordinate in one vectorized pass
+
+Directory layout:
+    grid.json               shape, first pixel centre, pixel size, dtype, nodata value, scale
+    YYYY-MM-DD.bin          one raw row-major grid per day (YYYY-MM-DD.npy is also accepted)
+
+Raw grids are what `gdal_translate -of ENVI` or `cdo -outputf` style exports produce, so GeoTIFF
+and NetCDF products are converted once and from then on only memory-mapped. Sampling is bilinear
+between the four surrounding pixel centres; nodata neighbours are dropped and the remaining
+weights renormalized. Points outside the grid read NaN.
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .market_sim import weather_multipliers
+from .sharding import SEVERITY_NAMES, _round1
+
+GRID_FILE = 'grid.json'
+RAW_SUFFIX = '.bin'
+NPY_SUFFIX = '.npy'
+DEFAULT_WINDOW_DAYS = 7           # Rainfall window used by calculateWeatherMultiplier
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    """Geometry and encoding shared by every day of a raster store"""
+    rows: int
+    cols: int
+    lat0: float                   # Latitude of the centre of row 0
+    lon0: float                   # Longitude of the centre of column 0
+    lat_step: float               # Degrees per row (negative for north-up grids)
+    lon_step: float               # Degrees per column
+    dtype: str = '<f4'
+    nodata: Optional[float] = None
+    scale: float = 1.0            # Stored value × scale = millimetres
+
+    def fractional_index(self, latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Row/column positions of coordinates in pixel units"""
+        rows = (np.asarray(latitudes, dtype=np.float64) - self.lat0) / self.lat_step
+        cols = (np.asarray(longitudes, dtype=np.float64) - self.lon0) / self.lon_step
+        return rows, cols
+
+
+class PointSampler:
+    """Precomputed bilinear gather indices and weights for a fixed set of points"""
+
+    def __init__(self, spec: GridSpec, latitudes: np.ndarray, longitudes: np.ndarray):
+        rows, cols = spec.fractional_index(latitudes, longitudes)
+        self.spec = spec
+        self.size = len(rows)
+        self.inside = (rows >= 0) & (rows <= spec.rows - 1) & (cols >= 0) & (cols <= spec.cols - 1)
+
+        # Clamp the upper-left corner so the last row/column interpolates towards itself
+        r0 = np.clip(np.floor(rows), 0, max(spec.rows - 2, 0)).astype(np.int64)
+        c0 = np.clip(np.floor(cols), 0, max(spec.cols - 2, 0)).astype(np.int64)
+        fr = np.clip(rows - r0, 0, 1)
+        fc = np.clip(cols - c0, 0, 1)
+        r1 = np.minimum(r0 + 1, spec.rows - 1)
+        c1 = np.minimum(c0 + 1, spec.cols - 1)
+
+        self.indices = np.stack([r0 * spec.cols + c0, r0 * spec.cols + c1,
+                                 r1 * spec.cols + c0, r1 * spec.cols + c1], axis=1)
+        self.weights = np.stack([(1 - fr) * (1 - fc), (1 - fr) * fc,
+                                 fr * (1 - fc), fr * fc], axis=1)
+        self.indices[~self.inside] = 0
+        self.weights[~self.inside] = 0
+
+    def sample(self, grid: np.ndarray) -> np.ndarray:
+        """Bilinear values (mm) at every point for one day's grid"""
+        values = np.asarray(grid).reshape(-1)[self.indices].astype(np.float64)
+        invalid = np.isnan(values)
+        if self.spec.nodata is not None:
+            invalid |= values == self.spec.nodata
+        if not invalid.any():
+            sampled = np.einsum('ij,ij->i', values, self.weights)
+        else:
+            # Renormalize over the neighbours that have data
+            values[invalid] = 0
+            weights = np.where(invalid, 0.0, self.weights)
+            total = weights.sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sampled = np.einsum('ij,ij->i', values, weights) / total
+            sampled[total == 0] = np.nan
+        sampled[~self.inside] = np.nan
+        return sampled * self.spec.scale
+
+
+class RasterStore:
+    """Directory of daily precipitation grids sharing one GridSpec"""
+
+    def __init__(self, root: str):
+        self.root = root
+        with open(os.path.join(root, GRID_FILE)) as f:
+            self.spec = GridSpec(**json.load(f))
+
+    @classmethod
+    def create(cls, root: str, spec: GridSpec) -> 'RasterStore':
+        os.makedirs(root, exist_ok=True)
+        tmp_path = os.path.join(root, GRID_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(asdict(spec), f, indent=2)
+        os.replace(tmp_path, os.path.join(root, GRID_FILE))
+        return cls(root)
+
+    # ---- days
+
+    def _path(self, day: date) -> Optional[str]:
+        for suffix in (RAW_SUFFIX, NPY_SUFFIX):
+            path = os.path.join(self.root, day.isoformat() + suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def days(self) -> List[date]:
+        """Dates that have a grid, oldest first"""
+        found = set()
+        for name in os.listdir(self.root):
+            stem, suffix = os.path.splitext(name)
+            if suffix in (RAW_SUFFIX, NPY_SUFFIX):
+                try:
+                    found.add(date.fromisoformat(stem))
+                except ValueError:
+                    continue
+        return sorted(found)
+
+    def write_day(self, day: date, grid: np.ndarray):
+        """Store one day's grid in the raw layout (atomically replaced)"""
+        spec = self.spec
+        grid = np.asarray(grid)
+        if grid.shape != (spec.rows, spec.cols):
+            raise ValueError(f'grid shape {grid.shape} != {(spec.rows, spec.cols)}')
+        path = os.path.join(self.root, day.isoformat() + RAW_SUFFIX)
+        grid.astype(spec.dtype).tofile(path + '.tmp')
+        os.replace(path + '.tmp', path)
+
+    def open_day(self, day: date) -> np.ndarray:
+        """Read-only memory map of one day's grid"""
+        path = self._path(day)
+        if path is None:
+            raise FileNotFoundError(f'No precipitation grid for {day.isoformat()} in {self.root}')
+        spec = self.spec
+        if path.endswith(NPY_SUFFIX):
+            grid = np.load(path, mmap_mode='r')
+            if grid.shape != (spec.rows, spec.cols):
+                raise ValueError(f'{path}: shape {grid.shape} != {(spec.rows, spec.cols)}')
+            return grid
+        return np.memmap(path, dtype=spec.dtype, mode='r', shape=(spec.rows, spec.cols))
+
+    # ---- sampling
+
+    def sampler(self, latitudes: np.ndarray, longitudes: np.ndarray) -> PointSampler:
+        return PointSampler(self.spec, latitudes, longitudes)
+
+    def daily(self, sampler: PointSampler, start: date, end: date) -> np.ndarray:
+        """[day, point] millimetres for every day in [start, end]"""
+        n_days = (end - start).days + 1
+        out = np.empty((n_days, sampler.size), dtype=np.float64)
+        for i in range(n_days):
+            out[i] = sampler.sample(self.open_day(start + timedelta(days=i)))
+        return out
+
+    def window_totals(self, sampler: PointSampler, days: int = DEFAULT_WINDOW_DAYS,
+                      end: Optional[date] = None) -> np.ndarray:
+        """
+        Rainfall totals over the window, rounded like providers.summarize
+
+        A point with any unobserved day reads NaN: a gap would otherwise look like a dry day.
+        """
+        end = end or date.today()
+        start = end - timedelta(days=days - 1)
+        return _round1(self.daily(sampler, start, end).sum(axis=0))
+
+
+def severity_tiers(totals: np.ndarray) -> np.ndarray:
+    """get_drought_severity tier per total (index into SEVERITY_NAMES; -1 where NaN)"""
+    totals = np.asarray(totals, dtype=np.float64)
+    tiers = np.select([totals == 0, totals < 5, totals < 10], [3, 2, 1], 0)
+    return np.where(np.isnan(totals), -1, tiers)
+
+
+def drought_summary(totals: np.ndarray) -> Dict:
+    """Point counts per severity tier and per predicted on-chain multiplier"""
+    tiers = severity_tiers(totals)
+    observed = ~np.isnan(totals)
+    multipliers = weather_multipliers(np.where(observed, totals, 10))[observed]
+    return {
+        'points': int(len(totals)),
+        'unobserved': int((~observed).sum()),
+        'severity': {name: int((tiers == i).sum()) for i, name in enumerate(SEVERITY_NAMES)},
+        'multiplier': {int(m): int(c) for m, c in zip(*np.unique(multipliers, return_counts=True))},
+    }
+
+
+def main():
+    """Synthetic benchmark: python -m agrihook.rasters [farms] [rows] [cols]"""
+    import sys
+    import tempfile
+    import time
+
+    from .consensus import get_drought_severity
+
+    n_farms = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    cols = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    rng = np.random.default_rng(11)
+    end = date.today()
+
+    with tempfile.TemporaryDirectory() as root:
+        # Brazil-sized 0.05° grid with rain patches and a dry north
+        spec = GridSpec(rows, cols, lat0=5.0, lon0=-74.0, lat_step=-40.0 / rows, lon_step=40.0 / cols,
+                        nodata=-9999.0)
+        store = RasterStore.create(root, spec)
+        for i in range(DEFAULT_WINDOW_DAYS):
+            grid = rng.gamma(0.4, 2.0, size=(rows, cols)).astype(np.float32)
+            grid[: rows // 4] = 0
+            grid[rng.random((rows, cols)) < 0.001] = spec.nodata
+            store.write_day(end - timedelta(days=i), grid)
+
+        latitudes = rng.uniform(-35.0, 5.0, n_farms)
+        longitudes = rng.uniform(-74.0, -34.0, n_farms)
+        start = time.perf_counter()
+        sampler = store.sampler(latitudes, longitudes)
+        prepared = time.perf_counter()
+        totals = store.window_totals(sampler, end=end)
+        elapsed = time.perf_counter() - start
+
+        print(f"🌧️  {n_farms:,} farms × {DEFAULT_WINDOW_DAYS} days on a {rows}×{cols} grid")
+        print(f"   weights {1000 * (prepared - start):.0f} ms, sampling "
+              f"{1000 * (elapsed - (prepared - start)):.0f} ms, total {elapsed:.2f} s")
+        summary = drought_summary(totals)
+        print(f"   {json.dumps(summary)}")
+
+        names = np.array(SEVERITY_NAMES + ('UNOBSERVED',))[severity_tiers(totals)]
+        checked = rng.choice(n_farms, 1000, replace=False)
+        same = all(names[i] == get_drought_severity(float(totals[i]))['severity']
+                   for i in checked if not np.isnan(totals[i]))
+        print(f"   {'✅' if same else '❌'} tiers match get_drought_severity on 1,000 sampled farms")
+
+
+if __name__ == '__main__':
+    main()
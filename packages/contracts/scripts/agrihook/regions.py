@@ -0,0 +1,224 @@
+"""
+Region Hash Grid for Agri-Hook
+Native InsuranceVault.calculateRegionHash with a memory-mapped 0.1° grid table and reverse index
+
+File layout (little-endian):
+    header   magic 'AGRG', version, lat0, lon0, n_lat, n_lon, n_slots
+    hashes   n_lat × n_lon × 32-byte region hashes, row-major by latitude cell
+    slots    n_slots × uint32 open-addressing index (cell index + 1, 0 = empty)
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, Optional, Tuple
+
+from eth_utils import keccak
+
+GRID_UNITS = 100000               # 0.1° in ×1e6 coordinate units
+COORD_SCALE = 10**6               # Contracts store GPS × 1e6
+
+MAGIC = b'AGRG'
+VERSION = 1
+HEADER = struct.Struct('<4sIiiIII')
+HASH_SIZE = 32
+SLOT = struct.Struct('<I')
+
+POLICY_CREATED_TOPIC = '0x' + keccak(text='PolicyCreated(address,bytes32,uint256,uint256)').hex()
+
+# Coffee-growing coverage area used when no bounding box is given (degrees)
+DEFAULT_COVERAGE = {
+    'name': 'Brazil coffee belt',
+    'lat_min': -25.0, 'lat_max': -10.0,
+    'lon_min': -52.0, 'lon_max': -38.0,
+}
+
+
+def _trunc_div(a: int, b: int) -> int:
+    """Integer division truncating towards zero (Solidity int256 semantics)"""
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+
+def to_e6(degrees: float) -> int:
+    """Convert degrees to the contracts' ×1e6 integer encoding"""
+    return int(degrees * COORD_SCALE)
+
+
+def region_cell(latitude: int, longitude: int) -> Tuple[int, int]:
+    """0.1° cell indices for ×1e6 coordinates, rounded like calculateRegionHash"""
+    return _trunc_div(latitude, GRID_UNITS), _trunc_div(longitude, GRID_UNITS)
+
+
+def cell_hash(lat_cell: int, lon_cell: int) -> bytes:
+    """keccak256(abi.encodePacked(int256 roundedLat, int256 roundedLng)) for a cell"""
+    return keccak(
+        (lat_cell * GRID_UNITS).to_bytes(32, 'big', signed=True)
+        + (lon_cell * GRID_UNITS).to_bytes(32, 'big', signed=True)
+    )
+
+
+def calculate_region_hash(latitude: int, longitude: int) -> bytes:
+    """InsuranceVault.calculateRegionHash computed locally (coordinates × 1e6)"""
+    return cell_hash(*region_cell(latitude, longitude))
+
+
+def _slot_of(region_hash: bytes, mask: int) -> int:
+    return int.from_bytes(region_hash[:8], 'little') & mask
+
+
+def build_grid_table(path: str, lat_min: float, lat_max: float,
+                     lon_min: float, lon_max: float) -> str:
+    """
+    Precompute region hashes for every 0.1° cell in a bounding box (degrees)
+
+    Returns:
+        Path of the written table
+    """
+    lat0, lat1 = region_cell(to_e6(lat_min), 0)[0], region_cell(to_e6(lat_max), 0)[0]
+    lon0, lon1 = region_cell(0, to_e6(lon_min))[1], region_cell(0, to_e6(lon_max))[1]
+    n_lat, n_lon = lat1 - lat0 + 1, lon1 - lon0 + 1
+    n_cells = n_lat * n_lon
+
+    n_slots = 1
+    while n_slots < n_cells * 2:
+        n_slots <<= 1
+    mask = n_slots - 1
+
+    hashes = bytearray(n_cells * HASH_SIZE)
+    slots = bytearray(n_slots * SLOT.size)
+    index = 0
+    for lat_cell in range(lat0, lat1 + 1):
+        for lon_cell in range(lon0, lon1 + 1):
+            h = cell_hash(lat_cell, lon_cell)
+            hashes[index * HASH_SIZE:(index + 1) * HASH_SIZE] = h
+            slot = _slot_of(h, mask)
+            while SLOT.unpack_from(slots, slot * SLOT.size)[0]:
+                slot = (slot + 1) & mask
+            SLOT.pack_into(slots, slot * SLOT.size, index + 1)
+            index += 1
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, lat0, lon0, n_lat, n_lon, n_slots))
+        f.write(hashes)
+        f.write(slots)
+    os.replace(tmp_path, path)
+    return path
+
+
+class RegionGrid:
+    """Memory-mapped region hash table with O(1) forward and reverse lookups"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.lat0, self.lon0, self.n_lat, self.n_lon, self.n_slots = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a region grid table')
+
+        self._mask = self.n_slots - 1
+        self._hash_offset = HEADER.size
+        self._slot_offset = self._hash_offset + self.n_lat * self.n_lon * HASH_SIZE
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n_lat * self.n_lon
+
+    def _cell_at(self, index: int) -> Tuple[int, int]:
+        return self.lat0 + index // self.n_lon, self.lon0 + index % self.n_lon
+
+    def _hash_at(self, index: int) -> bytes:
+        offset = self._hash_offset + index * HASH_SIZE
+        return self._mm[offset:offset + HASH_SIZE]
+
+    def cell_hash(self, lat_cell: int, lon_cell: int) -> bytes:
+        """Region hash of a cell, falling back to keccak outside the table"""
+        i, j = lat_cell - self.lat0, lon_cell - self.lon0
+        if 0 <= i < self.n_lat and 0 <= j < self.n_lon:
+            return self._hash_at(i * self.n_lon + j)
+        return cell_hash(lat_cell, lon_cell)
+
+    def region_hash(self, latitude: int, longitude: int) -> bytes:
+        """calculateRegionHash for ×1e6 coordinates without an RPC call"""
+        return self.cell_hash(*region_cell(latitude, longitude))
+
+    def lookup(self, region_hash) -> Optional[Tuple[int, int]]:
+        """Reverse lookup: region hash (bytes or hex) → (lat_cell, lon_cell), None if unknown"""
+        if isinstance(region_hash, str):
+            region_hash = bytes.fromhex(region_hash[2:] if region_hash.startswith('0x') else region_hash)
+        region_hash = bytes(region_hash)
+
+        slot = _slot_of(region_hash, self._mask)
+        while True:
+            entry = SLOT.unpack_from(self._mm, self._slot_offset + slot * SLOT.size)[0]
+            if entry == 0:
+                return None
+            if self._hash_at(entry - 1) == region_hash:
+                return self._cell_at(entry - 1)
+            slot = (slot + 1) & self._mask
+
+    def coordinates(self, region_hash) -> Optional[Tuple[int, int]]:
+        """Reverse lookup returning the rounded (latitude, longitude) × 1e6 stored on-chain"""
+        cell = self.lookup(region_hash)
+        if cell is None:
+            return None
+        return cell[0] * GRID_UNITS, cell[1] * GRID_UNITS
+
+    def cells(self) -> Iterator[Tuple[Tuple[int, int], bytes]]:
+        """Iterate over ((lat_cell, lon_cell), region_hash) for every cell in the table"""
+        for index in range(len(self)):
+            yield self._cell_at(index), self._hash_at(index)
+
+    def decode_policy_created(self, log: Dict) -> Dict:
+        """Decode an InsuranceVault PolicyCreated log, resolving regionHash to coordinates"""
+        topics = [bytes(t) if not isinstance(t, str) else bytes.fromhex(t[2:]) for t in log['topics']]
+        data = log['data']
+        data = bytes(data) if not isinstance(data, str) else bytes.fromhex(data[2:])
+
+        region_hash = topics[2]
+        coords = self.coordinates(region_hash)
+        return {
+            'farmer': '0x' + topics[1][-20:].hex(),
+            'region_hash': '0x' + region_hash.hex(),
+            'latitude': coords[0] if coords else None,
+            'longitude': coords[1] if coords else None,
+            'coverage_amount': int.from_bytes(data[0:32], 'big'),
+            'premium_paid': int.from_bytes(data[32:64], 'big'),
+        }
+
+
+def main():
+    """Build the default coverage table and check it against the reference location"""
+    import sys
+    import time
+
+    path = sys.argv[1] if len(sys.argv) > 1 else 'region_grid.bin'
+    area = DEFAULT_COVERAGE
+
+    start = time.perf_counter()
+    build_grid_table(path, area['lat_min'], area['lat_max'], area['lon_min'], area['lon_max'])
+    print(f"✅ Built {area['name']} grid in {time.perf_counter() - start:.2f}s → {path}")
+
+    with RegionGrid(path) as grid:
+        latitude, longitude = to_e6(-18.5122), to_e6(-44.5550)
+        h = grid.region_hash(latitude, longitude)
+        print(f"   Cells: {len(grid):,} ({os.path.getsize(path):,} bytes)")
+        print(f"   Minas Gerais region hash: 0x{h.hex()}")
+        print(f"   Reverse lookup: {grid.coordinates(h)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+"""
+Compact Farm and Policy Registry for Agri-Hook
+Column arrays for InsuranceVault policies and CoffeeToken farmers, memory-mappable from disk
+
+Each field is one numpy column in the contracts' encoding: coordinates as int32 × 1e6, amounts
+as uint64, addresses and region hashes as fixed-width bytes; boolean flags are packed bitsets.
+A policy row costs 84 bytes; the same fields as a dict cost about 670.
+
+Directory layout (one file per column, so a saved registry opens without copying):
+    meta.json               kind, row count
+    <column>.npy            one array per field
+    <flag>.bits             packed bits per flag
+"""
+
+import json
+import os
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+META_FILE = 'meta.json'
+BITS_SUFFIX = '.bits'
+INITIAL_CAPACITY = 1024
+
+
+def _to_bytes(value, width: int) -> bytes:
+    """Address / bytes32 given as hex or bytes, checked against the column width"""
+    if isinstance(value, str):
+        value = bytes.fromhex(value[2:] if value.startswith('0x') else value)
+    value = bytes(value)
+    if len(value) != width:
+        raise ValueError(f'expected {width} bytes, got {len(value)}')
+    return value
+
+
+def _to_hex(value, width: int) -> str:
+    # numpy strips trailing NUL bytes from fixed-width bytes scalars
+    return '0x' + bytes(value).ljust(width, b'\0').hex()
+
+
+class Bitset:
+    """Growable packed boolean column"""
+
+    def __init__(self, data: Optional[np.ndarray] = None):
+        self.data = np.zeros(INITIAL_CAPACITY // 8, dtype=np.uint8) if data is None else data
+
+    def reserve(self, size: int):
+        needed = (size + 7) // 8
+        if needed > len(self.data):
+            grown = np.zeros(max(needed, 2 * len(self.data)), dtype=np.uint8)
+            grown[:len(self.data)] = self.data
+            self.data = grown
+
+    def __getitem__(self, row: int) -> bool:
+        return bool(self.data[row >> 3] >> (row & 7) & 1)
+
+    def set(self, rows, value: bool = True):
+        """Set (or clear) the bit of one row or an array of rows"""
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        masks = (1 << (rows & 7)).astype(np.uint8)
+        if value:
+            np.bitwise_or.at(self.data, rows >> 3, masks)
+        else:
+            np.bitwise_and.at(self.data, rows >> 3, ~masks)
+
+    def assign(self, start: int, values: np.ndarray):
+        """Write a run of booleans starting at row `start`"""
+        values = np.asarray(values, dtype=bool)
+        if not len(values):
+            return
+        rows = np.arange(start, start + len(values))
+        self.set(rows[values], True)
+        self.set(rows[~values], False)
+
+    def mask(self, size: int) -> np.ndarray:
+        """Unpacked boolean array for the first `size` rows"""
+        return np.unpackbits(self.data[:(size + 7) // 8], bitorder='little')[:size].astype(bool)
+
+
+class ColumnRegistry:
+    """Append-only column store; subclasses declare COLUMNS and FLAGS"""
+
+    KIND = ''
+    COLUMNS: Dict[str, str] = {}          # name → numpy dtype
+    FLAGS: Tuple[str, ...] = ()
+    KEY = 'farmer'                        # Column rows are looked up by
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.size = 0
+        self.columns = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.COLUMNS.items()}
+        self.flags = {name: Bitset(np.zeros((capacity + 7) // 8, dtype=np.uint8)) for name in self.FLAGS}
+        self._sorted: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self.read_only = False
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def capacity(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+    def nbytes(self) -> int:
+        """Bytes held by the live rows"""
+        row = sum(np.dtype(dtype).itemsize for dtype in self.COLUMNS.values())
+        return self.size * row + len(self.FLAGS) * ((self.size + 7) // 8)
+
+    # ---- writes
+
+    def _reserve(self, size: int):
+        if self.read_only:
+            raise ValueError('registry was opened read-only')
+        capacity = self.capacity
+        if size > capacity:
+            capacity = max(size, 2 * capacity)
+            for name, column in self.columns.items():
+                grown = np.zeros(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                self.columns[name] = grown
+        for bits in self.flags.values():
+            bits.reserve(size)
+
+    def extend(self, **values) -> np.ndarray:
+        """
+        Bulk append: one sequence per column and flag (missing flags default to False)
+
+        Returns:
+            row numbers of the new rows
+        """
+        lengths = {len(v) for v in values.values()}
+        if len(lengths) != 1:
+            raise ValueError('all columns must have the same length')
+        n = lengths.pop()
+        unknown = set(values) - set(self.COLUMNS) - set(self.FLAGS)
+        if unknown:
+            raise ValueError(f'unknown fields: {sorted(unknown)}')
+
+        start = self.size
+        self._reserve(start + n)
+        for name, dtype in self.COLUMNS.items():
+            if name in values:
+                self.columns[name][start:start + n] = _encode(values[name], dtype)
+        for name in self.FLAGS:
+            self.flags[name].assign(start, values.get(name, np.zeros(n, dtype=bool)))
+        self.size += n
+        self._sorted = None
+        return np.arange(start, start + n)
+
+    def append(self, **values) -> int:
+        return int(self.extend(**{name: [value] for name, value in values.items()})[0])
+
+    def set_flag(self, name: str, rows, value: bool = True):
+        if self.read_only:
+            raise ValueError('registry was opened read-only')
+        self.flags[name].set(rows, value)
+
+    # ---- reads
+
+    def column(self, name: str) -> np.ndarray:
+        """Live rows of a column (a view, not a copy)"""
+        return self.columns[name][:self.size]
+
+    def flag(self, name: str) -> np.ndarray:
+        return self.flags[name].mask(self.size)
+
+    def __getitem__(self, row: int) -> 'RowView':
+        if not -self.size <= row < self.size:
+            raise IndexError(row)
+        return RowView(self, row % self.size)
+
+    def __iter__(self) -> Iterator['RowView']:
+        return (RowView(self, row) for row in range(self.size))
+
+    def find(self, key) -> Optional[int]:
+        """Latest row for a key (e.g. a farmer address), or None"""
+        if self._sorted is None:
+            keys = self.column(self.KEY)
+            order = np.argsort(keys, kind='stable')
+            self._sorted = keys[order], order
+        keys, order = self._sorted
+        needle = np.array(_to_bytes(key, keys.dtype.itemsize), dtype=keys.dtype)
+        hi = np.searchsorted(keys, needle, side='right')
+        if hi == 0 or keys[hi - 1] != needle:
+            return None
+        return int(order[hi - 1])
+
+    # ---- persistence
+
+    def save(self, root: str):
+        """Write the live rows; reopen with load() without copying"""
+        os.makedirs(root, exist_ok=True)
+        for name in self.COLUMNS:
+            np.save(os.path.join(root, name + '.npy'), self.column(name))
+        for name, bits in self.flags.items():
+            bits.data[:(self.size + 7) // 8].tofile(os.path.join(root, name + BITS_SUFFIX))
+        tmp_path = os.path.join(root, META_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'kind': self.KIND, 'rows': self.size}, f)
+        os.replace(tmp_path, os.path.join(root, META_FILE))
+
+    @classmethod
+    def load(cls, root: str, mode: str = 'r'):
+        """
+        Memory-map a saved registry
+
+        Args:
+            mode: 'r' read-only, 'r+' flag updates written through to disk, 'c' copy-on-write.
+                  Appends to an 'r+' or 'c' registry move the columns into memory; save() again
+                  to persist them.
+        """
+        with open(os.path.join(root, META_FILE)) as f:
+            meta = json.load(f)
+        if meta['kind'] != cls.KIND:
+            raise ValueError(f"{root} holds a {meta['kind']} registry, not {cls.KIND}")
+        registry = cls.__new__(cls)
+        registry.size = meta['rows']
+        registry.columns = {name: np.load(os.path.join(root, name + '.npy'), mmap_mode=mode)
+                            for name in cls.COLUMNS}
+        registry.flags = {name: Bitset(np.memmap(os.path.join(root, name + BITS_SUFFIX), dtype=np.uint8,
+                                                 mode=mode, shape=((registry.size + 7) // 8,)))
+                          if registry.size else Bitset(np.zeros(0, dtype=np.uint8))
+                          for name in cls.FLAGS}
+        registry._sorted = None
+        registry.read_only = mode == 'r'
+        return registry
+
+
+def _encode(values, dtype: str) -> np.ndarray:
+    """Column values in the column's encoding (hex strings → bytes, range-checked ints)"""
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'S':
+        if isinstance(values, np.ndarray) and values.dtype == dtype:
+            return values
+        return np.array([_to_bytes(v, dtype.itemsize) for v in values], dtype=dtype)
+    array = np.asarray(values)
+    if array.dtype.kind not in 'iub':
+        array = np.array([int(v) for v in values], dtype=object)      # uint256 from web3, bools
+    if len(array):
+        info = np.iinfo(dtype)
+        if int(array.min()) < info.min or int(array.max()) > info.max:
+            raise OverflowError(f'values outside {dtype} range')
+    return array.astype(dtype)
+
+
+class RowView:
+    """Typed read-only view of one registry row"""
+
+    __slots__ = ('_registry', 'row')
+
+    def __init__(self, registry: ColumnRegistry, row: int):
+        self._registry = registry
+        self.row = row
+
+    def __getattr__(self, name: str):
+        registry = self._registry
+        if name in registry.COLUMNS:
+            value = registry.columns[name][self.row]
+            dtype = np.dtype(registry.COLUMNS[name])
+            return _to_hex(value, dtype.itemsize) if dtype.kind == 'S' else int(value)
+        if name in registry.FLAGS:
+            return registry.flags[name][self.row]
+        raise AttributeError(name)
+
+    def to_dict(self) -> Dict:
+        registry = self._registry
+        return {name: getattr(self, name) for name in (*registry.COLUMNS, *registry.FLAGS)}
+
+    def __repr__(self):
+        return f'{type(self._registry).__name__}[{self.row}]({self.to_dict()})'
+
+
+class PolicyRegistry(ColumnRegistry):
+    """InsuranceVault.FarmerPolicy rows"""
+
+    KIND = 'policies'
+    COLUMNS = {
+        'farmer': 'S20',
+        'latitude': '<i4',            # × 1e6, as stored on-chain
+        'longitude': '<i4',
+        'region_hash': 'S32',
+        'coverage': '<u8',            # USDC, 6 decimals
+        'premium': '<u8',
+        'start_time': '<u4',
+        'end_time': '<u4',
+    }
+    FLAGS = ('active', 'claimed')
+
+    def add_policy(self, farmer, policy: Sequence) -> int:
+        """Append a getPolicy(farmer) result tuple"""
+        latitude, longitude, region_hash, coverage, premium, start, end, active, claimed = policy
+        return self.append(farmer=farmer, latitude=latitude, longitude=longitude, region_hash=region_hash,
+                           coverage=coverage, premium=premium, start_time=start, end_time=end,
+                           active=active, claimed=claimed)
+
+    # ---- filters (boolean masks over all rows)
+
+    def active(self) -> np.ndarray:
+        return self.flag('active')
+
+    def unclaimed(self) -> np.ndarray:
+        return self.flag('active') & ~self.flag('claimed')
+
+    def in_region(self, region_hash) -> np.ndarray:
+        return self.column('region_hash') == np.array(_to_bytes(region_hash, 32), dtype='S32')
+
+    def in_force(self, timestamp: int) -> np.ndarray:
+        """Active policies whose [start_time, end_time] covers a timestamp"""
+        return self.active() & (self.column('start_time') <= timestamp) & (self.column('end_time') >= timestamp)
+
+    def claimable(self, region_hash, timestamp: int) -> np.ndarray:
+        """Unclaimed policies in force in a region (who claimPayout would pay for an event)"""
+        return self.unclaimed() & self.in_region(region_hash) & self.in_force(timestamp)
+
+    def total_coverage(self, mask: Optional[np.ndarray] = None) -> int:
+        coverage = self.column('coverage')
+        return int(coverage[mask].sum(dtype=np.uint64) if mask is not None else coverage.sum(dtype=np.uint64))
+
+    def by_region(self, mask: Optional[np.ndarray] = None) -> Dict[str, Tuple[int, int]]:
+        """regionHash → (policies, coverage) over the masked rows"""
+        hashes = self.column('region_hash')
+        coverage = self.column('coverage')
+        if mask is not None:
+            hashes, coverage = hashes[mask], coverage[mask]
+        unique, inverse = np.unique(hashes, return_inverse=True)
+        counts = np.bincount(inverse, minlength=len(unique))
+        totals = np.zeros(len(unique), dtype=np.uint64)
+        np.add.at(totals, inverse, coverage)
+        return {_to_hex(h, 32): (int(c), int(t))
+                for h, c, t in zip(unique, counts, totals)}
+
+
+class FarmRegistry(ColumnRegistry):
+    """CoffeeToken.FarmerInfo rows"""
+
+    KIND = 'farms'
+    COLUMNS = {
+        'farmer': 'S20',
+        'latitude': '<i4',            # × 1e6
+        'longitude': '<i4',
+        'expected_bags': '<u8',
+    }
+    FLAGS = ('registered',)
+
+    def add_farmer(self, farmer, latitude: int, longitude: int, expected_bags: int) -> int:
+        """Append a FarmerRegistered event / getFarmerLocation result"""
+        return self.append(farmer=farmer, latitude=latitude, longitude=longitude,
+                           expected_bags=expected_bags, registered=True)
+
+    def coordinates(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Latitudes and longitudes in degrees (for SpatialIndex / assign_regions)"""
+        return self.column('latitude') / 1e6, self.column('longitude') / 1e6
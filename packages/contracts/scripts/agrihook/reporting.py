@@ -0,0 +1,202 @@
+"""
+Run Reporting for Agri-Hook
+Typed step/run results with pluggable reporters (quiet, NDJSON stream, console)
+
+Test and scenario runners compute StepResult objects and hand them to a reporter. Only the
+console reporter formats text; NDJSON writes one compact JSON object per line and quiet
+writes nothing, so bulk runs skip all string formatting.
+"""
+
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+REPORTER_ENV = 'AGRIHOOK_REPORTER'   # quiet | ndjson | console (default)
+
+
+@dataclass(slots=True)
+class StepResult:
+    """Outcome of one check or scenario step"""
+    name: str
+    passed: bool
+    data: Dict = field(default_factory=dict)
+    error: Optional[str] = None
+    duration_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class RunResult:
+    """All steps of one runner invocation"""
+    suite: str
+    steps: List[StepResult]
+    metadata: Dict = field(default_factory=dict)
+    started_at: float = 0.0
+    duration_ms: float = 0.0
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for s in self.steps if s.passed)
+
+    @property
+    def total(self) -> int:
+        return len(self.steps)
+
+    @property
+    def ok(self) -> bool:
+        return self.passed == self.total
+
+    def step(self, name: str) -> Optional[StepResult]:
+        for s in self.steps:
+            if s.name == name:
+                return s
+        return None
+
+    def to_dict(self) -> Dict:
+        return {
+            'suite': self.suite,
+            'started_at': self.started_at,
+            'duration_ms': self.duration_ms,
+            'passed': self.passed,
+            'total': self.total,
+            'metadata': self.metadata,
+            'steps': [asdict(s) for s in self.steps],
+        }
+
+    def save(self, path: str):
+        """Write the run as one JSON document"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+
+class Reporter:
+    """Receives run events; the base class ignores them (quiet)"""
+
+    console = False               # True if the reporter renders human-readable text
+
+    def start(self, suite: str, metadata: Dict):
+        pass
+
+    def step(self, result: StepResult):
+        pass
+
+    def finish(self, run: RunResult):
+        pass
+
+
+QuietReporter = Reporter
+
+
+class NDJSONReporter(Reporter):
+    """One compact JSON object per event: start, step, finish"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self._suite = ''
+
+    def _write(self, obj: Dict):
+        self.stream.write(json.dumps(obj, separators=(',', ':'), default=str))
+        self.stream.write('\n')
+
+    def start(self, suite, metadata):
+        self._suite = suite
+        self._write({'event': 'start', 'suite': suite, 'metadata': metadata})
+
+    def step(self, result):
+        self._write({'event': 'step', 'suite': self._suite, 'name': result.name,
+                     'passed': result.passed, 'error': result.error,
+                     'duration_ms': result.duration_ms, 'data': result.data})
+
+    def finish(self, run):
+        self._write({'event': 'finish', 'suite': run.suite, 'passed': run.passed,
+                     'total': run.total, 'duration_ms': run.duration_ms})
+        self.stream.flush()
+
+
+class ConsoleReporter(Reporter):
+    """Human-readable output; runners register a renderer per step name"""
+
+    console = True
+
+    def __init__(self, renderers: Optional[Dict[str, Callable[[StepResult], None]]] = None,
+                 summary: Optional[Callable[[RunResult], None]] = None,
+                 header: Optional[Callable[[str, Dict], None]] = None):
+        self.renderers = renderers or {}
+        self.summary = summary
+        self.header = header
+
+    def start(self, suite, metadata):
+        if self.header is not None:
+            self.header(suite, metadata)
+
+    def step(self, result):
+        renderer = self.renderers.get(result.name)
+        if renderer is not None:
+            renderer(result)
+            return
+        status = '✅' if result.passed else '❌'
+        print(f"{status} {result.name}" + (f": {result.error}" if result.error else ''))
+        for key, value in result.data.items():
+            print(f"   {key}: {value}")
+
+    def finish(self, run):
+        if self.summary is not None:
+            self.summary(run)
+            return
+        print(f"\nTotal: {run.passed}/{run.total} passed ({run.duration_ms:.0f} ms)")
+
+
+def make_reporter(kind: Optional[str] = None, renderers: Optional[Dict] = None,
+                  summary: Optional[Callable] = None, header: Optional[Callable] = None) -> Reporter:
+    """Reporter by name, defaulting to $AGRIHOOK_REPORTER or console"""
+    kind = (kind or os.getenv(REPORTER_ENV) or 'console').lower()
+    if kind == 'quiet':
+        return QuietReporter()
+    if kind in ('ndjson', 'jsonl', 'json'):
+        return NDJSONReporter()
+    if kind == 'console':
+        return ConsoleReporter(renderers, summary, header)
+    raise ValueError(f'Unknown reporter: {kind}')
+
+
+class Run:
+    """Collects step results for one suite and forwards them to a reporter"""
+
+    def __init__(self, suite: str, reporter: Optional[Reporter] = None, **metadata):
+        self.suite = suite
+        self.reporter = reporter or Reporter()
+        self.metadata = metadata
+        self.steps: List[StepResult] = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.reporter.start(suite, metadata)
+
+    def add(self, name: str, passed: bool = True, data: Optional[Dict] = None,
+            error: Optional[str] = None, duration_ms: float = 0.0) -> StepResult:
+        """Record an already computed step"""
+        result = StepResult(name, bool(passed), data or {}, error, duration_ms)
+        self.steps.append(result)
+        self.reporter.step(result)
+        return result
+
+    def step(self, name: str, fn: Callable, *args, **kwargs) -> StepResult:
+        """
+        Run fn(*args, **kwargs) as a step. fn returns a data dict, or (passed, data);
+        an exception fails the step.
+        """
+        start = time.perf_counter()
+        try:
+            outcome = fn(*args, **kwargs)
+        except Exception as e:
+            return self.add(name, False, {}, str(e) or repr(e), (time.perf_counter() - start) * 1000)
+        passed, data = outcome if isinstance(outcome, tuple) else (True, outcome)
+        return self.add(name, passed, data, None, (time.perf_counter() - start) * 1000)
+
+    def finish(self, **metadata) -> RunResult:
+        self.metadata.update(metadata)
+        run = RunResult(self.suite, self.steps, self.metadata, self.started_at,
+                        round((time.perf_counter() - self._start) * 1000, 3))
+        self.reporter.finish(run)
+        return run
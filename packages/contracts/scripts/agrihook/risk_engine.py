@@ -0,0 +1,206 @@
+"""
+Region Risk Engine for Agri-Hook
+Incremental, region-vectorized current/historical risk scores for InsuranceVault.updateRegionRisk
+
+Every day each region gets the drought tier calculateWeatherMultiplier would assign to its
+trailing 7-day consensus rainfall. A window of tiers scores
+
+    risk = (50 × drought_days + Σ(multiplier - 100)) / observed_days
+
+so drought frequency and severity each contribute half of the 0-100 range
+(every day a severe drought = 100).
+"""
+
+from datetime import date, timedelta
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .market_sim import weather_multipliers
+from .regions import cell_hash
+
+RAIN_WINDOW_DAYS = 7              # calculateWeatherMultiplier uses 7-day rainfall
+MIN_WINDOW_DAYS = 5               # Observed days needed to extrapolate a 7-day total
+CURRENT_WINDOW_DAYS = 30          # currentRiskScore lookback
+HISTORICAL_WINDOW_DAYS = 3 * 365  # historicalRiskScore lookback
+DROUGHT_WEIGHT = 50               # Score points for drought frequency
+MAX_RISK = 100                    # updateRegionRisk rejects scores above 100
+
+UNKNOWN = -1                      # Tier slot with no rainfall window
+
+
+class RiskEngine:
+    """Sliding-window drought statistics for every region, updated one day at a time"""
+
+    def __init__(self, n_regions: int = 0, current_days: int = CURRENT_WINDOW_DAYS,
+                 historical_days: int = HISTORICAL_WINDOW_DAYS):
+        if current_days > historical_days:
+            raise ValueError('Current window cannot be longer than the historical window')
+        self.current_days = current_days
+        self.historical_days = historical_days
+        self.last_day: Optional[date] = None
+        self._pos = 0                                   # Next slot in the tier ring
+        self._resize(n_regions)
+
+    def _resize(self, n_regions: int):
+        """Grow every per-region array to n_regions (new regions start with no history)"""
+        old = getattr(self, 'n_regions', 0)
+        if old and n_regions <= old:
+            return
+        grow = n_regions - old
+
+        def extend(array, fill, axis):
+            pad = [(0, 0)] * array.ndim
+            pad[axis] = (0, grow)
+            return np.pad(array, pad, constant_values=fill)
+
+        if not old:
+            self._rain = np.full((RAIN_WINDOW_DAYS, n_regions), np.nan, dtype=np.float32)
+            self._excess = np.full((self.historical_days, n_regions), UNKNOWN, dtype=np.int16)
+            self._counts = np.zeros((2, 3, n_regions), dtype=np.int32)   # window × (observed, drought, excess)
+            self.published = np.zeros((2, n_regions), dtype=np.int16)    # On-chain (current, historical)
+        else:
+            self._rain = extend(self._rain, np.nan, 1)
+            self._excess = extend(self._excess, UNKNOWN, 1)
+            self._counts = extend(self._counts, 0, 2)
+            self.published = extend(self.published, 0, 1)
+        self.n_regions = n_regions
+
+    # ------------------------------------------------------------------ updates
+
+    def update(self, rainfall: np.ndarray, day: Optional[date] = None):
+        """
+        Add one day of consensus rainfall (mm, NaN = not observed) for regions 0..len-1
+        """
+        rainfall = np.asarray(rainfall, dtype=np.float32)
+        if len(rainfall) > self.n_regions:
+            self._resize(len(rainfall))
+        today = np.full(self.n_regions, np.nan, dtype=np.float32)
+        today[:len(rainfall)] = rainfall
+
+        # Trailing 7-day total, extrapolated over missing days
+        self._rain[self._pos % RAIN_WINDOW_DAYS] = today
+        observed = (~np.isnan(self._rain)).sum(axis=0)
+        total = np.nansum(self._rain, axis=0) * RAIN_WINDOW_DAYS / np.maximum(observed, 1)
+        known = observed >= MIN_WINDOW_DAYS
+        excess = np.where(known, weather_multipliers(np.where(known, total, 0)) - 100, UNKNOWN)
+
+        slot = self._pos % self.historical_days
+        for window, days in enumerate((self.current_days, self.historical_days)):
+            if self._pos >= days:
+                self._count(window, self._excess[(self._pos - days) % self.historical_days], -1)
+        self._excess[slot] = excess
+        for window in (0, 1):
+            self._count(window, excess, 1)
+
+        self._pos += 1
+        if day is not None:
+            self.last_day = day
+        elif self.last_day is not None:
+            self.last_day += timedelta(days=1)
+
+    def _count(self, window: int, excess: np.ndarray, sign: int):
+        counts = self._counts[window]
+        valid = excess != UNKNOWN
+        counts[0] += sign * valid
+        counts[1] += sign * (excess > 0)
+        counts[2] += sign * np.where(valid, excess, 0)
+
+    def update_many(self, rainfall: np.ndarray, start: Optional[date] = None):
+        """Add consecutive days of rainfall, array of shape [day, region]"""
+        for i, day_rainfall in enumerate(rainfall):
+            self.update(day_rainfall, start + timedelta(days=i) if start else None)
+
+    def sync(self, store, end: Optional[date] = None, chunk_days: int = 90) -> int:
+        """
+        Consume every day in a HistoryStore after last_day (up to `end`)
+
+        Returns:
+            Number of days added
+        """
+        days = store.days()
+        if not days:
+            return 0
+        start = self.last_day + timedelta(days=1) if self.last_day else days[0]
+        end = end or days[-1]
+        added = 0
+        while start <= end:
+            stop = min(start + timedelta(days=chunk_days - 1), end)
+            _, rainfall = store.consensus(start, stop)
+            self.update_many(rainfall, start)
+            added += len(rainfall)
+            start = stop + timedelta(days=1)
+        return added
+
+    # ------------------------------------------------------------------ scores
+
+    def scores(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(currentRiskScore, historicalRiskScore) per region; -1 where nothing was observed"""
+        result = []
+        for observed, drought, excess in self._counts:
+            score = (DROUGHT_WEIGHT * drought + excess) / np.maximum(observed, 1)
+            score = np.clip(np.rint(score), 0, MAX_RISK).astype(np.int16)
+            result.append(np.where(observed > 0, score, -1).astype(np.int16))
+        return result[0], result[1]
+
+    def changed(self, min_delta: int = 1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Regions whose scores moved at least min_delta from the published values
+
+        Returns:
+            (region_ids, current, historical)
+        """
+        current, historical = self.scores()
+        scored = (current >= 0) & (historical >= 0)
+        moved = (np.abs(current - self.published[0]) >= min_delta) | \
+            (np.abs(historical - self.published[1]) >= min_delta)
+        ids = np.flatnonzero(scored & moved)
+        return ids, current[ids], historical[ids]
+
+    def pending_updates(self, cells: np.ndarray, min_delta: int = 1) -> List[Tuple[bytes, int, int]]:
+        """
+        updateRegionRisk(regionHash, currentRisk, historicalRisk) arguments for changed regions
+
+        Args:
+            cells: (lat_cell, lon_cell) per region id, e.g. HistoryStore.regions
+        """
+        ids, current, historical = self.changed(min_delta)
+        return [
+            (cell_hash(int(cells[i][0]), int(cells[i][1])), int(c), int(h))
+            for i, c, h in zip(ids.tolist(), current.tolist(), historical.tolist())
+        ]
+
+    def mark_published(self, region_ids: Sequence[int],
+                       current: Optional[Sequence[int]] = None,
+                       historical: Optional[Sequence[int]] = None):
+        """Record scores as on-chain (defaults to the engine's current scores)"""
+        region_ids = np.asarray(region_ids, dtype=np.int64)
+        if current is None or historical is None:
+            scores = self.scores()
+            current, historical = scores[0][region_ids], scores[1][region_ids]
+        self.published[0, region_ids] = current
+        self.published[1, region_ids] = historical
+
+    # ------------------------------------------------------------------ persistence
+
+    def save(self, path: str):
+        """Write the engine state so the next run only processes new days"""
+        np.savez(path, rain=self._rain, excess=self._excess, counts=self._counts,
+                 published=self.published,
+                 meta=np.array([self.current_days, self.historical_days, self._pos,
+                                self.last_day.toordinal() if self.last_day else 0], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: str) -> 'RiskEngine':
+        """Restore an engine written by save()"""
+        with np.load(path) as data:
+            current_days, historical_days, pos, last_day = data['meta'].tolist()
+            engine = cls(0, current_days, historical_days)
+            engine._rain = data['rain']
+            engine._excess = data['excess']
+            engine._counts = data['counts']
+            engine.published = data['published']
+        engine.n_regions = engine._rain.shape[1]
+        engine._pos = pos
+        engine.last_day = date.fromordinal(last_day) if last_day else None
+        return engine
@@ -0,0 +1,247 @@
+"""
+Multi-RPC Provider Pool for Agri-Hook
+Web3 provider spreading reads over several RPC endpoints, scored by latency and error rate
+
+Reads go to the healthy endpoint with the best score (adjusted for requests already in
+flight) and fail over to the next one on transport errors or rate limiting. Raw transactions
+are broadcast to every healthy endpoint. Endpoints that keep failing are benched with an
+exponential back-off and retried once it expires. Identical concurrent reads are coalesced
+into one upstream request.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Sequence
+
+from web3 import Web3
+from web3.providers import JSONBaseProvider
+
+from .singleflight import SingleFlight
+from .telemetry import TELEMETRY
+
+BROADCAST_METHODS = {'eth_sendRawTransaction'}
+COALESCED_METHODS = {             # Idempotent reads safe to share between concurrent callers
+    'eth_blockNumber', 'eth_chainId', 'net_version', 'eth_gasPrice', 'eth_maxPriorityFeePerGas',
+    'eth_feeHistory', 'eth_call', 'eth_estimateGas', 'eth_getBalance', 'eth_getCode',
+    'eth_getStorageAt', 'eth_getTransactionCount', 'eth_getTransactionReceipt',
+    'eth_getTransactionByHash', 'eth_getBlockByNumber', 'eth_getBlockByHash', 'eth_getLogs',
+}
+RETRYABLE_ERROR_CODES = {-32005, 429}   # Limit exceeded / too many requests
+RETRYABLE_ERROR_TEXT = ('rate limit', 'too many requests', 'limit exceeded', 'header not found')
+
+LATENCY_ALPHA = 0.2               # EWMA weight of the newest latency sample
+ERROR_ALPHA = 0.1                 # EWMA weight of the newest success/failure
+ERROR_PENALTY = 20                # Score multiplier per unit of error rate
+MAX_CONSECUTIVE_FAILURES = 3      # Failures before an endpoint is benched
+BENCH_SECONDS = 5.0               # First bench period, doubled per further failure
+MAX_BENCH_SECONDS = 120.0
+DEFAULT_TIMEOUT = 10
+NEGATIVE_TTL = 1.0                # Seconds a failed read is replayed to identical callers
+
+
+class NoHealthyEndpoint(Exception):
+    """Raised when every endpoint failed a request"""
+
+
+class Endpoint:
+    """One RPC URL with its health statistics"""
+
+    def __init__(self, url: str, timeout: float = DEFAULT_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        self.provider = Web3.HTTPProvider(url, request_kwargs={'timeout': timeout})
+        self.latency = None           # EWMA seconds
+        self.error_rate = 0.0         # EWMA of failures
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.consecutive_failures = 0
+        self.benched_until = 0.0
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.benched_until
+
+    def score(self) -> float:
+        """Expected cost of the next request (lower is better)"""
+        if self.latency is not None:
+            latency = self.latency
+        else:
+            # Untried endpoints go first; one that has only ever failed is assumed to time out
+            latency = float(self.timeout) if self.errors else 0.0
+        return latency * (1 + ERROR_PENALTY * self.error_rate) * (1 + self.in_flight)
+
+    def record(self, ok: bool, elapsed: float, now: float):
+        self.requests += 1
+        if ok:
+            self.latency = elapsed if self.latency is None else \
+                LATENCY_ALPHA * elapsed + (1 - LATENCY_ALPHA) * self.latency
+            self.error_rate *= 1 - ERROR_ALPHA
+            self.consecutive_failures = 0
+            self.benched_until = 0.0
+        else:
+            self.errors += 1
+            self.error_rate = ERROR_ALPHA + (1 - ERROR_ALPHA) * self.error_rate
+            self.consecutive_failures += 1
+            if self.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
+                extra = self.consecutive_failures - MAX_CONSECUTIVE_FAILURES
+                self.benched_until = now + min(BENCH_SECONDS * 2 ** extra, MAX_BENCH_SECONDS)
+
+    def metrics(self, now: float) -> Dict:
+        return {
+            'url': self.url,
+            'healthy': self.healthy(now),
+            'latency_ms': round(self.latency * 1000, 2) if self.latency is not None else None,
+            'error_rate': round(self.error_rate, 4),
+            'requests': self.requests,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'score': round(self.score(), 6),
+        }
+
+
+def _retryable(response: Dict) -> bool:
+    """True if an RPC error response is the node's fault rather than the request's"""
+    error = response.get('error') if isinstance(response, dict) else None
+    if not error:
+        return False
+    message = str(error.get('message', '')).lower() if isinstance(error, dict) else str(error).lower()
+    code = error.get('code') if isinstance(error, dict) else None
+    return code in RETRYABLE_ERROR_CODES or any(text in message for text in RETRYABLE_ERROR_TEXT)
+
+
+def _batch_retryable(responses) -> bool:
+    return isinstance(responses, dict) and 'error' in responses or any(_retryable(r) for r in responses)
+
+
+class RPCPool(JSONBaseProvider):
+    """Web3 provider over several RPC endpoints with health scoring and failover"""
+
+    def __init__(self, urls: Sequence[str], timeout: float = DEFAULT_TIMEOUT,
+                 negative_ttl: float = NEGATIVE_TTL, **kwargs):
+        if not urls:
+            raise ValueError('RPCPool needs at least one endpoint')
+        super().__init__(**kwargs)
+        self.endpoints = [Endpoint(url, timeout) for url in urls]
+        self._lock = threading.Lock()
+        self._broadcaster = ThreadPoolExecutor(max_workers=len(self.endpoints),
+                                               thread_name_prefix='rpc-broadcast')
+        self.flights = SingleFlight('rpc', negative_ttl=negative_ttl)
+        self.failovers = 0
+
+    @classmethod
+    def from_env(cls, default: str, variable: str = 'COSTON2_RPC_URLS', **kwargs) -> 'RPCPool':
+        """Endpoints from a comma-separated environment variable, falling back to one URL"""
+        urls = [u.strip() for u in os.getenv(variable, '').split(',') if u.strip()]
+        return cls(urls or [default], **kwargs)
+
+    def __str__(self):
+        return f"RPCPool({', '.join(e.url for e in self.endpoints)})"
+
+    # ------------------------------------------------------------------ selection
+
+    def _ranked(self) -> List[Endpoint]:
+        """Healthy endpoints best-first, then benched ones as a last resort"""
+        now = time.monotonic()
+        with self._lock:
+            healthy = sorted((e for e in self.endpoints if e.healthy(now)), key=Endpoint.score)
+            benched = sorted((e for e in self.endpoints if not e.healthy(now)),
+                             key=lambda e: e.benched_until)
+        return healthy + benched
+
+    def _call(self, endpoint: Endpoint, method, params) -> Dict:
+        """Send one request, updating the endpoint's statistics"""
+        return self._timed(endpoint, method, lambda: endpoint.provider.make_request(method, params))
+
+    def _timed(self, endpoint: Endpoint, method: str, send):
+        with self._lock:
+            endpoint.in_flight += 1
+        start = time.monotonic()
+        ok = False
+        try:
+            with TELEMETRY.span('rpc.request', method=method, endpoint=endpoint.url):
+                response = send()
+            ok = not _batch_retryable(response) if isinstance(response, list) else not _retryable(response)
+            return response
+        finally:
+            now = time.monotonic()
+            with self._lock:
+                endpoint.in_flight -= 1
+                endpoint.record(ok, now - start, now)
+
+    # ------------------------------------------------------------------ provider API
+
+    def make_request(self, method, params):
+        if method in BROADCAST_METHODS:
+            return self._broadcast(method, params)
+        if method in COALESCED_METHODS:
+            key = (method, json.dumps(params, sort_keys=True, default=str))
+            return dict(self.flights.do(key, self._failover, method, params))
+        return self._failover(method, params)
+
+    def make_batch_request(self, requests):
+        """Send a JSON-RPC batch to one endpoint; the whole batch fails over together"""
+        return self._failover('batch', requests,
+                              lambda e: e.provider.make_batch_request(requests), _batch_retryable)
+
+    def _failover(self, method, params, send=None, retryable=_retryable):
+        """Try endpoints best-first until one gives a non-retryable response"""
+        last_error: Optional[BaseException] = None
+        last_response = None
+        for attempt, endpoint in enumerate(self._ranked()):
+            if attempt:
+                self.failovers += 1
+                TELEMETRY.count('rpc.failovers', method=method)
+            try:
+                response = self._timed(endpoint, method, lambda: send(endpoint)) if send \
+                    else self._call(endpoint, method, params)
+            except Exception as e:
+                last_error = e
+                continue
+            if not retryable(response):
+                return response
+            last_response = response
+        if last_response is not None:
+            return last_response
+        raise NoHealthyEndpoint(f'{method} failed on every endpoint: {last_error}') from last_error
+
+    def _broadcast(self, method, params):
+        """Send to every healthy endpoint; the first accepted response wins"""
+        now = time.monotonic()
+        targets = [e for e in self.endpoints if e.healthy(now)] or self._ranked()[:1]
+        futures = [self._broadcaster.submit(self._call, e, method, params) for e in targets]
+
+        first_error_response = None
+        last_error: Optional[BaseException] = None
+        for future in as_completed(futures):
+            try:
+                response = future.result()
+            except Exception as e:
+                last_error = e
+                continue
+            if 'error' not in response:
+                return response
+            first_error_response = first_error_response or response
+        if first_error_response is not None:
+            return first_error_response
+        raise NoHealthyEndpoint(f'{method} failed on every endpoint: {last_error}') from last_error
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return any(e.provider.is_connected() for e in self._ranked())
+
+    def close(self):
+        self._broadcaster.shutdown(wait=False)
+
+    # ------------------------------------------------------------------ metrics
+
+    def metrics(self) -> Dict:
+        """Per-endpoint health, latency and error statistics"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                'failovers': self.failovers,
+                'coalescing': self.flights.totals(),
+                'endpoints': [e.metrics(now) for e in self.endpoints],
+            }
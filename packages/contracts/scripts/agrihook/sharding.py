@@ -0,0 +1,305 @@
+"""
+Sharded Region Pipeline for Agri-Hook
+Consensus, drought tier, premium quote and WeatherData encoding for every region on a process pool
+
+Regions are assigned to shards by their calculateRegionHash, so a region always lands on the
+same shard. The observation block (HistoryStore.scan layout [day, region, provider, field]) is
+copied once into shared memory with its regions grouped by shard, so every shard is a contiguous
+region range; workers map that range as a view, compute it and write straight into the matching
+range of a shared structured result array, which the caller scatters back into input order.
+"""
+
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .contract_math import (
+    BASE_PREMIUM_RATE,
+    BASIS_POINTS,
+    DROUGHT_RAINFALL_THRESHOLD,
+    RISK_DAMPENING_FACTOR,
+    WEATHER_EVENT_DROUGHT,
+    WEATHER_EVENT_NONE,
+    utilization_multiplier,
+)
+from .market_sim import weather_multipliers
+from .regions import GRID_UNITS, cell_hash
+
+CONSENSUS_TOLERANCE = 0.2         # calculate_consensus: readings within 20% of the median
+MIN_SOURCES = 2
+WEATHER_DATA_SIZE = 6 * 32        # abi.encode(WeatherData): six 32-byte words
+SHARDS_PER_WORKER = 4             # More shards than workers keeps the pool balanced
+
+SEVERITY_NAMES = ('NORMAL', 'MILD', 'MODERATE', 'SEVERE')
+
+RESULT_DTYPE = np.dtype([
+    ('valid', np.bool_),                  # At least MIN_SOURCES providers reported
+    ('sources', np.int8),
+    ('rainfall', np.float64),             # Consensus 7-day total (mm, 0.1 resolution)
+    ('temperature', np.float64),
+    ('humidity', np.float64),
+    ('agreement', np.bool_),              # calculate_consensus 'consensus' flag
+    ('multiplier', np.int16),             # WeatherOracle.calculateWeatherMultiplier
+    ('severity', np.int8),                # Index into SEVERITY_NAMES
+    ('event_type', np.int8),
+    ('premium', np.int64),                # InsuranceVault.calculatePremium for `coverage`
+    ('weather_data', np.uint8, WEATHER_DATA_SIZE),
+])
+
+
+class SharedArray:
+    """numpy array backed by a named shared-memory block"""
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple, dtype, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.array = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, shape: Tuple, dtype) -> 'SharedArray':
+        size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        return cls(shared_memory.SharedMemory(create=True, size=size), shape, dtype, owner=True)
+
+    @classmethod
+    def copy_of(cls, array: np.ndarray) -> 'SharedArray':
+        shared = cls.create(array.shape, array.dtype)
+        shared.array[...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spec: Tuple) -> 'SharedArray':
+        name, shape, dtype = spec
+        return cls(shared_memory.SharedMemory(name=name), shape, dtype, owner=False)
+
+    @property
+    def spec(self) -> Tuple:
+        """Picklable handle for attach() in another process"""
+        return self.shm.name, self.array.shape, self.array.dtype
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def shard_of(region_hashes: Sequence[bytes], shards: int) -> np.ndarray:
+    """Shard index of each region: first 8 bytes of its region hash modulo `shards`"""
+    return np.fromiter((int.from_bytes(h[:8], 'big') % shards for h in region_hashes),
+                       dtype=np.int64, count=len(region_hashes))
+
+
+_round_py = np.frompyfunc(lambda v: round(v, 1), 1, 1)
+
+
+def _round1(values: np.ndarray) -> np.ndarray:
+    """Python round(v, 1) elementwise (np.round differs on values near .x5, which can cross a tier)"""
+    return _round_py(values).astype(np.float64)
+
+
+def encode_weather_data(rainfall: int, temperature: int, soil_moisture: int,
+                        latitude: int, longitude: int, timestamp: int) -> bytes:
+    """abi.encode(WeatherOracle.WeatherData) without an ABI library"""
+    return b''.join(v.to_bytes(32, 'big', signed=True) for v in
+                    (rainfall, temperature, soil_moisture, latitude, longitude, timestamp))
+
+
+def process_regions(observations: np.ndarray, cells: np.ndarray, risk: np.ndarray,
+                    out: np.ndarray, coverage: int, premium_multiplier: int, timestamp: int):
+    """
+    Run the pipeline for a set of regions
+
+    Args:
+        observations: [day, region, provider, field] float32 (rainfall_mm, temp_c, humidity_pct)
+        cells: [region, 2] lat/lon 0.1° cells
+        risk: [region, 2] current/historical risk scores (0-100)
+        out: RESULT_DTYPE array of the same region count, written in place
+    """
+    observations = observations.astype(np.float64)                 # Python floats in calculate_consensus
+    rain = observations[..., 0]
+    reported = ~np.isnan(rain).all(axis=0)                          # [region, provider]
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)     # All-NaN slices: regions without data
+        sources = reported.sum(axis=1)
+        valid = sources >= MIN_SOURCES
+
+        # Per-provider 7-day summaries, rounded like providers.summarize
+        totals = _round1(np.where(reported, np.nansum(rain, axis=0), np.nan))
+        temps = _round1(np.where(reported, np.nanmean(observations[..., 1], axis=0), np.nan))
+        humidity = _round1(np.where(reported, np.nanmean(observations[..., 2], axis=0), np.nan))
+
+        median_rain = _round1(np.nanmedian(totals, axis=1))
+        median_temp = _round1(np.nanmedian(temps, axis=1))
+        median_humidity = _round1(np.nanmedian(humidity, axis=1))
+        raw_median = np.nanmedian(totals, axis=1)
+        deviation = np.abs(totals - raw_median[:, None]) / (raw_median[:, None] + 0.1)
+        agreement = np.where(reported, deviation <= CONSENSUS_TOLERANCE, True).all(axis=1)
+
+    rainfall = np.nan_to_num(median_rain)
+    multiplier = weather_multipliers(rainfall)
+    contract_rain = np.floor(rainfall).astype(np.int64)
+
+    base_premium = (coverage * BASE_PREMIUM_RATE) // BASIS_POINTS
+    risk_multiplier = 100 + (risk[:, 0].astype(np.int64) + risk[:, 1]) // RISK_DAMPENING_FACTOR
+    premium = ((base_premium * risk_multiplier) // 100 * premium_multiplier) // 100
+
+    out['valid'] = valid
+    out['sources'] = sources
+    out['rainfall'] = np.where(valid, rainfall, np.nan)
+    out['temperature'] = np.where(valid, median_temp, np.nan)
+    out['humidity'] = np.where(valid, median_humidity, np.nan)
+    out['agreement'] = agreement & valid
+    out['multiplier'] = multiplier
+    out['severity'] = np.select([multiplier == 150, multiplier == 130, multiplier == 115], [3, 2, 1], 0)
+    out['event_type'] = np.where(contract_rain < DROUGHT_RAINFALL_THRESHOLD,
+                                 WEATHER_EVENT_DROUGHT, WEATHER_EVENT_NONE)
+    out['premium'] = premium
+
+    # WeatherData fields as build_weather_data sets them (latitude/longitude: cell origin)
+    encoded = out['weather_data']
+    encoded[~valid] = 0                                             # `out` may be uninitialised memory
+    for i in np.flatnonzero(valid):
+        encoded[i] = np.frombuffer(encode_weather_data(
+            int(rainfall[i] * 100), int(median_temp[i] * 100), 0,
+            int(cells[i, 0]) * GRID_UNITS, int(cells[i, 1]) * GRID_UNITS, timestamp), dtype=np.uint8)
+
+
+def _run_shard(obs_spec: Tuple, out_spec: Tuple, start: int, stop: int, cells: np.ndarray,
+               risk: np.ndarray, params: Dict) -> int:
+    """Worker entry point: map shared inputs/outputs and process regions [start, stop) in place"""
+    observations = SharedArray.attach(obs_spec)
+    results = SharedArray.attach(out_spec)
+    try:
+        process_regions(observations.array[:, start:stop], cells, risk, results.array[start:stop], **params)
+    finally:
+        observations.close()
+        results.close()
+    return stop - start
+
+
+class ShardedExecutor:
+    """Process pool running process_regions over hash-partitioned region shards"""
+
+    def __init__(self, workers: Optional[int] = None, shards: Optional[int] = None):
+        """
+        Args:
+            workers: Pool size (default: CPU count); 0 runs every shard in this process
+            shards: Number of hash partitions (default: workers × SHARDS_PER_WORKER)
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.shards = shards or max(self.workers, 1) * SHARDS_PER_WORKER
+        self._pool = ProcessPoolExecutor(self.workers) if self.workers else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def run(self, observations: np.ndarray, cells: np.ndarray, risk: Optional[np.ndarray] = None,
+            coverage: int = 5000 * 10**6, total_coverage: int = 0, treasury_balance: int = 0,
+            timestamp: Optional[int] = None, region_hashes: Optional[Sequence[bytes]] = None) -> np.ndarray:
+        """
+        Process every region
+
+        Args:
+            observations: [day, region, provider, field] float32 (HistoryStore.scan output)
+            cells: [region, 2] int lat/lon cells (HistoryStore.regions)
+            risk: [region, 2] current/historical scores (RiskEngine.scores() stacked), default 0
+            coverage: Coverage amount to quote (6 decimals)
+            total_coverage, treasury_balance: Vault totals for the utilization multiplier
+            region_hashes: Precomputed calculateRegionHash values (computed from cells if omitted)
+
+        Returns:
+            RESULT_DTYPE array in region order
+        """
+        n_regions = observations.shape[1]
+        cells = np.asarray(cells, dtype=np.int64)
+        risk = np.zeros((n_regions, 2), dtype=np.int64) if risk is None else np.asarray(risk, dtype=np.int64)
+        if region_hashes is None:
+            region_hashes = [cell_hash(int(a), int(b)) for a, b in cells]
+        params = {
+            'coverage': int(coverage),
+            'premium_multiplier': utilization_multiplier(total_coverage, treasury_balance),
+            'timestamp': int(time.time()) if timestamp is None else int(timestamp),
+        }
+        shard_ids = shard_of(region_hashes, self.shards)
+        shards = [np.flatnonzero(shard_ids == s) for s in range(self.shards)]
+
+        if self._pool is None:
+            out = np.zeros(n_regions, dtype=RESULT_DTYPE)
+            for indices in shards:
+                block = np.empty(len(indices), dtype=RESULT_DTYPE)
+                process_regions(observations[:, indices], cells[indices], risk[indices], block, **params)
+                out[indices] = block
+            return out
+
+        # Group regions by shard while filling shared memory: each shard is then a slice, not a gather
+        order = np.argsort(shard_ids, kind='stable')
+        bounds = np.searchsorted(shard_ids[order], np.arange(self.shards + 1))
+        shared_obs = SharedArray.create(observations.shape, np.float32)
+        np.take(np.asarray(observations, dtype=np.float32), order, axis=1, out=shared_obs.array)
+        shared_out = SharedArray.create((n_regions,), RESULT_DTYPE)
+        try:
+            futures = [self._pool.submit(_run_shard, shared_obs.spec, shared_out.spec, int(start), int(stop),
+                                         cells[order[start:stop]], risk[order[start:stop]], params)
+                       for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+            for future in futures:
+                future.result()
+            out = np.empty(n_regions, dtype=RESULT_DTYPE)
+            out[order] = shared_out.array
+            return out
+        finally:
+            shared_obs.close()
+            shared_out.close()
+
+
+def severity_names(results: np.ndarray) -> List[str]:
+    return [SEVERITY_NAMES[s] for s in results['severity']]
+
+
+def main():
+    """Scaling benchmark on synthetic data: python -m agrihook.sharding [regions] [workers...]"""
+    import sys
+
+    n_regions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    worker_counts = [int(w) for w in sys.argv[2:]] or sorted({0, 1, 2, os.cpu_count() or 1})
+    rng = np.random.default_rng(7)
+    observations = rng.gamma(0.6, 3.0, size=(7, n_regions, 3, 3)).astype(np.float32)
+    observations[..., 1] = rng.normal(24, 3, size=(7, n_regions, 3))
+    observations[..., 2] = rng.uniform(30, 90, size=(7, n_regions, 3))
+    observations[:, rng.random(n_regions) < 0.05, 2] = np.nan
+    cells = np.stack([rng.integers(-250, -150, n_regions), rng.integers(-500, -400, n_regions)], axis=1)
+    hashes = [cell_hash(int(a), int(b)) for a, b in cells]
+    risk = rng.integers(0, 101, size=(n_regions, 2))
+
+    print(f"🌍 {n_regions:,} regions × 7 days × 3 providers ({os.cpu_count()} CPUs)")
+    baseline = None
+    reference = None
+    for workers in worker_counts:
+        with ShardedExecutor(workers) as executor:
+            executor.run(observations[:, :64], cells[:64], risk[:64], region_hashes=hashes[:64])  # warm the pool
+            start = time.perf_counter()
+            results = executor.run(observations, cells, risk, timestamp=0, region_hashes=hashes)
+            elapsed = time.perf_counter() - start
+        if reference is None:
+            reference = results
+        same = np.array_equal(results.view(np.uint8), reference.view(np.uint8))
+        baseline = baseline or elapsed
+        label = 'in-process' if workers == 0 else f'{workers} worker(s)'
+        print(f"   {label:>12}: {elapsed * 1000:8.1f} ms  speed-up {baseline / elapsed:4.2f}x  "
+              f"{'✅ identical' if same else '❌ differs'}")
+
+
+if __name__ == '__main__':
+    main()
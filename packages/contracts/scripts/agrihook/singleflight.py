@@ -0,0 +1,177 @@
+"""
+Request Coalescing for Agri-Hook
+Single-flight groups: concurrent calls with the same key share one upstream call
+
+The first caller for a key runs the call; callers arriving while it is in flight wait on its
+result instead of issuing their own. Failures are remembered for a short negative-cache TTL so
+a burst against a failing upstream produces one error, not one per caller. SingleFlight is for
+threads (web3 reads), AsyncSingleFlight for asyncio (provider fetches).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .telemetry import TELEMETRY
+
+DEFAULT_NEGATIVE_TTL = 2.0        # Seconds a failure is replayed to new callers
+
+
+class KeyStats:
+    """Per-key counters"""
+
+    __slots__ = ('calls', 'upstream', 'joined', 'errors', 'negative_hits')
+
+    def __init__(self):
+        self.calls = 0            # Every do()
+        self.upstream = 0         # Calls that actually ran
+        self.joined = 0           # Calls that waited on an in-flight leader
+        self.errors = 0           # Upstream failures
+        self.negative_hits = 0    # Calls answered from the negative cache
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class _Group:
+    """State and statistics shared by both flavours"""
+
+    def __init__(self, name: str, negative_ttl: float, max_keys: int):
+        self.name = name
+        self.negative_ttl = negative_ttl
+        self.max_keys = max_keys
+        self.stats: Dict[Hashable, KeyStats] = {}
+        self._failures: Dict[Hashable, Tuple[float, BaseException]] = {}
+
+    def _key_stats(self, key) -> KeyStats:
+        stats = self.stats.get(key)
+        if stats is None:
+            if len(self.stats) >= self.max_keys:
+                self.stats.pop(next(iter(self.stats)))        # Drop the oldest key's counters
+            stats = self.stats[key] = KeyStats()
+        return stats
+
+    def _negative(self, key, stats: KeyStats) -> Optional[BaseException]:
+        failure = self._failures.get(key)
+        if failure is None:
+            return None
+        if failure[0] <= time.monotonic():
+            del self._failures[key]
+            return None
+        stats.negative_hits += 1
+        TELEMETRY.count('singleflight.negative_hits', group=self.name)
+        return failure[1]
+
+    def _failed(self, key, stats: KeyStats, error: BaseException):
+        stats.errors += 1
+        if self.negative_ttl > 0:
+            self._failures[key] = (time.monotonic() + self.negative_ttl, error)
+
+    def forget(self, key=None):
+        """Drop negative-cache entries (all, or one key)"""
+        if key is None:
+            self._failures.clear()
+        else:
+            self._failures.pop(key, None)
+
+    def totals(self) -> Dict:
+        totals = KeyStats()
+        for stats in self.stats.values():
+            for name in KeyStats.__slots__:
+                setattr(totals, name, getattr(totals, name) + getattr(stats, name))
+        return totals.to_dict()
+
+    def top(self, n: int = 10) -> List[Tuple[Hashable, Dict]]:
+        """Keys with the most calls"""
+        ranked = sorted(self.stats.items(), key=lambda item: item[1].calls, reverse=True)
+        return [(key, stats.to_dict()) for key, stats in ranked[:n]]
+
+
+class SingleFlight(_Group):
+    """Thread-safe single-flight group"""
+
+    def __init__(self, name: str = 'default', negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_keys: int = 4096):
+        super().__init__(name, negative_ttl, max_keys)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, Future] = {}
+
+    def do(self, key: Hashable, fn: Callable, *args, **kwargs):
+        """Return fn(*args, **kwargs), sharing the call with concurrent callers of `key`"""
+        with self._lock:
+            stats = self._key_stats(key)
+            stats.calls += 1
+            error = self._negative(key, stats)
+            if error is None:
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = self._inflight[key] = Future()
+                    stats.upstream += 1
+                else:
+                    stats.joined += 1
+        if error is not None:
+            raise error
+        if not leader:
+            TELEMETRY.count('singleflight.joined', group=self.name)
+            return future.result()
+
+        try:
+            value = fn(*args, **kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._failed(key, stats, e)
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[key]
+        future.set_result(value)
+        return value
+
+
+class AsyncSingleFlight(_Group):
+    """Single-flight group for coroutines on one event loop"""
+
+    def __init__(self, name: str = 'default', negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+                 max_keys: int = 4096):
+        super().__init__(name, negative_ttl, max_keys)
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable], *args, **kwargs):
+        """Await fn(*args, **kwargs), sharing it with concurrent callers of `key`"""
+        stats = self._key_stats(key)
+        stats.calls += 1
+        error = self._negative(key, stats)
+        if error is not None:
+            raise error
+
+        future = self._inflight.get(key)
+        if future is not None:
+            stats.joined += 1
+            TELEMETRY.count('singleflight.joined', group=self.name)
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise                                     # We were cancelled, not the leader
+            return await self.do(key, fn, *args, **kwargs)    # Leader cancelled: take over
+
+        stats.upstream += 1
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            value = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._failed(key, stats, e)
+            future.set_exception(e)
+            future.exception()                                # Mark retrieved when nobody joined
+            raise
+        finally:
+            del self._inflight[key]
+        future.set_result(value)
+        return value
@@ -0,0 +1,254 @@
+"""
+Spatial Index for Agri-Hook
+Grid index over farms and weather sources aligned to InsuranceVault's 0.1° region cells
+
+Points are bucketed into square cells whose size is a multiple of 0.1°, so every bucket edge is
+also a calculateRegionHash cell edge. Buckets are stored CSR-style: points sorted by bucket and
+one offsets array over the dense bucket grid. A bucket is an O(1) slice, a bounding box is one
+slice per bucket row, and nearest-neighbour queries search rings of buckets outwards for all
+query points at once.
+
+Distances are equirectangular kilometres at the query latitude; that is accurate to well under
+1% at the tens-of-kilometres scale used to match farms to sources.
+"""
+
+import math
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .regions import GRID_UNITS, COORD_SCALE, RegionGrid, cell_hash
+
+REGION_DEGREES = GRID_UNITS / COORD_SCALE     # 0.1°
+KM_PER_DEGREE = 111.195                       # Mean Earth radius × π / 180
+TARGET_PER_BUCKET = 4                         # Auto bucket size aims for this many points per bucket
+MAX_BUCKETS_PER_POINT = 16                    # Cap on the dense bucket grid for sparse inputs
+CELL_KEY_OFFSET = 2000                        # |cell| <= 1800 for valid coordinates
+CELL_KEY_STRIDE = 4096
+
+
+def _trunc_div(a: np.ndarray, b: int) -> np.ndarray:
+    """Vectorized regions._trunc_div (int256 division rounding towards zero)"""
+    q = np.abs(a) // b
+    return np.where(a >= 0, q, -q)
+
+
+def region_cells(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """[n, 2] calculateRegionHash cells for coordinates in degrees (to_e6 then region_cell)"""
+    lat_e6 = np.trunc(np.asarray(latitudes, dtype=np.float64) * COORD_SCALE).astype(np.int64)
+    lon_e6 = np.trunc(np.asarray(longitudes, dtype=np.float64) * COORD_SCALE).astype(np.int64)
+    return np.stack([_trunc_div(lat_e6, GRID_UNITS), _trunc_div(lon_e6, GRID_UNITS)], axis=1)
+
+
+class RegionAssignment(NamedTuple):
+    cells: np.ndarray             # [regions, 2] distinct (lat_cell, lon_cell)
+    hashes: List[bytes]           # regionHash per distinct cell
+    region_of: np.ndarray         # [points] row in `cells` for every input point
+
+
+def assign_regions(latitudes: np.ndarray, longitudes: np.ndarray,
+                   grid: Optional[RegionGrid] = None) -> RegionAssignment:
+    """Group points by regionHash cell; hashes come from a RegionGrid table when given"""
+    cells = region_cells(latitudes, longitudes)
+    # One int64 key per cell: 1-D unique is far faster than unique(axis=0)
+    packed = (cells + CELL_KEY_OFFSET) @ np.array([CELL_KEY_STRIDE, 1])
+    keys, region_of = np.unique(packed, return_inverse=True)
+    cells = np.stack([keys // CELL_KEY_STRIDE, keys % CELL_KEY_STRIDE], axis=1) - CELL_KEY_OFFSET
+    lookup = grid.cell_hash if grid is not None else cell_hash
+    hashes = [lookup(int(lat), int(lon)) for lat, lon in cells.tolist()]
+    return RegionAssignment(cells, hashes, region_of.reshape(-1))
+
+
+class SpatialIndex:
+    """Static bucket-grid index over (latitude, longitude) points in degrees"""
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                 bucket_cells: Optional[int] = None):
+        """
+        Args:
+            latitudes, longitudes: Point coordinates in degrees
+            bucket_cells: Bucket edge in 0.1° region cells (default: sized from point density)
+        """
+        self.latitudes = np.asarray(latitudes, dtype=np.float64)
+        self.longitudes = np.asarray(longitudes, dtype=np.float64)
+        n = len(self.latitudes)
+        if n == 0:
+            raise ValueError('SpatialIndex needs at least one point')
+
+        if bucket_cells is None:
+            area = max(np.ptp(self.latitudes), REGION_DEGREES) * max(np.ptp(self.longitudes), REGION_DEGREES)
+            edge = math.sqrt(area * TARGET_PER_BUCKET / n)
+            bucket_cells = max(1, round(edge / REGION_DEGREES))
+        self.bucket_cells = bucket_cells
+        self.bucket_degrees = bucket_cells * REGION_DEGREES
+
+        rows, cols = self._bucket_of(self.latitudes, self.longitudes)
+        self.row0, self.col0 = int(rows.min()), int(cols.min())
+        self.n_rows = int(rows.max()) - self.row0 + 1
+        self.n_cols = int(cols.max()) - self.col0 + 1
+        if self.n_rows * self.n_cols > MAX_BUCKETS_PER_POINT * n + 1024:
+            raise ValueError(f'{self.n_rows}×{self.n_cols} buckets for {n} points; '
+                             f'pass a larger bucket_cells')
+
+        keys = (rows - self.row0) * self.n_cols + (cols - self.col0)
+        self.order = np.argsort(keys, kind='stable')               # Index position → point id
+        counts = np.bincount(keys, minlength=self.n_rows * self.n_cols)
+        self.offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self._lat = self.latitudes[self.order]
+        self._lon = self.longitudes[self.order]
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def _bucket_of(self, latitudes: np.ndarray, longitudes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return (np.floor(np.asarray(latitudes) / self.bucket_degrees).astype(np.int64),
+                np.floor(np.asarray(longitudes) / self.bucket_degrees).astype(np.int64))
+
+    def stats(self) -> Dict:
+        counts = np.diff(self.offsets)
+        return {
+            'points': len(self),
+            'bucket_degrees': round(self.bucket_degrees, 4),
+            'buckets': int(len(counts)),
+            'occupied': int((counts > 0).sum()),
+            'max_per_bucket': int(counts.max()),
+        }
+
+    # ---- range queries
+
+    def bbox(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float) -> np.ndarray:
+        """Ids of points inside a bounding box (inclusive)"""
+        r_lo, c_lo = self._bucket_of(lat_min, lon_min)
+        r_hi, c_hi = self._bucket_of(lat_max, lon_max)
+        r_lo, r_hi = max(int(r_lo) - self.row0, 0), min(int(r_hi) - self.row0, self.n_rows - 1)
+        c_lo, c_hi = max(int(c_lo) - self.col0, 0), min(int(c_hi) - self.col0, self.n_cols - 1)
+        if r_lo > r_hi or c_lo > c_hi:
+            return np.empty(0, dtype=np.int64)
+
+        # Buckets of one row are adjacent in the sorted order: one slice per row
+        starts = self.offsets[np.arange(r_lo, r_hi + 1) * self.n_cols + c_lo]
+        ends = self.offsets[np.arange(r_lo, r_hi + 1) * self.n_cols + c_hi + 1]
+        positions = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+        lat, lon = self._lat[positions], self._lon[positions]
+        inside = (lat >= lat_min) & (lat <= lat_max) & (lon >= lon_min) & (lon <= lon_max)
+        return self.order[positions[inside]]
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> np.ndarray:
+        """Ids of points within `radius_km` of a location, nearest first"""
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = dlat / max(math.cos(math.radians(latitude)), 1e-6)
+        ids = self.bbox(latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon)
+        km = self.distance_km(latitude, longitude, self.latitudes[ids], self.longitudes[ids])
+        keep = km <= radius_km
+        return ids[keep][np.argsort(km[keep], kind='stable')]
+
+    @staticmethod
+    def distance_km(latitude, longitude, latitudes, longitudes) -> np.ndarray:
+        """Equirectangular distance at the first point's latitude"""
+        cos = np.cos(np.radians(latitude))
+        return KM_PER_DEGREE * np.hypot(np.asarray(latitudes) - latitude,
+                                        (np.asarray(longitudes) - longitude) * cos)
+
+    # ---- nearest neighbour
+
+    def nearest(self, latitudes: Sequence[float], longitudes: Sequence[float],
+                max_km: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Nearest indexed point for every query point
+
+        Returns:
+            (ids, km): point id and distance per query; -1 / inf where nothing is within max_km
+        """
+        q_lat = np.asarray(latitudes, dtype=np.float64)
+        q_lon = np.asarray(longitudes, dtype=np.float64)
+        n = len(q_lat)
+        best = np.full(n, np.inf)                               # Squared km
+        best_pos = np.full(n, -1, dtype=np.int64)
+        q_row, q_col = self._bucket_of(q_lat, q_lon)
+        q_row -= self.row0
+        q_col -= self.col0
+        cos = np.cos(np.radians(q_lat))
+        ring_km = self.bucket_degrees * KM_PER_DEGREE * cos     # Lower bound gained per ring
+
+        # Rings beyond this cover no bucket of the grid for the query
+        last_ring = np.maximum.reduce([np.abs(q_row), np.abs(q_row - self.n_rows + 1),
+                                       np.abs(q_col), np.abs(q_col - self.n_cols + 1)])
+        pending = np.arange(n)
+        ring = 0
+        while pending.size:
+            for dr, dc in _ring_offsets(ring):
+                rows, cols = q_row[pending] + dr, q_col[pending] + dc
+                ok = (rows >= 0) & (rows < self.n_rows) & (cols >= 0) & (cols < self.n_cols)
+                if not ok.any():
+                    continue
+                queries, keys = pending[ok], rows[ok] * self.n_cols + cols[ok]
+                starts = self.offsets[keys]
+                counts = self.offsets[keys + 1] - starts
+                for j in range(int(counts.max())):
+                    has = counts > j
+                    qs, pos = queries[has], starts[has] + j
+                    d2 = (((self._lat[pos] - q_lat[qs]) * KM_PER_DEGREE) ** 2
+                          + ((self._lon[pos] - q_lon[qs]) * KM_PER_DEGREE * cos[qs]) ** 2)
+                    better = d2 < best[qs]
+                    best[qs[better]] = d2[better]
+                    best_pos[qs[better]] = pos[better]
+
+            # Points outside rings 0..ring are at least ring × bucket away
+            bound = ring * ring_km[pending]
+            done = (best[pending] <= bound ** 2) | (ring >= last_ring[pending])
+            if max_km is not None:
+                done |= bound > max_km
+            pending = pending[~done]
+            ring += 1
+
+        km = np.sqrt(best)
+        found = best_pos >= 0
+        if max_km is not None:
+            found &= km <= max_km
+        ids = np.where(found, self.order[np.maximum(best_pos, 0)], -1)
+        return ids, np.where(found, km, np.inf)
+
+
+def _ring_offsets(ring: int) -> List[Tuple[int, int]]:
+    """Bucket offsets at Chebyshev distance `ring`"""
+    if ring == 0:
+        return [(0, 0)]
+    side = range(-ring, ring + 1)
+    return ([(-ring, c) for c in side] + [(ring, c) for c in side]
+            + [(r, -ring) for r in side[1:-1]] + [(r, ring) for r in side[1:-1]])
+
+
+def main():
+    """Synthetic benchmark: python -m agrihook.spatial [farms] [sources]"""
+    import sys
+    import time
+
+    n_farms = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    n_sources = int(sys.argv[2]) if len(sys.argv) > 2 else 5_000
+    rng = np.random.default_rng(5)
+    farm_lat, farm_lon = rng.uniform(-25, -15, n_farms), rng.uniform(-50, -40, n_farms)
+    src_lat, src_lon = rng.uniform(-26, -14, n_sources), rng.uniform(-51, -39, n_sources)
+    print(f"📍 {n_farms:,} farms, {n_sources:,} observation sources")
+
+    start = time.perf_counter()
+    regions = assign_regions(farm_lat, farm_lon)
+    print(f"   regionHash cells: {len(regions.cells):,} in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    index = SpatialIndex(src_lat, src_lon)
+    built = time.perf_counter()
+    ids, km = index.nearest(farm_lat, farm_lon)
+    elapsed = time.perf_counter() - built
+    print(f"   nearest source: build {1000 * (built - start):.0f} ms, query {elapsed:.2f} s, "
+          f"median {np.median(km):.1f} km  {index.stats()}")
+
+    checked = rng.choice(n_farms, 2000, replace=False)
+    brute = [int(np.argmin(SpatialIndex.distance_km(farm_lat[i], farm_lon[i], src_lat, src_lon)))
+             for i in checked]
+    same = np.array_equal(ids[checked], brute)
+    print(f"   {'✅' if same else '❌'} matches brute force on 2,000 farms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,267 @@
+"""
+Protocol State Cache for Agri-Hook
+Snapshot-consistent cache of contract reads with block- and event-based invalidation
+
+Pure functions and token metadata are cached permanently. Storage-backed views are
+read at a pinned block number; they are dropped when the block advances unless they
+declare the protocol events that change them, in which case they survive until one
+of those events is seen in the logs. Concurrent misses for the same read at the same block
+share one eth_call.
+"""
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from eth_utils import keccak
+
+from .singleflight import SingleFlight
+
+# Functions whose results never change for a deployed contract
+IMMUTABLE_FUNCTIONS = {
+    'name', 'symbol', 'decimals',
+    'oracle', 'weatherOracle',
+    'calculateWeatherMultiplier', 'calculateRegionHash',
+    'calculateDeviation', 'isTraderAligned', 'getOperatingMode',
+}
+
+# Protocol events and the views they change
+EVENT_SIGNATURES = {
+    'BasePriceUpdated': 'BasePriceUpdated(uint256,uint256)',
+    'DisruptionUpdated': 'DisruptionUpdated(uint8,int256,uint256)',
+    'DisruptionCleared': 'DisruptionCleared(uint256)',
+    'FTSOPriceUpdated': 'FTSOPriceUpdated(uint256,uint256,uint256)',
+    'FTSOConfigUpdated': 'FTSOConfigUpdated(string,uint256,bool)',
+    'PolicyCreated': 'PolicyCreated(address,bytes32,uint256,uint256)',
+    'ClaimPaid': 'ClaimPaid(address,bytes32,uint256,uint256)',
+    'TreasuryFunded': 'TreasuryFunded(address,uint256)',
+    'RegionRiskUpdated': 'RegionRiskUpdated(bytes32,uint256,uint256)',
+    'Transfer': 'Transfer(address,address,uint256)',
+}
+
+# Flare RPC nodes cap eth_getLogs ranges; wider gaps drop event-scoped reads instead
+MAX_LOG_RANGE = 30
+
+EVENT_TOPICS = {'0x' + keccak(text=sig).hex(): name for name, sig in EVENT_SIGNATURES.items()}
+
+_WEATHER_EVENTS = ('DisruptionUpdated', 'DisruptionCleared')
+_PRICE_EVENTS = ('BasePriceUpdated', 'FTSOPriceUpdated') + _WEATHER_EVENTS
+_VAULT_EVENTS = ('PolicyCreated', 'ClaimPaid', 'TreasuryFunded')
+
+VIEW_DEPENDENCIES = {
+    # WeatherOracle / WeatherOracleWithFTSO
+    'basePrice': ('BasePriceUpdated', 'FTSOPriceUpdated'),
+    'getTheoreticalPrice': _PRICE_EVENTS,
+    'getCurrentWeatherEvent': _WEATHER_EVENTS,
+    'currentWeatherEvent': _WEATHER_EVENTS,
+    'ftsoSymbol': ('FTSOConfigUpdated',),
+    'ftsoToCoffeeRatio': ('FTSOConfigUpdated',),
+    'useFTSO': ('FTSOConfigUpdated',),
+    # InsuranceVault
+    'totalCoverage': _VAULT_EVENTS,
+    'totalPremiums': _VAULT_EVENTS,
+    'totalPayouts': _VAULT_EVENTS,
+    'treasuryBalance': _VAULT_EVENTS,
+    'getVaultStats': _VAULT_EVENTS,
+    'getPolicy': ('PolicyCreated', 'ClaimPaid'),
+    'regionRisks': ('RegionRiskUpdated',),
+    'calculatePremium': _VAULT_EVENTS + ('RegionRiskUpdated',),
+    # ERC20
+    'totalSupply': ('Transfer',),
+    'balanceOf': ('Transfer',),
+}
+
+
+class StateCache:
+    """In-process cache for protocol reads, pinned to a block snapshot"""
+
+    def __init__(self, w3, block_ttl: float = 1.0, dependencies: Optional[Dict] = None):
+        """
+        Args:
+            w3: Web3 instance
+            block_ttl: Seconds a fetched block number is reused before asking the node again
+            dependencies: View name → invalidating event names (defaults to VIEW_DEPENDENCIES)
+        """
+        self.w3 = w3
+        self.block_ttl = block_ttl
+        self.dependencies = VIEW_DEPENDENCIES if dependencies is None else dependencies
+
+        self._immutable: Dict[Tuple, object] = {}
+        self._block_scoped: Dict[Tuple, object] = {}
+        self._event_scoped: Dict[Tuple, object] = {}
+        self._by_event: Dict[Tuple[str, str], set] = defaultdict(set)
+        self._watched: set = set()
+
+        self._block: Optional[int] = None
+        self._block_checked = 0.0
+        self._pinned: Optional[int] = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.function_stats: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        self.flights = SingleFlight('state_cache')
+
+    # ------------------------------------------------------------------ blocks
+
+    def block_number(self) -> int:
+        """Block the cache reads at (pinned snapshot or the recently seen head)"""
+        if self._pinned is not None:
+            return self._pinned
+        now = time.monotonic()
+        if self._block is None or now - self._block_checked >= self.block_ttl:
+            self._advance(self.w3.eth.block_number)
+            self._block_checked = now
+        return self._block
+
+    def _advance(self, block: int):
+        """Move to a new head block, dropping block-scoped reads and applying events"""
+        if block == self._block:
+            return
+        if self._block is not None and block < self._block:
+            # Reorg or lagging node: nothing cached above this height can be trusted
+            self.invalidate()
+        self._block_scoped.clear()
+        previous = self._block
+        self._block = block
+        if previous is not None and self._watched:
+            self._scan_logs(previous + 1, block)
+
+    def new_block(self, block: int):
+        """Notify the cache of a new head (e.g. from a block subscription)"""
+        self._advance(block)
+        self._block_checked = time.monotonic()
+
+    @contextmanager
+    def snapshot(self, block: Optional[int] = None):
+        """Pin every read inside the block to one block number"""
+        previous = self._pinned
+        self._pinned = block if block is not None else self.block_number()
+        try:
+            yield self._pinned
+        finally:
+            self._pinned = previous
+
+    # ------------------------------------------------------------------ reads
+
+    def call(self, contract, fn_name: str, *args):
+        """Read contract.fn_name(*args) through the cache"""
+        address = contract.address
+        key = (address, fn_name, args)
+        stats = self.function_stats[fn_name]
+
+        if key in self._immutable:
+            self.hits += 1
+            stats[0] += 1
+            return self._immutable[key]
+
+        immutable = fn_name in IMMUTABLE_FUNCTIONS or fn_name.isupper() or \
+            _is_pure(contract, fn_name)
+        block = None if immutable else self.block_number()
+
+        if not immutable:
+            # Event-scoped reads stay valid from the block they were read at up to the last head
+            # whose logs were scanned; a snapshot past that head has unscanned blocks in between
+            event_scoped = fn_name in self.dependencies
+            entry = (self._event_scoped if event_scoped else self._block_scoped).get(key)
+            if entry is not None and (self._scanned(entry[0], block) if event_scoped else entry[0] == block):
+                self.hits += 1
+                stats[0] += 1
+                return entry[1]
+
+        self.misses += 1
+        stats[1] += 1
+        fn = getattr(contract.functions, fn_name)(*args)
+        if immutable:
+            value = self.flights.do((key, None), fn.call)
+            self._immutable[key] = value
+            return value
+
+        value = self.flights.do((key, block), fn.call, block_identifier=block)
+        if fn_name in self.dependencies:
+            # A read below the scanned head cannot be carried forward: the logs between its block
+            # and the head were scanned before it was watched
+            if self._block is not None and block >= self._block:
+                self._event_scoped[key] = (block, value)
+                self._watch(address, fn_name, key)
+        else:
+            self._block_scoped[key] = (block, value)
+        return value
+
+    def _scanned(self, read_at: int, block: int) -> bool:
+        """True if no watched event can lie between read_at and block"""
+        return self._block is not None and read_at <= block <= self._block
+
+    def _watch(self, address: str, fn_name: str, key: Tuple):
+        self._watched.add(address)
+        for event in self.dependencies[fn_name]:
+            self._by_event[(address, event)].add(key)
+
+    # ------------------------------------------------------------------ invalidation
+
+    def _scan_logs(self, from_block: int, to_block: int):
+        """Invalidate event-scoped reads touched by protocol events in a block range"""
+        if to_block - from_block + 1 > MAX_LOG_RANGE:
+            for address in list(self._watched):
+                self._invalidate_store(self._event_scoped, address)
+            self._by_event.clear()
+            return
+        logs = self.w3.eth.get_logs({
+            'fromBlock': from_block,
+            'toBlock': to_block,
+            'address': sorted(self._watched),
+        })
+        self.process_logs(logs)
+
+    def process_logs(self, logs: Iterable[Dict]):
+        """Invalidate cached views affected by the given logs"""
+        for log in logs:
+            topic0 = log['topics'][0]
+            topic0 = topic0 if isinstance(topic0, str) else '0x' + bytes(topic0).hex()
+            event = EVENT_TOPICS.get(topic0.lower())
+            if event is None:
+                continue
+            address = self.w3.to_checksum_address(log['address'])
+            for key in self._by_event.pop((address, event), ()):
+                if self._event_scoped.pop(key, None) is not None:
+                    self.invalidations += 1
+
+    def invalidate(self, address: Optional[str] = None):
+        """Drop every mutable entry (optionally only for one contract)"""
+        for store in (self._block_scoped, self._event_scoped):
+            self._invalidate_store(store, address)
+        if address is None:
+            self._by_event.clear()
+
+    def _invalidate_store(self, store: Dict, address: Optional[str]):
+        for key in [k for k in store if address is None or k[0] == address]:
+            del store[key]
+            self.invalidations += 1
+
+    def stats(self) -> Dict:
+        """Hit/miss counters, overall and per function"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'invalidations': self.invalidations,
+            'coalescing': self.flights.totals(),
+            'block': self._block,
+            'entries': {
+                'immutable': len(self._immutable),
+                'block_scoped': len(self._block_scoped),
+                'event_scoped': len(self._event_scoped),
+            },
+            'functions': {name: {'hits': h, 'misses': m}
+                          for name, (h, m) in self.function_stats.items()},
+        }
+
+
+def _is_pure(contract, fn_name: str) -> bool:
+    """True if the contract ABI marks the function as pure"""
+    for item in contract.abi:
+        if item.get('type') == 'function' and item.get('name') == fn_name:
+            return item.get('stateMutability') == 'pure'
+    return False
@@ -0,0 +1,309 @@
+"""
+Telemetry for Agri-Hook
+Timing spans, log-linear latency histograms and counters with Prometheus and JSON export
+
+Disabled by default: span() then returns a shared no-op context and count() returns at once,
+so instrumented hot paths cost one attribute check. Enable with AGRIHOOK_TELEMETRY=1 (add
+AGRIHOOK_TELEMETRY_CONSOLE=1 for the console sink, AGRIHOOK_METRICS_FILE=path to dump on exit)
+or TELEMETRY.enable(); sinks receive every finished span.
+
+Status lines (the scripts' ✅/❌ progress output) go through echo() to the message sinks.
+The console sink is attached by default; AGRIHOOK_QUIET=1 or TELEMETRY.quiet() drops it.
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+SUB_BUCKET_BITS = 7               # 128 linear sub-buckets per power of two (< 1.6% error)
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_HALF = _SUB_BUCKETS >> 1
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+METRIC_PREFIX = 'agrihook_'
+
+
+def _bucket(value: int) -> int:
+    """Histogram bucket of a non-negative integer (HDR log-linear layout)"""
+    if value < _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return _SUB_BUCKETS + (shift - 1) * _HALF + (value >> shift) - _HALF
+
+
+def _bucket_value(index: int) -> int:
+    """Highest value that falls into a bucket"""
+    if index < _SUB_BUCKETS:
+        return index
+    shift, offset = divmod(index - _SUB_BUCKETS, _HALF)
+    shift += 1
+    return ((offset + _HALF + 1) << shift) - 1
+
+
+class Histogram:
+    """Latency histogram in microseconds with bounded relative error"""
+
+    __slots__ = ('counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max = 0
+
+    def record(self, micros: int):
+        micros = max(int(micros), 0)
+        index = _bucket(micros)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += micros
+        if self.min is None or micros < self.min:
+            self.min = micros
+        if micros > self.max:
+            self.max = micros
+
+    def percentile(self, q: float) -> int:
+        """Value (µs) at quantile q, accurate to one bucket"""
+        if not self.count:
+            return 0
+        target = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(_bucket_value(index), self.max)
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum_ms': round(self.total / 1000, 3),
+            'min_ms': round((self.min or 0) / 1000, 3),
+            'max_ms': round(self.max / 1000, 3),
+            'mean_ms': round(self.total / self.count / 1000, 3) if self.count else 0.0,
+            **{f'p{q * 100:g}_ms': round(self.percentile(q) / 1000, 3) for q in QUANTILES},
+        }
+
+
+class _NullSpan:
+    """Context returned while telemetry is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Times a block and records it into the span's histogram"""
+
+    __slots__ = ('telemetry', 'name', 'labels', 'start')
+
+    def __init__(self, telemetry: 'Telemetry', name: str, labels: Tuple):
+        self.telemetry = telemetry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter_ns() - self.start
+        self.telemetry._finish(self.name, self.labels, elapsed, exc)
+        return False
+
+
+class ConsoleSink:
+    """Prints one status line per finished span (the scripts' ✅/❌ style) and echo() messages"""
+
+    def __init__(self, stream=None, min_ms: float = 0.0):
+        self.stream = stream          # None: sys.stdout at print time (follows redirection)
+        self.min_ms = min_ms
+
+    def __call__(self, name: str, labels: Dict, seconds: float, error: Optional[BaseException]):
+        ms = seconds * 1000
+        if error is None and ms < self.min_ms:
+            return
+        label_text = ' '.join(f'{k}={v}' for k, v in labels.items())
+        status = '❌' if error is not None else '✅'
+        suffix = f' ({error})' if error is not None else ''
+        print(f'{status} {name} {label_text} {ms:.1f} ms{suffix}'.replace('  ', ' '), file=self.stream or sys.stdout)
+
+    def message(self, text: str):
+        print(text, file=self.stream or sys.stdout)
+
+
+class Telemetry:
+    """Registry of span histograms and counters"""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.sinks: List[Callable] = []
+        self.histograms: Dict[Tuple[str, Tuple], Histogram] = {}
+        self.counters: Dict[Tuple[str, Tuple], float] = {}
+        self.messages: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    def enable(self, console: bool = False):
+        self.enabled = True
+        if console and not any(isinstance(s, ConsoleSink) for s in self.sinks):
+            self.sinks.append(ConsoleSink())
+
+    def disable(self):
+        self.enabled = False
+
+    def quiet(self, quiet: bool = True):
+        """Drop (or restore) the console message sink; other message sinks are kept"""
+        self.messages = [m for m in self.messages if not isinstance(getattr(m, '__self__', None), ConsoleSink)]
+        if not quiet:
+            self.messages.append(ConsoleSink().message)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+    # ------------------------------------------------------------------ recording
+
+    def span(self, name: str, **labels):
+        """Context manager timing a block as `name` (no-op while disabled)"""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, tuple(sorted(labels.items())))
+
+    def timed(self, name: str):
+        """Decorator form of span()"""
+        def decorator(fn):
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with Span(self, name, ()):
+                    return fn(*args, **kwargs)
+            wrapper.__name__ = fn.__name__
+            wrapper.__doc__ = fn.__doc__
+            return wrapper
+        return decorator
+
+    def count(self, name: str, value: float = 1, **labels):
+        """Increment a counter (no-op while disabled)"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record an externally measured duration"""
+        if not self.enabled:
+            return
+        self._finish(name, tuple(sorted(labels.items())), int(seconds * 1e9), None)
+
+    def _finish(self, name: str, labels: Tuple, elapsed_ns: int, error: Optional[BaseException]):
+        key = (name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.record(elapsed_ns // 1000)
+            if error is not None:
+                error_key = (name + '.errors', labels)
+                self.counters[error_key] = self.counters.get(error_key, 0) + 1
+        for sink in self.sinks:
+            sink(name, dict(labels), elapsed_ns / 1e9, error)
+
+    def echo(self, text: str = ''):
+        """Emit a human-readable status line to the message sinks (independent of enabled)"""
+        for sink in self.messages:
+            sink(text)
+
+    # ------------------------------------------------------------------ export
+
+    def to_json(self) -> Dict:
+        """Snapshot of every histogram and counter"""
+        with self._lock:
+            return {
+                'spans': [{'name': name, 'labels': dict(labels), **h.to_dict()}
+                          for (name, labels), h in sorted(self.histograms.items())],
+                'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                             for (name, labels), value in sorted(self.counters.items())],
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition: spans as summaries (seconds), counters as counters"""
+        lines = []
+        with self._lock:
+            histograms = sorted(self.histograms.items())
+            counters = sorted(self.counters.items())
+
+        typed = set()
+        for (name, labels), h in histograms:
+            metric = _metric_name(name) + '_seconds'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} summary')
+                typed.add(metric)
+            for q in QUANTILES:
+                lines.append(f'{metric}{_labels(labels, quantile=q)} {h.percentile(q) / 1e6:.6f}')
+            lines.append(f'{metric}_sum{_labels(labels)} {h.total / 1e6:.6f}')
+            lines.append(f'{metric}_count{_labels(labels)} {h.count}')
+
+        for (name, labels), value in counters:
+            metric = _metric_name(name) + '_total'
+            if metric not in typed:
+                lines.append(f'# TYPE {metric} counter')
+                typed.add(metric)
+            lines.append(f'{metric}{_labels(labels)} {value:g}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path: str):
+        """Write metrics to a file: Prometheus text for *.prom, JSON otherwise"""
+        with open(path, 'w') as f:
+            if path.endswith('.prom'):
+                f.write(self.prometheus())
+            else:
+                json.dump(self.to_json(), f, indent=2)
+
+
+def _metric_name(name: str) -> str:
+    return METRIC_PREFIX + ''.join(c if c.isalnum() else '_' for c in name)
+
+
+def _labels(labels: Tuple, **extra) -> str:
+    items = list(labels) + [(k, v) for k, v in extra.items()]
+    if not items:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in items) + '}'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, '').lower() not in ('', '0', 'false', 'no')
+
+
+TELEMETRY = Telemetry(enabled=_env_flag('AGRIHOOK_TELEMETRY'))
+TELEMETRY.quiet(_env_flag('AGRIHOOK_QUIET'))
+if _env_flag('AGRIHOOK_TELEMETRY_CONSOLE'):
+    TELEMETRY.enable(console=True)
+if os.getenv('AGRIHOOK_METRICS_FILE'):
+    TELEMETRY.enable()
+    atexit.register(TELEMETRY.dump, os.environ['AGRIHOOK_METRICS_FILE'])
+
+span = TELEMETRY.span
+count = TELEMETRY.count
+observe = TELEMETRY.observe
+timed = TELEMETRY.timed
+echo = TELEMETRY.echo
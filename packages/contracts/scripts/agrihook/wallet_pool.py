@@ -0,0 +1,525 @@
+"""
+Multi-Sender Wallet Pool for Agri-Hook
+Bulk contract writes sharded over several accounts, each with its own local nonce lane
+
+One account can only have one nonce stream. If every write goes through it and waits for its
+receipt, throughput is one transaction per block. The pool keeps a nonce counter per account
+(a lane), so a lane sends its whole queue back to back without waiting. Operations that any
+account may send are spread over the least loaded lanes. Operations that must come from one
+account (`updateRegionRisk` is onlyOwner, `createPolicy` / `claimPayout` act for msg.sender) stay
+on that account's lane. A claim wave over N farmers therefore runs on N lanes.
+
+Transactions are legacy EIP-155, as everywhere else in these scripts. A TxTemplate pre-encodes
+the fields shared by every call of one function (gas price, gas, target, chain id, selector). Per
+transaction only the nonce, value and ABI arguments are encoded. Signing runs on a process pool
+whose workers receive the lane keys once, at start-up, and sign in chunks. eth_keys uses the
+coincurve backend automatically when it is installed, which makes each signature roughly 20×
+cheaper again.
+
+Signed transactions go out in JSON-RPC batches, and receipts are polled in batches. Lanes below
+the balance a wave needs are topped up from a funder account first.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import rlp
+from eth_abi import encode
+from eth_keys import keys
+from eth_utils import keccak, to_checksum_address
+
+CHAIN_ID = 114                    # Coston2
+SIGN_CHUNK = 64                   # Transactions per signing task
+SEND_BATCH = 100                  # Raw transactions per JSON-RPC batch
+RECEIPT_BATCH = 200               # Receipt lookups per JSON-RPC batch
+RECEIPT_POLL_SECONDS = 1.0
+RECEIPT_TIMEOUT = 180
+MAX_SEND_ROUNDS = 3               # Re-sign rounds after stale-nonce rejections
+TRANSFER_GAS = 21000
+KNOWN_ERRORS = ('already known', 'known transaction')   # Node already has this exact transaction
+STALE_NONCE_ERRORS = ('nonce too low',)                  # Nonce used elsewhere: re-sign with a fresh one
+
+
+# ---- keys
+
+def derive_keys(master_key: bytes, count: int, label: str = 'operator') -> List[bytes]:
+    """Deterministic lane keys keccak(master ‖ label ‖ i): recoverable from the master key alone"""
+    return [keccak(master_key + label.encode() + i.to_bytes(4, 'big')) for i in range(count)]
+
+
+def _key_bytes(key) -> bytes:
+    if isinstance(key, str):
+        return bytes.fromhex(key[2:] if key.startswith('0x') else key)
+    return bytes(key)
+
+
+def address_of(key) -> str:
+    return keys.PrivateKey(_key_bytes(key)).public_key.to_checksum_address()
+
+
+# ---- transaction templates
+
+def _arg_types(signature: str) -> List[str]:
+    inner = signature[signature.index('(') + 1:-1]
+    return inner.split(',') if inner else []
+
+
+class TxTemplate:
+    """Pre-encoded legacy transaction fields for one contract function (or plain transfers)"""
+
+    def __init__(self, to: Optional[str], signature: Optional[str], gas: int, gas_price: int,
+                 chain_id: int = CHAIN_ID):
+        """
+        Args:
+            to: Target contract, or None for per-operation recipients (transfers)
+            signature: e.g. 'updateRegionRisk(bytes32,uint256,uint256)'; None for plain transfers
+        """
+        if signature and '(' in signature[signature.index('(') + 1:]:
+            raise ValueError('tuple arguments are not supported by TxTemplate')
+        self.to = to_checksum_address(to) if to else None
+        self.signature = signature
+        self.gas = gas
+        self.gas_price = gas_price
+        self.chain_id = chain_id
+        self.selector = keccak(text=signature)[:4] if signature else b''
+        self.arg_types = _arg_types(signature) if signature else []
+        self._price_gas = rlp.encode(gas_price) + rlp.encode(gas)
+        self._to = rlp.encode(bytes.fromhex(self.to[2:])) if self.to else None
+        self._unsigned_tail = rlp.encode(chain_id) + rlp.encode(0) + rlp.encode(0)
+
+    def __repr__(self):
+        return f'TxTemplate({self.signature or "transfer"} → {self.to or "*"})'
+
+    def calldata(self, args: Sequence) -> bytes:
+        return self.selector + encode(self.arg_types, list(args)) if self.selector else b''
+
+    def cost(self, value: int = 0) -> int:
+        """Worst-case balance a transaction from this template needs"""
+        return self.gas * self.gas_price + value
+
+    def _body(self, nonce: int, to: Optional[str], value: int, data: bytes) -> bytes:
+        target = self._to if to is None else rlp.encode(bytes.fromhex(to[2:]))
+        return rlp.encode(nonce) + self._price_gas + target + rlp.encode(value) + rlp.encode(data)
+
+    def sign(self, key: keys.PrivateKey, nonce: int, to: Optional[str], value: int,
+             data: bytes) -> Tuple[bytes, bytes]:
+        """(raw transaction, transaction hash)"""
+        body = self._body(nonce, to, value, data)
+        signature = key.sign_msg_hash(keccak(_rlp_list(body + self._unsigned_tail)))
+        v = signature.v + 35 + 2 * self.chain_id
+        raw = _rlp_list(body + rlp.encode(v) + rlp.encode(signature.r) + rlp.encode(signature.s))
+        return raw, keccak(raw)
+
+
+def _rlp_list(payload: bytes) -> bytes:
+    if len(payload) < 56:
+        return bytes([0xc0 + len(payload)]) + payload
+    length = len(payload).to_bytes((len(payload).bit_length() + 7) // 8, 'big')
+    return bytes([0xf7 + len(length)]) + length + payload
+
+
+# ---- signing workers
+
+_WORKER_KEYS: Dict[str, keys.PrivateKey] = {}
+
+
+def _init_signer(lane_keys: Sequence[bytes]):
+    """Process-pool initializer: the keys cross the process boundary once, not per task"""
+    _WORKER_KEYS.clear()
+    for key in lane_keys:
+        private_key = keys.PrivateKey(key)
+        _WORKER_KEYS[private_key.public_key.to_checksum_address()] = private_key
+
+
+def _sign_chunk(address: str, template: TxTemplate,
+                items: Sequence[Tuple[int, Optional[str], int, bytes]]) -> List[Tuple[bytes, bytes]]:
+    key = _WORKER_KEYS[address]
+    return [template.sign(key, nonce, to, value, data) for nonce, to, value, data in items]
+
+
+# ---- operations
+
+@dataclass
+class Op:
+    """One contract write"""
+    template: TxTemplate
+    args: Tuple = ()
+    value: int = 0
+    sender: Optional[str] = None          # Required lane (msg.sender-bound calls); None: any lane
+    to: Optional[str] = None              # Recipient for templates without a fixed target
+    label: str = ''
+
+    def cost(self) -> int:
+        return self.template.cost(self.value)
+
+
+@dataclass
+class Outcome:
+    op: Op
+    sender: str
+    nonce: Optional[int] = None
+    tx_hash: Optional[str] = None
+    status: Optional[int] = None          # Receipt status (None: not mined / not sent)
+    block: Optional[int] = None
+    gas_used: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 1
+
+    def summary(self) -> Dict:
+        return {'label': self.op.label, 'sender': self.sender, 'nonce': self.nonce, 'tx_hash': self.tx_hash,
+                'status': self.status, 'block': self.block, 'gas_used': self.gas_used, 'error': self.error}
+
+
+@dataclass
+class Lane:
+    """One sending account and its locally tracked nonce"""
+    address: str
+    nonce: Optional[int] = None
+    sent: int = 0
+    rejected: int = 0
+
+
+@dataclass
+class WaveReport:
+    outcomes: List[Outcome]
+    lanes: int
+    sign_seconds: float = 0.0
+    send_seconds: float = 0.0
+    confirm_seconds: float = 0.0
+    round_trips: int = 0
+    topped_up: int = 0
+    fillers: int = 0
+
+    @property
+    def failed(self) -> List[Outcome]:
+        return [o for o in self.outcomes if not o.ok]
+
+    def summary(self) -> Dict:
+        total = self.sign_seconds + self.send_seconds + self.confirm_seconds
+        return {
+            'transactions': len(self.outcomes),
+            'succeeded': len(self.outcomes) - len(self.failed),
+            'failed': len(self.failed),
+            'lanes': self.lanes,
+            'topped_up': self.topped_up,
+            'nonce_fillers': self.fillers,
+            'round_trips': self.round_trips,
+            'sign_s': round(self.sign_seconds, 3),
+            'send_s': round(self.send_seconds, 3),
+            'confirm_s': round(self.confirm_seconds, 3),
+            'tx_per_s': round(len(self.outcomes) / total, 1) if total else None,
+        }
+
+
+class WalletPool:
+    """Nonce lanes over several accounts with parallel signing and batched broadcast"""
+
+    def __init__(self, w3, lane_keys: Sequence, funder_key=None, workers: Optional[int] = None,
+                 send_batch: int = SEND_BATCH):
+        """
+        Args:
+            lane_keys: Private keys of the sending accounts (operators, or farmers for their own calls)
+            funder_key: Account that tops up lanes (gets its own lane, never used for operations)
+            workers: Signing processes (default: CPU count); 0 signs in this process
+        """
+        if not lane_keys:
+            raise ValueError('WalletPool needs at least one lane key')
+        self.w3 = w3
+        self.send_batch = send_batch
+        self.lanes: Dict[str, Lane] = {}
+        all_keys = [_key_bytes(k) for k in lane_keys]
+        for key in all_keys:
+            address = address_of(key)
+            self.lanes[address] = Lane(address)
+        self.funder: Optional[Lane] = None
+        if funder_key is not None:
+            all_keys.append(_key_bytes(funder_key))
+            self.funder = Lane(address_of(funder_key))
+        self.round_trips = 0
+
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_signer, initargs=(all_keys,)) \
+            if self.workers else None
+        if self._pool is None:
+            _init_signer(all_keys)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def addresses(self) -> List[str]:
+        return list(self.lanes)
+
+    # ------------------------------------------------------------------ RPC
+
+    def _batch(self, requests: List[Tuple[str, list]], size: int) -> List[Dict]:
+        provider = self.w3.provider
+        responses = []
+        for start in range(0, len(requests), size):
+            group = requests[start:start + size]
+            self.round_trips += 1
+            try:
+                batch = provider.make_batch_request(group)
+            except NotImplementedError:
+                batch = [provider.make_request(method, params) for method, params in group]
+            if isinstance(batch, dict):
+                raise RuntimeError(f"RPC batch failed: {batch.get('error')}")
+            responses.extend(batch)
+        return responses
+
+    def _values(self, method: str, addresses: Sequence[str], tag: str = 'pending') -> Dict[str, int]:
+        responses = self._batch([(method, [a, tag]) for a in addresses], RECEIPT_BATCH)
+        values = {}
+        for address, response in zip(addresses, responses):
+            if 'error' in response:
+                raise RuntimeError(f"{method} {address}: {response['error']}")
+            values[address] = int(response['result'], 16)
+        return values
+
+    def sync_nonces(self, lanes: Optional[Iterable[Lane]] = None):
+        """Read the pending nonce of every lane in one batch"""
+        lanes = list(lanes if lanes is not None else self._all_lanes())
+        nonces = self._values('eth_getTransactionCount', [lane.address for lane in lanes])
+        for lane in lanes:
+            lane.nonce = nonces[lane.address]
+
+    def _all_lanes(self) -> List[Lane]:
+        return list(self.lanes.values()) + ([self.funder] if self.funder else [])
+
+    # ------------------------------------------------------------------ balances
+
+    def balances(self, tag: str = 'latest') -> Dict[str, int]:
+        """Balance of every lane (and the funder) in one batch"""
+        return self._values('eth_getBalance', [lane.address for lane in self._all_lanes()], tag)
+
+    def low_balances(self, minimum: int) -> Dict[str, int]:
+        """Lanes below `minimum` wei"""
+        return {a: b for a, b in self.balances().items() if a in self.lanes and b < minimum}
+
+    def top_up(self, needs: Dict[str, int], target: Optional[Dict[str, int]] = None,
+               gas_price: Optional[int] = None) -> WaveReport:
+        """
+        Fund every lane whose balance is below needs[address], up to target[address] (default: the need)
+
+        Transfers come from the funder lane as one wave, and the call returns once they are mined.
+        """
+        if self.funder is None:
+            raise RuntimeError('top_up needs a funder key')
+        balances = self.balances()
+        template = TxTemplate(None, None, TRANSFER_GAS, gas_price or self.w3.eth.gas_price,
+                              self.w3.eth.chain_id)
+        ops = [Op(template, value=(target or needs).get(address, need) - balances[address],
+                  sender=self.funder.address, to=address, label=f'top-up {address}')
+               for address, need in needs.items() if balances.get(address, 0) < need]
+        return self.execute(ops, top_up=False)
+
+    # ------------------------------------------------------------------ waves
+
+    def _assign(self, ops: Sequence[Op]) -> List[Outcome]:
+        """Route each operation to its required lane, or to the least loaded lane"""
+        outcomes = []
+        loads = dict.fromkeys(self.lanes, 0)
+        for op in ops:
+            if op.sender is not None:
+                sender = to_checksum_address(op.sender)
+                if sender not in self.lanes and not (self.funder and sender == self.funder.address):
+                    raise ValueError(f'{op.label or op.template}: no lane for sender {sender}')
+            else:
+                sender = min(loads, key=loads.get)
+            loads[sender] = loads.get(sender, 0) + 1
+            outcomes.append(Outcome(op, sender))
+        return outcomes
+
+    def _lane(self, address: str) -> Lane:
+        return self.funder if self.funder and address == self.funder.address else self.lanes[address]
+
+    def _sign(self, outcomes: List[Outcome], assign: bool = True) -> List[Tuple[bytes, bytes]]:
+        """Assign nonces lane by lane (unless preset) and sign, returning (raw, hash) in outcome order"""
+        tasks = []
+        groups: Dict[Tuple[str, int], List[int]] = {}
+        for i, outcome in enumerate(outcomes):
+            if assign:
+                lane = self._lane(outcome.sender)
+                outcome.nonce = lane.nonce
+                lane.nonce += 1
+            groups.setdefault((outcome.sender, id(outcome.op.template)), []).append(i)
+
+        for (sender, _), indices in groups.items():
+            template = outcomes[indices[0]].op.template
+            for start in range(0, len(indices), SIGN_CHUNK):
+                chunk = indices[start:start + SIGN_CHUNK]
+                items = [(outcomes[i].nonce, outcomes[i].op.to and to_checksum_address(outcomes[i].op.to),
+                          outcomes[i].op.value, template.calldata(outcomes[i].op.args)) for i in chunk]
+                tasks.append((chunk, sender, template, items))
+
+        signed: List[Optional[Tuple[bytes, bytes]]] = [None] * len(outcomes)
+        if self._pool is None:
+            results = [_sign_chunk(sender, template, items) for _, sender, template, items in tasks]
+        else:
+            futures = [self._pool.submit(_sign_chunk, sender, template, items)
+                       for _, sender, template, items in tasks]
+            results = [future.result() for future in futures]
+        for (chunk, *_), result in zip(tasks, results):
+            for i, raw_and_hash in zip(chunk, result):
+                signed[i] = raw_and_hash
+        return signed
+
+    def _broadcast(self, outcomes: List[Outcome], signed: List[Tuple[bytes, bytes]]) -> List[Outcome]:
+        """Send in nonce order per lane; returns the outcomes whose transaction the node rejected"""
+        order = sorted(range(len(outcomes)), key=lambda i: (outcomes[i].sender, outcomes[i].nonce))
+        responses = self._batch([('eth_sendRawTransaction', ['0x' + signed[i][0].hex()]) for i in order],
+                                self.send_batch)
+        rejected = []
+        for i, response in zip(order, responses):
+            outcome = outcomes[i]
+            outcome.tx_hash = '0x' + signed[i][1].hex()
+            error = response.get('error')
+            message = (error.get('message', '') if isinstance(error, dict) else str(error)) if error else ''
+            if error and not any(text in message.lower() for text in KNOWN_ERRORS):
+                outcome.error = message
+                rejected.append(outcome)
+            else:
+                self._lane(outcome.sender).sent += 1
+        return rejected
+
+    def _fill(self, gaps: List[Outcome]) -> int:
+        """
+        Plug the nonce of each rejected transaction with a 0-value self-transfer
+
+        Later transactions of the lane are already in the node's queue with the following
+        nonces. Re-signing them with shifted nonces would collide with those copies, so the gap
+        is filled instead and they go through unchanged.
+        """
+        fillers = []
+        for outcome in gaps:
+            template = outcome.op.template
+            filler = TxTemplate(None, None, TRANSFER_GAS, template.gas_price, template.chain_id)
+            fillers.append(Outcome(Op(filler, sender=outcome.sender, to=outcome.sender, label='nonce filler'),
+                                   outcome.sender, nonce=outcome.nonce))
+        failed = self._broadcast(fillers, self._sign(fillers, assign=False))
+        if failed:
+            raise RuntimeError(f'nonce filler {failed[0].nonce} for {failed[0].sender} rejected: {failed[0].error}')
+        return len(fillers)
+
+    def _confirm(self, outcomes: List[Outcome], timeout: float):
+        deadline = time.monotonic() + timeout
+        waiting = [o for o in outcomes if o.error is None]
+        while waiting:
+            responses = self._batch([('eth_getTransactionReceipt', [o.tx_hash]) for o in waiting], RECEIPT_BATCH)
+            still = []
+            for outcome, response in zip(waiting, responses):
+                receipt = response.get('result')
+                if not receipt:
+                    still.append(outcome)
+                    continue
+                outcome.status = int(receipt['status'], 16)
+                outcome.block = int(receipt['blockNumber'], 16)
+                outcome.gas_used = int(receipt['gasUsed'], 16)
+                if outcome.status != 1:
+                    outcome.error = 'reverted'
+            waiting = still
+            if waiting:
+                if time.monotonic() > deadline:
+                    for outcome in waiting:
+                        outcome.error = 'receipt timeout'
+                    return
+                time.sleep(RECEIPT_POLL_SECONDS)
+
+    def execute(self, ops: Sequence[Op], wait: bool = True, top_up: bool = True,
+                reserve: int = 0, receipt_timeout: float = RECEIPT_TIMEOUT) -> WaveReport:
+        """
+        Send a wave of operations over the lanes
+
+        Args:
+            wait: Poll receipts until every transaction is mined (or times out)
+            top_up: Fund lanes short of their share of the wave first (needs a funder)
+            reserve: Extra wei each topped-up lane keeps above the wave's cost
+
+        A rejected transaction fails with the node's message, and its nonce is filled so the rest
+        of its lane is not stuck. Transactions rejected for a stale nonce (the account sent
+        elsewhere meanwhile) are re-signed with fresh nonces, up to MAX_SEND_ROUNDS times.
+        """
+        outcomes = self._assign(ops)
+        report = WaveReport(outcomes, len({o.sender for o in outcomes}))
+        start_trips = self.round_trips
+        if not outcomes:
+            return report
+
+        self.sync_nonces({self._lane(o.sender).address: self._lane(o.sender) for o in outcomes}.values())
+        if top_up and self.funder is not None:
+            needs: Dict[str, int] = {}
+            for outcome in outcomes:
+                if outcome.sender in self.lanes:
+                    needs[outcome.sender] = needs.get(outcome.sender, reserve) + outcome.op.cost()
+            funded = self.top_up(needs)
+            report.topped_up = len(funded.outcomes)
+            if funded.failed:
+                raise RuntimeError(f'top-up failed: {funded.failed[0].error}')
+
+        pending = outcomes
+        for _ in range(MAX_SEND_ROUNDS):
+            began = time.perf_counter()
+            signed = self._sign(pending)
+            report.sign_seconds += time.perf_counter() - began
+
+            began = time.perf_counter()
+            rejected = self._broadcast(pending, signed)
+            report.send_seconds += time.perf_counter() - began
+            stale = [o for o in rejected if any(text in o.error.lower() for text in STALE_NONCE_ERRORS)]
+            gaps = [o for o in rejected if o not in stale]
+            for outcome in rejected:
+                self._lane(outcome.sender).rejected += 1
+            if gaps:
+                report.fillers += self._fill(gaps)
+            if not stale:
+                break
+            for outcome in stale:
+                outcome.error = outcome.tx_hash = None
+            self.sync_nonces({o.sender: self._lane(o.sender) for o in stale}.values())
+            pending = stale
+
+        if wait:
+            began = time.perf_counter()
+            self._confirm(outcomes, receipt_timeout)
+            report.confirm_seconds = time.perf_counter() - began
+        report.round_trips = self.round_trips - start_trips
+        return report
+
+
+# ---- vault waves
+
+def risk_updates(vault: str, owner: str, updates: Iterable[Tuple[bytes, int, int]], gas_price: int,
+                 gas: int = 100000, chain_id: int = CHAIN_ID) -> List[Op]:
+    """updateRegionRisk for RiskEngine.pending_updates() output (onlyOwner: one lane)"""
+    template = TxTemplate(vault, 'updateRegionRisk(bytes32,uint256,uint256)', gas, gas_price, chain_id)
+    return [Op(template, (region_hash, current, historical), sender=owner, label=f'risk {region_hash.hex()[:12]}')
+            for region_hash, current, historical in updates]
+
+
+def policy_purchases(vault: str, policies: Iterable[Tuple[str, int, int, int, int]], gas_price: int,
+                     gas: int = 400000, chain_id: int = CHAIN_ID) -> List[Op]:
+    """createPolicy from each farmer's own lane: (farmer, latitude e6, longitude e6, coverage, premium)"""
+    template = TxTemplate(vault, 'createPolicy(int256,int256,uint256)', gas, gas_price, chain_id)
+    return [Op(template, (latitude, longitude, coverage), value=premium, sender=farmer, label=f'policy {farmer}')
+            for farmer, latitude, longitude, coverage, premium in policies]
+
+
+def claims(vault: str, farmers: Iterable[str], gas_price: int, gas: int = 300000,
+           chain_id: int = CHAIN_ID) -> List[Op]:
+    """claimPayout from each farmer's own lane"""
+    template = TxTemplate(vault, 'claimPayout()', gas, gas_price, chain_id)
+    return [Op(template, sender=farmer, label=f'claim {farmer}') for farmer in farmers]
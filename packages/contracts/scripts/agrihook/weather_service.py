@@ -0,0 +1,299 @@
+"""
+Weather Consensus Service for Agri-Hook
+Async HTTP service serving region consensus, drought tier and predicted oracle multiplier from a warm cache
+
+Requests are mapped to the 0.1° region cell used by calculateRegionHash, so every coordinate in a
+cell shares one cache entry and at most one upstream fetch per TTL (concurrent misses are
+coalesced). Response bodies and ETags are built once per refresh; a cache hit is a dictionary
+lookup and a write. When the providers fail, the last good entry is served (marked stale) for up
+to STALE_GRACE seconds.
+
+Endpoints:
+    GET  /v1/region?lat=..&lon=..            one region
+    GET  /v1/regions?points=lat,lon;lat,lon  batch (cacheable)
+    POST /v1/regions {"points": [[lat, lon], ...]}
+    GET  /healthz, /metrics
+"""
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+from .consensus import calculate_consensus, get_drought_severity
+from .contract_math import calculate_weather_multiplier, weather_event_for_rainfall
+from .oracle_gate import contract_rainfall
+from .providers import DEFAULT_WINDOW_DAYS, ProviderClient, summarize_results
+from .regions import GRID_UNITS, cell_hash, region_cell, to_e6
+from .singleflight import AsyncSingleFlight
+from .telemetry import TELEMETRY
+
+DEFAULT_TTL = 600                 # Seconds a region's consensus is served before refreshing
+STALE_GRACE = 3600                # Seconds a stale entry is served while providers are failing
+NEGATIVE_TTL = 30                 # Seconds a failed refresh is replayed instead of retried
+MAX_BATCH = 500                   # Points per batch request
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8787
+
+
+class BadRequest(ValueError):
+    """Malformed coordinates or batch"""
+
+
+class RegionEntry:
+    """Serialized consensus for one region cell"""
+
+    __slots__ = ('cell', 'body', 'etag', 'fetched', 'expires')
+
+    def __init__(self, cell: Tuple[int, int], payload: Dict, ttl: float):
+        self.cell = cell
+        self.body = json.dumps(payload, separators=(',', ':')).encode()
+        self.etag = _etag(self.body)
+        self.fetched = time.monotonic()
+        self.expires = self.fetched + ttl
+
+
+def _etag(*parts: bytes) -> str:
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def cell_center(lat_cell: int, lon_cell: int) -> Tuple[float, float]:
+    """Degrees at the middle of a cell (cells truncate towards zero, so cell 0 spans ±0.1°)"""
+    def center(c: int) -> float:
+        return (c + (0.5 if c > 0 else -0.5 if c < 0 else 0)) * GRID_UNITS / 10**6
+    return center(lat_cell), center(lon_cell)
+
+
+def parse_point(lat, lon) -> Tuple[float, float]:
+    try:
+        latitude, longitude = float(lat), float(lon)
+    except (TypeError, ValueError):
+        raise BadRequest(f'invalid coordinates: {lat!r}, {lon!r}')
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise BadRequest(f'coordinates out of range: {latitude}, {longitude}')
+    return latitude, longitude
+
+
+def _point(point) -> Tuple[float, float]:
+    """[lat, lon] or {"lat": .., "lon": ..}"""
+    if isinstance(point, dict):
+        return parse_point(point.get('lat'), point.get('lon'))
+    if not isinstance(point, (list, tuple)) or len(point) != 2:
+        raise BadRequest(f'expected [lat, lon], got {point!r}')
+    return parse_point(*point)
+
+
+def region_payload(cell: Tuple[int, int], readings: List[Dict], failed: List[str],
+                   ttl: float) -> Dict:
+    """Consensus, drought tier and the multiplier updateWeatherSimple would store"""
+    latitude, longitude = cell_center(*cell)
+    consensus = calculate_consensus(readings)
+    rainfall = contract_rainfall(consensus['rainfall'])
+    event_type, price_impact, active = weather_event_for_rainfall(rainfall)
+    now = int(time.time())
+    return {
+        'region': {
+            'hash': '0x' + cell_hash(*cell).hex(),
+            'cell': list(cell),
+            'latitude': latitude,
+            'longitude': longitude,
+        },
+        'consensus': consensus,
+        'severity': get_drought_severity(consensus['rainfall']),
+        'onchain': {
+            'rainfall': rainfall,
+            'multiplier': calculate_weather_multiplier(rainfall),
+            'event_type': event_type,
+            'price_impact': price_impact,
+            'active': active,
+        },
+        'failed_sources': failed,
+        'fetched_at': now,
+        'expires_at': now + int(ttl),
+    }
+
+
+class WeatherService:
+    """Region consensus cache in front of ProviderClient"""
+
+    def __init__(self, client: Optional[ProviderClient] = None, ttl: float = DEFAULT_TTL,
+                 days: int = DEFAULT_WINDOW_DAYS, stale_grace: float = STALE_GRACE,
+                 max_batch: int = MAX_BATCH):
+        self.client = client or ProviderClient(cache_ttl=ttl)
+        self.ttl = ttl
+        self.days = days
+        self.stale_grace = stale_grace
+        self.max_batch = max_batch
+        self.flights = AsyncSingleFlight('weather_service', negative_ttl=NEGATIVE_TTL)
+        self._entries: Dict[Tuple[int, int], RegionEntry] = {}
+
+        self.requests = 0
+        self.hits = 0
+        self.refreshes = 0
+        self.stale_served = 0
+        self.not_modified = 0
+
+    # ---- cache
+
+    async def region(self, latitude: float, longitude: float) -> Tuple[RegionEntry, bool]:
+        """(entry, stale) for the cell containing a coordinate"""
+        cell = region_cell(to_e6(latitude), to_e6(longitude))
+        entry = self._entries.get(cell)
+        now = time.monotonic()
+        if entry is not None and entry.expires > now:
+            self.hits += 1
+            return entry, False
+        try:
+            return await self.flights.do(cell, self._refresh, cell), False
+        except Exception:
+            if entry is not None and now - entry.expires <= self.stale_grace:
+                self.stale_served += 1
+                TELEMETRY.count('weather_service.stale')
+                return entry, True
+            raise
+
+    async def _refresh(self, cell: Tuple[int, int]) -> RegionEntry:
+        latitude, longitude = cell_center(*cell)
+        self.refreshes += 1
+        with TELEMETRY.span('weather_service.refresh'):
+            observations = await self.client.fetch_all(latitude, longitude, self.days)
+        summaries = summarize_results(observations)
+        readings = [s for s in summaries.values() if s['success']]
+        failed = [name for name, s in summaries.items() if not s['success']]
+        if len(readings) < 2:
+            raise RuntimeError(f'only {len(readings)} provider(s) answered for cell {cell}')
+        entry = RegionEntry(cell, region_payload(cell, readings, failed, self.ttl), self.ttl)
+        self._entries[cell] = entry
+        return entry
+
+    async def batch(self, points: List[Tuple[float, float]]) -> Tuple[bytes, str, float]:
+        """(body, etag, max_age) for many points; each distinct cell is resolved once"""
+        if len(points) > self.max_batch:
+            raise BadRequest(f'at most {self.max_batch} points per request')
+        cells = {}
+        for latitude, longitude in points:
+            cells.setdefault(region_cell(to_e6(latitude), to_e6(longitude)), (latitude, longitude))
+        resolved = await asyncio.gather(*(self.region(*point) for point in cells.values()),
+                                        return_exceptions=True)
+        by_cell = dict(zip(cells, resolved))
+
+        parts, tags, max_age = [], [], self.ttl
+        now = time.monotonic()
+        for latitude, longitude in points:
+            result = by_cell[region_cell(to_e6(latitude), to_e6(longitude))]
+            if isinstance(result, Exception):
+                part = json.dumps({'error': str(result) or repr(result),
+                                   'latitude': latitude, 'longitude': longitude}).encode()
+                tags.append(part)
+                max_age = 0
+            else:
+                entry, stale = result
+                part = entry.body
+                tags.append(entry.etag.encode())
+                max_age = 0 if stale else min(max_age, entry.expires - now)
+            parts.append(part)
+        body = b'{"results":[' + b','.join(parts) + b']}'
+        return body, _etag(*tags), max_age
+
+    def stats(self) -> Dict:
+        return {
+            'regions': len(self._entries),
+            'requests': self.requests,
+            'hits': self.hits,
+            'refreshes': self.refreshes,
+            'stale_served': self.stale_served,
+            'not_modified': self.not_modified,
+            'upstream_requests': self.client.requests,
+            'coalescing': self.flights.totals(),
+        }
+
+    # ---- HTTP
+
+    def _respond(self, request: web.Request, body: bytes, etag: str, max_age: float,
+                 stale: bool = False) -> web.Response:
+        headers = {'ETag': etag, 'Cache-Control': f'public, max-age={max(int(max_age), 0)}'}
+        if stale:
+            headers['Warning'] = '110 - "Response is Stale"'
+        if etag in request.headers.get('If-None-Match', ''):
+            self.not_modified += 1
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type='application/json', headers=headers)
+
+    async def handle_region(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        latitude, longitude = parse_point(request.query.get('lat'), request.query.get('lon'))
+        entry, stale = await self.region(latitude, longitude)
+        max_age = 0 if stale else entry.expires - time.monotonic()
+        return self._respond(request, entry.body, entry.etag, max_age, stale)
+
+    async def handle_batch(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if request.method == 'POST':
+            try:
+                raw = (await request.json()).get('points', [])
+            except (ValueError, AttributeError):
+                raise BadRequest('body must be {"points": [[lat, lon], ...]}')
+            points = [_point(p) for p in raw]
+        else:
+            points = [_point(p.split(',')) for p in request.query.get('points', '').split(';') if p]
+        if not points:
+            raise BadRequest('no points given')
+        body, etag, max_age = await self.batch(points)
+        return self._respond(request, body, etag, max_age)
+
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({'healthy': True, **self.stats()})
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        lines = [TELEMETRY.prometheus().rstrip('\n')]
+        for name, value in self.stats().items():
+            if isinstance(value, int):
+                kind = 'gauge' if name == 'regions' else 'counter'
+                lines.append(f'# TYPE agrihook_weather_service_{name} {kind}')
+                lines.append(f'agrihook_weather_service_{name} {value}')
+        return web.Response(text='\n'.join(line for line in lines if line) + '\n',
+                            content_type='text/plain')
+
+    @web.middleware
+    async def _errors(self, request: web.Request, handler):
+        try:
+            return await handler(request)
+        except BadRequest as e:
+            return web.json_response({'error': str(e)}, status=400)
+        except web.HTTPException:
+            raise
+        except Exception as e:
+            TELEMETRY.count('weather_service.errors')
+            return web.json_response({'error': str(e) or repr(e)}, status=502)
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._errors])
+        app.router.add_get('/v1/region', self.handle_region)
+        app.router.add_get('/v1/regions', self.handle_batch)
+        app.router.add_post('/v1/regions', self.handle_batch)
+        app.router.add_get('/healthz', self.handle_health)
+        app.router.add_get('/metrics', self.handle_metrics)
+        app.on_cleanup.append(lambda _: self.client.close())
+        return app
+
+    async def warm(self, points: List[Tuple[float, float]]):
+        """Fill the cache for known regions before serving"""
+        results = await asyncio.gather(*(self.region(*p) for p in points), return_exceptions=True)
+        failed = [p for p, r in zip(points, results) if isinstance(r, Exception)]
+        TELEMETRY.echo(f"🔥 Warmed {len(points) - len(failed)}/{len(points)} region(s)")
+
+    def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+              warm: Optional[List[Tuple[float, float]]] = None):
+        app = self.app()
+        if warm:
+            async def on_startup(_):
+                await self.warm(warm)
+            app.on_startup.append(on_startup)
+        TELEMETRY.echo(f"✅ Weather service on http://{host}:{port}/v1/region (TTL {self.ttl:.0f}s)")
+        web.run_app(app, host=host, port=port, print=None, access_log=None)
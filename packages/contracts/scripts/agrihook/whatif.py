@@ -0,0 +1,347 @@
+"""
+What-If Scenarios for Agri-Hook
+View calls evaluated against hypothetical contract state with eth_call state overrides
+
+A scenario is a set of storage-slot patches (`stateDiff`, so every slot that is not patched
+keeps its on-chain value) plus the view calls to evaluate under them. All scenarios go out as
+one JSON-RPC batch pinned to a single block. Hundreds of what-ifs cost one round trip, no gas
+and no transaction, and nothing is ever written to the chain.
+
+Storage layouts (solc assigns slots in declaration order; immutables take none):
+
+    WeatherOracle   0 basePrice, 1-4 currentWeatherEvent (eventType, priceImpactPercent,
+                    timestamp, active), 5 owner
+    InsuranceVault  0 policies, 1 regionRisks, 2 farmersByRegion, 3 totalCoverage,
+                    4 totalPremiums, 5 totalPayouts, 6 treasuryBalance, 7 owner
+    AgriHook        0 poolPrice, 1 treasuryBalance, 2 circuitBreakerActive,
+                    3 lastRebalanceTime (all keyed by PoolId), 4 cachedOraclePrice, 5 lastPriceUpdate
+
+Any change to those declarations must be mirrored here.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import keccak
+
+from .contract_math import (
+    ContractRevert,
+    calculate_premium,
+    theoretical_price,
+    weather_event_for_rainfall,
+)
+
+# WeatherOracle
+ORACLE_BASE_PRICE_SLOT = 0
+ORACLE_EVENT_SLOT = 1             # eventType +0, priceImpactPercent +1, timestamp +2, active +3
+
+# InsuranceVault
+VAULT_POLICIES_SLOT = 0
+VAULT_REGION_RISKS_SLOT = 1       # currentRiskScore +0, historicalRiskScore +1, droughtCount +2, lastDroughtTime +3
+VAULT_TOTAL_COVERAGE_SLOT = 3
+VAULT_TREASURY_SLOT = 6
+
+# AgriHook
+HOOK_POOL_PRICE_SLOT = 0
+HOOK_TREASURY_SLOT = 1
+HOOK_BREAKER_SLOT = 2
+HOOK_ORACLE_PRICE_SLOT = 4
+
+CALLS_PER_REQUEST = 500           # eth_calls per JSON-RPC batch
+POOL_KEY_TYPE = '(address,address,uint24,int24,address)'
+
+
+# ---- storage helpers
+
+def word(value: int) -> str:
+    """32-byte storage word (two's complement for negative values)"""
+    return '0x' + (value % 2**256).to_bytes(32, 'big').hex()
+
+
+def _slot_hex(slot: int) -> str:
+    return word(slot)
+
+
+def _key32(key) -> bytes:
+    if isinstance(key, str):
+        key = bytes.fromhex(key[2:] if key.startswith('0x') else key)
+    return bytes(key).rjust(32, b'\0')
+
+
+def mapping_slot(key, slot: int) -> int:
+    """Storage slot of mapping[key] for a mapping declared at `slot` (bytes32 / address keys)"""
+    return int.from_bytes(keccak(_key32(key) + slot.to_bytes(32, 'big')), 'big')
+
+
+def pool_id(pool_key: Sequence) -> bytes:
+    """PoolIdLibrary.toId: keccak256(abi.encode(key))"""
+    return keccak(encode([POOL_KEY_TYPE], [tuple(pool_key)]))
+
+
+class StateOverride:
+    """eth_call state override: address → storage slot → value"""
+
+    def __init__(self):
+        self._diffs: Dict[str, Dict[str, str]] = {}
+
+    def set(self, address: str, slot: int, value: int) -> 'StateOverride':
+        self._diffs.setdefault(address.lower(), {})[_slot_hex(slot)] = word(value)
+        return self
+
+    def merged(self, other: 'StateOverride') -> 'StateOverride':
+        out = StateOverride()
+        for source in (self, other):
+            for address, diff in source._diffs.items():
+                out._diffs.setdefault(address, {}).update(diff)
+        return out
+
+    def to_rpc(self) -> Dict[str, Dict]:
+        return {address: {'stateDiff': dict(diff)} for address, diff in self._diffs.items()}
+
+    def __len__(self) -> int:
+        return sum(len(diff) for diff in self._diffs.values())
+
+    # ---- WeatherOracle
+
+    def weather_event(self, oracle: str, event_type: int, price_impact: int, active: bool = True,
+                      timestamp: int = 0) -> 'StateOverride':
+        self.set(oracle, ORACLE_EVENT_SLOT, event_type)
+        self.set(oracle, ORACLE_EVENT_SLOT + 1, price_impact)
+        self.set(oracle, ORACLE_EVENT_SLOT + 2, timestamp)
+        return self.set(oracle, ORACLE_EVENT_SLOT + 3, int(active))
+
+    def rainfall(self, oracle: str, rainfall_mm: int, timestamp: int = 0) -> 'StateOverride':
+        """The event updateWeatherSimple would store for this 7-day rainfall"""
+        event_type, impact, active = weather_event_for_rainfall(rainfall_mm)
+        return self.weather_event(oracle, event_type, impact, active, timestamp)
+
+    def base_price(self, oracle: str, price: int) -> 'StateOverride':
+        return self.set(oracle, ORACLE_BASE_PRICE_SLOT, price)
+
+    # ---- InsuranceVault
+
+    def region_risk(self, vault: str, region_hash: bytes, current: int, historical: int) -> 'StateOverride':
+        base = mapping_slot(region_hash, VAULT_REGION_RISKS_SLOT)
+        self.set(vault, base, current)
+        return self.set(vault, base + 1, historical)
+
+    def vault_totals(self, vault: str, total_coverage: Optional[int] = None,
+                     treasury: Optional[int] = None) -> 'StateOverride':
+        if total_coverage is not None:
+            self.set(vault, VAULT_TOTAL_COVERAGE_SLOT, total_coverage)
+        if treasury is not None:
+            self.set(vault, VAULT_TREASURY_SLOT, treasury)
+        return self
+
+    def utilization(self, vault: str, percent: int, treasury: int) -> 'StateOverride':
+        """Smallest totalCoverage whose utilizationRate against `treasury` is `percent`"""
+        total_coverage = -(-percent * (treasury + 1) // 100)
+        return self.vault_totals(vault, total_coverage, treasury)
+
+    # ---- AgriHook
+
+    def oracle_price(self, hook: str, price: int) -> 'StateOverride':
+        return self.set(hook, HOOK_ORACLE_PRICE_SLOT, price)
+
+    def pool_price(self, hook: str, pool: bytes, price: int) -> 'StateOverride':
+        return self.set(hook, mapping_slot(pool, HOOK_POOL_PRICE_SLOT), price)
+
+    def hook_treasury(self, hook: str, pool: bytes, amount: int) -> 'StateOverride':
+        return self.set(hook, mapping_slot(pool, HOOK_TREASURY_SLOT), amount)
+
+    def circuit_breaker(self, hook: str, pool: bytes, active: bool) -> 'StateOverride':
+        return self.set(hook, mapping_slot(pool, HOOK_BREAKER_SLOT), int(active))
+
+
+# ---- scenarios
+
+def _arg_types(signature: str) -> List[str]:
+    """Top-level argument types of 'name(t1,(t2,t3),...)'"""
+    inner = signature[signature.index('(') + 1:-1]
+    types, depth, current = [], 0, ''
+    for char in inner:
+        if char == ',' and depth == 0:
+            types.append(current)
+            current = ''
+            continue
+        depth += (char == '(') - (char == ')')
+        current += char
+    return types + [current] if current else types
+
+
+@dataclass(frozen=True)
+class Call:
+    """One view call: target, signature, arguments and return types"""
+    to: str
+    signature: str                        # e.g. 'calculatePremium(uint256,bytes32)'
+    args: Tuple = ()
+    returns: Tuple[str, ...] = ('uint256',)
+    sender: Optional[str] = None
+
+    def transaction(self) -> Dict:
+        data = keccak(text=self.signature)[:4] + encode(_arg_types(self.signature), list(self.args))
+        tx = {'to': self.to, 'data': '0x' + data.hex()}
+        if self.sender:
+            tx['from'] = self.sender
+        return tx
+
+
+@dataclass
+class Scenario:
+    """Named state patch and the calls to evaluate under it"""
+    name: str
+    calls: Tuple[Call, ...]
+    overrides: StateOverride = field(default_factory=StateOverride)
+    params: Dict = field(default_factory=dict)        # Reported with the result
+    predicted: Optional[Tuple] = None                 # Off-chain expectation (contract_math)
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    params: Dict
+    values: List[Optional[Tuple]]                     # Decoded return values per call (None: reverted)
+    errors: List[Optional[str]]
+    predicted: Optional[Tuple] = None
+
+    @property
+    def ok(self) -> bool:
+        return not any(self.errors)
+
+    @property
+    def value(self):
+        """First return value of the first call"""
+        return self.values[0][0] if self.values and self.values[0] else None
+
+    def summary(self) -> Dict:
+        return {
+            'scenario': self.name,
+            **self.params,
+            'result': [list(v) if v is not None else None for v in self.values],
+            'errors': [e for e in self.errors if e],
+            'predicted': list(self.predicted) if self.predicted is not None else None,
+        }
+
+
+class ScenarioEngine:
+    """Batched eth_call evaluation of scenarios against one pinned block"""
+
+    def __init__(self, w3, calls_per_request: int = CALLS_PER_REQUEST):
+        self.w3 = w3
+        self.calls_per_request = calls_per_request
+        self.round_trips = 0
+        self.eth_calls = 0
+
+    def _send(self, requests: List[Tuple[str, list]]) -> List[Dict]:
+        provider = self.w3.provider
+        responses = []
+        for start in range(0, len(requests), self.calls_per_request):
+            group = requests[start:start + self.calls_per_request]
+            self.round_trips += 1
+            self.eth_calls += len(group)
+            try:
+                batch = provider.make_batch_request(group)
+            except NotImplementedError:
+                batch = [provider.make_request(method, params) for method, params in group]
+            if isinstance(batch, dict):                     # The whole batch was rejected
+                raise RuntimeError(f"eth_call batch failed: {batch.get('error')}")
+            responses.extend(batch)
+        return responses
+
+    def evaluate(self, scenarios: Sequence[Scenario], block: Optional[int] = None) -> List[ScenarioResult]:
+        """Run every call of every scenario under its overrides at one block"""
+        block_id = hex(block if block is not None else self.w3.eth.block_number)
+        requests = []
+        for scenario in scenarios:
+            overrides = scenario.overrides.to_rpc()
+            for call in scenario.calls:
+                params = [call.transaction(), block_id]
+                if overrides:
+                    params.append(overrides)
+                requests.append(('eth_call', params))
+        responses = iter(self._send(requests))
+
+        results = []
+        for scenario in scenarios:
+            values, errors = [], []
+            for call in scenario.calls:
+                response = next(responses)
+                if 'error' in response:
+                    error = response['error']
+                    values.append(None)
+                    errors.append(error.get('message', str(error)) if isinstance(error, dict) else str(error))
+                else:
+                    values.append(tuple(decode(list(call.returns), bytes.fromhex(response['result'][2:]))))
+                    errors.append(None)
+            results.append(ScenarioResult(scenario.name, scenario.params, values, errors, scenario.predicted))
+        return results
+
+
+# ---- builders
+
+def _predict(model, *args) -> Optional[Tuple]:
+    """contract_math expectation for a scenario (None where the contract would revert)"""
+    try:
+        return (model(*args),)
+    except ContractRevert:
+        return None
+
+
+def price_scenarios(oracle: str, rainfalls: Iterable[int], base_price: Optional[int] = None) -> List[Scenario]:
+    """getTheoreticalPrice under the event each 7-day rainfall would set"""
+    scenarios = []
+    for rainfall in rainfalls:
+        overrides = StateOverride().rainfall(oracle, rainfall)
+        if base_price is not None:
+            overrides.base_price(oracle, base_price)
+        event_type, impact, active = weather_event_for_rainfall(rainfall)
+        predicted = _predict(theoretical_price, base_price, impact, active) if base_price is not None else None
+        scenarios.append(Scenario(f'rainfall={rainfall}mm', (Call(oracle, 'getTheoreticalPrice()'),),
+                                  overrides, {'rainfall': rainfall}, predicted))
+    return scenarios
+
+
+def premium_scenarios(vault: str, region_hash: bytes, coverage: int, risks: Iterable[Tuple[int, int]],
+                      utilizations: Iterable[int], treasury: int) -> List[Scenario]:
+    """calculatePremium over a grid of (current, historical) risk × utilization %"""
+    utilizations = list(utilizations)
+    scenarios = []
+    for current, historical in risks:
+        for percent in utilizations:
+            overrides = StateOverride().region_risk(vault, region_hash, current, historical) \
+                .utilization(vault, percent, treasury)
+            total_coverage = -(-percent * (treasury + 1) // 100)
+            scenarios.append(Scenario(
+                f'risk={current}/{historical} utilization={percent}%',
+                (Call(vault, 'calculatePremium(uint256,bytes32)', (coverage, region_hash)),),
+                overrides,
+                {'current_risk': current, 'historical_risk': historical, 'utilization': percent},
+                _predict(calculate_premium, coverage, current, historical, total_coverage, treasury),
+            ))
+    return scenarios
+
+
+def pool_scenarios(hook: str, pool_key: Sequence, oracle_prices: Iterable[int],
+                   pool_prices: Iterable[int]) -> List[Scenario]:
+    """getPoolStatus (price, oracle price, deviation, mode, treasury) over price grids"""
+    pool = pool_id(pool_key)
+    pool_prices = list(pool_prices)
+    call = Call(hook, f'getPoolStatus({POOL_KEY_TYPE})', (tuple(pool_key),),
+                ('uint256', 'uint256', 'uint256', 'uint8', 'uint256'))
+    return [
+        Scenario(f'oracle={oracle_price} pool={price}', (call,),
+                 StateOverride().oracle_price(hook, oracle_price).pool_price(hook, pool, price),
+                 {'oracle_price': oracle_price, 'pool_price': price})
+        for oracle_price in oracle_prices for price in pool_prices
+    ]
+
+
+def claim_scenarios(vault: str, oracle: str, farmers: Iterable[str], rainfall: int) -> List[Scenario]:
+    """Would claimPayout succeed for each farmer if the oracle held this rainfall's event?"""
+    overrides = StateOverride().rainfall(oracle, rainfall)
+    return [Scenario(f'claim {farmer} at {rainfall}mm',
+                     (Call(vault, 'claimPayout()', returns=(), sender=farmer),),
+                     overrides, {'farmer': farmer, 'rainfall': rainfall})
+            for farmer in farmers]
+
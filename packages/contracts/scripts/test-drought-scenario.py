@@ -7,267 +7,362 @@ Simulates a severe drought to demonstrate all features
 import json
 from datetime import datetime
 
+from agrihook.contract_math import calculate_weather_multiplier
+from agrihook.reporting import Run, RunResult, StepResult, make_reporter
+
+FARMER_BAGS = 1000                # João's expected harvest
+PREMIUM_PAID = 421                # Premium from the risk-based pricing example (8.4%)
+
+
+def severity_name(multiplier: int) -> str:
+    return {150: 'SEVERE', 130: 'MODERATE', 115: 'MILD'}.get(multiplier, 'NORMAL')
+
+
 class DroughtScenarioTester:
-    def __init__(self):
-        print("🌿 AGRI-HOOK DROUGHT SCENARIO TEST")
-        print("="*80)
-        print("Simulating: Severe drought in Minas Gerais coffee region")
-        print("="*80)
-    
-    def run_scenario(self):
-        """Run complete drought scenario"""
-        
-        # SCENARIO SETUP
-        print("\n📋 SCENARIO SETUP")
-        print("-"*80)
-        print("Location: Minas Gerais, Brazil (-18.5122, -44.5550)")
-        print("Crop: Coffee")
-        print("Farmer: João (1,000 bags expected harvest)")
-        print("Coverage: $5,000 (50% of crop value)")
-        print("\nWeather Conditions:")
-        print("  Rainfall (7 days): 0mm ← SEVERE DROUGHT")
-        print("  Temperature: 38°C (extreme heat)")
-        print("  Soil Moisture: 15% (critically low)")
-        
-        # STEP 1: Weather-Adjusted Pricing (Innovation #2)
-        print("\n" + "="*80)
-        print("STEP 1: WEATHER-ADJUSTED ORACLE PRICING (Innovation #2)")
-        print("="*80)
-        
-        base_price = 5.00
-        rainfall = 0  # Severe drought
-        multiplier = 150  # 0mm rainfall = 150% multiplier
-        oracle_price = base_price * multiplier / 100
-        
-        print(f"\nBase Market Price: ${base_price:.2f}")
-        print(f"Rainfall: {rainfall}mm (SEVERE DROUGHT)")
-        print(f"Weather Multiplier: {multiplier}%")
-        print(f"→ Adjusted Oracle Price: ${oracle_price:.2f}")
-        print(f"→ Impact: +{multiplier-100}% (+${oracle_price-base_price:.2f})")
-        
-        print("\n✅ Oracle predicts price spike BEFORE it happens on exchanges!")
-        
-        # STEP 2: Pool Price Lags Behind
-        print("\n" + "="*80)
-        print("STEP 2: POOL PRICE LAGS (Arbitrage Opportunity)")
-        print("="*80)
-        
-        pool_price = 5.00  # Pool hasn't updated yet
-        print(f"\nPool Price: ${pool_price:.2f} (stale)")
-        print(f"Oracle Price: ${oracle_price:.2f} (weather-adjusted)")
-        print(f"Gap: ${oracle_price - pool_price:.2f} ({(oracle_price/pool_price-1)*100:.0f}%)")
-        
-        print("\n⚠️  Without Agri-Hook:")
-        print(f"   Bot buys at: ${pool_price:.2f}")
-        print(f"   Bot sells at: ${oracle_price:.2f}")
-        print(f"   Bot profit: ${oracle_price - pool_price:.2f} per bag")
-        print(f"   João loses: ${(oracle_price - pool_price) * 1000:.0f} (1,000 bags drained)")
-        
-        # STEP 3: Arbitrage Capture (Innovation #1)
-        print("\n" + "="*80)
-        print("STEP 3: ARBITRAGE CAPTURE FEE (Innovation #1)")
-        print("="*80)
-        
-        deviation = (oracle_price - pool_price) / pool_price * 100
-        print(f"\nDeviation: {deviation:.0f}%")
-        
-        if deviation >= 100:
-            print(f"\n🔴 CIRCUIT BREAKER TRIGGERED!")
-            print(f"   Gap >= 100% → All swaps BLOCKED")
-            print(f"   Bot cannot exploit the pool")
-            print(f"   João's LP position: PROTECTED ✅")
-        else:
-            fee_percent = deviation
-            bot_pays = pool_price * (1 + fee_percent / 100)
-            print(f"\nFee Charged: {fee_percent:.0f}%")
-            print(f"Bot pays: ${bot_pays:.2f}")
-            print(f"Bot sells: ${oracle_price:.2f}")
-            print(f"Bot profit: ${oracle_price - bot_pays:.2f}")
-            print(f"\n✅ Arbitrage captured! Bot pays fair value.")
-        
-        # STEP 4: Circuit Breaker (Innovation #4)
-        print("\n" + "="*80)
-        print("STEP 4: CIRCUIT BREAKER SYSTEM (Innovation #4)")
-        print("="*80)
-        
-        print(f"\nDeviation: {deviation:.0f}%")
-        
+    def __init__(self, reporter=None, rainfall=0, base_price=5.00, pool_price=5.00,
+                 liquidity=500000, coverage=5000, recovered_deviation=30, trade_amount=10000):
+        self.reporter = reporter or make_reporter(renderers=RENDERERS, summary=render_summary)
+        self.rainfall = rainfall
+        self.base_price = base_price
+        self.pool_price = pool_price        # Pool hasn't updated yet
+        self.liquidity = liquidity
+        self.coverage = coverage
+        self.recovered_deviation = recovered_deviation
+        self.trade_amount = trade_amount
+
+        if self.reporter.console:
+            print("🌿 AGRI-HOOK DROUGHT SCENARIO TEST")
+            print("="*80)
+            print("Simulating: Severe drought in Minas Gerais coffee region")
+            print("="*80)
+
+    # ------------------------------------------------------------------ steps
+
+    def weather_pricing(self):
+        """STEP 1: Weather-Adjusted Pricing (Innovation #2)"""
+        multiplier = calculate_weather_multiplier(self.rainfall)
+        oracle_price = self.base_price * multiplier / 100
+        return {
+            'base_price': self.base_price,
+            'rainfall': self.rainfall,
+            'severity': severity_name(multiplier),
+            'multiplier': multiplier,
+            'oracle_price': oracle_price,
+            'impact_percent': multiplier - 100,
+        }
+
+    def pool_lag(self, oracle_price):
+        """STEP 2: Pool price lags behind the oracle"""
+        gap = oracle_price - self.pool_price
+        return {
+            'pool_price': self.pool_price,
+            'oracle_price': oracle_price,
+            'gap': gap,
+            'gap_percent': (oracle_price / self.pool_price - 1) * 100,
+            'farmer_loss': gap * FARMER_BAGS,
+        }
+
+    def arbitrage_capture(self, oracle_price):
+        """STEP 3: Arbitrage Capture Fee (Innovation #1)"""
+        deviation = (oracle_price - self.pool_price) / self.pool_price * 100
+        data = {'deviation': deviation, 'blocked': deviation >= 100, 'oracle_price': oracle_price}
+        if not data['blocked']:
+            bot_pays = self.pool_price * (1 + deviation / 100)
+            data.update(fee_percent=deviation, bot_pays=bot_pays, bot_profit=oracle_price - bot_pays)
+        return data
+
+    def circuit_breaker(self, deviation):
+        """STEP 4: Circuit Breaker System (Innovation #4)"""
         if deviation >= 100:
-            mode = "CIRCUIT BREAKER"
-            status = "🔴 FROZEN"
+            mode, status = "CIRCUIT BREAKER", "🔴 FROZEN"
         elif deviation >= 50:
-            mode = "RECOVERY"
-            status = "🟡 RECOVERY"
+            mode, status = "RECOVERY", "🟡 RECOVERY"
         else:
-            mode = "NORMAL"
-            status = "🟢 NORMAL"
-        
-        print(f"Operating Mode: {mode}")
-        print(f"Status: {status}")
-        
-        if mode == "CIRCUIT BREAKER":
-            print(f"\nPool Actions:")
-            print(f"  ❌ Standard swaps: BLOCKED")
-            print(f"  ❌ Bot exploitation: IMPOSSIBLE")
-            print(f"  ✅ Rebalancing: ALLOWED (with bonus)")
-            print(f"  ✅ João's tokens: SAFE")
-        
-        # STEP 5: Rebalancing (Innovation #5)
-        print("\n" + "="*80)
-        print("STEP 5: POOL REBALANCING (Innovation #5)")
-        print("="*80)
-        
-        liquidity = 500000
-        required_capital = liquidity * (deviation / 100)
+            mode, status = "NORMAL", "🟢 NORMAL"
+        return {'deviation': deviation, 'mode': mode, 'status': status}
+
+    def rebalancing(self, deviation):
+        """STEP 5: Pool Rebalancing (Innovation #5)"""
+        required_capital = self.liquidity * (deviation / 100)
         bonus_rate = min((deviation ** 2) / 10000, 5.0)
-        bonus_amount = required_capital * bonus_rate / 100
-        
-        print(f"\nCurrent Pool Liquidity: ${liquidity:,.0f}")
-        print(f"Required Capital to Unfreeze: ${required_capital:,.0f}")
-        print(f"Rebalancer Bonus: {bonus_rate:.1f}% = ${bonus_amount:,.0f}")
-        
-        print(f"\nAlice (rebalancer) deposits ${required_capital:,.0f}:")
-        print(f"  Receives LP tokens: ${required_capital:,.0f}")
-        print(f"  Receives bonus: ${bonus_amount:,.0f}")
-        print(f"  Total value: ${required_capital + bonus_amount:,.0f}")
-        print(f"  Profit: ${bonus_amount:,.0f} ({bonus_rate:.1f}%)")
-        
-        print(f"\n✅ Pool unfreezes, João's position preserved!")
-        
-        # STEP 6: Quadratic Bonuses (Innovation #3)
-        print("\n" + "="*80)
-        print("STEP 6: QUADRATIC BONUS SYSTEM (Innovation #3)")
-        print("="*80)
-        
-        # After rebalancing, deviation drops
-        new_deviation = 30  # Pool recovering
-        bonus_rate = (new_deviation ** 2) / 10000
-        
-        print(f"\nAfter Rebalancing:")
-        print(f"  New Deviation: {new_deviation}%")
-        print(f"  Bonus Rate: ({new_deviation}²) / 10000 = {bonus_rate:.1f}%")
-        
-        trade_amount = 10000
-        bonus = trade_amount * bonus_rate / 100
-        
-        print(f"\nAligned Trader (helps fix price):")
-        print(f"  Swaps: ${trade_amount:,.0f}")
-        print(f"  Fee: 0.01% (minimal)")
-        print(f"  Bonus: {bonus_rate:.1f}% = ${bonus:,.0f}")
-        print(f"  Net received: ${trade_amount + bonus:,.0f}")
-        print(f"  Profit: ${bonus:,.0f}")
-        
-        print(f"\n✅ Traders rush to help fix price (attracted by bonuses)")
-        
-        # STEP 7: Insurance Payout (Innovation #6 + Feature #8)
-        print("\n" + "="*80)
-        print("STEP 7: INSURANCE PAYOUT (Instant Settlement)")
-        print("="*80)
-        
-        coverage = 5000
-        
-        print(f"\nJoão's Insurance Policy:")
-        print(f"  Coverage: ${coverage:,.0f}")
-        print(f"  GPS: -18.5122, -44.5550")
-        print(f"  Premium Paid: $421 (8.4%)")
-        
-        print(f"\nDrought Verification:")
-        print(f"  ✅ Rainfall: 0mm (confirmed by 3 APIs)")
-        print(f"  ✅ GPS coordinates: Match")
-        print(f"  ✅ Timestamp: Valid")
-        print(f"  ✅ Policy: Active")
-        
-        payout = coverage / 2  # 50% payout for partial loss
-        
-        print(f"\nPayout Calculation:")
-        print(f"  Coverage: ${coverage:,.0f}")
-        print(f"  Payout (50%): ${payout:,.0f}")
-        
-        print(f"\nPayout Process:")
-        print(f"  ⏱️  Time 0:00 - João taps 'Claim Payout' on WhatsApp")
-        print(f"  ⏱️  Time 0:01 - System verifies weather data")
-        print(f"  ⏱️  Time 0:02 - Smart contract approves claim")
-        print(f"  ⏱️  Time 0:03 - ${payout:,.0f} sent to João's PIX account")
-        
-        print(f"\n✅ INSTANT PAYOUT - 3 minutes total!")
-        
-        # STEP 8: Dual Protection Summary
-        print("\n" + "="*80)
-        print("STEP 8: DUAL PROTECTION SUMMARY (Feature #5)")
-        print("="*80)
-        
-        print(f"\nWithout Agri-Hook:")
-        print(f"  Physical crop dies: -$5,000")
-        print(f"  LP tokens drained by bots: -$5,000")
-        print(f"  Total loss: -$10,000 ❌")
-        print(f"  João: BANKRUPT")
-        
-        print(f"\nWith Agri-Hook:")
-        print(f"  Physical crop dies: -$5,000")
-        print(f"  LP tokens protected (circuit breaker): $0 loss ✅")
-        print(f"  Insurance payout: +$2,500 ✅")
-        print(f"  Net loss: -$2,500 (50% protected)")
-        print(f"  João: SURVIVES")
-        
-        # FINAL SUMMARY
-        print("\n" + "="*80)
-        print("📊 FINAL SUMMARY")
-        print("="*80)
-        
-        print(f"\n✅ All 6 Math Innovations Demonstrated:")
-        print(f"   1. Arbitrage Capture: Bot profit = $0")
-        print(f"   2. Weather-Adjusted Pricing: ${base_price:.2f} → ${oracle_price:.2f}")
-        print(f"   3. Quadratic Bonuses: {bonus_rate:.1f}% for aligned traders")
-        print(f"   4. Circuit Breaker: Pool frozen at {deviation:.0f}% gap")
-        print(f"   5. Rebalancing: ${bonus_amount:,.0f} bonus to unfreeze")
-        print(f"   6. Risk-Based Pricing: $421 premium (8.4%)")
-        
-        print(f"\n✅ All 9 Smart Contract Features Demonstrated:")
-        print(f"   1. Multi-Source Weather: 3 APIs consensus")
-        print(f"   2. Weather-Adjusted Oracle: +50% price impact")
-        print(f"   3. Arbitrage Capture: 100% protection")
-        print(f"   4. Circuit Breaker: 3-tier system")
-        print(f"   5. Dual Protection: LP + Insurance")
-        print(f"   6. GPS-Verified: 10km precision")
-        print(f"   7. Risk-Based Pricing: Dynamic premiums")
-        print(f"   8. Instant Payouts: 3-minute settlement")
-        print(f"   9. Self-Funding: Bot fees fund protection")
-        
-        print(f"\n🎉 AGRI-HOOK SUCCESSFULLY PROTECTS JOÃO!")
-        print(f"\n💡 Key Innovation: Farmer survives drought by turning")
-        print(f"   liquidity provision into insurance.")
-        
-        # Save results
-        results = {
-            'scenario': 'Severe Drought',
-            'timestamp': datetime.now().isoformat(),
-            'location': 'Minas Gerais, Brazil',
-            'weather': {
-                'rainfall': 0,
-                'severity': 'SEVERE',
-                'multiplier': 150
-            },
-            'prices': {
-                'base': base_price,
-                'oracle': oracle_price,
-                'pool': pool_price,
-                'deviation': deviation
-            },
-            'protection': {
-                'lp_loss_without': 5000,
-                'lp_loss_with': 0,
-                'insurance_payout': payout,
-                'net_loss': 2500,
-                'survival_rate': '50%'
-            },
-            'innovations_tested': 6,
-            'features_tested': 9
+        return {
+            'liquidity': self.liquidity,
+            'required_capital': required_capital,
+            'bonus_rate': bonus_rate,
+            'bonus_amount': required_capital * bonus_rate / 100,
+        }
+
+    def quadratic_bonus(self):
+        """STEP 6: Quadratic Bonus System (Innovation #3), after rebalancing"""
+        bonus_rate = (self.recovered_deviation ** 2) / 10000
+        return {
+            'new_deviation': self.recovered_deviation,
+            'bonus_rate': bonus_rate,
+            'trade_amount': self.trade_amount,
+            'bonus': self.trade_amount * bonus_rate / 100,
+        }
+
+    def insurance_payout(self):
+        """STEP 7: Insurance Payout (Innovation #6 + Feature #8)"""
+        return {
+            'coverage': self.coverage,
+            'premium_paid': PREMIUM_PAID,
+            'payout': self.coverage / 2,    # 50% payout for partial loss
+        }
+
+    def dual_protection(self, payout):
+        """STEP 8: Dual Protection Summary (Feature #5)"""
+        crop_loss = self.coverage
+        return {
+            'lp_loss_without': crop_loss,
+            'lp_loss_with': 0,
+            'insurance_payout': payout,
+            'total_loss_without': crop_loss * 2,
+            'net_loss': crop_loss - payout,
+            'survival_rate': f"{payout / crop_loss * 100:.0f}%",
         }
-        
-        with open('drought_scenario_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
-        
-        print(f"\n💾 Results saved to drought_scenario_results.json")
+
+    # ------------------------------------------------------------------ run
+
+    def run_scenario(self, output='drought_scenario_results.json') -> RunResult:
+        """Run complete drought scenario"""
+        run = Run('drought_scenario', self.reporter, scenario='Severe Drought',
+                  location='Minas Gerais, Brazil')
+        run.add('setup', data={'rainfall': self.rainfall, 'coverage': self.coverage})
+
+        pricing = run.step('weather_pricing', self.weather_pricing).data
+        oracle_price = pricing['oracle_price']
+        run.step('pool_lag', self.pool_lag, oracle_price)
+        deviation = run.step('arbitrage_capture', self.arbitrage_capture, oracle_price).data['deviation']
+        run.step('circuit_breaker', self.circuit_breaker, deviation)
+        run.step('rebalancing', self.rebalancing, deviation)
+        run.step('quadratic_bonus', self.quadratic_bonus)
+        payout = run.step('insurance_payout', self.insurance_payout).data['payout']
+        protection = run.step('dual_protection', self.dual_protection, payout).data
+
+        result = run.finish()
+
+        if output:
+            results = {
+                'scenario': 'Severe Drought',
+                'timestamp': datetime.now().isoformat(),
+                'location': 'Minas Gerais, Brazil',
+                'weather': {
+                    'rainfall': self.rainfall,
+                    'severity': pricing['severity'],
+                    'multiplier': pricing['multiplier']
+                },
+                'prices': {
+                    'base': self.base_price,
+                    'oracle': oracle_price,
+                    'pool': self.pool_price,
+                    'deviation': deviation
+                },
+                'protection': {
+                    'lp_loss_without': protection['lp_loss_without'],
+                    'lp_loss_with': protection['lp_loss_with'],
+                    'insurance_payout': payout,
+                    'net_loss': protection['net_loss'],
+                    'survival_rate': protection['survival_rate']
+                },
+                'innovations_tested': 6,
+                'features_tested': 9
+            }
+            with open(output, 'w') as f:
+                json.dump(results, f, indent=2)
+            if self.reporter.console:
+                print(f"\n💾 Results saved to {output}")
+        return result
+
+
+# ---------------------------------------------------------------------- console rendering
+
+def _header(title):
+    print("\n" + "="*80)
+    print(title)
+    print("="*80)
+
+
+def render_setup(step: StepResult):
+    d = step.data
+    print("\n📋 SCENARIO SETUP")
+    print("-"*80)
+    print("Location: Minas Gerais, Brazil (-18.5122, -44.5550)")
+    print("Crop: Coffee")
+    print(f"Farmer: João ({FARMER_BAGS:,} bags expected harvest)")
+    print(f"Coverage: ${d['coverage']:,} (50% of crop value)")
+    print("\nWeather Conditions:")
+    print(f"  Rainfall (7 days): {d['rainfall']}mm ← SEVERE DROUGHT")
+    print("  Temperature: 38°C (extreme heat)")
+    print("  Soil Moisture: 15% (critically low)")
+
+
+def render_weather_pricing(step: StepResult):
+    d = step.data
+    _header("STEP 1: WEATHER-ADJUSTED ORACLE PRICING (Innovation #2)")
+    print(f"\nBase Market Price: ${d['base_price']:.2f}")
+    print(f"Rainfall: {d['rainfall']}mm ({d['severity']} DROUGHT)")
+    print(f"Weather Multiplier: {d['multiplier']}%")
+    print(f"→ Adjusted Oracle Price: ${d['oracle_price']:.2f}")
+    print(f"→ Impact: +{d['impact_percent']}% (+${d['oracle_price'] - d['base_price']:.2f})")
+    print("\n✅ Oracle predicts price spike BEFORE it happens on exchanges!")
+
+
+def render_pool_lag(step: StepResult):
+    d = step.data
+    _header("STEP 2: POOL PRICE LAGS (Arbitrage Opportunity)")
+    print(f"\nPool Price: ${d['pool_price']:.2f} (stale)")
+    print(f"Oracle Price: ${d['oracle_price']:.2f} (weather-adjusted)")
+    print(f"Gap: ${d['gap']:.2f} ({d['gap_percent']:.0f}%)")
+    print("\n⚠️  Without Agri-Hook:")
+    print(f"   Bot buys at: ${d['pool_price']:.2f}")
+    print(f"   Bot sells at: ${d['oracle_price']:.2f}")
+    print(f"   Bot profit: ${d['gap']:.2f} per bag")
+    print(f"   João loses: ${d['farmer_loss']:.0f} ({FARMER_BAGS:,} bags drained)")
+
+
+def render_arbitrage_capture(step: StepResult):
+    d = step.data
+    _header("STEP 3: ARBITRAGE CAPTURE FEE (Innovation #1)")
+    print(f"\nDeviation: {d['deviation']:.0f}%")
+    if d['blocked']:
+        print(f"\n🔴 CIRCUIT BREAKER TRIGGERED!")
+        print(f"   Gap >= 100% → All swaps BLOCKED")
+        print(f"   Bot cannot exploit the pool")
+        print(f"   João's LP position: PROTECTED ✅")
+    else:
+        print(f"\nFee Charged: {d['fee_percent']:.0f}%")
+        print(f"Bot pays: ${d['bot_pays']:.2f}")
+        print(f"Bot sells: ${d['oracle_price']:.2f}")
+        print(f"Bot profit: ${d['bot_profit']:.2f}")
+        print(f"\n✅ Arbitrage captured! Bot pays fair value.")
+
+
+def render_circuit_breaker(step: StepResult):
+    d = step.data
+    _header("STEP 4: CIRCUIT BREAKER SYSTEM (Innovation #4)")
+    print(f"\nDeviation: {d['deviation']:.0f}%")
+    print(f"Operating Mode: {d['mode']}")
+    print(f"Status: {d['status']}")
+    if d['mode'] == "CIRCUIT BREAKER":
+        print(f"\nPool Actions:")
+        print(f"  ❌ Standard swaps: BLOCKED")
+        print(f"  ❌ Bot exploitation: IMPOSSIBLE")
+        print(f"  ✅ Rebalancing: ALLOWED (with bonus)")
+        print(f"  ✅ João's tokens: SAFE")
+
+
+def render_rebalancing(step: StepResult):
+    d = step.data
+    _header("STEP 5: POOL REBALANCING (Innovation #5)")
+    print(f"\nCurrent Pool Liquidity: ${d['liquidity']:,.0f}")
+    print(f"Required Capital to Unfreeze: ${d['required_capital']:,.0f}")
+    print(f"Rebalancer Bonus: {d['bonus_rate']:.1f}% = ${d['bonus_amount']:,.0f}")
+    print(f"\nAlice (rebalancer) deposits ${d['required_capital']:,.0f}:")
+    print(f"  Receives LP tokens: ${d['required_capital']:,.0f}")
+    print(f"  Receives bonus: ${d['bonus_amount']:,.0f}")
+    print(f"  Total value: ${d['required_capital'] + d['bonus_amount']:,.0f}")
+    print(f"  Profit: ${d['bonus_amount']:,.0f} ({d['bonus_rate']:.1f}%)")
+    print(f"\n✅ Pool unfreezes, João's position preserved!")
+
+
+def render_quadratic_bonus(step: StepResult):
+    d = step.data
+    _header("STEP 6: QUADRATIC BONUS SYSTEM (Innovation #3)")
+    print(f"\nAfter Rebalancing:")
+    print(f"  New Deviation: {d['new_deviation']}%")
+    print(f"  Bonus Rate: ({d['new_deviation']}²) / 10000 = {d['bonus_rate']:.1f}%")
+    print(f"\nAligned Trader (helps fix price):")
+    print(f"  Swaps: ${d['trade_amount']:,.0f}")
+    print(f"  Fee: 0.01% (minimal)")
+    print(f"  Bonus: {d['bonus_rate']:.1f}% = ${d['bonus']:,.0f}")
+    print(f"  Net received: ${d['trade_amount'] + d['bonus']:,.0f}")
+    print(f"  Profit: ${d['bonus']:,.0f}")
+    print(f"\n✅ Traders rush to help fix price (attracted by bonuses)")
+
+
+def render_insurance_payout(step: StepResult):
+    d = step.data
+    _header("STEP 7: INSURANCE PAYOUT (Instant Settlement)")
+    print(f"\nJoão's Insurance Policy:")
+    print(f"  Coverage: ${d['coverage']:,.0f}")
+    print(f"  GPS: -18.5122, -44.5550")
+    print(f"  Premium Paid: ${d['premium_paid']} ({d['premium_paid'] / d['coverage'] * 100:.1f}%)")
+    print(f"\nDrought Verification:")
+    print(f"  ✅ Rainfall: 0mm (confirmed by 3 APIs)")
+    print(f"  ✅ GPS coordinates: Match")
+    print(f"  ✅ Timestamp: Valid")
+    print(f"  ✅ Policy: Active")
+    print(f"\nPayout Calculation:")
+    print(f"  Coverage: ${d['coverage']:,.0f}")
+    print(f"  Payout (50%): ${d['payout']:,.0f}")
+    print(f"\nPayout Process:")
+    print(f"  ⏱️  Time 0:00 - João taps 'Claim Payout' on WhatsApp")
+    print(f"  ⏱️  Time 0:01 - System verifies weather data")
+    print(f"  ⏱️  Time 0:02 - Smart contract approves claim")
+    print(f"  ⏱️  Time 0:03 - ${d['payout']:,.0f} sent to João's PIX account")
+    print(f"\n✅ INSTANT PAYOUT - 3 minutes total!")
+
+
+def render_dual_protection(step: StepResult):
+    d = step.data
+    _header("STEP 8: DUAL PROTECTION SUMMARY (Feature #5)")
+    print(f"\nWithout Agri-Hook:")
+    print(f"  Physical crop dies: -${d['lp_loss_without']:,}")
+    print(f"  LP tokens drained by bots: -${d['lp_loss_without']:,}")
+    print(f"  Total loss: -${d['total_loss_without']:,} ❌")
+    print(f"  João: BANKRUPT")
+    print(f"\nWith Agri-Hook:")
+    print(f"  Physical crop dies: -${d['lp_loss_without']:,}")
+    print(f"  LP tokens protected (circuit breaker): $0 loss ✅")
+    print(f"  Insurance payout: +${d['insurance_payout']:,.0f} ✅")
+    print(f"  Net loss: -${d['net_loss']:,.0f} ({d['survival_rate']} protected)")
+    print(f"  João: SURVIVES")
+
+
+def render_summary(run: RunResult):
+    pricing = run.step('weather_pricing').data
+    deviation = run.step('arbitrage_capture').data['deviation']
+    bonus_rate = run.step('quadratic_bonus').data['bonus_rate']
+    rebalance_bonus = run.step('rebalancing').data['bonus_amount']
+
+    _header("📊 FINAL SUMMARY")
+    print(f"\n✅ All 6 Math Innovations Demonstrated:")
+    print(f"   1. Arbitrage Capture: Bot profit = $0")
+    print(f"   2. Weather-Adjusted Pricing: ${pricing['base_price']:.2f} → ${pricing['oracle_price']:.2f}")
+    print(f"   3. Quadratic Bonuses: {bonus_rate:.1f}% for aligned traders")
+    print(f"   4. Circuit Breaker: Pool frozen at {deviation:.0f}% gap")
+    print(f"   5. Rebalancing: ${rebalance_bonus:,.0f} bonus to unfreeze")
+    print(f"   6. Risk-Based Pricing: ${PREMIUM_PAID} premium (8.4%)")
+
+    print(f"\n✅ All 9 Smart Contract Features Demonstrated:")
+    print(f"   1. Multi-Source Weather: 3 APIs consensus")
+    print(f"   2. Weather-Adjusted Oracle: +{pricing['impact_percent']}% price impact")
+    print(f"   3. Arbitrage Capture: 100% protection")
+    print(f"   4. Circuit Breaker: 3-tier system")
+    print(f"   5. Dual Protection: LP + Insurance")
+    print(f"   6. GPS-Verified: 10km precision")
+    print(f"   7. Risk-Based Pricing: Dynamic premiums")
+    print(f"   8. Instant Payouts: 3-minute settlement")
+    print(f"   9. Self-Funding: Bot fees fund protection")
+
+    print(f"\n🎉 AGRI-HOOK SUCCESSFULLY PROTECTS JOÃO!")
+    print(f"\n💡 Key Innovation: Farmer survives drought by turning")
+    print(f"   liquidity provision into insurance.")
+
+
+RENDERERS = {
+    'setup': render_setup,
+    'weather_pricing': render_weather_pricing,
+    'pool_lag': render_pool_lag,
+    'arbitrage_capture': render_arbitrage_capture,
+    'circuit_breaker': render_circuit_breaker,
+    'rebalancing': render_rebalancing,
+    'quadratic_bonus': render_quadratic_bonus,
+    'insurance_payout': render_insurance_payout,
+    'dual_protection': render_dual_protection,
+}
+
 
 def main():
     tester = DroughtScenarioTester()
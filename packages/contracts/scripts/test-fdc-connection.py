@@ -10,6 +10,8 @@ from eth_account import Account
 import requests
 from datetime import datetime
 
+from agrihook.rpc_pool import RPCPool
+
 # Flare Coston2 Configuration
 COSTON2_RPC = "https://coston2-api.flare.network/ext/C/rpc"
 CHAIN_ID = 114
@@ -27,13 +29,13 @@ class FDCTester:
         print("="*80)
         
         # Connect to Coston2
-        self.w3 = Web3(Web3.HTTPProvider(COSTON2_RPC))
+        self.w3 = Web3(RPCPool.from_env(COSTON2_RPC))
         
         if not self.w3.is_connected():
             raise Exception("❌ Failed to connect to Coston2")
         
         print(f"✅ Connected to Coston2")
-        print(f"   RPC: {COSTON2_RPC}")
+        print(f"   RPC: {self.w3.provider}")
         print(f"   Chain ID: {self.w3.eth.chain_id}")
         print(f"   Block Number: {self.w3.eth.block_number}")
         
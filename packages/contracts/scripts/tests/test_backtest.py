@@ -0,0 +1,96 @@
+import warnings
+from datetime import date, timedelta
+
+import numpy as np
+
+from agrihook.backtest import BacktestConfig, Backtester, premiums, synthetic_chunks, window_consensus
+from agrihook.contract_math import PAYOUT_DIVISOR, calculate_premium
+from agrihook.sharding import MIN_SOURCES, _round1
+
+START = date(2020, 1, 1)
+
+
+def reference_consensus(rain):
+    """Per-day 7-day consensus with the sharding.process_regions rules, one window at a time"""
+    out = np.full(rain.shape[:2], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for day in range(6, len(rain)):
+            window = rain[day - 6:day + 1].astype(np.float64)
+            reported = ~np.isnan(window).all(axis=0)
+            totals = _round1(np.where(reported, np.nansum(window, axis=0), np.nan))
+            median = _round1(np.nanmedian(totals, axis=1))
+            out[day] = np.where(reported.sum(axis=1) >= MIN_SOURCES, median, np.nan)
+    return out
+
+
+def test_window_consensus_matches_per_window_reference():
+    rain = np.concatenate([data for _, data in synthetic_chunks(40, 120, START, seed=3)])
+    expected = reference_consensus(rain)
+    consensus, valid = window_consensus(rain[6:], rain[:6])
+    np.testing.assert_array_equal(consensus, expected[6:])
+    assert (valid == ~np.isnan(expected[6:])).all()
+
+    # Chunk boundaries only move the carry
+    pieces = [window_consensus(rain[6 + s:6 + s + 25], rain[s:6 + s])[0] for s in range(0, 114, 25)]
+    np.testing.assert_array_equal(np.concatenate(pieces), expected[6:])
+
+
+def test_partial_windows_are_not_droughts():
+    # 2 mm/day is 14 mm a week; the first six days of a history have fewer days behind them
+    rain = np.full((30, 4, 3), 2.0, dtype=np.float32)
+    consensus, valid = window_consensus(rain, None)
+    assert not valid[:6].any() and valid[6:].all()
+    assert (consensus[6:] == 14.0).all()
+
+    # A region whose carry has an unreported day: windows reaching back to it stay invalid
+    carry = np.full((6, 4, 3), 2.0, dtype=np.float32)
+    carry[2, 1] = np.nan
+    _, valid = window_consensus(rain, carry)
+    assert valid[:, [0, 2, 3]].all()
+    assert not valid[:3, 1].any() and valid[3:, 1].all()
+
+    days = [START + timedelta(days=i) for i in range(30)]
+    summary = Backtester().run_chunks([(days, rain)]).summary()
+    assert summary['drought_region_days'] == 0
+    assert summary['claims'] == 0
+
+
+def test_premiums_match_calculate_premium():
+    rng = np.random.default_rng(7)
+    coverage = 10_000 * 10**6
+    current = rng.integers(0, 101, 500)
+    historical = rng.integers(0, 101, 500)
+    total = rng.integers(0, 10, 500) * coverage
+    treasury = rng.integers(1, 400_000, 500) * 10**6
+    expected = [calculate_premium(coverage, int(c), int(h), int(t), int(b))
+                for c, h, t, b in zip(current, historical, total, treasury)]
+    assert premiums(coverage, current, historical, total, treasury).tolist() == expected
+
+
+def test_drought_pays_every_live_policy_once():
+    # Region 0 wet all along, region 1 dry from day 20
+    rain = np.full((40, 2, 3), 3.0, dtype=np.float32)
+    rain[20:, 1] = 0.0
+    cfg = BacktestConfig(farmers_per_region=4)
+    result = Backtester(cfg).run_chunks([([START + timedelta(days=i) for i in range(40)], rain)])
+
+    payout = cfg.coverage // PAYOUT_DIVISOR
+    summary = result.summary()
+    assert summary['claims'] == 4
+    assert result.regions['payouts'].tolist() == [0, 4 * payout]
+    # Day 23's window holds three wet days: 9 mm, the first total under the 10 mm threshold
+    first_drought = int(np.argmax(result.metrics['drought'] > 0))
+    assert first_drought == 23
+    assert result.metrics['drought'][first_drought:].tolist() == [1] * 17
+    assert result.metrics['claims'][first_drought] == 4
+    assert result.regions['treasury'][1] == result.regions['premiums'][1] + cfg.initial_treasury - 4 * payout
+
+
+def test_chunking_does_not_change_the_replay():
+    days, rain = next(synthetic_chunks(30, 400, START, chunk_days=400, seed=1))
+    whole = Backtester().run_chunks([(days, rain)])
+    chunked = Backtester().run_chunks((days[i:i + 37], rain[i:i + 37]) for i in range(0, 400, 37))
+    assert whole.days == chunked.days
+    for name in whole.metrics.dtype.names:
+        np.testing.assert_array_equal(whole.metrics[name], chunked.metrics[name], err_msg=name)
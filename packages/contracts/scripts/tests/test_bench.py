@@ -0,0 +1,32 @@
+"""
+Startup benchmark as a test: pure CLI commands must not import web3 & co and must start within
+a budget over bare Python (AGRIHOOK_STARTUP_BUDGET_MS, default 250).
+"""
+
+import os
+import sys
+
+import pytest
+
+from agrihook.cli import BENCH_COMMANDS, _leaked_modules, _time_process
+
+BUDGET_MS = float(os.getenv('AGRIHOOK_STARTUP_BUDGET_MS', '250'))
+RUNS = 3
+
+IDS = [' '.join(command) for command in BENCH_COMMANDS]
+
+
+@pytest.fixture(scope='module')
+def baseline_ms():
+    return _time_process([sys.executable, '-c', 'pass'], RUNS)
+
+
+@pytest.mark.parametrize('command', BENCH_COMMANDS, ids=IDS)
+def test_pure_commands_skip_heavy_imports(command):
+    assert _leaked_modules(command) == []
+
+
+@pytest.mark.parametrize('command', BENCH_COMMANDS, ids=IDS)
+def test_startup_within_budget(command, baseline_ms):
+    elapsed = _time_process([sys.executable, '-m', 'agrihook'] + command, RUNS)
+    assert elapsed - baseline_ms <= BUDGET_MS, f'{elapsed} ms vs {baseline_ms} ms for bare Python'
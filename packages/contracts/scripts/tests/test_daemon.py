@@ -0,0 +1,306 @@
+import asyncio
+import json
+import os
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from agrihook import daemon
+from agrihook.contract_math import WEATHER_DATA_MAX_AGE
+from agrihook.daemon import Job, OracleDaemon, Region, Scheduler
+from agrihook.providers import DailyObservation, ProviderError
+
+T0 = 1_760_000_000.0
+LAT, LON = -18.5122, -44.5550
+
+
+class Clock:
+    """Virtual wall and loop time, advanced by the event loop whenever it would sleep"""
+
+    def __init__(self, now=T0):
+        self.start = self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class VirtualLoop(asyncio.SelectorEventLoop):
+    """Event loop on the fake clock: when nothing is ready it jumps to the next timer
+
+    Loop time counts from the clock's start, like a monotonic clock, so the loop's timer
+    resolution is not lost in the float rounding of epoch seconds.
+    """
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def time(self):
+        return self.clock.now - self.clock.start
+
+    def _run_once(self):
+        if not self._ready and self._scheduled:
+            self.clock.now = max(self.clock.now, self.clock.start + self._scheduled[0].when())
+        super()._run_once()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(daemon.time, 'time', clock)
+    return clock
+
+
+def run(clock, coro):
+    loop = VirtualLoop(clock)
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class FakeClient:
+    """ProviderClient stand-in: two providers answering (unless down), one failing"""
+
+    def __init__(self):
+        self.requests = self.cache_hits = 0
+        self.down = False
+
+    async def fetch_all(self, latitude, longitude, days=7, end=None):
+        self.requests += 1
+        if self.down:
+            return {'visual_crossing': ProviderError('timeout'), 'weather_api': ProviderError('timeout')}
+        start = date(2025, 10, 1)
+        rows = lambda name, rain: [DailyObservation(name, latitude, longitude, start + timedelta(days=i),
+                                                    rain, 21.0, 60.0) for i in range(days)]
+        return {'visual_crossing': rows('visual_crossing', 1.0), 'weather_api': rows('weather_api', 2.0),
+                'openweathermap': ProviderError('HTTP 401')}
+
+    async def close(self):
+        pass
+
+
+class Writer:
+    """StreamWriter stand-in collecting the response"""
+
+    def __init__(self):
+        self.data = b''
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+# ---------------------------------------------------------------------- scheduler and health
+
+def test_scheduler_keeps_a_fixed_rate_and_isolates_failures(clock):
+    starts = []
+
+    async def steady():
+        starts.append(clock.now - T0)
+        if len(starts) == 3:
+            await asyncio.sleep(25)            # Overruns two slots
+
+    async def broken():
+        raise RuntimeError('boom')
+
+    async def scenario():
+        scheduler = Scheduler()
+        scheduler.every('steady', 10, steady)
+        scheduler.every('broken', 10, broken)
+        scheduler.start()
+        await asyncio.sleep(95)
+        await scheduler.stop()
+        return scheduler
+
+    scheduler = run(clock, scenario())
+    assert starts == [0, 10, 20, 50, 60, 70, 80, 90]          # 30 and 40 skipped, not bunched
+    steady_job, broken_job = scheduler.jobs['steady'], scheduler.jobs['broken']
+    assert (steady_job.runs, steady_job.failures, steady_job.last_success) == (8, 0, T0 + 90)
+    assert (broken_job.runs, broken_job.failures, broken_job.consecutive_failures) == (10, 10, 10)
+    assert broken_job.last_error == 'RuntimeError: boom' and broken_job.last_success is None
+
+    status = scheduler.status()
+    assert status['steady']['healthy'] and status['steady']['last_success_age'] == 5.0
+    assert not status['broken']['healthy'] and not scheduler.healthy()
+
+
+def test_job_health_window():
+    job = Job('fdc', 90, None, started=T0)
+    assert job.healthy(T0 + 269) and not job.healthy(T0 + 270)
+    job.last_success = T0 + 200
+    assert job.healthy(T0 + 469) and not job.healthy(T0 + 470)
+    job.consecutive_failures = 3
+    assert not job.healthy(T0 + 201)
+    assert Job('new', 10, None).healthy(T0)
+
+
+def test_daemon_health_metrics_and_endpoint(clock, tmp_path):
+    regions = [Region.parse(f'minas:{LAT}:{LON}:submit'), Region.parse('cerrado:-18.9:-46.9')]
+    assert regions[0].submit and not regions[1].submit
+    oracle = OracleDaemon(regions, weather_interval=10, fdc_interval=30, fdc_dir=str(tmp_path))
+    oracle.client = FakeClient()
+
+    async def get(path):
+        """One request through the health endpoint's handler, without a socket"""
+        reader, writer = asyncio.StreamReader(), Writer()
+        reader.feed_data(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+        await oracle._handle(reader, writer)
+        head, body = writer.data.decode().split('\r\n\r\n', 1)
+        return head.split('\r\n')[0], body
+
+    async def scenario():
+        oracle.scheduler.start()
+        await asyncio.sleep(25)
+        healthy = await get('/healthz'), await get('/state')
+        oracle.client.down = True
+        await asyncio.sleep(30)                # Three failed weather rounds
+        unhealthy = await get('/healthz'), oracle.metrics(), await get('/nope')
+        await oracle.scheduler.stop()
+        return healthy, unhealthy
+
+    ((status, body), (_, state)), ((bad_status, bad_body), metrics, missing) = run(clock, scenario())
+    assert status == 'HTTP/1.1 200 OK' and json.loads(body)['healthy']
+    assert json.loads(body)['dry_run'] and json.loads(body)['providers']['requests'] == 6
+    consensus = json.loads(state)['consensus']
+    assert set(consensus) == {'minas', 'cerrado'} and consensus['minas']['rainfall'] == 10.5
+
+    assert bad_status == 'HTTP/1.1 503 Service Unavailable'
+    jobs = json.loads(bad_body)['jobs']
+    assert not jobs['weather:minas']['healthy'] and jobs['weather:minas']['consecutive_failures'] == 3
+    assert jobs['weather:minas']['last_error'] == 'RuntimeError: only 0 provider(s) answered'
+    assert jobs['fdc']['healthy'] and jobs['fdc']['runs'] == 2
+    assert 'agrihook_daemon_job_healthy{job="weather:minas"} 0' in metrics
+    assert 'agrihook_daemon_job_healthy{job="fdc"} 1' in metrics
+    assert 'agrihook_daemon_job_failures_total{job="weather:cerrado"} 3' in metrics
+    assert missing[0] == 'HTTP/1.1 404 Not Found'
+
+    with open(tmp_path / 'requests' / 'minas.json') as f:
+        request = json.load(f)
+    assert request['expected']['rainfall'] == 1050 and 'lat=-18.5122' in request['requestBody']['url']
+
+
+# ---------------------------------------------------------------------- FDC proofs
+
+class FakeEth:
+    """Chain stand-in: proofs marked `revert` mine with status 0; `fail_next` drops one send"""
+
+    def __init__(self):
+        self.chain_nonce = 7
+        self.nonce_reads = 0
+        self.gas_price = 25
+        self.sent = []
+        self.fail_next = False
+
+    def get_transaction_count(self, address):
+        self.nonce_reads += 1
+        return self.chain_nonce
+
+    def send_raw_transaction(self, raw):
+        if self.fail_next:
+            self.fail_next = False
+            raise ConnectionError('rpc down')
+        self.sent.append(raw)
+        self.chain_nonce += 1
+        return bytes([len(self.sent)]) * 32
+
+    def wait_for_transaction_receipt(self, tx_hash, timeout):
+        tx = self.sent[tx_hash[0] - 1]
+        return {'status': 0 if tx['data'].get('revert') else 1, 'blockNumber': 100 + tx_hash[0],
+                'transactionHash': tx_hash}
+
+
+class FakeCall:
+    def __init__(self, proof):
+        self.proof = proof
+
+    def build_transaction(self, params):
+        return {**params, 'data': self.proof}
+
+
+class FakeCache:
+    def __init__(self):
+        self.blocks = []
+        self.invalidated = []
+
+    def new_block(self, number):
+        self.blocks.append(number)
+
+    def invalidate(self, address):
+        self.invalidated.append(address)
+
+
+def fdc_daemon(tmp_path, account=True):
+    """Off-chain daemon wired to the stub chain, oracle and cache"""
+    signer = SimpleNamespace(address='0xKeeper', sign_transaction=lambda tx: SimpleNamespace(raw_transaction=tx))
+    oracle = OracleDaemon([Region('minas', LAT, LON)], fdc_dir=str(tmp_path), account=signer if account else None)
+    oracle.w3 = SimpleNamespace(eth=FakeEth())
+    oracle.oracle = SimpleNamespace(address='0xOracle', functions=SimpleNamespace(setWeatherDisruptionWithFDC=FakeCall))
+    oracle.cache = FakeCache()
+    os.makedirs(tmp_path / 'proofs')
+    return oracle
+
+
+def write_proof(tmp_path, name, **proof):
+    with open(tmp_path / 'proofs' / name, 'w') as f:
+        json.dump(proof, f)
+
+
+def test_fdc_round_submits_proofs_and_parks_reverted_ones(clock, tmp_path):
+    oracle = fdc_daemon(tmp_path)
+    eth = oracle.w3.eth
+    write_proof(tmp_path, 'a-ok.json', round=1)
+    write_proof(tmp_path, 'b-bad.json', round=2, revert=True)
+    (tmp_path / 'proofs' / 'notes.txt').write_text('not a proof')
+    oracle.consensus['minas'] = {'rainfall': 4.2, 'temperature': 21.0, 'humidity': 60.0,
+                                 'timestamp': int(T0) - WEATHER_DATA_MAX_AGE - 1}
+
+    run(clock, oracle.fdc_round())
+    assert [(tx['nonce'], tx['data']['round']) for tx in eth.sent] == [(7, 1), (8, 2)]
+    assert os.listdir(tmp_path / 'proofs' / 'done') == ['a-ok.json']
+    assert sorted(os.listdir(tmp_path / 'proofs' / 'failed')) == ['b-bad.error.json', 'b-bad.json']
+    with open(tmp_path / 'proofs' / 'failed' / 'b-bad.error.json') as f:
+        assert 'reverted' in json.load(f)['error']
+    assert (tmp_path / 'proofs' / 'notes.txt').exists()
+    assert oracle.cache.blocks == [101, 102] and oracle.cache.invalidated == ['0xOracle']
+    assert [(s['proof'], s.get('reverted', False)) for s in oracle.submissions] == \
+        [('a-ok.json', False), ('b-bad.json', True)]
+    assert os.listdir(tmp_path / 'requests') == []                 # Consensus too old to attest
+
+    run(clock, oracle.fdc_round())                                 # Parked proofs are not resent
+    assert len(eth.sent) == 2 and eth.nonce_reads == 1
+
+    oracle.consensus['minas']['timestamp'] = int(T0)
+    run(clock, oracle.fdc_round())
+    assert os.listdir(tmp_path / 'requests') == ['minas.json']
+
+
+def test_fdc_proof_stays_pending_until_sent(clock, tmp_path):
+    oracle = fdc_daemon(tmp_path)
+    eth = oracle.w3.eth
+    write_proof(tmp_path, 'c.json', round=3)
+    eth.fail_next = True
+
+    with pytest.raises(ConnectionError):
+        run(clock, oracle.fdc_round())
+    assert os.listdir(tmp_path / 'proofs' / 'done') == [] and (tmp_path / 'proofs' / 'c.json').exists()
+    assert oracle._nonce is None and oracle.submissions == []
+
+    run(clock, oracle.fdc_round())                                 # Retried next round
+    assert eth.nonce_reads == 2 and [tx['nonce'] for tx in eth.sent] == [7]
+    assert os.listdir(tmp_path / 'proofs' / 'done') == ['c.json']
+    assert oracle.submissions[0]['proof'] == 'c.json'
+
+
+def test_fdc_dry_run_leaves_proofs_pending(clock, tmp_path):
+    oracle = fdc_daemon(tmp_path, account=False)
+    write_proof(tmp_path, 'd.json', round=4)
+    run(clock, oracle.fdc_round())
+    assert oracle.dry_run and oracle.w3.eth.sent == [] and oracle.submissions == []
+    assert (tmp_path / 'proofs' / 'd.json').exists()
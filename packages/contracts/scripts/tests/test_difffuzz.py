@@ -0,0 +1,81 @@
+"""
+Differential fuzzing in CI: the Python contract models against the compiled harness on anvil.
+Skipped when anvil (or forge, if out/ has not been built) is not installed.
+
+    AGRIHOOK_FUZZ_CASES=100000 python -m pytest tests/test_difffuzz.py
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import time
+
+import pytest
+
+from agrihook.contract_math import quadratic_bonus
+from agrihook.difffuzz import HARNESS_FILE, TARGETS, EVMHarness, fuzz_target, model_outcome
+
+from conftest import CONTRACTS_DIR
+
+FUZZ_CASES = int(os.getenv('AGRIHOOK_FUZZ_CASES', '20000'))
+ARTIFACTS = os.path.join(CONTRACTS_DIR, 'out')
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope='module')
+def harness():
+    if shutil.which('anvil') is None:
+        pytest.skip('anvil not installed')
+    if not os.path.exists(os.path.join(ARTIFACTS, HARNESS_FILE, 'CurveHarness.json')):
+        if shutil.which('forge') is None:
+            pytest.skip('forge not installed and harness artifacts missing')
+        subprocess.run(['forge', 'build'], cwd=CONTRACTS_DIR, check=True, capture_output=True)
+
+    from web3 import Web3
+
+    port = _free_port()
+    anvil = subprocess.Popen(['anvil', '--port', str(port), '--silent'],
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        w3 = Web3(Web3.HTTPProvider(f'http://127.0.0.1:{port}'))
+        deadline = time.monotonic() + 30
+        while not w3.is_connected():
+            if time.monotonic() > deadline or anvil.poll() is not None:
+                pytest.fail('anvil did not start')
+            time.sleep(0.1)
+        yield EVMHarness.deploy(w3, ARTIFACTS)
+    finally:
+        anvil.terminate()
+        anvil.wait()
+
+
+@pytest.mark.parametrize('name', sorted(TARGETS))
+def test_models_match_evm(harness, name):
+    report = fuzz_target(harness, TARGETS[name], FUZZ_CASES)
+    assert report.passed, [m.describe(TARGETS[name]) for m in report.examples]
+
+
+class ModelHarness:
+    """Stands in for the EVM with the contract_math model (no node needed)"""
+
+    round_trips = 0
+
+    def evaluate(self, target, cases):
+        return [model_outcome(quadratic_bonus, case) for case in cases]
+
+
+def test_mismatches_are_found_and_shrunk():
+    report = fuzz_target(ModelHarness(), TARGETS['bonus'], 2000, legacy=True)
+    assert report.mismatches['contract_math'] == 0
+    assert report.mismatches['legacy_float'] > 0
+    assert not report.passed
+    for example in report.examples:
+        assert example.shrink_steps > 0
+        assert model_outcome(quadratic_bonus, example.case) == example.evm
+        assert example.python != example.evm
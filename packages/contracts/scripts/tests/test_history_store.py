@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+from agrihook.history_store import HistoryStore
+from agrihook.providers import DailyObservation, ProviderError, history_rows
+
+TODAY = date(2025, 6, 10)
+LAT, LON = -18.5122, -44.5550
+
+
+def window(provider, rainfall):
+    return [DailyObservation(provider, LAT, LON, TODAY - timedelta(days=6 - i), rainfall, 20.0, 70.0)
+            for i in range(7)]
+
+
+def test_history_rows_keep_completed_measured_days():
+    results = {
+        'visual_crossing': window('visual_crossing', 2.0),
+        'weather_api': ProviderError('WeatherAPI: HTTP 500'),
+        'openweathermap': window('openweathermap', 24.0),
+    }
+    rows = history_rows(results, today=TODAY)
+    assert [o.day for o in rows] == [TODAY - timedelta(days=6 - i) for i in range(6)]
+    assert {o.provider for o in rows} == {'visual_crossing'}
+
+
+def test_partial_day_is_stored_once_complete(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    # Morning run: today's total so far is 0.4 mm and must not be kept
+    store.append(history_rows({'visual_crossing': window('visual_crossing', 0.4)}, today=TODAY))
+    assert store.day(TODAY) is None
+
+    # Next day the window includes the completed total
+    tomorrow = [DailyObservation('visual_crossing', LAT, LON, TODAY, 12.5, 20.0, 70.0)]
+    store.append(history_rows({'visual_crossing': tomorrow}, today=TODAY + timedelta(days=1)))
+    _, data = store.scan(TODAY, TODAY, fields=['rainfall_mm'])
+    column = store.provider_index('visual_crossing', create=False)
+    assert data[0, store.region_for(LAT, LON, create=False), column, 0] == np.float32(12.5)
@@ -0,0 +1,179 @@
+import pytest
+from eth_account import Account
+from eth_utils import keccak
+
+from agrihook import job_queue
+from agrihook.job_queue import (
+    DONE, FAILED, PENDING, RETRY_BASE, RUNNING, JobQueue, PermanentJobError, claim_key, run_worker,
+    send_checkpointed,
+)
+
+KEY = keccak(text='agrihook job queue test')
+
+
+class Clock:
+    def __init__(self, now: float = 1_760_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_queue.time, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'jobs.sqlite')
+
+
+def test_enqueue_is_idempotent(path, clock):
+    queue = JobQueue(path)
+    assert queue.enqueue('claim', claim_key('0xABC', 1700), {'farmer': '0xabc'})
+    assert not queue.enqueue('claim', claim_key('0xabc', 1700.0), {'farmer': 'other'})
+    assert queue.enqueue_many('fetch', [('a:1', {}), ('b:1', {}), ('a:1', {})]) == 2
+
+    job = queue.claim(['claim'])
+    queue.complete(job, {'ok': True})
+    # Re-running the batch after the work is done adds nothing and leaves the result alone
+    assert not queue.enqueue('claim', claim_key('0xabc', 1700))
+    assert queue.get('claim', '0xabc:1700')['state'] == DONE
+    assert queue.get('claim', '0xabc:1700')['payload'] == {'farmer': '0xabc'}
+    assert queue.stats() == {'claim': {DONE: 1}, 'fetch': {PENDING: 2}}
+
+
+def test_expired_lease_is_reclaimed_with_its_checkpoint(path, clock):
+    first = JobQueue(path, worker='first')
+    first.enqueue('fetch', 'minas:2026-10-19', {'day': '2026-10-19'})
+    job = first.claim(lease=60)
+    job.checkpoint(providers={'visual_crossing': []})
+    first.close()                                       # Worker dies mid-job
+
+    second = JobQueue(path, worker='second')
+    clock.now += 59
+    assert second.claim(lease=60) is None               # Checkpoint renewed the lease
+    clock.now += 2
+    resumed = second.claim(lease=60)
+    assert (resumed.id, resumed.attempts) == (job.id, 2)
+    assert resumed.checkpoint_data == {'providers': {'visual_crossing': []}}
+    row = second.get('fetch', 'minas:2026-10-19')
+    assert (row['state'], row['worker']) == (RUNNING, 'second')
+
+
+def test_retry_back_off_and_permanent_failure(path, clock):
+    queue = JobQueue(path)
+    queue.enqueue('submit', 'minas:1', max_attempts=3)
+    queue.enqueue('claim', '0xf:1')
+    calls = []
+
+    def flaky(job):
+        calls.append(clock.now)
+        raise RuntimeError('rpc down')
+
+    def already_claimed(job):
+        raise PermanentJobError('policy already claimed')
+
+    handlers = {'submit': flaky, 'claim': already_claimed}
+    assert run_worker(queue, handlers) == {'completed': 0, 'failed': 2}
+    assert queue.get('claim', '0xf:1')['state'] == FAILED
+    assert queue.get('claim', '0xf:1')['attempts'] == 1
+
+    for delay in (RETRY_BASE, 2 * RETRY_BASE):
+        clock.now += delay - 1
+        assert run_worker(queue, handlers) == {'completed': 0, 'failed': 0}
+        clock.now += 1
+        assert run_worker(queue, handlers) == {'completed': 0, 'failed': 1}
+    row = queue.get('submit', 'minas:1')
+    assert (row['state'], row['attempts'], row['error']) == (FAILED, 3, 'RuntimeError: rpc down')
+    assert len(calls) == 3
+
+    assert queue.retry_failed('submit') == 1
+    assert run_worker(queue, {'submit': lambda job: 'ok'}) == {'completed': 1, 'failed': 0}
+
+
+class Crash(BaseException):
+    """Process death between two statements (not caught by handlers)"""
+
+
+class FakeEth:
+    def __init__(self):
+        self.nonce = 7
+        self.gas_price = 25 * 10**9
+        self.sent = []
+        self.mined = {}
+        self.crash_on_send = False
+
+    def get_transaction_count(self, address, block):
+        return self.nonce
+
+    def send_raw_transaction(self, raw):
+        if self.crash_on_send:
+            self.crash_on_send = False
+            raise Crash()
+        if raw in self.sent:
+            raise ValueError('already known')
+        self.sent.append(raw)
+        tx_hash = '0x' + keccak(bytes.fromhex(raw[2:])).hex()
+        self.mined[tx_hash] = {'status': 1, 'blockNumber': 100 + len(self.mined), 'gasUsed': 21000}
+        self.nonce += 1
+
+    def get_transaction_receipt(self, tx_hash):
+        if tx_hash not in self.mined:
+            raise LookupError(tx_hash)
+        return self.mined[tx_hash]
+
+    def wait_for_transaction_receipt(self, tx_hash, timeout):
+        return self.get_transaction_receipt(tx_hash)
+
+
+class FakeW3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+class FakeCall:
+    def build_transaction(self, tx):
+        return {**tx, 'to': '0x' + '11' * 20, 'value': 0, 'data': '0x1234', 'chainId': 114}
+
+
+def test_send_checkpointed_resumes_after_crash_between_sign_and_send(path, clock):
+    w3, account = FakeW3(), Account.from_key(KEY)
+    queue = JobQueue(path)
+    queue.enqueue('claim', '0xf:1')
+    job = queue.claim(lease=30)
+
+    w3.eth.crash_on_send = True
+    with pytest.raises(Crash):
+        send_checkpointed(job, w3, account, FakeCall(), gas=300000)
+    signed = queue.get('claim', '0xf:1')['checkpoint']
+    assert signed['nonce'] == 7 and w3.eth.sent == []
+
+    clock.now += 31
+    w3.eth.nonce = 8                                    # Something else used nonce 7 meanwhile
+    resumed = JobQueue(path).claim(lease=30)
+    result = send_checkpointed(resumed, w3, account, FakeCall(), gas=300000)
+    assert w3.eth.sent == [signed['raw_tx']]            # Same bytes, same nonce: no second spend
+    assert result == {'tx_hash': signed['tx_hash'], 'block': 100, 'gas_used': 21000}
+
+    # A further resume finds the receipt and broadcasts nothing
+    again = send_checkpointed(resumed, w3, account, FakeCall(), gas=300000)
+    assert again == result and len(w3.eth.sent) == 1
+
+
+def test_send_checkpointed_tolerates_already_known(path, clock):
+    w3, account = FakeW3(), Account.from_key(KEY)
+    queue = JobQueue(path)
+    queue.enqueue('claim', '0xf:1')
+    job = queue.claim()
+    send_checkpointed(job, w3, account, FakeCall(), gas=300000)
+
+    # Node has the transaction but no receipt yet: "already known" is not an error
+    w3.eth.mined.clear()
+    w3.eth.wait_for_transaction_receipt = lambda tx_hash, timeout: {'status': 0, 'blockNumber': 9, 'gasUsed': 1}
+    with pytest.raises(PermanentJobError, match='reverted'):
+        send_checkpointed(job, w3, account, FakeCall(), gas=300000)
+    assert len(w3.eth.sent) == 1
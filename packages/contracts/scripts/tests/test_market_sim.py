@@ -0,0 +1,66 @@
+import numpy as np
+
+from agrihook.contract_math import (
+    aligned_bonus_rate,
+    calculate_deviation,
+    calculate_weather_multiplier,
+    get_operating_mode,
+    misaligned_fee,
+)
+from agrihook.market_sim import (
+    MarketSimulator,
+    SimConfig,
+    hook_bonus_rates,
+    hook_deviation,
+    hook_fees,
+    hook_modes,
+    weather_multipliers,
+)
+
+# 10 normal days, a severe drought week, then recovery (the module's benchmark scenario, shortened)
+DROUGHT = [25] * 3 + [0] * 4 + [25] * 3
+
+
+def test_weather_multipliers_match_contract():
+    rainfall = np.arange(0, 40, 0.5)
+    expected = [calculate_weather_multiplier(int(r)) for r in rainfall]
+    assert weather_multipliers(rainfall).tolist() == expected
+    assert weather_multipliers([0, 0.9, 4.9, 5, 9.99, 10]).tolist() == [150, 150, 130, 115, 115, 100]
+
+
+def test_vectorized_hook_rules_match_contract():
+    oracle = 5_000_000
+    pool = np.arange(0, 15_000_001, 12_345, dtype=np.int64)
+    deviation = hook_deviation(pool, np.full_like(pool, oracle))
+    assert deviation.tolist() == [calculate_deviation(int(p), oracle) for p in pool]
+    assert hook_modes(deviation).tolist() == [get_operating_mode(int(d)) for d in deviation]
+    assert hook_fees(deviation, np.zeros_like(deviation, dtype=bool)).tolist() == \
+        [misaligned_fee(int(d)) for d in deviation]
+    assert set(hook_fees(deviation, np.ones_like(deviation, dtype=bool)).tolist()) == {10}
+    assert hook_bonus_rates(deviation).tolist() == [aligned_bonus_rate(int(d)) for d in deviation]
+
+
+def run(**overrides):
+    return MarketSimulator(SimConfig(n_pools=200, steps_per_day=12, **overrides)).run(DROUGHT)
+
+
+def test_run_is_deterministic_and_consistent():
+    result = run()
+    assert result.summary() == run().summary()
+    assert result.steps == len(DROUGHT) * 12
+    assert result.swaps_attempted == result.swaps_executed + result.swaps_reverted
+    assert result.mode_share.shape == (result.steps, 3)
+    assert np.allclose(result.mode_share.sum(axis=1), 1)
+    # The oracle jumps from $5 to $7.50 on the first drought day: |5 - 7.5| × 100 / 7.5 = 33%,
+    # still NORMAL mode, measured before that step's swaps move the pools
+    assert 32 <= result.mean_deviation[3 * 12] <= 34
+    assert result.mode_share[:, 0].min() == 1.0
+
+
+def test_concentrated_range_keeps_reserves_non_negative():
+    sim = MarketSimulator(SimConfig(n_pools=100, steps_per_day=12, range_lower=4.0, range_upper=8.0))
+    result = sim.run(DROUGHT)
+    assert result.swaps_executed > 0
+    assert (sim.x - sim.x_offset >= -1e-6).all() and (sim.y - sim.y_offset >= -1e-6).all()
+    # Below the circuit breaker nothing reverts and rebalancePool() is never reachable
+    assert result.swaps_reverted == 0 and result.rebalances == 0
@@ -0,0 +1,75 @@
+import numpy as np
+
+from agrihook.consensus import calculate_consensus
+from agrihook.contract_math import (
+    WEATHER_EVENT_DROUGHT,
+    WEATHER_EVENT_FLOOD,
+    WEATHER_EVENT_FROST,
+    WEATHER_EVENT_NONE,
+    calculate_weather_multiplier,
+)
+from agrihook.perils import DEFAULT_PERILS, classify, describe, reduce_window
+
+
+def block(rain_per_day, temp_c=22.0, days=7, providers=3):
+    """[day, 1 region, provider, field] with the same reading from every provider"""
+    obs = np.empty((days, 1, providers, 3), dtype=np.float32)
+    obs[..., 0] = rain_per_day
+    obs[..., 1] = temp_c
+    obs[..., 2] = 70.0
+    return obs
+
+
+def test_hand_computed_events():
+    regions = np.concatenate([
+        block(2.0),                  # 14 mm: normal
+        block(0.0),                  # 0 mm: severe drought
+        block(0.5),                  # 3.5 mm floors to 3: moderate drought
+        block(30.0),                 # 210 mm: flood tier 2
+        block(2.0, temp_c=0.0),      # coldest day 0 °C: frost tier 2
+        block(0.0, temp_c=-2.0),     # severe drought (+50%) beats severe frost (+40%)
+        block(np.nan, np.nan),       # no data
+    ], axis=1)
+    result, tiers = classify(regions)
+    assert describe(result) == [
+        {'event': 'NONE', 'severity': 'NORMAL', 'impact': 0},
+        {'event': 'DROUGHT', 'severity': 'SEVERE', 'impact': 50},
+        {'event': 'DROUGHT', 'severity': 'MODERATE', 'impact': 30},
+        {'event': 'FLOOD', 'severity': 'MODERATE', 'impact': 10},
+        {'event': 'FROST', 'severity': 'MODERATE', 'impact': 25},
+        {'event': 'DROUGHT', 'severity': 'SEVERE', 'impact': 50},
+        {'event': 'NONE', 'severity': 'NORMAL', 'impact': 0},
+    ]
+    assert tiers[5].tolist() == [3, 0, 3]
+    assert result['peril'].tolist() == [-1, 0, 0, 1, 2, 0, -1]
+    assert result['event_type'][[1, 3, 4]].tolist() == [WEATHER_EVENT_DROUGHT, WEATHER_EVENT_FLOOD,
+                                                        WEATHER_EVENT_FROST]
+    assert result['event_type'][0] == WEATHER_EVENT_NONE
+
+
+def test_drought_impact_matches_weather_multiplier():
+    weekly = np.arange(0, 20, 0.1)
+    regions = np.concatenate([block(w / 7) for w in weekly], axis=1)
+    result, _ = classify(regions)
+    totals = reduce_window(regions, ['rainfall_mm', 'temp_c', 'humidity_pct'], [('rainfall_mm', 'sum')])
+    for total, impact in zip(totals['rainfall_mm', 'sum'], result['impact']):
+        assert impact == calculate_weather_multiplier(int(np.floor(total))) - 100
+
+
+def test_median_across_providers_matches_calculate_consensus():
+    rng = np.random.default_rng(4)
+    obs = rng.gamma(0.5, 2.0, size=(7, 50, 3, 3)).astype(np.float32)
+    obs[:, :10, 2] = np.nan                                     # Two providers only for some regions
+    stats = reduce_window(obs, ['rainfall_mm', 'temp_c', 'humidity_pct'], [('rainfall_mm', 'sum')])
+    for region in range(obs.shape[1]):
+        readings = [{'rainfall': round(float(obs[:, region, p, 0].astype(np.float64).sum()), 1),
+                     'temperature': 0, 'humidity': 0, 'source': str(p)}
+                    for p in range(3) if not np.isnan(obs[:, region, p, 0]).all()]
+        assert stats['rainfall_mm', 'sum'][region] == calculate_consensus(readings)['rainfall']
+
+
+def test_tier_bounds():
+    drought, flood, frost = DEFAULT_PERILS
+    assert drought.tiers(np.array([0.9, 1.0, 4.99, 5.0, 9.99, 10.0, np.nan])).tolist() == [3, 2, 2, 1, 1, 0, 0]
+    assert flood.tiers(np.array([99.9, 100.0, 150.0, 249.9, 250.0])).tolist() == [0, 1, 2, 2, 3]
+    assert frost.tiers(np.array([3.0, 2.9, 1.0, 0.9, -1.0, -1.1])).tolist() == [0, 1, 1, 2, 2, 3]
@@ -0,0 +1,117 @@
+from agrihook.contract_math import (
+    ALIGNED_FEE,
+    MODE_CIRCUIT_BREAKER,
+    MODE_NORMAL,
+    MODE_RECOVERY,
+    aligned_bonus_rate,
+    misaligned_fee,
+)
+from agrihook.prescreen import (
+    CIRCUIT_BREAKER_REVERT,
+    TIER_ALIGNED,
+    TIER_BLOCKED,
+    TIER_MISALIGNED,
+    SwapPrescreener,
+    status_from_prices,
+)
+
+
+def screener(current_price, oracle_price, treasury=0):
+    s = SwapPrescreener()
+    s.set_status(status_from_prices(current_price, oracle_price, treasury))
+    return s
+
+
+def test_status_from_prices_uses_hook_rules():
+    assert status_from_prices(5_000_000, 5_000_000).mode == MODE_NORMAL
+    status = status_from_prices(7_500_000, 5_000_000)
+    assert (status.deviation, status.mode) == (50, MODE_RECOVERY)
+    status = status_from_prices(2_500_000, 7_500_000)
+    assert (status.deviation, status.mode) == (66, MODE_RECOVERY)
+    assert status_from_prices(10_000_000, 5_000_000).mode == MODE_CIRCUIT_BREAKER
+    # An uninitialised pool price is treated as sitting on the oracle
+    assert status_from_prices(0, 5_000_000).deviation == 0
+
+
+def test_fee_tiers_in_recovery():
+    # Pool 80% above the oracle: selling the commodity (zeroForOne=False with the default key) is aligned
+    sell, buy = screener(9_000_000, 5_000_000, treasury=10**6).screen_batch([(False, 10**6), (True, 10**6)])
+
+    assert (sell.tier, sell.fee, sell.aligned, sell.mode) == (TIER_ALIGNED, ALIGNED_FEE, True, MODE_RECOVERY)
+    assert sell.bonus_eligible and sell.bonus_rate == 3 == aligned_bonus_rate(80)   # 80² × 5 / 10000
+    assert sell.bonus_amount == 300                                                  # 10⁶ × 3 bp
+
+    assert (buy.tier, buy.fee, buy.aligned) == (TIER_MISALIGNED, 3006, False)      # 3000 + 80² × 10 / 10000
+    assert buy.fee == misaligned_fee(80)
+    assert not buy.bonus_eligible and buy.bonus_amount == 0
+
+
+def test_bonus_needs_treasury():
+    prediction = screener(9_000_000, 5_000_000, treasury=299).screen(False, 10**6)
+    assert prediction.bonus_eligible and prediction.bonus_amount == 0
+
+
+def test_normal_mode_pays_no_bonus():
+    prediction = screener(6_000_000, 5_000_000, treasury=10**18).screen(False, 10**6)
+    assert (prediction.mode, prediction.tier, prediction.bonus_eligible) == (MODE_NORMAL, TIER_ALIGNED, False)
+
+
+def test_circuit_breaker_blocks_both_directions():
+    s = screener(15_000_000, 5_000_000)
+    for prediction in s.screen_batch([(True, 1), (False, 1)]):
+        assert (prediction.tier, prediction.fee, prediction.reverts) == (TIER_BLOCKED, 0, True)
+        assert prediction.revert_reason == CIRCUIT_BREAKER_REVERT
+    assert s.doomed([(True, 1), (False, 1), (True, 2)]) == [0, 1, 2]
+
+
+class _Chain:
+    """Minimal w3 stand-in counting eth_blockNumber and getPoolStatus reads"""
+
+    def __init__(self, block=10):
+        self.block = block
+        self.block_reads = 0
+        self.status_blocks = []
+        self.eth = self
+
+    @property
+    def block_number(self):
+        self.block_reads += 1
+        return self.block
+
+    def to_checksum_address(self, address):
+        return address
+
+    def contract(self, address, abi):
+        chain = self
+
+        class Call:
+            def call(self, block_identifier):
+                chain.status_blocks.append(block_identifier)
+                return 7_500_000, 5_000_000, 50, MODE_RECOVERY, 0
+
+        class Functions:
+            def getPoolStatus(self, key):
+                return Call()
+
+        return type('Contract', (), {'functions': Functions()})()
+
+
+def test_status_read_once_per_block():
+    chain = _Chain()
+    s = SwapPrescreener(chain, '0xhook', ('0x0', '0x1', 3000, 60, '0xhook'))
+    for _ in range(100):
+        s.screen(True)
+    assert chain.block_reads == 1 and chain.status_blocks == [10]
+
+    s.new_block(11)
+    s.screen_batch([(True, 0)] * 10)
+    s.screen(False, block_number=11)
+    assert chain.block_reads == 1 and chain.status_blocks == [10, 11]
+
+
+def test_head_from_state_cache():
+    chain = _Chain()
+    cache = type('Cache', (), {'block_number': lambda self: 42})()
+    s = SwapPrescreener(chain, '0xhook', ('0x0', '0x1', 3000, 60, '0xhook'), cache=cache)
+    s.screen(True)
+    assert chain.block_reads == 0 and chain.status_blocks == [42]
@@ -0,0 +1,149 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+
+from agrihook.providers import (
+    DailyObservation, OpenWeatherMapProvider, ProviderClient, ProviderError, VisualCrossingProvider,
+    WeatherApiProvider, summarize, summarize_results, window,
+)
+
+LAT, LON = -18.5122, -44.555
+START, END = date(2026, 10, 12), date(2026, 10, 14)
+
+VISUAL_CROSSING = {'days': [
+    {'datetime': '2026-10-12', 'temp': 24.1, 'precip': 1.2, 'humidity': 61.0},
+    {'datetime': '2026-10-13', 'temp': 25.3, 'precip': None, 'humidity': 58.5},
+    {'datetime': '2026-10-14', 'temp': 22.0, 'humidity': 70.0},
+]}
+WEATHER_API = {
+    '2026-10-12': {'totalprecip_mm': 0.4, 'avgtemp_c': 23.0, 'avghumidity': 64},
+    '2026-10-13': {'totalprecip_mm': 0.0, 'avgtemp_c': 24.0, 'avghumidity': 60},
+    '2026-10-14': {'avgtemp_c': 21.5, 'avghumidity': 75},
+}
+OPENWEATHERMAP = {'main': {'temp': 26.4, 'humidity': 55}, 'rain': {'1h': 0.25}}
+
+
+class FakeResponse:
+    def __init__(self, status, payload):
+        self.status = status
+        self.payload = payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def json(self, content_type=None):
+        return self.payload
+
+
+class FakeSession:
+    """Canned JSON per provider URL; WeatherAPI answers per `dt`"""
+
+    def __init__(self, status=200, delay=0.0):
+        self.status = status
+        self.delay = delay
+        self.requests = []
+        self.closed = False
+
+    def get(self, url, params=None):
+        self.requests.append((url, dict(params or {})))
+        if url.startswith(VisualCrossingProvider.url):
+            payload = VISUAL_CROSSING
+        elif url == WeatherApiProvider.url:
+            payload = {'forecast': {'forecastday': [{'day': WEATHER_API[params['dt']]}]}}
+        else:
+            payload = OPENWEATHERMAP
+        return _Delayed(self.delay, FakeResponse(self.status, payload))
+
+    async def close(self):
+        self.closed = True
+
+
+class _Delayed:
+    def __init__(self, delay, response):
+        self.delay, self.response = delay, response
+
+    async def __aenter__(self):
+        await asyncio.sleep(self.delay)
+        return self.response
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def fetch(provider, session=None):
+    return asyncio.run(provider.fetch_days(session or FakeSession(), LAT, LON, START, END))
+
+
+def test_visual_crossing_normalization():
+    session = FakeSession()
+    rows = fetch(VisualCrossingProvider('key'), session)
+    assert rows == [
+        DailyObservation('visual_crossing', LAT, LON, date(2026, 10, 12), 1.2, 24.1, 61.0),
+        DailyObservation('visual_crossing', LAT, LON, date(2026, 10, 13), 0.0, 25.3, 58.5),
+        DailyObservation('visual_crossing', LAT, LON, date(2026, 10, 14), 0.0, 22.0, 70.0),
+    ]
+    (url, params), = session.requests
+    assert url.endswith(f'/{LAT},{LON}/2026-10-12/2026-10-14')
+    assert params['key'] == 'key' and params['unitGroup'] == 'metric'
+
+
+def test_weather_api_normalization():
+    session = FakeSession()
+    rows = fetch(WeatherApiProvider('key'), session)
+    assert [(o.day, o.rainfall_mm, o.temp_c, o.humidity_pct) for o in rows] == [
+        (date(2026, 10, 12), 0.4, 23.0, 64.0),
+        (date(2026, 10, 13), 0.0, 24.0, 60.0),
+        (date(2026, 10, 14), 0.0, 21.5, 75.0),
+    ]
+    assert sorted(p['dt'] for _, p in session.requests) == ['2026-10-12', '2026-10-13', '2026-10-14']
+    assert all(isinstance(o.humidity_pct, float) for o in rows)
+
+
+def test_openweathermap_extrapolates_and_is_flagged_estimated():
+    rows = fetch(OpenWeatherMapProvider('key'))
+    assert [(o.day, o.rainfall_mm, o.temp_c) for o in rows] == [(START + timedelta(days=i), 6.0, 26.4)
+                                                                 for i in range(3)]
+    assert OpenWeatherMapProvider.estimated and not VisualCrossingProvider.estimated
+
+
+def test_http_errors_and_summaries():
+    with pytest.raises(ProviderError, match='VisualCrossing: HTTP 429'):
+        fetch(VisualCrossingProvider('key'), FakeSession(status=429))
+
+    summary = summarize(fetch(VisualCrossingProvider('key')))
+    assert {k: summary[k] for k in ('source', 'rainfall', 'temperature', 'humidity', 'days')} == \
+        {'source': 'VisualCrossing', 'rainfall': 1.2, 'temperature': 23.8, 'humidity': 63.2, 'days': 3}
+    summaries = summarize_results({'weather_api': ProviderError('WeatherAPI: HTTP 500'),
+                                   'openweathermap': fetch(OpenWeatherMapProvider('key'))})
+    assert summaries['weather_api'] == {'source': 'WeatherAPI', 'success': False, 'error': 'WeatherAPI: HTTP 500'}
+    assert summaries['openweathermap']['rainfall'] == 18.0
+    assert window(7, END) == (END - timedelta(days=6), END)
+
+
+def test_client_cache_coalescing_and_session_reuse():
+    async def run():
+        session = FakeSession(delay=0.02)
+        client = ProviderClient({'visual_crossing': 'k', 'weather_api': 'k'}, ['visual_crossing', 'weather_api'],
+                                cache_ttl=60)
+        client._session = session
+        first = await asyncio.gather(*(client.fetch_all(LAT, LON, days=3, end=END) for _ in range(5)))
+        assert client.requests == 2                            # One upstream fetch per provider
+        assert len(session.requests) == 1 + 3                  # Visual Crossing once, WeatherAPI per day
+        assert all(result == first[0] for result in first)
+
+        again = await client.fetch_all(LAT, LON, days=3, end=END)
+        assert again == first[0] and client.requests == 2 and client.cache_hits == 2
+        assert client.session() is session
+
+        for key in client._cache:                               # TTL over
+            client._cache[key] = (0.0, client._cache[key][1])
+        await client.fetch_all(LAT, LON, days=3, end=END)
+        assert client.requests == 4
+
+        await client.close()
+        assert session.closed and client._session is None
+    asyncio.run(run())
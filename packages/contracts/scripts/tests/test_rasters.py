@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from agrihook.consensus import get_drought_severity
+from agrihook.rasters import GridSpec, PointSampler, RasterStore, drought_summary, severity_tiers
+from agrihook.sharding import SEVERITY_NAMES
+
+# 3 × 4 north-up grid: row centres 0, -1, -2; column centres 10, 11, 12, 13
+SPEC = GridSpec(3, 4, lat0=0.0, lon0=10.0, lat_step=-1.0, lon_step=1.0, nodata=-9999.0)
+GRID = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+
+def test_bilinear_sampling_hand_computed():
+    sampler = PointSampler(SPEC, [0.0, -0.5, -1.25, -2.0, 0.0], [10.0, 10.5, 11.5, 13.0, 13.0])
+    # Pixel centre, centre of 4 pixels (0,1,4,5), 25% down / 50% across from pixel 5, last pixel, corner
+    expected = [0.0, 2.5, 5 + 0.25 * 4 + 0.5 * 1, 11.0, 3.0]
+    assert sampler.sample(GRID).tolist() == pytest.approx(expected)
+
+
+def test_outside_points_read_nan():
+    sampler = PointSampler(SPEC, [0.1, -2.1, -1.0, -1.0], [11.0, 11.0, 9.9, 13.1])
+    assert np.isnan(sampler.sample(GRID)).all()
+
+
+def test_nodata_neighbours_are_renormalized():
+    grid = GRID.copy()
+    grid[0, 1] = SPEC.nodata
+    sampler = PointSampler(SPEC, [-0.5, 0.0], [10.5, 11.0])
+    # Remaining neighbours 0, 4, 5 with equal weights; a point on the nodata pixel itself has no data
+    centre, on_nodata = sampler.sample(grid)
+    assert centre == pytest.approx((0 + 4 + 5) / 3)
+    assert np.isnan(on_nodata)
+
+
+def test_scale_is_applied():
+    spec = GridSpec(3, 4, lat0=0.0, lon0=10.0, lat_step=-1.0, lon_step=1.0, scale=0.1)
+    assert PointSampler(spec, [-1.0], [12.0]).sample(GRID).tolist() == pytest.approx([0.6])
+
+
+def test_store_window_totals(tmp_path):
+    store = RasterStore.create(str(tmp_path), SPEC)
+    end = date(2026, 10, 18)
+    for i in range(7):
+        store.write_day(end - timedelta(days=i), GRID * 0.1)
+    np.save(tmp_path / '2026-10-11.npy', GRID)          # Outside the window, .npy also accepted
+    assert RasterStore(str(tmp_path)).days()[0] == date(2026, 10, 11)
+
+    sampler = store.sampler([0.0, -1.0, 5.0], [10.0, 11.0, 10.0])
+    totals = store.window_totals(sampler, end=end)
+    assert totals[:2].tolist() == [0.0, 3.5]             # 7 × 0.0, 7 × 0.5 (pixel 5 × 0.1)
+    assert np.isnan(totals[2])
+    with pytest.raises(FileNotFoundError):
+        store.window_totals(sampler, end=end + timedelta(days=1))
+    with pytest.raises(ValueError):
+        store.write_day(end, np.zeros((2, 2)))
+
+
+def test_severity_tiers_match_get_drought_severity():
+    totals = np.array([0.0, 0.1, 4.9, 5.0, 9.9, 10.0, 25.0, np.nan])
+    tiers = severity_tiers(totals)
+    for total, tier in zip(totals[:-1], tiers[:-1]):
+        assert SEVERITY_NAMES[tier] == get_drought_severity(float(total))['severity']
+    assert tiers[-1] == -1
+
+    summary = drought_summary(totals)
+    assert summary['points'] == 8 and summary['unobserved'] == 1
+    assert summary['severity'] == {'NORMAL': 2, 'MILD': 2, 'MODERATE': 2, 'SEVERE': 1}
+    # On-chain multipliers use integer millimetres: 0.1 mm floors to 0 → severe
+    assert summary['multiplier'] == {100: 2, 115: 2, 130: 1, 150: 2}
@@ -0,0 +1,78 @@
+import pytest
+from eth_abi.packed import encode_packed
+from eth_utils import keccak
+
+from agrihook.regions import (
+    POLICY_CREATED_TOPIC,
+    RegionGrid,
+    build_grid_table,
+    calculate_region_hash,
+    region_cell,
+    to_e6,
+)
+
+
+def solidity_region_hash(latitude: int, longitude: int) -> bytes:
+    """calculateRegionHash spelled out: (x / 100000) * 100000 with int256 truncation"""
+    rounded_lat = int(latitude / 100000) * 100000
+    rounded_lng = int(longitude / 100000) * 100000
+    return keccak(encode_packed(['int256', 'int256'], [rounded_lat, rounded_lng]))
+
+
+@pytest.mark.parametrize('latitude, longitude', [
+    (-18_512_200, -44_555_000),       # Minas Gerais reference location
+    (-99_999, 99_999),                # Truncates towards zero on both sides
+    (-100_000, 100_000),
+    (0, 0),
+    (90_000_000, -180_000_000),
+])
+def test_region_hash_matches_solidity(latitude, longitude):
+    assert calculate_region_hash(latitude, longitude) == solidity_region_hash(latitude, longitude)
+
+
+def test_region_cell_truncates_towards_zero():
+    assert region_cell(-18_512_200, -44_555_000) == (-185, -445)
+    assert region_cell(-99_999, 99_999) == (0, 0)
+    assert to_e6(-18.5122) == -18_512_200
+
+
+@pytest.fixture(scope='module')
+def grid(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp('grid') / 'grid.bin')
+    with RegionGrid(build_grid_table(path, -19.0, -18.0, -45.0, -44.0)) as grid:
+        yield grid
+
+
+def test_grid_forward_and_reverse_lookup(grid):
+    assert len(grid) == 11 * 11                      # Cells -190..-180 × -450..-440
+    for (lat_cell, lon_cell), h in grid.cells():
+        assert h == solidity_region_hash(lat_cell * 100000, lon_cell * 100000)
+        assert grid.lookup(h) == (lat_cell, lon_cell)
+
+    h = grid.region_hash(-18_512_200, -44_555_000)
+    assert h == calculate_region_hash(-18_512_200, -44_555_000)
+    assert grid.coordinates(h) == (-18_500_000, -44_500_000)
+    assert grid.coordinates('0x' + h.hex()) == (-18_500_000, -44_500_000)
+
+
+def test_grid_outside_table(grid):
+    h = grid.region_hash(10_000_000, 10_000_000)
+    assert h == solidity_region_hash(10_000_000, 10_000_000)
+    assert grid.lookup(h) is None and grid.coordinates(h) is None
+
+
+def test_decode_policy_created(grid):
+    farmer = bytes.fromhex('ab' * 20)
+    region = calculate_region_hash(-18_512_200, -44_555_000)
+    log = {
+        'topics': [POLICY_CREATED_TOPIC, '0x' + (b'\0' * 12 + farmer).hex(), '0x' + region.hex()],
+        'data': '0x' + (5000 * 10**6).to_bytes(32, 'big').hex() + (10**17).to_bytes(32, 'big').hex(),
+    }
+    assert grid.decode_policy_created(log) == {
+        'farmer': '0x' + farmer.hex(),
+        'region_hash': '0x' + region.hex(),
+        'latitude': -18_500_000,
+        'longitude': -44_500_000,
+        'coverage_amount': 5000 * 10**6,
+        'premium_paid': 10**17,
+    }
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from agrihook.regions import calculate_region_hash
+from agrihook.registry import Bitset, FarmRegistry, PolicyRegistry
+
+MINAS = calculate_region_hash(-18_512_200, -44_555_000)
+SUL = calculate_region_hash(-21_700_000, -45_400_000)
+YEAR = 365 * 86400
+
+
+def farmer(i: int) -> str:
+    return '0x' + i.to_bytes(20, 'big').hex()
+
+
+def policy(region: bytes, coverage: int, start: int = 1_700_000_000, active=True, claimed=False):
+    """getPolicy() result tuple"""
+    return (-18_512_200, -44_555_000, region, coverage, coverage // 20, start, start + YEAR, active, claimed)
+
+
+@pytest.fixture
+def registry():
+    r = PolicyRegistry(capacity=2)                       # Forces growth
+    r.add_policy(farmer(1), policy(MINAS, 5_000 * 10**6))
+    r.add_policy(farmer(2), policy(MINAS, 10_000 * 10**6, claimed=True))
+    r.add_policy(farmer(3), policy(SUL, 1_000 * 10**6))
+    r.add_policy(farmer(4), policy(MINAS, 2_000 * 10**6, active=False))
+    r.add_policy(farmer(5), policy(MINAS, 3_000 * 10**6, start=1_800_000_000))
+    return r
+
+
+def test_rows_round_trip(registry):
+    row = registry[0]
+    assert row.to_dict() == {
+        'farmer': farmer(1), 'latitude': -18_512_200, 'longitude': -44_555_000,
+        'region_hash': '0x' + MINAS.hex(), 'coverage': 5_000 * 10**6, 'premium': 250 * 10**6,
+        'start_time': 1_700_000_000, 'end_time': 1_700_000_000 + YEAR, 'active': True, 'claimed': False,
+    }
+    assert registry[-1].farmer == farmer(5)
+    assert len(registry) == 5 and registry.capacity >= 5
+    assert registry.nbytes() == 5 * 84 + 2                # 84-byte rows plus two 1-byte bitsets
+
+
+def test_claimable_matches_hand_count(registry):
+    now = 1_710_000_000
+    assert registry.claimable(MINAS, now).tolist() == [True, False, False, False, False]
+    assert registry.total_coverage(registry.in_force(now)) == 15_000 * 10**6 + 1_000 * 10**6
+    assert registry.by_region(registry.unclaimed()) == {
+        '0x' + MINAS.hex(): (2, 8_000 * 10**6),
+        '0x' + SUL.hex(): (1, 1_000 * 10**6),
+    }
+    registry.set_flag('claimed', [0])
+    assert not registry.claimable(MINAS, now).any()
+
+
+def test_find_returns_latest_row(registry):
+    assert registry.find(farmer(3)) == 2
+    registry.add_policy(farmer(3), policy(SUL, 4_000 * 10**6))
+    assert registry.find(farmer(3)) == 5
+    assert registry.find(bytes.fromhex(farmer(3)[2:])) == 5
+    assert registry.find(farmer(99)) is None
+
+
+def test_out_of_range_values_are_rejected():
+    r = PolicyRegistry()
+    with pytest.raises(OverflowError):
+        r.add_policy(farmer(1), policy(MINAS, 2**64))
+    with pytest.raises(ValueError):
+        r.extend(farmer=[farmer(1)], coverage=[1, 2])
+    with pytest.raises(ValueError):
+        r.extend(farmer=[farmer(1)], unknown=[1])
+
+
+def test_save_and_memory_map(registry, tmp_path):
+    registry.save(str(tmp_path))
+    loaded = PolicyRegistry.load(str(tmp_path))
+    assert [row.to_dict() for row in loaded] == [row.to_dict() for row in registry]
+    assert isinstance(loaded.columns['coverage'], np.memmap)
+    with pytest.raises(ValueError):
+        loaded.set_flag('claimed', [0])
+    with pytest.raises(ValueError):
+        FarmRegistry.load(str(tmp_path))
+
+    writable = PolicyRegistry.load(str(tmp_path), mode='r+')
+    writable.set_flag('claimed', [2])
+    assert PolicyRegistry.load(str(tmp_path))[2].claimed
+
+
+def test_bitset_growth_and_assign():
+    bits = Bitset(np.zeros(1, dtype=np.uint8))
+    bits.reserve(20)
+    bits.assign(5, [True, False, True, True])
+    bits.set([17])
+    assert np.flatnonzero(bits.mask(20)).tolist() == [5, 7, 8, 17]
+    bits.set([7, 17], False)
+    assert np.flatnonzero(bits.mask(20)).tolist() == [5, 8]
+
+
+def test_farm_coordinates():
+    farms = FarmRegistry()
+    farms.add_farmer(farmer(1), -18_512_200, -44_555_000, 120)
+    lat, lon = farms.coordinates()
+    assert (lat[0], lon[0]) == (-18.5122, -44.555)
+    assert farms[0].registered and farms[0].expected_bags == 120
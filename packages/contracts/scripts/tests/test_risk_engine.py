@@ -0,0 +1,85 @@
+import math
+from datetime import date
+
+import numpy as np
+
+from agrihook.contract_math import calculate_weather_multiplier
+from agrihook.regions import cell_hash
+from agrihook.risk_engine import MIN_WINDOW_DAYS, RAIN_WINDOW_DAYS, RiskEngine
+
+
+def reference_scores(rainfall: np.ndarray, window: int) -> list:
+    """Scores of the last `window` days recomputed from scratch with the scalar contract model"""
+    n_days, n_regions = rainfall.shape
+    scores = []
+    for region in range(n_regions):
+        observed = drought = excess_sum = 0
+        for day in range(max(0, n_days - window), n_days):
+            rain = rainfall[max(0, day - RAIN_WINDOW_DAYS + 1):day + 1, region]
+            seen = rain[~np.isnan(rain)]
+            if len(seen) < MIN_WINDOW_DAYS:
+                continue
+            total = float(np.float32(seen.sum(dtype=np.float32)) * RAIN_WINDOW_DAYS / len(seen))
+            excess = calculate_weather_multiplier(math.floor(total)) - 100
+            observed += 1
+            drought += excess > 0
+            excess_sum += excess
+        scores.append(-1 if not observed else min(max(round((50 * drought + excess_sum) / observed), 0), 100))
+    return scores
+
+
+def test_hand_computed_tiers():
+    engine = RiskEngine(4, current_days=5, historical_days=12)
+    # 0 mm → severe (150), 0.5 mm/day → 3.5 mm/week → moderate (130), 1 mm/day → mild (115), 3 mm/day → normal
+    engine.update_many(np.tile([0.0, 0.5, 1.0, 3.0], (10, 1)), date(2026, 1, 1))
+    current, historical = engine.scores()
+    assert current.tolist() == [100, 80, 65, 0]          # 50 + excess on every scored day
+    assert historical.tolist() == [100, 80, 65, 0]
+    assert engine.last_day == date(2026, 1, 10)
+
+
+def test_too_few_observed_days_is_unscored():
+    engine = RiskEngine(2, current_days=5, historical_days=12)
+    engine.update_many(np.zeros((MIN_WINDOW_DAYS - 1, 2)))
+    assert [s.tolist() for s in engine.scores()] == [[-1, -1], [-1, -1]]
+    engine.update([0.0, np.nan])
+    assert engine.scores()[0].tolist() == [100, -1]
+
+
+def test_incremental_matches_recomputation():
+    rng = np.random.default_rng(3)
+    rainfall = rng.gamma(0.5, 2.0, size=(40, 25)).astype(np.float32)
+    rainfall[rng.random(rainfall.shape) < 0.15] = np.nan
+    engine = RiskEngine(0, current_days=6, historical_days=15)
+    for day in range(len(rainfall)):
+        engine.update(rainfall[day])
+        current, historical = engine.scores()
+        assert current.tolist() == reference_scores(rainfall[:day + 1], 6)
+        assert historical.tolist() == reference_scores(rainfall[:day + 1], 15)
+
+
+def test_new_regions_grow_the_engine():
+    engine = RiskEngine(1, current_days=5, historical_days=12)
+    engine.update_many(np.zeros((6, 1)))
+    engine.update_many(np.zeros((6, 3)))
+    assert engine.n_regions == 3
+    assert engine.scores()[0].tolist() == [100, 100, 100]
+
+
+def test_changed_and_published(tmp_path):
+    engine = RiskEngine(3, current_days=5, historical_days=12)
+    engine.update_many(np.tile([0.0, 3.0, np.nan], (6, 1)))
+    cells = np.array([[-185, -445], [-186, -445], [-187, -445]])
+    assert engine.pending_updates(cells) == [(cell_hash(-185, -445), 100, 100)]   # 0 is already "published"
+
+    ids, _, _ = engine.changed()
+    engine.mark_published(ids)
+    assert engine.pending_updates(cells) == []
+
+    path = str(tmp_path / 'risk.npz')
+    engine.save(path)
+    restored = RiskEngine.load(path)
+    restored.update([3.0, 3.0, 3.0])
+    engine.update([3.0, 3.0, 3.0])
+    assert [s.tolist() for s in restored.scores()] == [s.tolist() for s in engine.scores()]
+    assert restored.changed()[0].tolist() == engine.changed()[0].tolist()
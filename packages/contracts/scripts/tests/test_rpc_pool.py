@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agrihook.rpc_pool import MAX_CONSECUTIVE_FAILURES, NoHealthyEndpoint, RPCPool
+
+
+class StubNode:
+    """Local JSON-RPC endpoint with injected latency and a switchable failure mode"""
+
+    def __init__(self, name: str, delay: float = 0.0, mode: str = 'ok'):
+        self.name = name
+        self.delay = delay
+        self.mode = mode                  # ok | rate_limited | revert
+        self.calls = []
+        node = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                time.sleep(node.delay)
+                reply = [node.answer(r) for r in body] if isinstance(body, list) else node.answer(body)
+                data = json.dumps(reply).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def answer(self, request):
+        self.calls.append(request['method'])
+        if self.mode == 'rate_limited':
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': -32005, 'message': 'limit exceeded'}}
+        if self.mode == 'revert':
+            return {'jsonrpc': '2.0', 'id': request['id'], 'error': {'code': 3, 'message': 'execution reverted'}}
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': self.name}
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def _closed_url() -> str:
+    node = StubNode('gone')
+    node.close()
+    return node.url
+
+
+@pytest.fixture
+def nodes():
+    started = []
+
+    def start(*args, **kwargs):
+        node = StubNode(*args, **kwargs)
+        started.append(node)
+        return node
+
+    yield start
+    for node in started:
+        node.close()
+
+
+def test_reads_settle_on_the_fastest_endpoint(nodes):
+    slow, fast = nodes('slow', delay=0.05), nodes('fast')
+    pool = RPCPool([slow.url, fast.url], timeout=2)
+    answers = [pool.make_request('eth_chainId', [])['result'] for _ in range(20)]
+    assert answers[:2] == ['slow', 'fast']          # Each untried endpoint is sampled once
+    assert answers[2:] == ['fast'] * 18
+    latency = {e['url']: e['latency_ms'] for e in pool.metrics()['endpoints']}
+    assert latency[slow.url] >= 50 > latency[fast.url]
+
+
+def test_rate_limited_endpoint_fails_over_and_loses_rank(nodes):
+    limited, good = nodes('limited', mode='rate_limited'), nodes('good', delay=0.01)
+    pool = RPCPool([limited.url, good.url], timeout=2)
+    assert pool.make_request('eth_blockNumber', [])['result'] == 'good'
+    assert pool.failovers == 1
+    assert [e.url for e in pool._ranked()] == [good.url, limited.url]
+    assert pool.make_request('eth_blockNumber', [])['result'] == 'good'
+    assert limited.calls == ['eth_blockNumber']
+
+    # Request errors are the caller's: no failover, no penalty
+    reverting = nodes('reverting', mode='revert')
+    pool = RPCPool([reverting.url, good.url], timeout=2)
+    assert pool.make_request('eth_call', [{'to': '0x' + '00' * 20}, 'latest'])['error']['code'] == 3
+    assert pool.failovers == 0 and pool.endpoints[0].errors == 0
+
+
+def test_dead_endpoint_is_benched_and_ranks_last_after_its_bench(nodes):
+    good = nodes('good', delay=0.01)
+    pool = RPCPool([_closed_url(), good.url], timeout=2)
+    dead, alive = pool.endpoints
+    assert pool.make_request('net_version', [])['result'] == 'good'
+    assert pool.failovers == 1 and dead.latency is None
+    assert pool._ranked() == [alive, dead]
+
+    for _ in range(MAX_CONSECUTIVE_FAILURES - 1):
+        with pytest.raises(Exception):
+            pool._call(dead, 'net_version', [])
+    assert not dead.healthy(time.monotonic())
+    assert pool._ranked() == [alive, dead]
+
+    # Bench expired: an endpoint that never answered must not outrank a measured one
+    dead.benched_until = 0.0
+    assert dead.score() > alive.score()
+    assert pool._ranked() == [alive, dead]
+    assert pool.make_request('net_version', [])['result'] == 'good'
+    assert pool.failovers == 1
+
+
+def test_every_endpoint_down_raises():
+    pool = RPCPool([_closed_url(), _closed_url()], timeout=1)
+    with pytest.raises(NoHealthyEndpoint):
+        pool.make_request('eth_getCode', ['0x' + '00' * 20, 'latest'])
+
+
+def test_raw_transactions_are_broadcast(nodes):
+    a, b, c = nodes('a'), nodes('b', delay=0.02), nodes('c', delay=0.02)
+    pool = RPCPool([a.url, b.url, c.url], timeout=2)
+    assert pool.make_request('eth_sendRawTransaction', ['0x01'])['result'] in ('a', 'b', 'c')
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and not all(n.calls for n in (a, b, c)):
+        time.sleep(0.01)
+    assert [n.calls for n in (a, b, c)] == [['eth_sendRawTransaction']] * 3
+    pool.close()
+
+
+def test_batches_fail_over_together(nodes):
+    limited, good = nodes('limited', mode='rate_limited'), nodes('good')
+    pool = RPCPool([limited.url, good.url], timeout=2)
+    responses = pool.make_batch_request([('eth_blockNumber', []), ('eth_chainId', [])])
+    assert [r['result'] for r in responses] == ['good', 'good']
+    assert limited.calls == ['eth_blockNumber', 'eth_chainId']
+    assert good.calls == ['eth_blockNumber', 'eth_chainId']
+    assert pool.failovers == 1
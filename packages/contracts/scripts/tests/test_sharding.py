@@ -0,0 +1,88 @@
+import numpy as np
+from eth_abi import encode
+
+from agrihook.consensus import calculate_consensus
+from agrihook.contract_math import calculate_premium, calculate_weather_multiplier, weather_event_for_rainfall
+from agrihook.regions import GRID_UNITS, cell_hash
+from agrihook.sharding import RESULT_DTYPE, ShardedExecutor, process_regions, shard_of
+
+N_REGIONS = 300
+COVERAGE = 5000 * 10**6
+
+
+def synthetic(seed: int = 11):
+    rng = np.random.default_rng(seed)
+    observations = rng.gamma(0.6, 3.0, size=(7, N_REGIONS, 3, 3)).astype(np.float32)
+    observations[..., 1] = rng.normal(24, 3, size=(7, N_REGIONS, 3))
+    observations[..., 2] = rng.uniform(30, 90, size=(7, N_REGIONS, 3))
+    observations[:, rng.random(N_REGIONS) < 0.1, 2] = np.nan          # Third provider missing
+    observations[:, rng.random(N_REGIONS) < 0.05, 1:] = np.nan        # Single source: invalid
+    observations[rng.random((7, N_REGIONS, 3)) < 0.02] = np.nan       # Scattered missing days
+    cells = np.stack([rng.integers(-250, -150, N_REGIONS), rng.integers(-500, -400, N_REGIONS)], axis=1)
+    risk = rng.integers(0, 101, size=(N_REGIONS, 2))
+    return observations, cells, risk
+
+
+def reference(observations, cells, risk, region, total_coverage, treasury, timestamp):
+    """One region through calculate_consensus, the contract multiplier and calculatePremium"""
+    readings = []
+    for p in range(observations.shape[2]):
+        days = observations[:, region, p].astype(np.float64)
+        if np.isnan(days[:, 0]).all():
+            continue
+        present = ~np.isnan(days[:, 0])
+        readings.append({'rainfall': round(float(np.nansum(days[:, 0])), 1),
+                         'temperature': round(float(np.nanmean(days[present, 1])), 1),
+                         'humidity': round(float(np.nanmean(days[present, 2])), 1), 'source': str(p)})
+    premium = calculate_premium(COVERAGE, int(risk[region, 0]), int(risk[region, 1]), total_coverage, treasury)
+    if len(readings) < 2:
+        return None, premium
+    consensus = calculate_consensus(readings)
+    rainfall = int(np.floor(consensus['rainfall']))
+    words = [int(consensus['rainfall'] * 100), int(consensus['temperature'] * 100), 0,
+             int(cells[region, 0]) * GRID_UNITS, int(cells[region, 1]) * GRID_UNITS, timestamp]
+    return {
+        'rainfall': consensus['rainfall'],
+        'temperature': consensus['temperature'],
+        'humidity': consensus['humidity'],
+        'agreement': consensus['consensus'],
+        'multiplier': calculate_weather_multiplier(rainfall),
+        'event_type': weather_event_for_rainfall(rainfall)[0],
+        'weather_data': encode(['uint256'] + ['int256'] * 5, words),
+    }, premium
+
+
+def test_regions_match_scalar_models():
+    observations, cells, risk = synthetic()
+    total_coverage, treasury = 60 * 10**6, 100 * 10**6         # 59% utilization: ×1.25
+    with ShardedExecutor(workers=0) as executor:
+        results = executor.run(observations, cells, risk, coverage=COVERAGE, total_coverage=total_coverage,
+                               treasury_balance=treasury, timestamp=1_760_000_000)
+    assert 0 < (~results['valid']).sum() < N_REGIONS
+    for region in range(N_REGIONS):
+        expected, premium = reference(observations, cells, risk, region, total_coverage, treasury,
+                                      1_760_000_000)
+        row = results[region]
+        assert row['premium'] == premium
+        assert bool(row['valid']) == (expected is not None), region
+        if expected is None:
+            continue
+        for name in ('rainfall', 'temperature', 'humidity', 'agreement', 'multiplier', 'event_type'):
+            assert row[name] == expected[name], (region, name)
+        assert row['weather_data'].tobytes() == expected['weather_data']
+
+
+def test_pooled_run_equals_in_process():
+    observations, cells, risk = synthetic(seed=12)
+    hashes = [cell_hash(int(a), int(b)) for a, b in cells]
+    with ShardedExecutor(workers=0, shards=5) as executor:
+        local = executor.run(observations, cells, risk, timestamp=0, region_hashes=hashes)
+    with ShardedExecutor(workers=2, shards=5) as executor:
+        pooled = executor.run(observations, cells, risk, timestamp=0, region_hashes=hashes)
+    assert pooled.view(np.uint8).tobytes() == local.view(np.uint8).tobytes()
+
+    # Shards are stable per region and the unsharded call gives the same rows
+    assert np.array_equal(shard_of(hashes, 5), shard_of(hashes[::-1], 5)[::-1])
+    whole = np.zeros(N_REGIONS, dtype=RESULT_DTYPE)
+    process_regions(observations, cells, risk, whole, coverage=5000 * 10**6, premium_multiplier=100, timestamp=0)
+    assert whole.view(np.uint8).tobytes() == local.view(np.uint8).tobytes()
@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agrihook.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    group = SingleFlight('test')
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'block-42'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(group.do('k', upstream)))
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=lambda: results.append(group.do('k', upstream))) for _ in range(8)]
+    for t in followers:
+        t.start()
+    while group.stats['k'].joined < 8:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader] + followers:
+        t.join(5)
+
+    assert results == ['block-42'] * 9 and len(calls) == 1
+    assert group.stats['k'].to_dict() == {'calls': 9, 'upstream': 1, 'joined': 8, 'errors': 0, 'negative_hits': 0}
+    # Nothing in flight afterwards: the next call runs again
+    assert group.do('k', lambda: 'block-43') == 'block-43'
+
+
+def test_failures_are_negatively_cached():
+    group = SingleFlight('test', negative_ttl=60)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ConnectionError('rpc down')
+
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            group.do('k', failing)
+    assert len(calls) == 1 and group.totals()['negative_hits'] == 2
+
+    group.forget('k')
+    assert group.do('k', lambda: 'ok') == 'ok'
+
+
+def test_negative_cache_expires():
+    group = SingleFlight('test', negative_ttl=0.01)
+    with pytest.raises(ValueError):
+        group.do('k', lambda: (_ for _ in ()).throw(ValueError('x')))
+    time.sleep(0.02)
+    assert group.do('k', lambda: 1) == 1
+
+
+def test_key_stats_are_bounded():
+    group = SingleFlight('test', max_keys=3)
+    for key in range(5):
+        group.do(key, lambda: None)
+    assert list(group.stats) == [2, 3, 4]
+    assert group.top(1)[0][1]['calls'] == 1
+
+
+def test_async_callers_share_one_call():
+    group = AsyncSingleFlight('test')
+    calls = []
+
+    async def fetch(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def main():
+        return await asyncio.gather(*(group.do('k', fetch, 7) for _ in range(10)))
+
+    assert asyncio.run(main()) == [7] * 10 and calls == [7]
+    assert group.totals()['joined'] == 9
+
+
+def test_async_leader_cancellation_hands_over():
+    group = AsyncSingleFlight('test')
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 'done'
+
+    async def main():
+        leader = asyncio.ensure_future(group.do('k', fetch))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(group.do('k', fetch))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        return await follower
+
+    assert asyncio.run(main()) == 'done' and len(calls) == 2
+
+
+def test_async_failure_reaches_every_caller_once():
+    group = AsyncSingleFlight('test', negative_ttl=60)
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise TimeoutError('provider timeout')
+
+    async def main():
+        results = await asyncio.gather(*(group.do('k', fetch) for _ in range(5)), return_exceptions=True)
+        with pytest.raises(TimeoutError):
+            await group.do('k', fetch)
+        return results
+
+    assert all(isinstance(r, TimeoutError) for r in asyncio.run(main()))
+    assert len(calls) == 1 and group.totals()['negative_hits'] == 1
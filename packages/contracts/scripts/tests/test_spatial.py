@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from agrihook.regions import calculate_region_hash, region_cell, to_e6
+from agrihook.spatial import SpatialIndex, assign_regions, region_cells
+
+
+def test_region_cells_match_scalar_reference():
+    rng = np.random.default_rng(1)
+    lat, lon = rng.uniform(-30, 5, 500), rng.uniform(-75, -35, 500)
+    lat[:4], lon[:4] = [-18.5122, -0.05, 0.05, -0.1], [-44.555, 0.05, -0.05, -0.1]
+    expected = [region_cell(to_e6(a), to_e6(b)) for a, b in zip(lat, lon)]
+    assert [tuple(c) for c in region_cells(lat, lon).tolist()] == expected
+
+
+def test_assign_regions_groups_by_region_hash():
+    lat = [-18.5122, -18.55, -18.45, -18.5122]
+    lon = [-44.555, -44.59, -44.555, -44.555]
+    assignment = assign_regions(lat, lon)
+    assert len(assignment.cells) == 2
+    for point, region in enumerate(assignment.region_of):
+        assert assignment.hashes[region] == calculate_region_hash(to_e6(lat[point]), to_e6(lon[point]))
+    assert assignment.region_of[0] == assignment.region_of[1] == assignment.region_of[3]
+
+
+@pytest.fixture(scope='module')
+def points():
+    rng = np.random.default_rng(2)
+    return rng.uniform(-25, -15, 3000), rng.uniform(-50, -40, 3000)
+
+
+@pytest.mark.parametrize('bucket_cells', [None, 1, 7])
+def test_nearest_matches_brute_force(points, bucket_cells):
+    lat, lon = points
+    index = SpatialIndex(lat, lon, bucket_cells)
+    rng = np.random.default_rng(3)
+    q_lat, q_lon = rng.uniform(-27, -13, 400), rng.uniform(-52, -38, 400)
+    ids, km = index.nearest(q_lat, q_lon)
+    for i in range(len(q_lat)):
+        brute = SpatialIndex.distance_km(q_lat[i], q_lon[i], lat, lon)
+        assert km[i] == pytest.approx(brute.min())
+        assert brute[ids[i]] == pytest.approx(brute.min())
+
+
+def test_nearest_respects_max_km(points):
+    index = SpatialIndex(*points)
+    ids, km = index.nearest([-20.0, 10.0], [-45.0, 10.0], max_km=50)
+    assert ids[0] >= 0 and km[0] <= 50
+    assert ids[1] == -1 and km[1] == np.inf
+
+
+def test_bbox_and_within(points):
+    lat, lon = points
+    index = SpatialIndex(lat, lon)
+    box = index.bbox(-20.0, -19.0, -45.0, -44.0)
+    expected = np.flatnonzero((lat >= -20) & (lat <= -19) & (lon >= -45) & (lon <= -44))
+    assert sorted(box.tolist()) == expected.tolist()
+    assert index.bbox(10, 11, 10, 11).size == 0
+
+    near = index.within(-20.0, -45.0, 30)
+    brute = SpatialIndex.distance_km(-20.0, -45.0, lat, lon)
+    assert sorted(near.tolist()) == np.flatnonzero(brute <= 30).tolist()
+    assert np.all(np.diff(brute[near]) >= 0)                    # Nearest first
+
+
+def test_one_degree_is_about_111_km():
+    assert SpatialIndex.distance_km(0.0, 0.0, [1.0], [0.0])[0] == pytest.approx(111.195)
+    # Longitude shrinks with cos(latitude)
+    assert SpatialIndex.distance_km(60.0, 0.0, [60.0], [1.0])[0] == pytest.approx(111.195 / 2)
@@ -0,0 +1,134 @@
+from eth_utils import keccak, to_checksum_address
+
+from agrihook.state_cache import EVENT_SIGNATURES, MAX_LOG_RANGE, StateCache
+
+ORACLE = to_checksum_address('0x' + '11' * 20)
+VAULT = to_checksum_address('0x' + '22' * 20)
+
+
+def topic(event: str):
+    return keccak(text=EVENT_SIGNATURES[event])                # HexBytes-like, as web3 returns them
+
+
+class FakeEth:
+    def __init__(self):
+        self.block_number = 100
+        self.logs = []                                         # (block, address, event)
+        self.log_queries = []
+
+    def get_logs(self, params):
+        self.log_queries.append((params['fromBlock'], params['toBlock'], tuple(params['address'])))
+        return [{'address': address.lower(), 'topics': [topic(event)]}
+                for block, address, event in self.logs
+                if params['fromBlock'] <= block <= params['toBlock'] and address in params['address']]
+
+
+class FakeW3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+    @staticmethod
+    def to_checksum_address(address):
+        return to_checksum_address(address)
+
+
+class FakeContract:
+    """Views return (name, args, block) and count the reads that reach the node"""
+
+    def __init__(self, address, pure=()):
+        self.address = address
+        self.abi = [{'type': 'function', 'name': name, 'stateMutability': 'pure'} for name in pure]
+        self.reads = []
+        contract = self
+
+        class Functions:
+            def __getattr__(self, name):
+                def bind(*args):
+                    class Bound:
+                        def call(self, block_identifier=None):
+                            contract.reads.append((name, args, block_identifier))
+                            return (name, args, block_identifier)
+                    return Bound()
+                return bind
+        self.functions = Functions()
+
+
+def cache_at(block=100):
+    w3 = FakeW3()
+    w3.eth.block_number = block
+    return w3, StateCache(w3, block_ttl=3600)
+
+
+def test_immutable_and_block_scoped_reads():
+    w3, cache = cache_at()
+    oracle = FakeContract(ORACLE, pure=('calculatePremiumPure',))
+    for _ in range(3):
+        cache.call(oracle, 'decimals')
+        cache.call(oracle, 'calculatePremiumPure', 1)
+        cache.call(oracle, 'owner')                            # No dependencies: block-scoped
+    assert [r[0] for r in oracle.reads] == ['decimals', 'calculatePremiumPure', 'owner']
+    assert oracle.reads[2][2] == 100
+
+    cache.new_block(101)
+    assert cache.call(oracle, 'owner')[2] == 101
+    assert cache.call(oracle, 'decimals')[2] is None
+    assert len(oracle.reads) == 4
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (7, 4)
+    assert stats['functions']['owner'] == {'hits': 2, 'misses': 2}
+
+
+def test_event_scoped_reads_survive_quiet_blocks_and_drop_on_their_events():
+    w3, cache = cache_at()
+    oracle, vault = FakeContract(ORACLE), FakeContract(VAULT)
+    cache.call(oracle, 'basePrice')
+    cache.call(vault, 'totalCoverage')
+    cache.call(vault, 'regionRisks', b'\x01' * 32)
+
+    cache.new_block(105)                                       # No logs
+    assert cache.call(oracle, 'basePrice')[2] == 100
+    assert w3.eth.log_queries == [(101, 105, (ORACLE, VAULT))]
+
+    w3.eth.logs = [(107, VAULT, 'PolicyCreated'), (108, ORACLE, 'PolicyCreated')]
+    cache.new_block(110)
+    assert cache.call(vault, 'totalCoverage')[2] == 110        # PolicyCreated changes vault totals
+    assert cache.call(vault, 'regionRisks', b'\x01' * 32)[2] == 100   # ... but not region risks
+    assert cache.call(oracle, 'basePrice')[2] == 100           # Same event from another address
+    assert cache.invalidations == 1
+
+    w3.eth.logs.append((111, ORACLE, 'FTSOPriceUpdated'))
+    cache.new_block(111)
+    assert cache.call(oracle, 'basePrice')[2] == 111
+
+
+def test_gap_wider_than_log_range_drops_event_scoped_reads():
+    w3, cache = cache_at()
+    oracle = FakeContract(ORACLE)
+    cache.call(oracle, 'basePrice')
+    cache.call(oracle, 'getCurrentWeatherEvent')
+    queries = len(w3.eth.log_queries)
+
+    cache.new_block(100 + MAX_LOG_RANGE + 1)
+    assert len(w3.eth.log_queries) == queries                  # Too wide to scan: nothing is asked
+    assert cache.invalidations == 2
+    assert cache.call(oracle, 'basePrice')[2] == 100 + MAX_LOG_RANGE + 1
+
+    cache.new_block(100 + 2 * MAX_LOG_RANGE)                   # Within range again: scanned
+    assert w3.eth.log_queries[-1] == (100 + MAX_LOG_RANGE + 2, 100 + 2 * MAX_LOG_RANGE, (ORACLE,))
+    assert cache.call(oracle, 'basePrice')[2] == 100 + MAX_LOG_RANGE + 1
+
+
+def test_reorg_and_snapshots():
+    w3, cache = cache_at()
+    oracle = FakeContract(ORACLE)
+    cache.call(oracle, 'basePrice')
+    cache.new_block(98)                                        # Head moved backwards
+    assert cache.call(oracle, 'basePrice')[2] == 98
+
+    # A snapshot above the scanned head must not reuse event-scoped reads
+    with cache.snapshot(120) as block:
+        assert block == 120
+        assert cache.call(oracle, 'basePrice')[2] == 120
+        assert cache.call(oracle, 'basePrice')[2] == 120
+    assert cache.call(oracle, 'basePrice')[2] == 98
+    assert cache.block_number() == 98
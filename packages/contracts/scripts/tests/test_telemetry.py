@@ -0,0 +1,105 @@
+import json
+import random
+
+from agrihook.telemetry import NULL_SPAN, QUANTILES, ConsoleSink, Histogram, Telemetry, _bucket, _bucket_value
+
+MAX_ERROR = 1 / 64                 # Bucket width over its lowest value above the linear range
+
+
+def test_buckets_bound_the_relative_error():
+    values = list(range(0, 5000)) + [int(1.07 ** k) for k in range(400)] + [2**40 - 1, 2**40]
+    previous = -1
+    for value in sorted(values):
+        index = _bucket(value)
+        upper = _bucket_value(index)
+        assert index >= previous
+        previous = index
+        assert upper >= value and _bucket(upper) == index
+        assert upper - value <= max(value * MAX_ERROR, 0)
+
+
+def test_percentiles_against_exact_quantiles():
+    rng = random.Random(5)
+    samples = [int(rng.lognormvariate(8, 1.5)) for _ in range(20_000)]
+    histogram = Histogram()
+    for value in samples:
+        histogram.record(value)
+    ordered = sorted(samples)
+    for q in QUANTILES + (0.0, 0.25, 1.0):
+        exact = ordered[max(1, int(q * len(ordered) + 0.5)) - 1]
+        assert exact <= histogram.percentile(q) <= exact * (1 + MAX_ERROR)
+    assert histogram.percentile(1.0) == max(samples)
+    assert (histogram.min, histogram.max, histogram.count) == (min(samples), max(samples), len(samples))
+    assert Histogram().percentile(0.5) == 0
+
+
+def test_disabled_telemetry_is_a_no_op():
+    telemetry = Telemetry(enabled=False)
+    seen = []
+    telemetry.sinks.append(lambda *args: seen.append(args))
+    assert telemetry.span('rpc.request', method='eth_call') is NULL_SPAN
+    with telemetry.span('x'):
+        pass
+    telemetry.count('hits')
+    telemetry.observe('x', 0.5)
+
+    @telemetry.timed('decorated')
+    def add(a, b):
+        """Adds"""
+        return a + b
+
+    assert add(2, 3) == 5 and add.__doc__ == 'Adds'
+    assert telemetry.to_json() == {'spans': [], 'counters': []}
+    assert telemetry.prometheus() == '\n' and seen == []
+
+    messages = []
+    telemetry.messages.append(messages.append)
+    telemetry.echo('✅ still printed')
+    assert messages == ['✅ still printed']
+
+
+def test_json_and_prometheus_export(tmp_path):
+    telemetry = Telemetry(enabled=True)
+    for micros in (1000, 2000, 3000, 4000):
+        telemetry.observe('rpc.request', micros / 1e6, endpoint='https://a/"x"')
+    try:
+        with telemetry.span('tx.send'):
+            raise ValueError('nonce too low')
+    except ValueError:
+        pass
+    telemetry.count('cache.hits', 3, fn='basePrice')
+
+    data = telemetry.to_json()
+    rpc = data['spans'][0]
+    assert rpc['name'] == 'rpc.request' and rpc['labels'] == {'endpoint': 'https://a/"x"'}
+    assert (rpc['count'], rpc['sum_ms'], rpc['min_ms'], rpc['max_ms'], rpc['mean_ms']) == (4, 10.0, 1.0, 4.0, 2.5)
+    assert 2.0 <= rpc['p50_ms'] <= 2.0 * (1 + MAX_ERROR) and rpc['p99.9_ms'] == 4.0
+    assert {c['name']: c['value'] for c in data['counters']} == {'cache.hits': 3, 'tx.send.errors': 1}
+
+    text = telemetry.prometheus().splitlines()
+    assert text[0] == '# TYPE agrihook_rpc_request_seconds summary'
+    assert 'agrihook_rpc_request_seconds{endpoint="https://a/\\"x\\"",quantile="0.999"} 0.004000' in text
+    assert 'agrihook_rpc_request_seconds_sum{endpoint="https://a/\\"x\\""} 0.010000' in text
+    assert 'agrihook_rpc_request_seconds_count{endpoint="https://a/\\"x\\""} 4' in text
+    assert '# TYPE agrihook_cache_hits_total counter' in text
+    assert 'agrihook_cache_hits_total{fn="basePrice"} 3' in text
+    assert 'agrihook_tx_send_errors_total 1' in text
+    assert sum(line.startswith('# TYPE') for line in text) == 4
+
+    telemetry.dump(str(tmp_path / 'metrics.prom'))
+    telemetry.dump(str(tmp_path / 'metrics.json'))
+    assert (tmp_path / 'metrics.prom').read_text() == telemetry.prometheus()
+    assert json.loads((tmp_path / 'metrics.json').read_text()) == data
+
+
+def test_quiet_keeps_other_message_sinks(capsys):
+    telemetry = Telemetry()
+    captured = []
+    telemetry.messages.append(captured.append)
+    telemetry.quiet(False)
+    telemetry.echo('hello')
+    telemetry.quiet(True)
+    telemetry.echo('silent')
+    assert capsys.readouterr().out == 'hello\n'
+    assert captured == ['hello', 'silent']
+    assert not any(isinstance(getattr(m, '__self__', None), ConsoleSink) for m in telemetry.messages)
@@ -0,0 +1,75 @@
+import pytest
+from eth_abi import encode
+from eth_account import Account
+from eth_keys import keys
+from eth_utils import function_signature_to_4byte_selector, keccak, to_checksum_address
+
+from agrihook.wallet_pool import TRANSFER_GAS, TxTemplate, address_of, claims, derive_keys, risk_updates
+
+MASTER = keccak(text='agrihook test master')
+VAULT = to_checksum_address('0x' + '5a' * 20)
+
+
+def reference(key: bytes, template: TxTemplate, nonce: int, to, value: int, data: bytes):
+    signed = Account.sign_transaction({
+        'nonce': nonce, 'gasPrice': template.gas_price, 'gas': template.gas,
+        'to': to or template.to, 'value': value, 'data': data, 'chainId': template.chain_id,
+    }, key)
+    return bytes(signed.raw_transaction), bytes(signed.hash)
+
+
+@pytest.mark.parametrize('chain_id', [1, 114, 31337])
+def test_sign_matches_eth_account(chain_id):
+    key = derive_keys(MASTER, 1)[0]
+    template = TxTemplate(VAULT, 'updateRegionRisk(bytes32,uint256,uint256)', 100000, 25 * 10**9, chain_id)
+    for nonce in (0, 1, 127, 128, 65_536):
+        data = template.calldata((keccak(text=str(nonce)), nonce % 101, 17))
+        expected = reference(key, template, nonce, None, 0, data)
+        assert template.sign(keys.PrivateKey(key), nonce, None, 0, data) == expected
+
+
+def test_transfers_and_values_match_eth_account():
+    key = derive_keys(MASTER, 2)[1]
+    template = TxTemplate(None, None, TRANSFER_GAS, 1)
+    for value, recipient in ((0, '0x' + '00' * 20), (1, VAULT), (10**24, address_of(MASTER))):
+        expected = reference(key, template, 3, recipient, value, b'')
+        assert template.sign(keys.PrivateKey(key), 3, recipient, value, b'') == expected
+
+    payable = TxTemplate(VAULT, 'createPolicy(int256,int256,uint256)', 400000, 10**9)
+    data = payable.calldata((-19_500_000, -44_250_000, 10_000 * 10**6))
+    expected = reference(key, payable, 9, None, 123 * 10**15, data)
+    assert payable.sign(keys.PrivateKey(key), 9, None, 123 * 10**15, data) == expected
+
+
+def test_calldata_and_cost():
+    template = TxTemplate(VAULT.lower(), 'createPolicy(int256,int256,uint256)', 400000, 2 * 10**9)
+    assert template.to == VAULT
+    assert template.calldata((-1, 2, 3)) == function_signature_to_4byte_selector(
+        'createPolicy(int256,int256,uint256)') + encode(['int256', 'int256', 'uint256'], [-1, 2, 3])
+    assert template.cost(5) == 400000 * 2 * 10**9 + 5
+    assert TxTemplate(VAULT, 'claimPayout()', 1, 1).calldata(()) == function_signature_to_4byte_selector('claimPayout()')
+    assert TxTemplate(None, None, TRANSFER_GAS, 1).calldata(()) == b''
+    with pytest.raises(ValueError):
+        TxTemplate(VAULT, 'getPoolStatus((address,address,uint24,int24,address))', 1, 1)
+
+
+def test_derived_keys():
+    lanes = derive_keys(MASTER, 4)
+    assert lanes == derive_keys(MASTER, 4)
+    assert lanes[:2] == derive_keys(MASTER, 2)
+    assert len(set(lanes)) == 4 and set(lanes).isdisjoint(derive_keys(MASTER, 4, label='funder'))
+    assert lanes[0] == keccak(MASTER + b'operator' + b'\0\0\0\0')
+    for key in lanes:
+        assert address_of(key) == Account.from_key(key).address
+        assert address_of('0x' + key.hex()) == address_of(key.hex())
+
+
+def test_wave_builders_pin_senders():
+    owner = address_of(MASTER)
+    region = keccak(text='region')
+    (op,) = risk_updates(VAULT, owner, [(region, 40, 20)], gas_price=1)
+    assert op.sender == owner and op.args == (region, 40, 20)
+    farmers = [address_of(key) for key in derive_keys(MASTER, 3, label='farmer')]
+    ops = claims(VAULT, farmers, gas_price=1)
+    assert [op.sender for op in ops] == farmers
+    assert len({id(op.template) for op in ops}) == 1
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from datetime import date, timedelta
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from agrihook.contract_math import calculate_weather_multiplier
+from agrihook.providers import DailyObservation, ProviderError
+from agrihook.regions import region_cell, to_e6
+from agrihook.weather_service import WeatherService
+
+LAT, LON = -18.5122, -44.5550
+NEIGHBOUR = (-18.5499, -44.5001)                 # Same 0.1° cell
+OTHER = (-19.05, -45.05)
+
+
+class FakeClient:
+    """ProviderClient stand-in: 0.5 mm/day from two providers, one failing, after a short delay"""
+
+    def __init__(self, rainfall=0.5):
+        self.rainfall = rainfall
+        self.requests = 0
+        self.calls = []
+        self.down = False
+
+    async def fetch_all(self, latitude, longitude, days=7, end=None):
+        self.requests += 1
+        self.calls.append((latitude, longitude))
+        await asyncio.sleep(0.02)
+        if self.down:
+            raise ProviderError('all providers down')
+        start = date(2026, 10, 12)
+        rows = lambda name: [DailyObservation(name, latitude, longitude, start + timedelta(days=i),
+                                              self.rainfall, 21.0, 60.0) for i in range(days)]
+        return {'visual_crossing': rows('visual_crossing'), 'weather_api': rows('weather_api'),
+                'openweathermap': ProviderError('OpenWeatherMap: HTTP 401')}
+
+    async def close(self):
+        pass
+
+
+def serve(test, **kwargs):
+    """Run `test(client, service, upstream)` against the app on a local test server"""
+    async def run():
+        upstream = FakeClient()
+        service = WeatherService(upstream, **kwargs)
+        async with TestClient(TestServer(service.app())) as client:
+            return await test(client, service, upstream)
+    return asyncio.run(run())
+
+
+def test_region_payload_and_one_fetch_per_cell():
+    async def test(client, service, upstream):
+        responses = await asyncio.gather(*(client.get('/v1/region', params={'lat': lat, 'lon': lon})
+                                           for lat, lon in [(LAT, LON), NEIGHBOUR] * 10))
+        bodies = [await r.json() for r in responses]
+        assert {r.status for r in responses} == {200}
+        assert upstream.requests == 1                         # 20 concurrent misses, one cell
+        assert len({r.headers['ETag'] for r in responses}) == 1
+
+        payload = bodies[0]
+        assert payload['region']['cell'] == list(region_cell(to_e6(LAT), to_e6(LON)))
+        assert payload['consensus']['rainfall'] == 3.5       # 7 × 0.5 mm
+        assert payload['onchain'] == {'rainfall': 3, 'multiplier': calculate_weather_multiplier(3),
+                                      'event_type': 1, 'price_impact': 30, 'active': True}
+        assert payload['failed_sources'] == ['openweathermap']
+
+        await client.get('/v1/region', params={'lat': LAT, 'lon': LON})
+        assert upstream.requests == 1 and service.hits >= 1
+        return True
+    assert serve(test)
+
+
+def test_etag_revalidation():
+    async def test(client, service, upstream):
+        first = await client.get('/v1/region', params={'lat': LAT, 'lon': LON})
+        etag = first.headers['ETag']
+        assert 0 < int(first.headers['Cache-Control'].split('max-age=')[1]) <= 600
+        again = await client.get('/v1/region', params={'lat': LAT, 'lon': LON},
+                                 headers={'If-None-Match': etag})
+        assert again.status == 304 and await again.read() == b''
+        assert again.headers['ETag'] == etag and service.not_modified == 1
+
+        batch = await client.get('/v1/regions', params={'points': f'{LAT},{LON};{OTHER[0]},{OTHER[1]}'})
+        cached = await client.get('/v1/regions', params={'points': f'{LAT},{LON};{OTHER[0]},{OTHER[1]}'},
+                                  headers={'If-None-Match': batch.headers['ETag']})
+        assert cached.status == 304
+        return True
+    assert serve(test)
+
+
+def test_batch_validation():
+    async def test(client, service, upstream):
+        too_many = {'points': [[LAT, LON]] * 4}
+        cases = [
+            client.post('/v1/regions', json=too_many),
+            client.post('/v1/regions', data='not json'),
+            client.post('/v1/regions', json={'points': [[LAT]]}),
+            client.post('/v1/regions', json={'points': [[91, 0]]}),
+            client.post('/v1/regions', json={'points': []}),
+            client.get('/v1/regions', params={'points': 'a,b'}),
+            client.get('/v1/region', params={'lat': LAT}),
+        ]
+        for response in await asyncio.gather(*cases):
+            assert response.status == 400
+            assert 'error' in await response.json()
+        assert upstream.requests == 0
+
+        ok = await client.post('/v1/regions', json={'points': [[LAT, LON], {'lat': NEIGHBOUR[0],
+                                                                              'lon': NEIGHBOUR[1]}, list(OTHER)]})
+        results = (await ok.json())['results']
+        assert ok.status == 200 and len(results) == 3
+        assert results[0] == results[1] != results[2]
+        assert upstream.requests == 2                          # One per distinct cell
+        return True
+    assert serve(test, max_batch=3)
+
+
+def test_stale_entries_within_grace():
+    async def test(client, service, upstream):
+        fresh = await client.get('/v1/region', params={'lat': LAT, 'lon': LON})
+        body = await fresh.read()
+        entry = next(iter(service._entries.values()))
+
+        upstream.down = True
+        entry.expires = time.monotonic() - 100                # Expired, well inside the grace
+        stale = await client.get('/v1/region', params={'lat': LAT, 'lon': LON})
+        assert stale.status == 200 and await stale.read() == body
+        assert stale.headers['Warning'] == '110 - "Response is Stale"'
+        assert stale.headers['Cache-Control'] == 'public, max-age=0'
+
+        # Past the grace (and the replayed failure) the error surfaces
+        entry.expires = time.monotonic() - service.stale_grace - 1
+        gone = await client.get('/v1/region', params={'lat': LAT, 'lon': LON})
+        assert gone.status == 502
+        assert service.stale_served == 1
+        return True
+    assert serve(test)
+
+
+def test_health_and_metrics():
+    async def test(client, service, upstream):
+        await client.get('/v1/region', params={'lat': LAT, 'lon': LON})
+        health = await (await client.get('/healthz')).json()
+        assert health['healthy'] and health['regions'] == 1 and health['upstream_requests'] == 1
+        text = await (await client.get('/metrics')).text()
+        assert 'agrihook_weather_service_refreshes 1' in text
+        assert '# TYPE agrihook_weather_service_regions gauge' in text
+        return True
+    assert serve(test)
@@ -0,0 +1,143 @@
+import os
+import re
+
+from eth_abi import encode
+from eth_utils import function_signature_to_4byte_selector, keccak
+
+from agrihook import whatif
+from agrihook.contract_math import theoretical_price, utilization_multiplier, weather_event_for_rainfall
+from agrihook.whatif import Call, ScenarioEngine, StateOverride, mapping_slot, pool_id, price_scenarios, word
+
+from conftest import CONTRACTS_DIR
+
+ORACLE = '0x' + '11' * 20
+VAULT = '0x' + '22' * 20
+HOOK = '0x' + '33' * 20
+POOL_KEY = ('0x' + '00' * 19 + '01', '0x' + '00' * 19 + '02', 3000, 60, HOOK)
+REGION = keccak(text='region')
+
+# Slots taken by struct-typed state variables (everything else here takes one)
+STRUCT_SLOTS = {'WeatherEvent': 4}
+
+
+def storage_slots(contract):
+    """Contract-level state variables of src/<contract>.sol → first slot, in declaration order"""
+    with open(os.path.join(CONTRACTS_DIR, 'src', f'{contract}.sol')) as f:
+        source = f.read()
+    slots, slot = {}, 0
+    for line in source.splitlines():
+        match = re.match(r'    (mapping\(.*\)|[A-Za-z]\w*)\s+(?:public\s+|private\s+|internal\s+)?(\w+)\s*(?:=.*)?;', line)
+        if not match or match.group(1) in ('using', 'return', 'emit') or re.search(r'\b(constant|immutable)\b', line):
+            continue
+        slots[match.group(2)] = slot
+        slot += STRUCT_SLOTS.get(match.group(1), 1)
+    return slots
+
+
+def test_slot_constants_match_declarations():
+    oracle = storage_slots('WeatherOracle')
+    assert oracle['basePrice'] == whatif.ORACLE_BASE_PRICE_SLOT
+    assert oracle['currentWeatherEvent'] == whatif.ORACLE_EVENT_SLOT
+    assert oracle['owner'] == whatif.ORACLE_EVENT_SLOT + 4
+
+    vault = storage_slots('InsuranceVault')
+    assert vault['policies'] == whatif.VAULT_POLICIES_SLOT
+    assert vault['regionRisks'] == whatif.VAULT_REGION_RISKS_SLOT
+    assert vault['totalCoverage'] == whatif.VAULT_TOTAL_COVERAGE_SLOT
+    assert vault['treasuryBalance'] == whatif.VAULT_TREASURY_SLOT
+
+    hook = storage_slots('AgriHook')
+    assert hook['poolPrice'] == whatif.HOOK_POOL_PRICE_SLOT
+    assert hook['treasuryBalance'] == whatif.HOOK_TREASURY_SLOT
+    assert hook['circuitBreakerActive'] == whatif.HOOK_BREAKER_SLOT
+    assert hook['cachedOraclePrice'] == whatif.HOOK_ORACLE_PRICE_SLOT
+
+
+def test_mapping_slot_and_pool_id():
+    farmer = '0x' + 'ab' * 20
+    assert mapping_slot(REGION, 1) == int.from_bytes(keccak(encode(['bytes32', 'uint256'], [REGION, 1])), 'big')
+    assert mapping_slot(farmer, 0) == int.from_bytes(keccak(encode(['address', 'uint256'], [farmer, 0])), 'big')
+    assert mapping_slot('0x' + REGION.hex(), 1) == mapping_slot(REGION, 1)
+    assert pool_id(POOL_KEY) == keccak(encode(['address', 'address', 'uint24', 'int24', 'address'], list(POOL_KEY)))
+
+
+def test_state_override_words():
+    assert word(1) == '0x' + '00' * 31 + '01'
+    assert word(-1) == '0x' + 'ff' * 32
+
+    # 2 mm: MODERATE drought, +30%
+    diff = StateOverride().rainfall(ORACLE, 2, timestamp=7).base_price(ORACLE, 5 * 10**18).to_rpc()[ORACLE]['stateDiff']
+    assert {int(k, 16): int(v, 16) for k, v in diff.items()} == {0: 5 * 10**18, 1: 1, 2: 30, 3: 7, 4: 1}
+
+    region = mapping_slot(REGION, whatif.VAULT_REGION_RISKS_SLOT)
+    pool = pool_id(POOL_KEY)
+    overrides = StateOverride().region_risk(VAULT, REGION, 40, 20) \
+        .merged(StateOverride().circuit_breaker(HOOK, pool, True).oracle_price(HOOK, 9))
+    rpc = overrides.to_rpc()
+    assert len(overrides) == 4
+    assert rpc[VAULT]['stateDiff'] == {word(region): word(40), word(region + 1): word(20)}
+    assert rpc[HOOK]['stateDiff'] == {word(mapping_slot(pool, 2)): word(1), word(4): word(9)}
+
+
+def test_utilization_lands_on_the_requested_rate():
+    treasury = 123_456 * 10**6
+    for percent in (0, 49, 50, 79, 80, 150):
+        diff = StateOverride().utilization(VAULT, percent, treasury).to_rpc()[VAULT]['stateDiff']
+        total = int(diff[word(whatif.VAULT_TOTAL_COVERAGE_SLOT)], 16)
+        assert int(diff[word(whatif.VAULT_TREASURY_SLOT)], 16) == treasury
+        assert total * 100 // (treasury + 1) == percent
+        assert total == 0 or (total - 1) * 100 // (treasury + 1) == percent - 1
+        assert utilization_multiplier(total, treasury) == (100 if percent < 50 else 125 if percent < 80 else 150)
+
+
+def test_call_encoding():
+    call = Call(VAULT, 'calculatePremium(uint256,bytes32)', (10**9, REGION))
+    data = call.transaction()['data']
+    assert data == '0x' + (function_signature_to_4byte_selector('calculatePremium(uint256,bytes32)')
+                           + encode(['uint256', 'bytes32'], [10**9, REGION])).hex()
+    assert whatif._arg_types(f'getPoolStatus({whatif.POOL_KEY_TYPE})') == [whatif.POOL_KEY_TYPE]
+    assert whatif._arg_types('f(uint256,(address,bool),bytes32)') == ['uint256', '(address,bool)', 'bytes32']
+    assert whatif._arg_types('f()') == []
+    assert Call(VAULT, 'claimPayout()', returns=(), sender=ORACLE).transaction()['from'] == ORACLE
+
+
+class _Provider:
+    """Answers eth_call batches with the theoretical price the override encodes"""
+
+    def __init__(self):
+        self.batches = []
+
+    def make_batch_request(self, requests):
+        self.batches.append(requests)
+        responses = []
+        for _, (tx, block, overrides) in requests:
+            diff = {int(k, 16): int(v, 16) for k, v in overrides[tx['to']]['stateDiff'].items()}
+            if diff[0] == 0:
+                responses.append({'error': {'message': 'execution reverted: Invalid price calculation'}})
+                continue
+            impact = diff[2] - 2**256 if diff[2] >= 2**255 else diff[2]
+            price = theoretical_price(diff[0], impact, bool(diff[4]))
+            responses.append({'result': '0x' + encode(['uint256'], [price]).hex()})
+        return responses
+
+
+class _W3:
+    def __init__(self):
+        self.provider = _Provider()
+
+
+def test_engine_batches_and_decodes():
+    w3 = _W3()
+    engine = ScenarioEngine(w3, calls_per_request=4)
+    scenarios = price_scenarios(ORACLE, range(12), base_price=5 * 10**18)
+    results = engine.evaluate(scenarios, block=100)
+    assert (engine.round_trips, engine.eth_calls) == (3, 12)
+    assert all(params[1] == hex(100) for batch in w3.provider.batches for _, params in batch)
+    for rainfall, result in zip(range(12), results):
+        assert result.ok
+        assert result.predicted == (result.value,)
+        assert result.value == theoretical_price(5 * 10**18, *weather_event_for_rainfall(rainfall)[1:])
+
+    failed = engine.evaluate(price_scenarios(ORACLE, [0], base_price=0), block=100)[0]
+    assert not failed.ok and failed.value is None
+    assert failed.summary()['errors'] == ['execution reverted: Invalid price calculation']
@@ -0,0 +1,91 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.25;
+
+import {FeeCurve} from "../../src/libraries/FeeCurve.sol";
+import {BonusCurve} from "../../src/libraries/BonusCurve.sol";
+import {InsuranceVault} from "../../src/InsuranceVault.sol";
+import {WeatherOracle} from "../../src/WeatherOracle.sol";
+
+/**
+ * @title CurveHarness
+ * @notice Exposes FeeCurve / BonusCurve to eth_call for the differential fuzzer (scripts/agrihook/difffuzz.py)
+ * @dev The batch functions evaluate many cases in one call; a case that reverts reports ok = false
+ */
+contract CurveHarness {
+    function quadraticFee(
+        uint256 deviation,
+        uint256 baseFee,
+        uint256 multiplier,
+        uint256 maxFee
+    ) external pure returns (uint256) {
+        return FeeCurve.quadraticFee(deviation, baseFee, multiplier, maxFee);
+    }
+
+    function quadraticBonus(
+        uint256 deviation,
+        uint256 multiplier,
+        uint256 maxBonus
+    ) external pure returns (uint256) {
+        return BonusCurve.quadraticBonus(deviation, multiplier, maxBonus);
+    }
+
+    function batchQuadraticFee(uint256[4][] calldata cases)
+        external
+        view
+        returns (uint256[] memory results, bool[] memory ok)
+    {
+        results = new uint256[](cases.length);
+        ok = new bool[](cases.length);
+        for (uint256 i = 0; i < cases.length; i++) {
+            try this.quadraticFee(cases[i][0], cases[i][1], cases[i][2], cases[i][3]) returns (uint256 fee) {
+                results[i] = fee;
+                ok[i] = true;
+            } catch {}
+        }
+    }
+
+    function batchQuadraticBonus(uint256[3][] calldata cases)
+        external
+        view
+        returns (uint256[] memory results, bool[] memory ok)
+    {
+        results = new uint256[](cases.length);
+        ok = new bool[](cases.length);
+        for (uint256 i = 0; i < cases.length; i++) {
+            try this.quadraticBonus(cases[i][0], cases[i][1], cases[i][2]) returns (uint256 bonus) {
+                results[i] = bonus;
+                ok[i] = true;
+            } catch {}
+        }
+    }
+}
+
+/**
+ * @title PremiumHarness
+ * @notice InsuranceVault whose calculatePremium inputs can be set per case
+ * @dev Each case writes regionRisks / totalCoverage / treasuryBalance before calling calculatePremium.
+ *      Only ever called with eth_call, so none of those writes persist.
+ */
+contract PremiumHarness is InsuranceVault {
+    bytes32 private constant FUZZ_REGION = keccak256("agrihook.difffuzz");
+
+    constructor() InsuranceVault(WeatherOracle(address(0))) {}
+
+    /// @param cases [coverageAmount, currentRisk, historicalRisk, totalCoverage, treasuryBalance]
+    function batchCalculatePremium(uint256[5][] calldata cases)
+        external
+        returns (uint256[] memory results, bool[] memory ok)
+    {
+        results = new uint256[](cases.length);
+        ok = new bool[](cases.length);
+        for (uint256 i = 0; i < cases.length; i++) {
+            regionRisks[FUZZ_REGION] = RegionRisk(cases[i][1], cases[i][2], 0, 0);
+            totalCoverage = cases[i][3];
+            treasuryBalance = cases[i][4];
+            try this.calculatePremium(cases[i][0], FUZZ_REGION) returns (uint256 premium) {
+                results[i] = premium;
+                ok[i] = true;
+            } catch {}
+        }
+    }
+}
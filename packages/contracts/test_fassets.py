@@ -10,6 +10,10 @@ import dotenv
 from web3 import Web3
 from web3.middleware.proof_of_authority import ExtraDataToPOAMiddleware
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from agrihook.rpc_pool import RPCPool
+from agrihook.state_cache import StateCache
+
 dotenv.load_dotenv()
 
 # Colors
@@ -47,8 +51,9 @@ def main():
 """)
     
     # Connect
-    w3 = Web3(Web3.HTTPProvider(RPC))
+    w3 = Web3(RPCPool.from_env(RPC))
     w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+    cache = StateCache(w3)
     
     if not w3.is_connected():
         print(f"{Y}✗ Failed to connect to Flare{E}")
@@ -85,10 +90,10 @@ def main():
     fbtc = w3.eth.contract(address=FBTC_ADDRESS, abi=ERC20_ABI)
     
     try:
-        name = fbtc.functions.name().call()
-        symbol = fbtc.functions.symbol().call()
-        decimals = fbtc.functions.decimals().call()
-        total_supply = fbtc.functions.totalSupply().call()
+        name = cache.call(fbtc, 'name')
+        symbol = cache.call(fbtc, 'symbol')
+        decimals = cache.call(fbtc, 'decimals')
+        total_supply = cache.call(fbtc, 'totalSupply')
         
         print(f"{C}Token Information:{E}")
         print(f"  Name: {G}{name}{E}")
@@ -98,7 +103,7 @@ def main():
         print()
         
         # Check pool manager balance
-        pool_balance = fbtc.functions.balanceOf(POOL_MANAGER).call()
+        pool_balance = cache.call(fbtc, 'balanceOf', POOL_MANAGER)
         print(f"{C}Liquidity Pool:{E}")
         print(f"  Pool Manager: {POOL_MANAGER}")
         print(f"  FBTC Balance: {G}{pool_balance / (10**decimals):.8f} {symbol}{E}")
@@ -123,10 +128,10 @@ def main():
     coffee = w3.eth.contract(address=COFFEE_ADDRESS, abi=ERC20_ABI)
     
     try:
-        name = coffee.functions.name().call()
-        symbol = coffee.functions.symbol().call()
-        decimals = coffee.functions.decimals().call()
-        total_supply = coffee.functions.totalSupply().call()
+        name = cache.call(coffee, 'name')
+        symbol = cache.call(coffee, 'symbol')
+        decimals = cache.call(coffee, 'decimals')
+        total_supply = cache.call(coffee, 'totalSupply')
         
         print(f"{C}Token Information:{E}")
         print(f"  Name: {G}{name}{E}")
@@ -136,7 +141,7 @@ def main():
         print()
         
         # Check pool manager balance
-        pool_balance = coffee.functions.balanceOf(POOL_MANAGER).call()
+        pool_balance = cache.call(coffee, 'balanceOf', POOL_MANAGER)
         print(f"{C}Liquidity Pool:{E}")
         print(f"  Pool Manager: {POOL_MANAGER}")
         print(f"  COFFEE Balance: {G}{pool_balance / (10**decimals):.2f} {symbol}{E}")
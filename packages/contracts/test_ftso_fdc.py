@@ -10,6 +10,11 @@ import dotenv
 from web3 import Web3
 from web3.middleware.proof_of_authority import ExtraDataToPOAMiddleware
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from agrihook.reporting import Run, RunResult, StepResult, make_reporter
+from agrihook.rpc_pool import RPCPool
+from agrihook.state_cache import StateCache
+
 dotenv.load_dotenv()
 
 # Colors
@@ -43,7 +48,54 @@ VAULT_ABI = [
     {"name":"totalPayouts","type":"function","stateMutability":"view","inputs":[],"outputs":[{"type":"uint256"}]},
 ]
 
-def main():
+EVENT_NAMES = {0: "None", 1: "Drought", 2: "Flood", 3: "Frost"}
+
+
+def read_ftso_config(cache, oracle):
+    return {
+        'symbol': cache.call(oracle, 'ftsoSymbol'),
+        'ratio': cache.call(oracle, 'ftsoToCoffeeRatio'),
+        'enabled': cache.call(oracle, 'useFTSO'),
+    }
+
+
+def read_prices(cache, oracle):
+    data = {
+        'base_price': cache.call(oracle, 'basePrice'),
+        'theoretical': cache.call(oracle, 'getTheoreticalPrice'),
+        'ftso': None,
+    }
+    # Try to get current FTSO price
+    try:
+        ftso_price, timestamp, decimals = cache.call(oracle, 'getCurrentFTSOPrice')
+        data['ftso'] = {'price': ftso_price, 'timestamp': timestamp, 'decimals': decimals}
+    except Exception:
+        pass
+    return data
+
+
+def read_weather_event(cache, oracle):
+    event_type, severity, timestamp, active = cache.call(oracle, 'getCurrentWeatherEvent')
+    return {'type': event_type, 'severity': severity, 'timestamp': timestamp, 'active': active}
+
+
+def read_vault(cache, vault):
+    return {
+        'treasury': cache.call(vault, 'treasuryBalance'),
+        'total_coverage': cache.call(vault, 'totalCoverage'),
+        'total_premiums': cache.call(vault, 'totalPremiums'),
+        'total_payouts': cache.call(vault, 'totalPayouts'),
+    }
+
+
+def _section(title):
+    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
+    print(f"{BOLD}{title}{E}")
+    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
+    print()
+
+
+def render_start(suite, metadata):
     print(f"""
 {C}╔═══════════════════════════════════════════════════════════════╗
 ║                                                               ║
@@ -52,130 +104,92 @@ def main():
 ║                                                               ║
 ╚═══════════════════════════════════════════════════════════════╝{E}
 """)
-    
-    # Connect
-    w3 = Web3(Web3.HTTPProvider(RPC))
-    w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-    
-    if not w3.is_connected():
-        print(f"{Y}✗ Failed to connect to Flare{E}")
-        return
-    
     print(f"{G}✓ Connected to Flare Coston2{E}")
-    print(f"  Chain ID: {w3.eth.chain_id}")
-    print(f"  Block: {w3.eth.block_number}")
+    print(f"  Chain ID: {metadata['chain_id']}")
+    print(f"  Block: {metadata['block_number']}")
     print()
     
-    # Load contracts
-    oracle = w3.eth.contract(address=WEATHER_ORACLE, abi=ORACLE_ABI)
-    vault = w3.eth.contract(address=INSURANCE_VAULT, abi=VAULT_ABI)
     
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
-    print(f"{BOLD}1. FTSO (Flare Time Series Oracle) Integration{E}")
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
-    print()
-    
-    # FTSO Config
-    try:
-        symbol = oracle.functions.ftsoSymbol().call()
-        ratio = oracle.functions.ftsoToCoffeeRatio().call()
-        enabled = oracle.functions.useFTSO().call()
-        
-        print(f"{C}FTSO Configuration:{E}")
-        print(f"  Symbol: {G}{symbol}{E}")
-        print(f"  Coffee Ratio: {G}{ratio}{E}")
-        print(f"  Enabled: {G if enabled else Y}{'Yes' if enabled else 'No'}{E}")
-        print()
-    except Exception as e:
-        print(f"{Y}⚠ FTSO config error: {e}{E}")
+def render_ftso_config(step: StepResult):
+    _section("1. FTSO (Flare Time Series Oracle) Integration")
+    if step.error:
+        print(f"{Y}⚠ FTSO config error: {step.error}{E}")
         print()
+        return
+    data = step.data
+    print(f"{C}FTSO Configuration:{E}")
+    print(f"  Symbol: {G}{data['symbol']}{E}")
+    print(f"  Coffee Ratio: {G}{data['ratio']}{E}")
+    print(f"  Enabled: {G if data['enabled'] else Y}{'Yes' if data['enabled'] else 'No'}{E}")
+    print()
     
-    # FTSO Prices
-    try:
-        base_price = oracle.functions.basePrice().call()
-        theoretical = oracle.functions.getTheoreticalPrice().call()
-        
-        print(f"{C}Price Data:{E}")
-        print(f"  Base Price: {G}{base_price / 1e18:.6f} C2FLR{E}")
-        print(f"  Theoretical: {G}{theoretical / 1e18:.6f} C2FLR{E}")
-        print()
         
-        # Try to get current FTSO price
-        try:
-            ftso_data = oracle.functions.getCurrentFTSOPrice().call()
-            ftso_price, timestamp, decimals = ftso_data
-            print(f"  Current FTSO Price: {G}{ftso_price / (10**decimals):.2f}{E}")
-            print(f"  FTSO Timestamp: {G}{timestamp}{E}")
-            print(f"  FTSO Decimals: {G}{decimals}{E}")
-            print()
-            print(f"{G}✓ FTSO integration is WORKING - real price data from Flare!{E}")
-        except Exception as ftso_err:
-            print(f"{Y}⚠ FTSO price not available yet (need to call updatePriceFromFTSO()){E}")
-            print(f"{B}ℹ FTSO is configured and ready to use{E}")
+def render_prices(step: StepResult):
+    if step.error:
+        print(f"{Y}⚠ Price data error: {step.error}{E}")
         print()
-    except Exception as e:
-        print(f"{Y}⚠ Price data error: {e}{E}")
+        return
+    data = step.data
+    print(f"{C}Price Data:{E}")
+    print(f"  Base Price: {G}{data['base_price'] / 1e18:.6f} C2FLR{E}")
+    print(f"  Theoretical: {G}{data['theoretical'] / 1e18:.6f} C2FLR{E}")
+    print()
+    ftso = data['ftso']
+    if ftso:
+        print(f"  Current FTSO Price: {G}{ftso['price'] / (10**ftso['decimals']):.2f}{E}")
+        print(f"  FTSO Timestamp: {G}{ftso['timestamp']}{E}")
+        print(f"  FTSO Decimals: {G}{ftso['decimals']}{E}")
         print()
-    
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
-    print(f"{BOLD}2. FDC (Flare Data Connector) Integration{E}")
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
+        print(f"{G}✓ FTSO integration is WORKING - real price data from Flare!{E}")
+    else:
+        print(f"{Y}⚠ FTSO price not available yet (need to call updatePriceFromFTSO()){E}")
+        print(f"{B}ℹ FTSO is configured and ready to use{E}")
     print()
     
-    # Weather Event (FDC would verify this)
-    try:
-        event = oracle.functions.getCurrentWeatherEvent().call()
-        event_type, severity, timestamp, active = event
-        
-        event_names = {0: "None", 1: "Drought", 2: "Flood", 3: "Frost"}
         
-        print(f"{C}Current Weather Event:{E}")
-        print(f"  Type: {G if active else Y}{event_names.get(event_type, 'Unknown')}{E}")
-        print(f"  Severity: {G if active else Y}{severity}%{E}")
-        print(f"  Timestamp: {G if active else Y}{timestamp}{E}")
-        print(f"  Active: {G if active else Y}{'Yes' if active else 'No'}{E}")
-        print()
-        
-        if active:
-            print(f"{G}✓ Weather event detected - FDC would verify this data!{E}")
-        else:
-            print(f"{B}ℹ No active weather event - FDC ready to verify when triggered{E}")
-        print()
-    except Exception as e:
-        print(f"{Y}⚠ Weather event error: {e}{E}")
+def render_weather_event(step: StepResult):
+    _section("2. FDC (Flare Data Connector) Integration")
+    if step.error:
+        print(f"{Y}⚠ Weather event error: {step.error}{E}")
         print()
-    
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
-    print(f"{BOLD}3. Insurance Vault Status{E}")
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
+        return
+    event = step.data
+    color = G if event['active'] else Y
+    print(f"{C}Current Weather Event:{E}")
+    print(f"  Type: {color}{EVENT_NAMES.get(event['type'], 'Unknown')}{E}")
+    print(f"  Severity: {color}{event['severity']}%{E}")
+    print(f"  Timestamp: {color}{event['timestamp']}{E}")
+    print(f"  Active: {color}{'Yes' if event['active'] else 'No'}{E}")
+    print()
+    if event['active']:
+        print(f"{G}✓ Weather event detected - FDC would verify this data!{E}")
+    else:
+        print(f"{B}ℹ No active weather event - FDC ready to verify when triggered{E}")
     print()
     
-    try:
-        treasury = vault.functions.treasuryBalance().call()
-        total_coverage = vault.functions.totalCoverage().call()
-        total_premiums = vault.functions.totalPremiums().call()
-        total_payouts = vault.functions.totalPayouts().call()
         
-        print(f"{C}Vault Status:{E}")
-        print(f"  Treasury Balance: {G}{w3.from_wei(treasury, 'ether'):.4f} C2FLR{E}")
-        print(f"  Total Coverage: {G}{total_coverage / 1e6:.2f} USD{E}")
-        print(f"  Total Premiums: {G}{w3.from_wei(total_premiums, 'ether'):.4f} C2FLR{E}")
-        print(f"  Total Payouts: {G}{w3.from_wei(total_payouts, 'ether'):.4f} C2FLR{E}")
+def render_vault(step: StepResult):
+    _section("3. Insurance Vault Status")
+    if step.error:
+        print(f"{Y}⚠ Vault error: {step.error}{E}")
         print()
+        return
+    data = step.data
+    print(f"{C}Vault Status:{E}")
+    print(f"  Treasury Balance: {G}{Web3.from_wei(data['treasury'], 'ether'):.4f} C2FLR{E}")
+    print(f"  Total Coverage: {G}{data['total_coverage'] / 1e6:.2f} USD{E}")
+    print(f"  Total Premiums: {G}{Web3.from_wei(data['total_premiums'], 'ether'):.4f} C2FLR{E}")
+    print(f"  Total Payouts: {G}{Web3.from_wei(data['total_payouts'], 'ether'):.4f} C2FLR{E}")
+    print()
+    if data['treasury'] > 0:
+        print(f"{G}✓ Insurance vault is funded and operational!{E}")
+    else:
+        print(f"{B}ℹ Vault ready to receive funds{E}")
+    print()
         
-        if treasury > 0:
-            print(f"{G}✓ Insurance vault is funded and operational!{E}")
-        else:
-            print(f"{B}ℹ Vault ready to receive funds{E}")
-        print()
-    except Exception as e:
-        print(f"{Y}⚠ Vault error: {e}{E}")
-        print()
     
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
-    print(f"{BOLD}Summary{E}")
-    print(f"{BOLD}═══════════════════════════════════════════════════════════════{E}")
-    print()
+def render_summary(run: RunResult):
+    _section("Summary")
     print(f"{G}✓ FTSO Integration: Real-time price feeds from Flare{E}")
     print(f"{G}✓ FDC Integration: Weather data verification ready{E}")
     print(f"{G}✓ Smart Contracts: Deployed and operational on Coston2{E}")
@@ -188,5 +202,38 @@ def main():
     print(f"  https://coston2-explorer.flare.network/address/{WEATHER_ORACLE}")
     print()
 
+
+RENDERERS = {
+    'ftso_config': render_ftso_config,
+    'prices': render_prices,
+    'weather_event': render_weather_event,
+    'vault': render_vault,
+}
+
+
+def main(reporter=None) -> RunResult:
+    reporter = reporter or make_reporter(renderers=RENDERERS, summary=render_summary, header=render_start)
+    
+    # Connect
+    w3 = Web3(RPCPool.from_env(RPC))
+    w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+    cache = StateCache(w3)
+    
+    if not w3.is_connected():
+        print(f"{Y}✗ Failed to connect to Flare{E}", file=sys.stderr)
+        return None
+    
+    # Load contracts
+    oracle = w3.eth.contract(address=WEATHER_ORACLE, abi=ORACLE_ABI)
+    vault = w3.eth.contract(address=INSURANCE_VAULT, abi=VAULT_ABI)
+    
+    run = Run('ftso_fdc', reporter, chain_id=w3.eth.chain_id, block_number=w3.eth.block_number,
+              weather_oracle=WEATHER_ORACLE, insurance_vault=INSURANCE_VAULT)
+    run.step('ftso_config', read_ftso_config, cache, oracle)
+    run.step('prices', read_prices, cache, oracle)
+    run.step('weather_event', read_weather_event, cache, oracle)
+    run.step('vault', read_vault, cache, vault)
+    return run.finish()
+
 if __name__ == "__main__":
     main()